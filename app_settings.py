@@ -11,9 +11,10 @@ from config import ( # Absolute imports from project root
     DEEP_SCRAPE_DEPARTMENTS_DEFAULT, CONFIGURABLE_TIMEOUTS,
     PAGE_LOAD_TIMEOUT, ELEMENT_WAIT_TIMEOUT, STABILIZE_WAIT, POST_ACTION_WAIT,
     POST_CAPTCHA_WAIT, CAPTCHA_CHECK_TIMEOUT, DOWNLOAD_WAIT_TIMEOUT, POPUP_WAIT_TIMEOUT,
-    POST_DOWNLOAD_CLICK_WAIT
+    POST_DOWNLOAD_CLICK_WAIT, GLOBAL_BROWSER_BUDGET, PER_HOST_CONCURRENCY, ID_SEARCH_PARALLEL_WORKERS
 )
 from utils import get_website_keyword_from_url # Import utility
+from scraper.scheduler import configure_limits
 from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
@@ -37,8 +38,14 @@ DEFAULT_SETTINGS_STRUCTURE = {
     "use_undetected_driver": USE_UNDETECTED_DRIVER_DEFAULT,
     "headless_mode": HEADLESS_MODE_DEFAULT,
     "ui_update_interval_seconds": 2.0,
+    "log_view_max_lines": 20000,  # Lines kept per GUI log pane; older lines are dropped
     "automation_engine": "playwright",
     "department_parallel_workers": 1,
+    "id_search_parallel_workers": ID_SEARCH_PARALLEL_WORKERS,  # Browsers searching tender IDs at once
+    "global_browser_budget": GLOBAL_BROWSER_BUDGET,  # Browsers open at once across all scraping processes (0 = no limit)
+    "per_host_concurrency": PER_HOST_CONCURRENCY,  # Departments scraped at once from one portal host (0 = no limit)
+    "scraper_daemon_mode": "auto",  # auto (hand GUI jobs to a running scraper daemon) | off (always spawn a CLI process)
+    "scraper_log_mode": "normal",  # verbose | normal (sampled per-row/locator detail) | quiet (counters and summaries)
     "batch_delta_mode": "quick",
     "refresh_watch_enabled": False,
     "refresh_watch_loop_seconds": 30,
@@ -100,8 +107,16 @@ def load_settings(settings_filepath, default_download_dir):
     if not settings.get("selected_url_name"):
         settings["selected_url_name"] = FALLBACK_URL_CONFIG["Name"] # Default to fallback name initially
 
+    publish_scheduler_limits(settings)
     return settings
 
+def publish_scheduler_limits(settings):
+    """Share the browser budget / per-host limits with every scraping process on this machine."""
+    configure_limits(
+        settings.get("global_browser_budget", GLOBAL_BROWSER_BUDGET),
+        settings.get("per_host_concurrency", PER_HOST_CONCURRENCY),
+    )
+
 def save_settings(settings, settings_filepath):
     """Saves the provided settings dictionary to settings_filepath."""
     try:
@@ -120,6 +135,7 @@ def save_settings(settings, settings_filepath):
             os.fsync(f.fileno())  # Force write to disk
             
         logger.info(f"Settings saved successfully to {settings_filepath}")
+        publish_scheduler_limits(settings)
         return True
     except Exception as e:
         logger.error(f"Failed to save settings to {settings_filepath}: {e}", exc_info=True)
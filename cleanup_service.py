@@ -24,6 +24,14 @@ Usage:
     # Get stuck count
     from cleanup_service import get_stuck_run_info
     stuck_info = get_stuck_run_info()
+
+    # Expiry sweep (flip tenders past their closing time to is_live = 0)
+    from cleanup_service import sweep_expired_tenders
+    result = sweep_expired_tenders()
+
+    # Integrity counter reconcile (recount portal_integrity_counters, report drift)
+    from cleanup_service import reconcile_integrity_counters
+    result = reconcile_integrity_counters()
 """
 
 import sqlite3
@@ -40,6 +48,8 @@ DB_PATH = Path("database/blackforest_tenders.sqlite3")
 CHECKPOINT_DIR = Path("data/checkpoints")
 DEFAULT_AGE_THRESHOLD_HOURS = 24.0  # Changed from 2 to 24 hours
 DEFAULT_MIN_IDLE_MINUTES = 30
+DEFAULT_EXPIRY_SWEEP_INTERVAL_MINUTES = 15
+DEFAULT_INTEGRITY_RECONCILE_INTERVAL_MINUTES = 360
 
 
 def check_checkpoint_exists(portal_name, started_at):
@@ -56,20 +66,16 @@ def check_checkpoint_exists(portal_name, started_at):
     if not CHECKPOINT_DIR.exists():
         return False, None, False
     
-    # Checkpoint filename format: {portal_slug}_checkpoint.json
-    portal_slug = portal_name.lower().replace(" ", "_").replace("-", "_")
-    checkpoint_path = CHECKPOINT_DIR / f"{portal_slug}_checkpoint.json"
-    
-    if not checkpoint_path.exists():
+    # Per-department journal ({portal_slug}_checkpoint.jsonl) or an older whole-file JSON checkpoint
+    from scraper.checkpoint_journal import CheckpointJournal
+
+    journal = CheckpointJournal(str(CHECKPOINT_DIR), portal_name)
+    if not journal.exists():
         return False, None, False
+    checkpoint_path = Path(journal.path if os.path.exists(journal.path) else journal.legacy_path)
     
     try:
-        # Check if checkpoint has actual data
-        with open(checkpoint_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            has_tenders = len(data.get('tenders', [])) > 0
-            has_depts = len(data.get('processed_departments', [])) > 0
-            return True, checkpoint_path, (has_tenders or has_depts)
+        return True, checkpoint_path, journal.has_data()
     except Exception as e:
         logger.warning(f"Error reading checkpoint {checkpoint_path}: {e}")
         return True, checkpoint_path, False  # Exists but can't read
@@ -366,6 +372,74 @@ def get_stuck_run_summary():
     }
 
 
+def sweep_expired_tenders(backfill_batch_size=5000, db_path=None):
+    """
+    Materialize live/expired state for tenders.
+
+    Backfills the parsed `closing_at` column for rows that predate it, then
+    flips every live tender whose closing time (IST) has passed to expired.
+
+    Args:
+        db_path: Database to sweep (default: DB_PATH)
+
+    Returns:
+        dict with 'backfilled' and 'expired' row counts
+    """
+    db_path = Path(db_path or DB_PATH)
+    if not db_path.exists():
+        logger.warning(f"Database not found: {db_path}")
+        return {'backfilled': 0, 'expired': 0}
+
+    try:
+        from tender_store import TenderDataStore
+
+        store = TenderDataStore(str(db_path))
+        backfilled = store.backfill_closing_at(batch_size=backfill_batch_size)
+        expired = store.expire_closed_tenders()
+        if backfilled or expired:
+            logger.info(f"Expiry sweep: {expired} tenders expired ({backfilled} closing dates backfilled)")
+        return {'backfilled': backfilled, 'expired': expired}
+
+    except Exception as e:
+        logger.error(f"Error sweeping expired tenders: {e}")
+        return {'backfilled': 0, 'expired': 0, 'error': str(e)}
+
+
+def reconcile_integrity_counters(db_path=None):
+    """
+    Recount the trigger-maintained portal_integrity_counters table.
+
+    The triggers keep the counters exact; this periodic full recount verifies
+    that and repairs any drift (e.g. rows written before the triggers existed).
+
+    Args:
+        db_path: Database to reconcile (default: DB_PATH)
+
+    Returns:
+        dict with 'portals' reconciled and the list of 'drift' corrections
+    """
+    db_path = Path(db_path or DB_PATH)
+    if not db_path.exists():
+        logger.warning(f"Database not found: {db_path}")
+        return {'portals': 0, 'drift': []}
+
+    try:
+        from tender_store import TenderDataStore
+
+        store = TenderDataStore(str(db_path))
+        drift = store.reconcile_integrity_counters()
+        for item in drift:
+            logger.warning(
+                f"Integrity counter drift for '{item['portal_key']}': "
+                f"{item['field']} was {item['counter']}, actual {item['actual']}"
+            )
+        return {'portals': len(store.get_integrity_counters()), 'drift': drift}
+
+    except Exception as e:
+        logger.error(f"Error reconciling integrity counters: {e}")
+        return {'portals': 0, 'drift': [], 'error': str(e)}
+
+
 # DO NOT USE startup_cleanup() - TOO RISKY!
 # If server restarts, legitimate slow runs would be killed.
 # Use check_portal_resume() before starting new scrapes instead.
@@ -387,6 +461,44 @@ async def async_cleanup_task():
     return await loop.run_in_executor(None, cleanup_if_needed)
 
 
+async def async_expiry_sweep_task(interval_minutes=DEFAULT_EXPIRY_SWEEP_INTERVAL_MINUTES, run_once=False, db_path=None):
+    """
+    Async background loop for the tender expiry sweeper.
+
+    Runs sweep_expired_tenders() in an executor every `interval_minutes`.
+    Pass run_once=True to sweep a single time and return the result.
+    The dashboard registers this as a lifespan task.
+    """
+    import asyncio
+    import functools
+    loop = asyncio.get_event_loop()
+    sweep = functools.partial(sweep_expired_tenders, db_path=db_path)
+    while True:
+        result = await loop.run_in_executor(None, sweep)
+        if run_once:
+            return result
+        await asyncio.sleep(max(1.0, float(interval_minutes)) * 60)
+
+
+async def async_integrity_reconcile_task(interval_minutes=DEFAULT_INTEGRITY_RECONCILE_INTERVAL_MINUTES, run_once=False, db_path=None):
+    """
+    Async background loop for the integrity counter reconcile.
+
+    Runs reconcile_integrity_counters() in an executor every `interval_minutes`.
+    Pass run_once=True to reconcile a single time and return the result.
+    The dashboard registers this as a lifespan task.
+    """
+    import asyncio
+    import functools
+    loop = asyncio.get_event_loop()
+    reconcile = functools.partial(reconcile_integrity_counters, db_path=db_path)
+    while True:
+        result = await loop.run_in_executor(None, reconcile)
+        if run_once:
+            return result
+        await asyncio.sleep(max(1.0, float(interval_minutes)) * 60)
+
+
 if __name__ == '__main__':
     # Quick test - show stuck run summary
     logging.basicConfig(level=logging.INFO)
@@ -406,6 +518,12 @@ if __name__ == '__main__':
             print(f"    Age: {run['age_hours']}h")
             print(f"    Resume: {run['resume_reason']}")
     
+    sweep = sweep_expired_tenders()
+    print(f"\nExpiry sweep: {sweep['expired']} expired, {sweep['backfilled']} backfilled")
+
+    reconcile = reconcile_integrity_counters()
+    print(f"Integrity counters: {reconcile['portals']} portal(s), {len(reconcile['drift'])} drift correction(s)")
+
     # Only cleanup non-resumable runs
     if summary['dead_count'] > 0:
         print(f"\nCleaning {summary['dead_count']} dead run(s)...")
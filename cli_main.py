@@ -25,10 +25,13 @@ except AttributeError as e:
 # Disable interactive hook to prevent readline setup errors
 setattr(sys, '__interactivehook__', lambda: None)
 
-import tkinter as tk
-import tkinter.messagebox
 import logging
 import datetime
+import importlib.util
+try:
+    import importlib.metadata as _metadata
+except ImportError:  # Python 3.7: importlib.metadata arrived in 3.8
+    _metadata = None
 import platform
 import traceback
 
@@ -60,6 +63,14 @@ except NameError:
 if SCRIPT_DIR not in sys.path:
     sys.path.insert(0, SCRIPT_DIR)
 
+# --- Hand the command to a running scraper daemon (cli_main.py serve) ---
+# Done before logging setup and the package checks, which a forwarded command does not need
+if __name__ == "__main__" and "--daemon" in sys.argv[1:]:
+    from daemon_client import forward_cli_command
+    _daemon_exit_code = forward_cli_command(sys.argv[1:])
+    if _daemon_exit_code is not None:
+        sys.exit(_daemon_exit_code)
+
 # --- Configuration and Utility Imports ---
 try:
     from config import (
@@ -167,32 +178,56 @@ OPTIONAL_PACKAGES = {
     'webdriver_manager': 'webdriver-manager'
 }
 
+# Commands that start a browser; urls/status/export/help run without the scraping packages
+SCRAPING_COMMANDS = ('department', 'ids', 'serve')
+
+
+def needs_scraping_packages(argv):
+    """True for interactive mode and scraping commands."""
+    return not argv or any(arg in SCRAPING_COMMANDS for arg in argv)
+
+
+def _package_version(requirement):
+    """Installed version of a requirement's distribution, read without importing it."""
+    distribution = requirement.split('>=')[0]
+    if _metadata is not None:
+        try:
+            return _metadata.version(distribution)
+        except _metadata.PackageNotFoundError:
+            return 'unknown'
+    try:
+        import pkg_resources  # slow to import, so only on Python 3.7
+        return pkg_resources.get_distribution(distribution).version
+    except Exception:
+        return 'unknown'
+
+
 def check_package_versions():
     """Check package availability and versions with detailed reporting."""
     missing_packages = []
     outdated_packages = []
 
+    # find_spec locates a package without importing it (selenium and pandas alone take ~0.5 s)
     for package, requirement in REQUIRED_PACKAGES.items():
-        try:
-            imported_module = __import__(package)
-            version = getattr(imported_module, '__version__', 'unknown')
-            logging.info(f"[OK] {package} {version} is available")
-        except ImportError:
+        if importlib.util.find_spec(package) is not None:
+            logging.info(f"[OK] {package} {_package_version(requirement)} is available")
+        else:
             missing_packages.append((package, requirement))
             logging.error(f"[MISSING] {package} is not installed")
 
     # Check optional packages
     for package, requirement in OPTIONAL_PACKAGES.items():
-        try:
-            imported_module = __import__(package)
-            version = getattr(imported_module, '__version__', 'unknown')
-            logging.info(f"[OK] {package} {version} (optional) is available")
-        except ImportError:
+        if importlib.util.find_spec(package) is not None:
+            logging.info(f"[OK] {package} {_package_version(requirement)} (optional) is available")
+        else:
             logging.warning(f"[WARN] {package} (optional) is not installed")
 
     return missing_packages, outdated_packages
 
-missing_packages, outdated_packages = check_package_versions()
+if needs_scraping_packages(sys.argv[1:]):
+    missing_packages, outdated_packages = check_package_versions()
+else:
+    missing_packages, outdated_packages = [], []
 
 if missing_packages:
     error_msg = "Missing required packages:\n\n"
@@ -208,6 +243,8 @@ if missing_packages:
     print(error_msg)
 
     try:
+        import tkinter as tk
+        import tkinter.messagebox
         root_err = tk.Tk()
         root_err.withdraw()
         tkinter.messagebox.showerror(
@@ -248,6 +285,8 @@ except ImportError as e:
     error_message = str(e)
     print(f"FATAL ERROR: {error_message}")
     try:
+        import tkinter as tk
+        import tkinter.messagebox
         root_err = tk.Tk()
         root_err.withdraw()
         tkinter.messagebox.showerror("CLI Import Error", error_message)
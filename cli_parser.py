@@ -33,6 +33,13 @@ Examples:
   # Dry run to see what would be scraped
   python main.py department --all --dry-run
 
+  # Search tenders by ID (stored IDs open from their saved link) with 3 browsers
+  python cli_main.py --url "HP Tenders" ids 2025_PWD_123456_1 --file ids.txt --workers 3
+
+  # Keep a warm scraper daemon running and hand jobs to it
+  python cli_main.py serve
+  python cli_main.py --daemon --url "HP Tenders" department --all
+
 For Windows Task Scheduler, use the batch file: run_hp_tenders.bat
             """
         )
@@ -100,6 +107,12 @@ For Windows Task Scheduler, use the batch file: run_hp_tenders.bat
             help='Optional job identifier propagated in JSON events for supervisor correlation'
         )
 
+        self.parser.add_argument(
+            '--daemon',
+            action='store_true',
+            help='Submit the command to a running scraper daemon (cli_main.py serve); runs in this process if none is running'
+        )
+
         # Subcommands
         subparsers = self.parser.add_subparsers(dest='command', help='Available commands')
 
@@ -157,7 +170,7 @@ For Windows Task Scheduler, use the batch file: run_hp_tenders.bat
         dept_parser.add_argument(
             '--manifest-path',
             type=str,
-            help='Path to batch manifest JSON (default: batch_tender_manifest.json in project root)'
+            help='Legacy batch manifest JSON to migrate into the SQLite manifest (default: batch_tender_manifest.json in project root)'
         )
 
         dept_parser.add_argument(
@@ -167,6 +180,13 @@ For Windows Task Scheduler, use the batch file: run_hp_tenders.bat
             help='Excel export policy for this run (default from settings, recommended: on_demand)'
         )
 
+        dept_parser.add_argument(
+            '--log-mode',
+            type=str,
+            choices=['verbose', 'normal', 'quiet'],
+            help='Scraper log detail: verbose (every step), normal (sampled), quiet (counters and summaries only)'
+        )
+
         dept_parser.add_argument(
             '--export-now',
             action='store_true',
@@ -213,6 +233,64 @@ For Windows Task Scheduler, use the batch file: run_hp_tenders.bat
             help='Export only from latest full-scope scrape (scope=all)'
         )
 
+        ids_parser = subparsers.add_parser(
+            'ids',
+            help='Search tenders by ID and download their documents'
+        )
+
+        ids_parser.add_argument(
+            'tender_ids',
+            nargs='*',
+            help='Tender IDs to search'
+        )
+
+        ids_parser.add_argument(
+            '--file',
+            type=str,
+            help='Text file with tender IDs (one per line)'
+        )
+
+        ids_parser.add_argument(
+            '--workers',
+            type=int,
+            help='Browsers searching at once (default: id_search_parallel_workers setting)'
+        )
+
+        ids_parser.add_argument(
+            '--details-only',
+            action='store_true',
+            help='Collect tender details without downloading documents'
+        )
+
+        serve_parser = subparsers.add_parser(
+            'serve',
+            help='Run the scraper daemon: a warm process that accepts department jobs over a loopback HTTP API'
+        )
+
+        serve_parser.add_argument(
+            '--port',
+            type=int,
+            help='Loopback port to listen on (default: DAEMON_PORT in config.py, 0 = any free port)'
+        )
+
+        serve_parser.add_argument(
+            '--jobs',
+            type=int,
+            help='Department jobs run at once (default: DAEMON_MAX_JOBS in config.py)'
+        )
+
+        serve_parser.add_argument(
+            '--warm-browsers',
+            type=int,
+            help='Idle browsers kept open for the next job (default: DAEMON_WARM_BROWSERS in config.py)'
+        )
+
+        serve_parser.add_argument(
+            '--browser-idle-seconds',
+            type=int,
+            help='Close a warm browser after this many idle seconds (default: DAEMON_BROWSER_IDLE_SECONDS in config.py)'
+        )
+
         # Help command
         help_parser = subparsers.add_parser(
             'help',
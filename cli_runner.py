@@ -4,16 +4,15 @@ CLI Runner for Black Forest Tender Scraper
 Handles department scraping operations via command line
 """
 
+import csv
 import sys
 import os
 import logging
 import time
 import json
 import re
-import sqlite3
 from pathlib import Path
-from datetime import datetime
-import pandas as pd
+from datetime import datetime, timedelta
 
 
 def _configure_utf8_stdio():
@@ -39,12 +38,10 @@ if project_root not in sys.path:
 try:
     from cli_parser import CLIParser, validate_paths
     from config import APP_VERSION
-    from scraper.logic import fetch_department_list_from_site_v2, run_scraping_logic
-    from scraper.playwright_logic import fetch_department_list_from_site_playwright
-    from scraper.driver_manager import setup_driver, safe_quit_driver
     from app_settings import load_settings
     from tender_store import TenderDataStore
-    from utils import get_website_keyword_from_url
+    from utils import get_website_keyword_from_url, portal_name_candidates
+    from scraper.known_id_index import open_known_id_filter
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     print("Make sure you're running this from the project root directory")
@@ -57,6 +54,7 @@ class CLIRunner:
         self.args = args
         self.paths = validate_paths(args)
         self.driver = None
+        self.stop_event = None  # set by the scraper daemon to cancel a job
         # Initialize logger early
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
@@ -72,6 +70,9 @@ class CLIRunner:
             'job_id': str(getattr(self.args, 'job_id', '') or ''),
         }
         event_data.update(payload)
+        self._publish_event(event_data)
+
+    def _publish_event(self, event_data):
         try:
             print(json.dumps(event_data, ensure_ascii=False), flush=True)
         except Exception:
@@ -200,145 +201,62 @@ class CLIRunner:
         return targeted_departments, stats
 
     def _manifest_path(self):
+        # Legacy JSON manifest; migrated into the SQLite manifest tables on first use
         path = str(getattr(self.args, 'manifest_path', '') or '').strip()
         if not path:
             path = str(project_root / 'batch_tender_manifest.json')
         return path
 
-    def _load_manifest(self):
-        path = self._manifest_path()
-        if not os.path.exists(path):
-            return {'portals': {}}
-        try:
-            with open(path, 'r', encoding='utf-8') as handle:
-                data = json.load(handle)
-            if not isinstance(data, dict):
-                return {'portals': {}}
-            data.setdefault('portals', {})
-            if not isinstance(data.get('portals'), dict):
-                data['portals'] = {}
-            return data
-        except Exception:
-            return {'portals': {}}
-
-    def _save_manifest(self, data):
-        path = self._manifest_path()
-        try:
-            parent = os.path.dirname(path)
-            if parent:
-                os.makedirs(parent, exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as handle:
-                json.dump(data, handle, indent=2, ensure_ascii=False)
-        except Exception as err:
-            self.logger.warning(f"Failed to save manifest: {err}")
-
-    def _get_sqlite_known_ids_for_portal(self, portal_name, portal_config):
-        config_dir = str(self.paths['config_file'].parent)
-        sqlite_db_path = str(self.settings.get('central_sqlite_db_path') or '').strip()
-        if sqlite_db_path and not os.path.isabs(sqlite_db_path):
-            sqlite_db_path = str(Path(config_dir) / sqlite_db_path)
-        if not sqlite_db_path or not os.path.exists(sqlite_db_path):
-            return set()
+    def _get_manifest_store(self):
+        data_store, sqlite_db_path = self._get_data_store()
+        legacy_path = self._manifest_path()
+        if os.path.exists(legacy_path):
+            try:
+                imported = data_store.import_manifest_json(legacy_path)
+                self.logger.info(f"Migrated {imported} portal(s) from {os.path.basename(legacy_path)} into the SQLite manifest")
+            except Exception as err:
+                self.logger.warning(f"Failed to migrate manifest {legacy_path}: {err}")
+        return data_store, sqlite_db_path
 
-        base_url = str(portal_config.get('BaseURL') or '').strip()
-        keyword = str(portal_config.get('Keyword') or '').strip()
-        keyword_from_url = ''
-        try:
-            from utils import get_website_keyword_from_url
-            keyword_from_url = str(get_website_keyword_from_url(base_url) or '').strip()
-        except Exception:
-            keyword_from_url = ''
-
-        candidates_raw = {
-            str(portal_name or '').strip(),
-            keyword,
-            keyword_from_url,
-            keyword.replace('.', '_').replace('-', '_'),
-            keyword_from_url.replace('.', '_').replace('-', '_'),
-        }
-        portal_candidates = sorted({item.lower() for item in candidates_raw if item})
-        if not portal_candidates:
-            return set()
-
-        placeholders = ','.join(['?'] * len(portal_candidates))
-        query = (
-            "SELECT DISTINCT trim(tender_id_extracted) "
-            "FROM tenders "
-            "WHERE trim(coalesce(tender_id_extracted, '')) <> '' "
-            f"AND lower(trim(coalesce(portal_name, ''))) IN ({placeholders})"
-        )
+    def _portal_name_candidates(self, portal_name, portal_config):
+        return portal_name_candidates(portal_name, portal_config)
 
+    def _get_known_from_manifest(self, portal_name, portal_config):
+        """(known-ID filter over the portal's stored tenders, known department names)."""
+        data_store, sqlite_db_path = self._get_manifest_store()
+        portal_keys = self._portal_name_candidates(portal_name, portal_config)
         try:
-            conn = sqlite3.connect(sqlite_db_path)
-            try:
-                rows = conn.execute(query, portal_candidates).fetchall()
-            finally:
-                conn.close()
+            added = data_store.seed_manifest_from_tenders(portal_name, portal_keys)
+            if added:
+                self.logger.info(f"Added {added} new SQLite tender IDs to the manifest for '{portal_name}'")
         except Exception as err:
             self.logger.warning(f"SQLite known-id seed failed for '{portal_name}': {err}")
-            return set()
 
-        return {
-            str(row[0]).strip()
-            for row in rows
-            if row and str(row[0]).strip()
-        }
-
-    def _get_known_from_manifest(self, portal_name, portal_config):
-        manifest = self._load_manifest()
-        portal_data = manifest.setdefault('portals', {}).setdefault(portal_name, {})
-
-        known_ids = {
-            str(item).strip()
-            for item in portal_data.get('tender_ids', [])
-            if str(item).strip()
-        }
-        known_departments = {
-            str(name).strip().lower()
-            for name in portal_data.get('processed_departments', [])
-            if str(name).strip()
-        }
-
-        sqlite_ids = self._get_sqlite_known_ids_for_portal(portal_name, portal_config)
-        if sqlite_ids:
-            known_ids.update(sqlite_ids)
-
-        return manifest, portal_data, known_ids, known_departments
-
-    def _update_manifest_for_portal(self, manifest, portal_name, summary):
-        portals = manifest.setdefault('portals', {})
-        portal_data = portals.setdefault(portal_name, {})
-
-        known = {
-            str(item).strip()
-            for item in portal_data.get('tender_ids', [])
-            if str(item).strip()
-        }
-        known.update({
-            str(item).strip()
-            for item in summary.get('extracted_tender_ids', [])
-            if str(item).strip()
-        })
-
-        known_departments = {
-            str(name).strip().lower()
-            for name in portal_data.get('processed_departments', [])
-            if str(name).strip()
-        }
-        known_departments.update({
-            str(name).strip().lower()
-            for name in summary.get('processed_department_names', [])
-            if str(name).strip()
-        })
-
-        portal_data['tender_ids'] = sorted(known)
-        portal_data['processed_departments'] = sorted(known_departments)
-        portal_data['last_run'] = datetime.now().isoformat(timespec='seconds')
-        portal_data['last_expected'] = int(summary.get('expected_total_tenders', 0) or 0)
-        portal_data['last_extracted'] = int(summary.get('extracted_total_tenders', 0) or 0)
-
-        self._save_manifest(manifest)
-        return len(known)
+        # Memory-mapped index instead of a set of every known ID; all stored IDs count as known
+        known_ids = open_known_id_filter(
+            sqlite_db_path,
+            portal_name,
+            portal_keys=portal_keys,
+            live_only=False,
+            log_callback=self.logger.info,
+        )
+        # IDs only the migrated JSON manifest knows about (not in the tenders table)
+        manifest_only_ids = data_store.get_manifest_only_tender_ids(portal_name, portal_keys)
+        if manifest_only_ids:
+            known_ids.update(manifest_only_ids)
+            self.logger.info(f"Added {len(manifest_only_ids)} manifest-only tender IDs for '{portal_name}'")
+        known_departments = data_store.get_manifest_departments(portal_name)
+        return known_ids, known_departments
+
+    def _update_manifest_for_portal(self, portal_name, summary):
+        data_store, _sqlite_db_path = self._get_data_store()
+        return data_store.record_manifest_portal(
+            portal_name,
+            tender_ids=summary.get('extracted_tender_ids', []),
+            departments=summary.get('processed_department_names', []),
+            last_expected=int(summary.get('expected_total_tenders', 0) or 0),
+            last_extracted=int(summary.get('extracted_total_tenders', 0) or 0),
+        )
 
     def _merge_pass_summaries(self, first_summary, delta_summary):
         combined_ids = sorted(set(first_summary.get('extracted_tender_ids', [])).union(delta_summary.get('extracted_tender_ids', [])))
@@ -379,6 +297,19 @@ class CLIRunner:
             merged['status'] = 'Error during scraping'
         return merged
 
+    def _read_base_urls(self):
+        """base_urls.csv as a DataFrame (the scraper daemon serves a cached copy)."""
+        import pandas as pd
+        return pd.read_csv(self.paths['base_urls_file'])
+
+    def _open_driver(self):
+        from scraper.driver_manager import setup_driver
+        return setup_driver(initial_download_dir=str(self.paths['output_dir']))
+
+    def _close_driver(self):
+        from scraper.driver_manager import safe_quit_driver
+        safe_quit_driver(self.driver, self.logger.info)
+
     def get_portal_config(self, portal_name=None):
         """Get portal configuration from base_urls.csv."""
         try:
@@ -386,8 +317,7 @@ class CLIRunner:
             if not base_urls_file.exists():
                 raise FileNotFoundError(f"Base URLs file not found: {base_urls_file}")
 
-            # Read CSV
-            df = pd.read_csv(base_urls_file)
+            df = self._read_base_urls()
 
             # If no portal specified, default to HP Tenders
             if not portal_name:
@@ -428,18 +358,20 @@ class CLIRunner:
                 self.logger.error(f"Base URLs file not found: {base_urls_file}")
                 return
 
-            df = pd.read_csv(base_urls_file)
+            # Plain csv here: listing portals should not wait for pandas to import
+            with open(base_urls_file, 'r', encoding='utf-8-sig', newline='') as handle:
+                rows = list(csv.DictReader(handle))
             print("\n📋 Available Portals:")
             print("=" * 80)
             print(f"{'Sr.No':<5} {'Portal Name':<30} {'Base URL':<40} {'Keyword'}")
             print("=" * 80)
-            for sr_no, (idx, row) in enumerate(df.iterrows(), 1):
-                name = str(row.get('Name', 'Unknown')).strip()
-                base_url = str(row.get('BaseURL', '')).strip()
-                keyword = str(row.get('Keyword', '')).strip()
+            for sr_no, row in enumerate(rows, 1):
+                name = str(row.get('Name') or 'Unknown').strip()
+                base_url = str(row.get('BaseURL') or '').strip()
+                keyword = str(row.get('Keyword') or '').strip()
                 print(f"{sr_no:<5} {name:<30} {base_url:<40} {keyword}")
             print("=" * 80)
-            print(f"Total: {len(df)} portals available")
+            print(f"Total: {len(rows)} portals available")
             print("\nUsage Examples:")
             print("  python main.py --url 'HP Tenders' department --all")
             print("  python main.py --url '2' department --all  (using serial number)")
@@ -492,7 +424,7 @@ class CLIRunner:
             if policy == 'alternate_days' and snapshot.get('last_excel_export_at'):
                 try:
                     last_export_at = datetime.fromisoformat(str(snapshot.get('last_excel_export_at')))
-                    next_due = last_export_at + pd.Timedelta(days=interval_days)
+                    next_due = last_export_at + timedelta(days=interval_days)
                     print(f"Next Export Due: {next_due.isoformat(timespec='seconds')}")
                 except Exception:
                     pass
@@ -544,8 +476,92 @@ class CLIRunner:
 ╚══════════════════════════════════════════════════════════════╝
 """)
 
+    def _read_tender_ids(self):
+        """Tender IDs from the command line and --file, without blanks and repeats, in order."""
+        tender_ids = list(getattr(self.args, 'tender_ids', None) or [])
+        ids_file = getattr(self.args, 'file', None)
+        if ids_file:
+            with open(ids_file, 'r', encoding='utf-8-sig') as handle:
+                tender_ids.extend(line.strip() for line in handle)
+        seen = set()
+        unique_ids = []
+        for tender_id in tender_ids:
+            tender_id = str(tender_id or '').strip()
+            if tender_id and tender_id not in seen:
+                seen.add(tender_id)
+                unique_ids.append(tender_id)
+        return unique_ids
+
+    def run_id_search(self):
+        """Search tenders by ID and download their documents."""
+        from scraper.logic import search_and_download_tenders
+
+        try:
+            self.show_banner()
+            tender_ids = self._read_tender_ids()
+            if not tender_ids:
+                self.logger.error("No tender IDs given (pass IDs or --file)")
+                sys.exit(2)
+
+            portal_config = self.get_portal_config(getattr(self.args, 'url', None))
+            workers = getattr(self.args, 'workers', None) or self.settings.get('id_search_parallel_workers', 1)
+            self.logger.info(f"Searching {len(tender_ids)} tender ID(s) on {portal_config['Name']} with up to {workers} browser(s)")
+            self._emit_event('start', command='ids', portal=portal_config.get('Name', ''), total_ids=len(tender_ids))
+            if self.args.dry_run:
+                print(f"🔍 DRY RUN: Would search {len(tender_ids)} tender ID(s) on {portal_config['Name']}")
+                self._emit_event('dry_run', command='ids')
+                return
+
+            def progress_callback(current, total, details=None, *args):
+                self._emit_event('progress', current=int(current or 0), total=int(total or 0), details=str(details or ''))
+                if not self.args.quiet:
+                    print(f"Progress: {current}/{total} - {details or ''}")
+
+            downloads = not getattr(self.args, 'details_only', False)
+            start_time = time.time()
+            self.driver = self._open_driver()
+            summary = search_and_download_tenders(
+                tender_ids=tender_ids,
+                base_url_config=portal_config,
+                download_dir=str(self.paths['output_dir']),
+                driver=self.driver,
+                log_callback=self.logger.info,
+                progress_callback=progress_callback,
+                stop_event=self.stop_event,
+                dl_more_details=downloads,
+                dl_zip=downloads,
+                dl_notice_pdfs=downloads,
+                sqlite_db_path=self._resolve_sqlite_db_path(),
+                id_search_workers=workers,
+            ) or {}
+            elapsed = time.time() - start_time
+            self._emit_event('completed', elapsed_seconds=round(float(elapsed), 2), **summary)
+            if not self.args.quiet:
+                print(f"\n✅ ID search finished in {elapsed:.1f} seconds: {summary.get('found', 0)} found, "
+                      f"{summary.get('not_found', 0)} not found, {summary.get('errors', 0)} errors")
+                print(f"📁 Output directory: {self.paths['output_dir']}")
+
+        except KeyboardInterrupt:
+            self.logger.info("Operation cancelled by user")
+            self._emit_event('cancelled', reason='keyboard_interrupt')
+        except Exception as e:
+            self.logger.error(f"Error during tender ID search: {e}")
+            self._emit_event('error', message=str(e))
+            if self.args.verbose:
+                import traceback
+                traceback.print_exc()
+            sys.exit(1)
+        finally:
+            if self.driver:
+                self._close_driver()
+
     def run_department_scraping(self):
         """Run department scraping operation."""
+        # Browser and scraping modules load here, so urls/status/export start without them
+        from scraper.logic import fetch_department_list_from_site_v2, run_scraping_logic
+        from scraper.playwright_logic import fetch_department_list_from_site_playwright
+
+        known_ids = None
         try:
             self.show_banner()
             self._emit_event('start', command='department', portal=getattr(self.args, 'url', None) or 'HP Tenders')
@@ -572,7 +588,7 @@ class CLIRunner:
 
             # Setup WebDriver
             self.logger.info("Setting up WebDriver...")
-            self.driver = setup_driver(initial_download_dir=str(self.paths['output_dir']))
+            self.driver = self._open_driver()
 
             # Create base URLs config for the scraper
             base_urls_config = {
@@ -725,6 +741,7 @@ class CLIRunner:
                 export_interval_days = 2
             force_excel_export = bool(getattr(self.args, 'export_now', False))
             self.logger.info(f"Excel export policy: {export_policy} | interval_days={export_interval_days} | force={force_excel_export}")
+            log_mode = str(getattr(self.args, 'log_mode', '') or self.settings.get('scraper_log_mode', 'normal') or 'normal').strip().lower()
 
             dept_workers = self.args.dept_workers
             if dept_workers is None:
@@ -739,10 +756,7 @@ class CLIRunner:
             if valid_departments:
                 departments = valid_departments
 
-            known_ids = set()
             known_departments = set()
-            manifest = {'portals': {}}
-            portal_manifest_data = {}
             full_rescrape = bool(getattr(self.args, 'full_rescrape', False))
             only_new = not full_rescrape  # default: only-new is ON; --full-rescrape opts out
             if full_rescrape:
@@ -754,7 +768,7 @@ class CLIRunner:
                 delta_mode = 'quick'
 
             if only_new:
-                manifest, portal_manifest_data, known_ids, known_departments = self._get_known_from_manifest(
+                known_ids, known_departments = self._get_known_from_manifest(
                     portal_config.get('Name', 'Unknown'),
                     portal_config,
                 )
@@ -764,7 +778,7 @@ class CLIRunner:
                     known_ids=len(known_ids),
                     known_departments=len(known_departments),
                     delta_mode=delta_mode,
-                    manifest_path=self._manifest_path(),
+                    manifest_db_path=self._resolve_sqlite_db_path(),
                 )
 
             summary = run_scraping_logic(
@@ -774,10 +788,10 @@ class CLIRunner:
                 log_callback=self.logger.info,
                 progress_callback=progress_callback,
                 status_callback=status_callback,
-                stop_event=None,  # CLI mode doesn't have stop events
+                stop_event=self.stop_event,
                 driver=self.driver,
                 deep_scrape=False,  # Keep it simple for CLI
-                existing_tender_ids=known_ids if only_new else None,
+                existing_tender_filter=known_ids if only_new else None,
                 existing_department_names=known_departments if only_new else None,
                 sqlite_db_path=sqlite_db_path or None,
                 sqlite_backup_dir=sqlite_backup_dir or None,
@@ -786,6 +800,7 @@ class CLIRunner:
                 export_policy=export_policy,
                 export_interval_days=export_interval_days,
                 force_excel_export=force_excel_export,
+                log_mode=log_mode,
             )
 
             if not isinstance(summary, dict):
@@ -823,10 +838,11 @@ class CLIRunner:
                         log_callback=self.logger.info,
                         progress_callback=progress_callback,
                         status_callback=status_callback,
-                        stop_event=None,
+                        stop_event=self.stop_event,
                         driver=self.driver,
                         deep_scrape=False,
-                        existing_tender_ids=set(known_ids).union(first_ids),
+                        existing_tender_ids=first_ids,
+                        existing_tender_filter=known_ids,
                         existing_department_names=set(),
                         sqlite_db_path=sqlite_db_path or None,
                         sqlite_backup_dir=sqlite_backup_dir or None,
@@ -835,6 +851,7 @@ class CLIRunner:
                         export_policy=export_policy,
                         export_interval_days=export_interval_days,
                         force_excel_export=force_excel_export,
+                        log_mode=log_mode,
                     )
                 else:
                     self._emit_event('delta_start', mode='quick', strategy='changed_departments')
@@ -857,10 +874,11 @@ class CLIRunner:
                             log_callback=self.logger.info,
                             progress_callback=progress_callback,
                             status_callback=status_callback,
-                            stop_event=None,
+                            stop_event=self.stop_event,
                             driver=self.driver,
                             deep_scrape=False,
-                            existing_tender_ids=set(known_ids).union(first_ids),
+                            existing_tender_ids=first_ids,
+                            existing_tender_filter=known_ids,
                             existing_department_names=set(),
                             sqlite_db_path=sqlite_db_path or None,
                             sqlite_backup_dir=sqlite_backup_dir or None,
@@ -869,6 +887,7 @@ class CLIRunner:
                             export_policy=export_policy,
                             export_interval_days=export_interval_days,
                             force_excel_export=force_excel_export,
+                            log_mode=log_mode,
                         )
                     else:
                         delta_summary = {
@@ -897,8 +916,12 @@ class CLIRunner:
 
             known_total = 0
             if only_new:
-                known_total = self._update_manifest_for_portal(manifest, portal_config.get('Name', 'Unknown'), summary)
-                self._emit_event('manifest_updated', known_total=int(known_total), manifest_path=self._manifest_path())
+                known_total = self._update_manifest_for_portal(portal_config.get('Name', 'Unknown'), summary)
+                self._emit_event('manifest_updated', known_total=int(known_total), manifest_db_path=self._resolve_sqlite_db_path())
+
+            # Expire tenders that closed since the last sweep, for setups that never run the dashboard
+            from cleanup_service import sweep_expired_tenders
+            sweep_expired_tenders(db_path=self._resolve_sqlite_db_path())
 
             elapsed = time.time() - start_time
             self.logger.info(f"Scraping completed in {elapsed:.1f} seconds")
@@ -935,8 +958,10 @@ class CLIRunner:
                 traceback.print_exc()
             sys.exit(1)
         finally:
+            if known_ids is not None:
+                known_ids.close()
             if self.driver:
-                safe_quit_driver(self.driver, self.logger.info)
+                self._close_driver()
 
 def main():
     """Main CLI entry point."""
@@ -971,6 +996,16 @@ def main():
         runner.export_latest()
         return
 
+    if args.command == 'serve':
+        from scraper_daemon import serve
+        serve(args)
+        return
+
+    if args.command == 'ids':
+        runner = CLIRunner(args)
+        runner.run_id_search()
+        return
+
     # Handle department command
     if args.command == 'department':
         runner = CLIRunner(args)
@@ -1,33 +1,40 @@
 # config.py v2.3.4
 # Stores configuration constants, defaults, and locators
 
+import importlib.util
 import logging
 
-# Try to import selenium, provide fallback values if not available
-try:
-    from selenium.webdriver.common.by import By  # type: ignore
-    from selenium.webdriver.remote.webdriver import WebDriver
-    from selenium.webdriver.support.ui import WebDriverWait
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("WARNING: Selenium not installed. Using string values for locators.")
-    SELENIUM_AVAILABLE = False
-
-    # Define fallback By class when Selenium is not available
-    class By:
-        ID = "id"
-        CSS_SELECTOR = "css selector"
-        XPATH = "xpath"
-        LINK_TEXT = "link text"
-        TAG_NAME = "tag name"
-
-    # Define fallback types
-    WebDriver = object  # Use object instead of None for type compatibility
-    WebDriverWait = object
-
-# By is already set in try/except
+# Locator strategies as plain strings. These are the W3C strategy names and
+# equal selenium's By constants, so locator tuples work with find_element
+# without importing selenium here (config is imported by every entry point,
+# including CLI commands that never start a browser).
+class By:
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
+
 ByType = By
 
+SELENIUM_AVAILABLE = importlib.util.find_spec("selenium") is not None
+
+
+def __getattr__(name):
+    # WebDriver / WebDriverWait are still importable from config; selenium loads on first access
+    if name in ("WebDriver", "WebDriverWait"):
+        if not SELENIUM_AVAILABLE:
+            return object
+        if name == "WebDriver":
+            from selenium.webdriver.remote.webdriver import WebDriver
+            return WebDriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # --- Application ---
 APP_VERSION = "2.3.6"
 APP_AUTHOR = "Cloud84, Una, HP, India (Refactored)"
@@ -78,6 +85,18 @@ ADAPTIVE_WAIT_SAMPLES = 5  # Number of samples to average
 JS_BATCH_THRESHOLD = 300  # Trigger batched extraction if department has more than this many rows (default: 300 for testing, production: 3000)
 JS_BATCH_SIZE = 2000  # Number of rows to extract per batch (default: 2000)
 
+# --- Global Scrape Scheduler (scraper/scheduler.py) ---
+# Shared by every scraping process on the machine; 0 disables a limit
+GLOBAL_BROWSER_BUDGET = 6  # Browsers open at once across GUI, CLI and dashboard workers
+PER_HOST_CONCURRENCY = 2  # Departments scraped at once from one portal host
+ID_SEARCH_PARALLEL_WORKERS = 2  # Browsers used by a tender-ID search (also capped by PER_HOST_CONCURRENCY)
+
+# --- Scraper Daemon (cli_main.py serve, scraper_daemon.py) ---
+DAEMON_PORT = 0  # Loopback port; 0 picks a free one (clients find it in the daemon info file)
+DAEMON_MAX_JOBS = 2  # Department jobs run at once inside the daemon
+DAEMON_WARM_BROWSERS = 1  # Idle browsers kept open between jobs (each holds a browser budget slot)
+DAEMON_BROWSER_IDLE_SECONDS = 600  # Warm browsers idle longer than this are closed
+
 
 class AdaptiveWaitManager:
     """
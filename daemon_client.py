@@ -0,0 +1,296 @@
+"""
+Client side of the scraper daemon (cli_main.py serve / scraper_daemon.py).
+
+The daemon listens on a loopback port and publishes how to reach it in
+daemon.json under DAEMON_STATE_DIR:
+
+    {"host": "127.0.0.1", "port": 53117, "pid": 4242, "token": "...", "started_at": "..."}
+
+Every request carries the token in the X-Daemon-Token header, so only
+processes that can read the info file (the same user) can submit work.
+
+API (JSON bodies):
+    GET  /health                     daemon status, job counts, warm browsers
+    POST /jobs   {"argv": [...]}     queue a CLI command (DAEMON_COMMANDS only)
+    GET  /jobs                       summaries of known jobs
+    GET  /jobs/<id>?after=N&wait=S   job summary plus events from index N,
+                                     long-polling up to S seconds for new ones
+    POST /jobs/<id>/stop {"force": bool}
+    POST /shutdown
+
+Job events are the CLI's --json-events records plus {"type": "log"} lines
+and a final {"type": "exit", "exit_code": n}.
+
+Standard library only: scheduled tasks use forward_cli_command before
+cli_main.py imports anything heavy.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+DAEMON_STATE_DIR = os.path.join(tempfile.gettempdir(), "blackforest_daemon")
+DAEMON_INFO_FILENAME = "daemon.json"
+TOKEN_HEADER = "X-Daemon-Token"
+HEALTH_TIMEOUT = 1.0
+REQUEST_TIMEOUT = 15.0
+POLL_WAIT_SECONDS = 10
+RETRY_SECONDS = 2.0
+MAX_POLL_FAILURES = 5  # consecutive failed polls before a job is given up on
+CLI_SCRIPTS = ("cli_main.py", "cli_runner.py")
+DAEMON_COMMANDS = ("department",)  # other commands run in the calling process
+# Global options that take a value, so it is not mistaken for the command
+GLOBAL_VALUE_OPTIONS = ("--config", "--url", "--log", "--output", "-o", "--engine", "--job-id")
+# The daemon resolves these against its own working directory: send them absolute
+PATH_OPTIONS = ("--output", "-o", "--log", "--config", "--manifest-path")
+
+
+class DaemonUnavailable(Exception):
+    """The daemon is not running or did not answer."""
+
+
+def daemon_info_path(state_dir=None):
+    return os.path.join(state_dir or DAEMON_STATE_DIR, DAEMON_INFO_FILENAME)
+
+
+def read_daemon_info(state_dir=None):
+    """Contents of the daemon info file, or None."""
+    try:
+        with open(daemon_info_path(state_dir), "r", encoding="utf-8") as handle:
+            info = json.load(handle)
+        if info.get("port") and info.get("token"):
+            return info
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def cli_arguments(command):
+    """CLI arguments of a subprocess command line ([python, cli_main.py, ...] -> [...])."""
+    command = [str(part) for part in command or []]
+    for position, part in enumerate(command):
+        if os.path.basename(part).lower() in CLI_SCRIPTS:
+            return command[position + 1:]
+    return command[1:]
+
+
+def cli_command(argv):
+    """Subcommand of CLI arguments (first positional), or None."""
+    skip_value = False
+    for part in argv:
+        if skip_value:
+            skip_value = False
+        elif part in GLOBAL_VALUE_OPTIONS:
+            skip_value = True
+        elif not part.startswith("-"):
+            return part
+    return None
+
+
+def absolute_path_arguments(argv, cwd=None):
+    """argv with the values of PATH_OPTIONS made absolute against cwd (default: os.getcwd())."""
+    base = cwd or os.getcwd()
+    resolved = []
+    pending_path = False
+    for part in argv:
+        if pending_path:
+            part = os.path.abspath(os.path.join(base, os.path.expanduser(part)))
+            pending_path = False
+        elif part in PATH_OPTIONS:
+            pending_path = True
+        elif "=" in part and part.split("=", 1)[0] in PATH_OPTIONS:
+            option, value = part.split("=", 1)
+            part = f"{option}={os.path.abspath(os.path.join(base, os.path.expanduser(value)))}"
+        resolved.append(part)
+    return resolved
+
+
+class DaemonClient:
+    """Thin JSON-over-HTTP client for one running daemon."""
+
+    def __init__(self, info):
+        self.info = info
+        self.base_url = f"http://{info.get('host') or '127.0.0.1'}:{int(info['port'])}"
+        self._token = str(info["token"])
+
+    def _request(self, method, path, payload=None, timeout=REQUEST_TIMEOUT):
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        request.add_header(TOKEN_HEADER, self._token)
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read().decode("utf-8") or "{}")
+        except urllib.error.HTTPError as err:
+            try:
+                detail = json.loads(err.read().decode("utf-8") or "{}").get("error")
+            except ValueError:
+                detail = None
+            raise RuntimeError(f"Scraper daemon rejected {method} {path}: {detail or err}") from err
+        except (urllib.error.URLError, OSError, ValueError) as err:
+            raise DaemonUnavailable(f"Scraper daemon not reachable at {self.base_url}: {err}") from err
+
+    def health(self, timeout=HEALTH_TIMEOUT):
+        return self._request("GET", "/health", timeout=timeout)
+
+    def submit(self, argv, cwd=None):
+        """Queue a CLI command; returns the job summary (job_id, state, ...).
+
+        Relative path options are resolved against cwd (the directory the
+        command would have run in), not the daemon's working directory.
+        """
+        argv = absolute_path_arguments([str(part) for part in argv], cwd)
+        return self._request("POST", "/jobs", {"argv": argv})
+
+    def jobs(self):
+        return self._request("GET", "/jobs").get("jobs", [])
+
+    def poll(self, job_id, after=0, wait=POLL_WAIT_SECONDS):
+        """{"job": summary, "events": [...], "next": index} for events from index after."""
+        return self._request(
+            "GET",
+            f"/jobs/{quote(str(job_id), safe='')}?after={int(after)}&wait={int(wait)}",
+            timeout=wait + REQUEST_TIMEOUT,
+        )
+
+    def stop(self, job_id, force=False):
+        return self._request("POST", f"/jobs/{quote(str(job_id), safe='')}/stop", {"force": bool(force)})
+
+    def shutdown(self):
+        return self._request("POST", "/shutdown", {})
+
+
+def connect(state_dir=None, timeout=HEALTH_TIMEOUT):
+    """DaemonClient for the running daemon, or None if there is none."""
+    info = read_daemon_info(state_dir)
+    if not info:
+        return None
+    client = DaemonClient(info)
+    try:
+        client.health(timeout=timeout)
+    except (DaemonUnavailable, RuntimeError):
+        return None
+    return client
+
+
+def follow_job(client, job_id, on_event, stop_event=None):
+    """Deliver a job's events to on_event until it exits; returns its exit code.
+
+    Returns None if stop_event is set first. Raises DaemonUnavailable when the
+    daemon stops answering.
+    """
+    after = 0
+    failures = 0
+    while stop_event is None or not stop_event.is_set():
+        try:
+            reply = client.poll(job_id, after=after)
+            failures = 0
+        except DaemonUnavailable:
+            failures += 1
+            if failures >= MAX_POLL_FAILURES:
+                raise
+            time.sleep(RETRY_SECONDS)
+            continue
+        after = int(reply.get("next", after))
+        for event in reply.get("events", []):
+            on_event(event)
+            if event.get("type") == "exit":
+                return int(event.get("exit_code", 1))
+    return None
+
+
+def forward_cli_command(argv):
+    """Run CLI arguments (with --daemon) as a daemon job, streaming its output.
+
+    Returns the job's exit code, or None when no daemon is running or the
+    command is not one the daemon runs, so the caller can run it itself.
+    """
+    argv = [part for part in argv if part != "--daemon"]
+    if cli_command(argv) not in DAEMON_COMMANDS:
+        print("The scraper daemon only runs department commands; running the command in this process.", flush=True)
+        return None
+    client = connect()
+    if client is None:
+        print("No scraper daemon running; running the command in this process.", flush=True)
+        return None
+
+    json_events = "--json-events" in argv
+    quiet = "--quiet" in argv or "-q" in argv
+    try:
+        job = client.submit(argv)
+    except RuntimeError as err:
+        print(str(err), file=sys.stderr, flush=True)
+        return 2
+    except DaemonUnavailable:
+        print("Scraper daemon stopped answering; running the command in this process.", flush=True)
+        return None
+    job_id = job.get("job_id")
+    if not json_events:
+        print(f"Submitted to scraper daemon (pid {client.info.get('pid')}) as job {job_id}", flush=True)
+
+    def _print_event(event):
+        kind = event.get("type")
+        if kind == "log":
+            print(event.get("message", ""), flush=True)
+        elif json_events:
+            print(json.dumps(event, ensure_ascii=False), flush=True)
+        elif kind == "progress" and not quiet:
+            print(
+                f"Progress: {event.get('current', 0)}/{event.get('total', 0)} "
+                f"({float(event.get('percent', 0) or 0):.1f}%) - {event.get('details', '')}",
+                flush=True,
+            )
+
+    try:
+        return follow_job(client, job_id, _print_event)
+    except KeyboardInterrupt:
+        try:
+            client.stop(job_id)
+            print(f"Stop requested for daemon job {job_id}", flush=True)
+        except (DaemonUnavailable, RuntimeError):
+            pass
+        return 130
+    except DaemonUnavailable as err:
+        print(str(err), file=sys.stderr, flush=True)
+        return 1
+
+
+class JobFollower:
+    """Background thread following one daemon job (used by the GUI and dashboard)."""
+
+    def __init__(self, client, job_id, on_event, on_exit=None, on_error=None):
+        self.client = client
+        self.job_id = job_id
+        self._on_event = on_event
+        self._on_exit = on_exit
+        self._on_error = on_error
+        self._stop = threading.Event()
+        self.exit_code = None
+        self._thread = threading.Thread(target=self._run, name=f"DaemonJob-{job_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def close(self):
+        self._stop.set()
+
+    def _run(self):
+        try:
+            self.exit_code = follow_job(self.client, self.job_id, self._on_event, self._stop)
+        except (DaemonUnavailable, RuntimeError) as err:
+            if self._on_error:
+                self._on_error(f"Lost scraper daemon job {self.job_id}: {err}")
+            self.exit_code = 1
+        if self.exit_code is not None and self._on_exit:
+            self._on_exit(self.exit_code)
@@ -8,6 +8,14 @@ import shutil
 from datetime import datetime
 from pathlib import Path
 
+from tender_dedupe import (
+    PLACEHOLDER_TENDER_IDS,
+    PORTAL_KEY,
+    TENDER_KEY,
+    count_duplicates,
+    remove_duplicates as dedupe_remove_duplicates,
+)
+
 DB_PATH = Path("D:/Dev84/BF 2.1.4/data/blackforest_tenders.sqlite3")
 
 def backup_database():
@@ -22,30 +30,22 @@ def backup_database():
     return backup_path
 
 def get_duplicate_stats(conn):
-    """Get statistics on duplicates"""
+    """Get statistics on duplicates (same portal + tender ID, see tender_dedupe)"""
     cursor = conn.execute("""
         SELECT COUNT(*) as total_rows
         FROM tenders
     """)
     total = cursor.fetchone()[0]
-    
-    cursor = conn.execute("""
-        SELECT COUNT(DISTINCT 
-            LOWER(TRIM(portal_name)) || '|' ||
-            LOWER(TRIM(tender_id_extracted)) || '|' ||
-            LOWER(TRIM(closing_date))
-        ) as unique_rows
-        FROM tenders
-        WHERE tender_id_extracted IS NOT NULL 
-          AND tender_id_extracted != ''
-    """)
-    unique = cursor.fetchone()[0]
-    duplicates = total - unique
+    duplicates = count_duplicates(conn)
+    unique = total - duplicates
     
     return total, unique, duplicates
 
+def _print_progress(done, total, message):
+    print(f"   {message}")
+
 def remove_duplicates(conn):
-    """Remove duplicate tenders, keeping most recent insertion"""
+    """Remove duplicate tenders, keeping the newest run's record"""
     
     print("🔍 Analyzing duplicates...")
     total_before, unique_before, dup_count_before = get_duplicate_stats(conn)
@@ -60,24 +60,8 @@ def remove_duplicates(conn):
     
     print(f"\n🧹 Removing {dup_count_before:,} duplicate tenders...")
     
-    # Keep the tender with highest ID (most recent) for each unique combination
-    cursor = conn.execute("""
-        DELETE FROM tenders
-        WHERE id NOT IN (
-            SELECT MAX(id)
-            FROM tenders
-            WHERE tender_id_extracted IS NOT NULL 
-              AND tender_id_extracted != ''
-            GROUP BY 
-                LOWER(TRIM(portal_name)),
-                LOWER(TRIM(tender_id_extracted)),
-                LOWER(TRIM(closing_date))
-        )
-        AND tender_id_extracted IS NOT NULL 
-        AND tender_id_extracted != ''
-    """)
-    
-    deleted_count = cursor.rowcount
+    # Batched deletes (one short transaction each) so a running scrape is not blocked
+    deleted_count = dedupe_remove_duplicates(DB_PATH, progress_callback=_print_progress)
     print(f"✅ Deleted {deleted_count:,} duplicate rows")
     
     # Verify
@@ -91,7 +75,7 @@ def remove_duplicates(conn):
     return deleted_count
 
 def add_unique_constraint(conn):
-    """Add unique constraint to prevent future duplicates"""
+    """Add unique constraint to prevent future duplicates (same key as tender_dedupe)"""
     
     print("\n🔒 Adding UNIQUE constraint to prevent future duplicates...")
     
@@ -100,23 +84,22 @@ def add_unique_constraint(conn):
         cursor = conn.execute("""
             SELECT name FROM sqlite_master 
             WHERE type='index' 
-              AND name='idx_tenders_unique_portal_tender_date'
+              AND name='idx_tenders_unique_portal_tender'
         """)
         
         if cursor.fetchone():
             print("ℹ️  Unique constraint already exists")
             return False
         
-        # Create unique index
-        conn.execute("""
-            CREATE UNIQUE INDEX idx_tenders_unique_portal_tender_date
-            ON tenders(
-                LOWER(TRIM(portal_name)),
-                LOWER(TRIM(tender_id_extracted)),
-                LOWER(TRIM(closing_date))
-            )
-            WHERE tender_id_extracted IS NOT NULL 
-              AND tender_id_extracted != ''
+        # Older runs of this script keyed on closing date too, which dedupe no longer does
+        conn.execute("DROP INDEX IF EXISTS idx_tenders_unique_portal_tender_date")
+        
+        # Create unique index over the tender_dedupe partition key
+        conn.execute(f"""
+            CREATE UNIQUE INDEX idx_tenders_unique_portal_tender
+            ON tenders({PORTAL_KEY}, {TENDER_KEY})
+            WHERE {TENDER_KEY} <> ''
+              AND LOWER({TENDER_KEY}) NOT IN {PLACEHOLDER_TENDER_IDS}
         """)
         
         print("✅ Unique constraint added successfully")
@@ -174,7 +157,7 @@ def main():
     except Exception as e:
         conn.rollback()
         print(f"\n❌ Error during cleanup: {e}")
-        print(f"   Database rolled back - no changes made")
+        print(f"   Pending changes rolled back (duplicate batches already deleted stay deleted)")
         print(f"   Backup is safe at: {backup_path}")
         raise
     
@@ -159,6 +159,11 @@ def _insert_styled_log_line(log_text_widget, formatted_message):
     for number_match in re.finditer(r"\d+(?:[\.,:/-]\d+)*", text):
         _apply_tag_by_span(log_text_widget, line_start, number_match, "number_token")
 
+def insert_styled_log_lines(log_text_widget, formatted_messages):
+    """Insert several styled lines at the end; the caller manages widget state and scrolling."""
+    for formatted_message in formatted_messages:
+        _insert_styled_log_line(log_text_widget, formatted_message)
+
 def append_styled_log_line(log_text_widget, formatted_message):
     if not (log_text_widget and log_text_widget.winfo_exists()):
         return
@@ -0,0 +1,246 @@
+# gui/log_view.py
+# Capped log store and virtualized Text viewer for long-running GUI log panes.
+#
+# LogStore keeps the newest max_lines formatted lines in a ring buffer and an
+# index of line sequence numbers per key (log level, portal name, ...), so a
+# filter change reads the index instead of re-testing every line.
+# VirtualLogView draws only the lines that fit in its Text widget and drives
+# its own scrollbar over the filtered rows, so insert and filter cost stays
+# flat no matter how many lines a multi-hour run produces.
+
+import threading
+import tkinter as tk
+from bisect import bisect_left
+from collections import deque
+from tkinter import ttk, font as tkFont
+
+from gui import gui_utils
+
+DEFAULT_MAX_LINES = 20000
+RENDER_DELAY_MS = 120
+LOG_LEVELS = ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG")
+
+
+def level_keys(line):
+    """Index keys for a formatted line: every level name it mentions."""
+    upper = line.upper()
+    return tuple(level for level in LOG_LEVELS if level in upper)
+
+
+class LogStore:
+    """Thread-safe ring buffer of log lines with a per-key sequence index."""
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, key_func=None):
+        self.max_lines = max(100, int(max_lines or DEFAULT_MAX_LINES))
+        self.key_func = key_func
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._entries = deque()  # (line, keys)
+        self._next_seq = 0
+        self._index = {}  # key -> deque of seqs, oldest first
+
+    @property
+    def first_seq(self):
+        return self._next_seq - len(self._entries)
+
+    @property
+    def next_seq(self):
+        return self._next_seq
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, line, keys=None):
+        if keys is None:
+            keys = self.key_func(line) if self.key_func else ()
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._entries.append((line, keys))
+            for key in keys:
+                self._index.setdefault(key, deque()).append(seq)
+            if len(self._entries) > self.max_lines:
+                _, old_keys = self._entries.popleft()
+                self.dropped += 1
+                for key in old_keys:
+                    # Seqs are appended in order, so the evicted one is at the front
+                    self._index[key].popleft()
+            return seq
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self.dropped = 0
+
+    def select(self, keys=None, predicate=None, since=0):
+        """Sorted seqs >= since whose line has any of keys (None = all) and passes predicate."""
+        with self._lock:
+            first = self.first_seq
+            start = max(since, first)
+            if keys is None:
+                seqs = range(start, self._next_seq)
+            else:
+                found = set()
+                for key in keys:
+                    for seq in reversed(self._index.get(key, ())):
+                        if seq < start:
+                            break
+                        found.add(seq)
+                seqs = sorted(found)
+            if predicate is None:
+                return list(seqs)
+            entries = self._entries
+            return [seq for seq in seqs if predicate(entries[seq - first][0])]
+
+    def lines(self, seqs):
+        """Text of the given seqs, skipping any already evicted."""
+        with self._lock:
+            first = self.first_seq
+            size = len(self._entries)
+            return [self._entries[seq - first][0] for seq in seqs if 0 <= seq - first < size]
+
+
+class VirtualLogView:
+    """Text widget that renders only the visible window of a LogStore's filtered rows.
+
+    Must be used from the Tk main thread; producers append to the store from
+    any thread and the owner calls refresh() on its UI tick.
+    """
+
+    def __init__(self, parent, store, styled=False, **text_options):
+        self.store = store
+        self.styled = styled
+        self.frame = ttk.Frame(parent)
+        text_options.setdefault("wrap", tk.WORD)
+        self.text = tk.Text(self.frame, state=tk.DISABLED, **text_options)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._keys = None
+        self._predicate = None
+        self._rows = []
+        self._synced_seq = store.next_seq
+        self._top_seq = None  # None = follow the tail
+        self._render_job = None
+        self._line_height = max(1, tkFont.Font(font=self.text.cget("font")).metrics("linespace"))
+
+        self.text.bind("<Configure>", lambda _e: self.schedule_render(), add="+")
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda _e: self._scroll_units(-3))
+        self.text.bind("<Button-5>", lambda _e: self._scroll_units(3))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def winfo_exists(self):
+        return bool(self.text.winfo_exists())
+
+    def set_filter(self, keys=None, predicate=None):
+        """Rebuild the filtered rows from the index and jump to the newest line."""
+        self._keys = tuple(keys) if keys is not None else None
+        self._predicate = predicate
+        self._synced_seq = self.store.next_seq
+        self._rows = self.store.select(self._keys, self._predicate)
+        self._top_seq = None
+        self.render()
+
+    def refresh(self):
+        """Schedule a redraw if the store has lines this view has not seen."""
+        if self.store.next_seq != self._synced_seq or self._rows and self._rows[0] < self.store.first_seq:
+            self.schedule_render()
+
+    def schedule_render(self):
+        if self._render_job is None and self.text.winfo_exists():
+            self._render_job = self.text.after(RENDER_DELAY_MS, self.render)
+
+    def clear(self):
+        self.store.clear()
+        self._rows = []
+        self._synced_seq = self.store.next_seq
+        self._top_seq = None
+        self.render()
+
+    def filtered_lines(self):
+        """Every stored line passing the current filter (for saving to a file)."""
+        self._sync_rows()
+        return self.store.lines(self._rows)
+
+    def render(self):
+        if self._render_job is not None:
+            try:
+                self.text.after_cancel(self._render_job)
+            except Exception:
+                pass
+            self._render_job = None
+        if not self.text.winfo_exists():
+            return
+        self._sync_rows()
+        visible = self._visible_count()
+        total = len(self._rows)
+        top = self._top_index(visible)
+        lines = self.store.lines(self._rows[top:top + visible])
+
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        if self.styled:
+            gui_utils.insert_styled_log_lines(self.text, lines)
+        elif lines:
+            self.text.insert(tk.END, "\n".join(lines) + "\n")
+        if self._top_seq is None:
+            self.text.see(tk.END)
+        self.text.config(state=tk.DISABLED)
+
+        if total:
+            self.scrollbar.set(top / total, min(1.0, (top + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _sync_rows(self):
+        """Add new matching lines and forget rows the store has evicted."""
+        if self.store.next_seq != self._synced_seq:
+            self._rows.extend(self.store.select(self._keys, self._predicate, since=self._synced_seq))
+            self._synced_seq = self.store.next_seq
+        evicted = bisect_left(self._rows, self.store.first_seq)
+        if evicted:
+            del self._rows[:evicted]
+
+    def _visible_count(self):
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def _top_index(self, visible):
+        last_top = max(0, len(self._rows) - visible)
+        if self._top_seq is None:
+            return last_top
+        return min(bisect_left(self._rows, self._top_seq), last_top)
+
+    def _scroll_to(self, index):
+        visible = self._visible_count()
+        last_top = max(0, len(self._rows) - visible)
+        index = max(0, min(int(index), last_top))
+        # Reaching the bottom resumes following new lines
+        self._top_seq = None if index >= last_top else self._rows[index]
+        self.render()
+
+    def _scroll_units(self, units):
+        self._sync_rows()
+        self._scroll_to(self._top_index(self._visible_count()) + units)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = max(1, abs(event.delta) // 120)
+        return self._scroll_units(step * 3 * notches)
+
+    def _on_scrollbar(self, action, *args):
+        self._sync_rows()
+        visible = self._visible_count()
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * len(self._rows))
+        elif action == "scroll":
+            amount = int(args[0])
+            if len(args) > 1 and args[1] == "pages":
+                amount *= max(1, visible - 1)
+            self._scroll_to(self._top_index(visible) + amount)
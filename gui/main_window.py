@@ -18,6 +18,7 @@ if (PROJECT_ROOT not in sys.path):
 # --- Import application components ---
 from gui import gui_utils
 from gui.gui_utils import EmergencyStopDialog
+from gui.log_view import DEFAULT_MAX_LINES, LOG_LEVELS, LogStore, VirtualLogView, level_keys
 from config import (
     APP_VERSION, APP_AUTHOR, DEFAULT_APP_NAME,
     CONFIGURABLE_TIMEOUTS, DEFAULT_THEME,
@@ -27,7 +28,7 @@ from config import (
     LOG_DIR_NAME, BASE_URLS_FILENAME
 )
 from app_settings import FALLBACK_URL_CONFIG, save_settings, DEFAULT_SETTINGS_STRUCTURE
-from ui_message_queue import get_pending_messages, check_stuck_workers, get_queue_size
+from ui_message_queue import get_pending_messages, check_stuck_workers, get_queue_size, get_dropped_counts
 from gui.tab_department import DepartmentTab
 from gui.tab_id_search import IdSearchTab
 from gui.tab_url_process import UrlProcessTab
@@ -35,6 +36,7 @@ from gui.tab_batch_scrape import BatchScrapeTab
 from gui.tab_refresh_watch import RefreshWatchTab
 from gui.tab_settings import SettingsTab
 from gui.process_supervisor import ProcessSupervisor
+from daemon_client import connect as connect_scraper_daemon
 from scraper.webdriver_manager import get_driver, quit_driver  # Add this import
 from scraper.driver_manager import setup_driver, safe_quit_driver  # Add setup_driver import
 from gui.tab_help import HelpTab
@@ -75,12 +77,10 @@ class MainWindow:
             self.start_time = None
             self.timer_id = None
             self.total_estimated_tenders_for_run = 0
-            self._all_log_messages = []
-            self._max_log_history = 10000
-            self._max_log_widget_lines = 2000
-            self._pending_log_messages = deque(maxlen=4000)
-            self._log_widget_line_count = 0
-            self._log_flush_job = None
+            self.log_store = LogStore(
+                max_lines=self.settings.get("log_view_max_lines", DEFAULT_MAX_LINES),
+                key_func=level_keys,
+            )
             self._ui_queue_fetch_limit = 600
             self._ui_queue_max_messages_per_tick = 80
             self._ui_queue_progress_log_interval_sec = 2.0
@@ -91,6 +91,7 @@ class MainWindow:
             self._ui_queue_last_worker_log_at = {}
             self._ui_queue_last_backlog_log_at = 0.0
             self._ui_queue_last_suppressed_log_at = 0.0
+            self._ui_queue_reported_dropped_logs = 0
             self._ui_queue_next_stuck_check_at = 0.0
             self.log_filter_var = StringVar(value="All")
             self._active_section_name = "Dashboard"
@@ -606,22 +607,18 @@ class MainWindow:
             timestamp = datetime.now().strftime("%H:%M:%S")
             thread_name = threading.current_thread().name
             formatted_message = f"[{timestamp}][{thread_name}] {message}"
-            self._all_log_messages.append(formatted_message)
-            if len(self._all_log_messages) > self._max_log_history:
-                self._all_log_messages = self._all_log_messages[-self._max_log_history:]
+            self.log_store.append(formatted_message)
 
             lowered = message.lower()
             if "watch" in lowered or "refresh" in lowered or "department" in lowered:
                 self._queue_status_message(message)
 
             if (
-                self._is_logs_section_active()
-                and hasattr(self, 'log_text') and self.log_text and self.log_text.winfo_exists()
-                and self._passes_log_filter(formatted_message)
+                threading.current_thread() is threading.main_thread()
+                and self._is_logs_section_active()
+                and hasattr(self, 'log_view') and self.log_view.winfo_exists()
             ):
-                self._pending_log_messages.append(formatted_message)
-                if threading.current_thread() is threading.main_thread() and self._log_flush_job is None:
-                    self._log_flush_job = self.log_text.after(120, self._flush_log_buffer)
+                self.log_view.refresh()
 
             logger.debug(f"Log updated: {message[:100]}")
         except Exception as e:
@@ -748,6 +745,14 @@ class MainWindow:
             if suppressed_worker_logs > 0 and (now - float(self._ui_queue_last_suppressed_log_at or 0.0) >= 2.0):
                 self.update_log(f"⚠️  Suppressed {suppressed_worker_logs} worker log events this cycle to keep UI responsive.")
                 self._ui_queue_last_suppressed_log_at = now
+
+            dropped_logs = get_dropped_counts()["log"]
+            if dropped_logs > self._ui_queue_reported_dropped_logs and (now - float(self._ui_queue_last_backlog_log_at or 0.0) >= 2.0):
+                self.update_log(
+                    f"⚠️  UI queue full; dropped {dropped_logs - self._ui_queue_reported_dropped_logs} worker log lines."
+                )
+                self._ui_queue_reported_dropped_logs = dropped_logs
+                self._ui_queue_last_backlog_log_at = now
             
             # Check for stuck workers (if scraping is active)
             if self.scraping_in_progress and now >= float(self._ui_queue_next_stuck_check_at or 0.0):
@@ -761,87 +766,30 @@ class MainWindow:
             # Don't crash the UI if queue processing fails
             logger.error(f"UI queue polling error: {poll_err}", exc_info=True)
 
-        if self._pending_log_messages and self._log_flush_job is None and hasattr(self, 'log_text') and self.log_text and self.log_text.winfo_exists():
-            self._log_flush_job = self.log_text.after(80, self._flush_log_buffer)
+        # Lines appended from worker threads are drawn on this tick
+        if self._is_logs_section_active() and hasattr(self, 'log_view') and self.log_view.winfo_exists():
+            self.log_view.refresh()
         
         # Schedule next poll (every 100ms)
         if self.root and self.root.winfo_exists():
             next_delay_ms = max(120, int(float(self._ui_queue_progress_ui_interval_sec) * 250)) if self.scraping_in_progress else 180
             self._ui_queue_poll_job = self.root.after(next_delay_ms, self._process_ui_queue)
 
-    def _flush_log_buffer(self):
-        self._log_flush_job = None
-        if not hasattr(self, 'log_text') or not self.log_text or not self.log_text.winfo_exists():
-            self._pending_log_messages.clear()
-            return
-        if not self._is_logs_section_active():
-            self._pending_log_messages.clear()
-            return
-        if not self._pending_log_messages:
-            return
-
-        try:
-            batch = []
-            while self._pending_log_messages and len(batch) < 80:
-                batch.append(self._pending_log_messages.popleft())
-
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.insert(tk.END, "\n".join(batch) + "\n")
-
-            self._log_widget_line_count = max(0, int(self._log_widget_line_count) + len(batch))
-            overflow = self._log_widget_line_count - int(self._max_log_widget_lines)
-            if overflow > 0:
-                self.log_text.delete('1.0', f'{overflow + 1}.0')
-                self._log_widget_line_count = int(self._max_log_widget_lines)
-
-            self.log_text.see(tk.END)
-            self.log_text.config(state=tk.DISABLED)
-        except Exception as e:
-            logger.error(f"Error flushing log buffer: {e}")
-
-        if self._pending_log_messages and self.log_text.winfo_exists():
-            self._log_flush_job = self.log_text.after(120, self._flush_log_buffer)
-
-    def _passes_log_filter(self, formatted_message):
-        """Check whether a log message matches the selected log level filter."""
-        try:
-            selected = self.log_filter_var.get().upper() if hasattr(self, 'log_filter_var') else "ALL"
-            if selected == "ALL":
-                return True
-
-            msg_upper = formatted_message.upper()
-            if selected == "CRITICAL":
-                return "CRITICAL" in msg_upper
-            if selected == "ERROR":
-                return "ERROR" in msg_upper or "CRITICAL" in msg_upper
-            if selected == "WARNING":
-                return "WARNING" in msg_upper
-            if selected == "INFO":
-                return "INFO" in msg_upper
-            if selected == "DEBUG":
-                return "DEBUG" in msg_upper
-            return True
-        except Exception:
-            return True
+    def _log_filter_keys(self):
+        """Level index keys for the selected log level filter (None shows everything)."""
+        selected = self.log_filter_var.get().upper() if hasattr(self, 'log_filter_var') else "ALL"
+        if selected == "ERROR":
+            return ("ERROR", "CRITICAL")
+        if selected in LOG_LEVELS:
+            return (selected,)
+        return None
 
     def _apply_log_filter(self, *_args):
         """Re-render logs in the viewer using the selected filter."""
         try:
-            if not hasattr(self, 'log_text') or not self.log_text or not self.log_text.winfo_exists():
+            if not hasattr(self, 'log_view') or not self.log_view.winfo_exists():
                 return
-
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.delete('1.0', tk.END)
-
-            filtered = [msg for msg in self._all_log_messages if self._passes_log_filter(msg)]
-            if len(filtered) > self._max_log_widget_lines:
-                filtered = filtered[-self._max_log_widget_lines:]
-            if filtered:
-                self.log_text.insert(tk.END, "\n".join(filtered) + "\n")
-            self._log_widget_line_count = len(filtered)
-
-            self.log_text.see(tk.END)
-            self.log_text.config(state=tk.DISABLED)
+            self.log_view.set_filter(keys=self._log_filter_keys())
         except Exception as e:
             logger.error(f"Error applying log filter: {e}")
 
@@ -1347,11 +1295,12 @@ class MainWindow:
         self.log_level_filter_combo.pack(side=tk.LEFT)
         self.log_level_filter_combo.bind("<<ComboboxSelected>>", self._apply_log_filter)
         
-        self.log_text = scrolledtext.ScrolledText(
-            log_labelframe, height=15, wrap=tk.WORD, state=tk.DISABLED,
+        self.log_view = VirtualLogView(
+            log_labelframe, self.log_store, height=15,
             borderwidth=1, relief="solid", font=self.log_font, bg="#FFFFFF"
         )
-        self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(2, 5))
+        self.log_view.pack(fill=tk.BOTH, expand=True, padx=5, pady=(2, 5))
+        self.log_text = self.log_view.text
         self.status_label = ttk.Label(logs_frame, text="Status: Initializing...", font=self.status_font, anchor="w")
         self.status_label.pack(fill=tk.X, padx=5, pady=(5, 0))
 
@@ -1525,8 +1474,8 @@ class MainWindow:
             from tkinter import filedialog
             import os
             
-            # Get log content
-            log_content = self.log_text.get("1.0", tk.END)
+            # Every stored line passing the level filter, not just the visible window
+            log_content = "\n".join(self.log_view.filtered_lines())
             
             if not log_content.strip():
                 gui_utils.show_message("Empty Log", "No log content to save.", type="info", parent=self.root)
@@ -1559,9 +1508,7 @@ class MainWindow:
     
     def _clear_log(self):
         """Clear the log text widget."""
-        self._all_log_messages = []
-        self._pending_log_messages.clear()
-        gui_utils.clear_log(self.log_text, None)
+        self.log_view.clear()
 
     def get_available_themes(self):
         """Returns list of available themes for the settings dialog."""
@@ -1794,6 +1741,11 @@ class MainWindow:
         on_exit=None,
         on_error=None,
     ):
+        daemon_client = None
+        if str(self.settings.get("scraper_daemon_mode", "auto") or "auto").strip().lower() == "auto":
+            daemon_client = connect_scraper_daemon()
+        if daemon_client is not None:
+            self.update_log(f"[DAEMON] Running job {job_id} in the scraper daemon (pid {daemon_client.info.get('pid')})")
         return self.process_supervisor.start_job(
             job_id=job_id,
             command=command,
@@ -1805,6 +1757,7 @@ class MainWindow:
             on_state_change=on_state_change,
             on_exit=on_exit,
             on_error=on_error,
+            daemon_client=daemon_client,
         )
 
     def stop_supervised_group(self, group, force=False):
@@ -1,12 +1,13 @@
 # gui/process_supervisor.py
 # Shared subprocess orchestration supervisor for GUI-controlled CLI jobs.
+# With a daemon client, jobs run inside the scraper daemon instead of a new process.
 
 import threading
 import time
 import uuid
 from datetime import datetime
 
-from gui.subprocess_runner import SubprocessRunner
+from gui.subprocess_runner import DaemonJobRunner, SubprocessRunner
 
 
 class ProcessSupervisor:
@@ -38,6 +39,7 @@ class ProcessSupervisor:
         on_state_change=None,
         on_exit=None,
         on_error=None,
+        daemon_client=None,
     ):
         if not job_id:
             raise ValueError("job_id is required")
@@ -133,15 +135,28 @@ class ProcessSupervisor:
                 except Exception:
                     pass
 
-        runner = SubprocessRunner(
-            command=command,
-            cwd=cwd,
-            on_log=_handle_log,
-            on_event=_handle_event,
-            on_exit=_handle_exit,
-            on_error=_handle_error,
-            tail_log_file=tail_log_file,
-        )
+        if daemon_client is not None:
+            # Log lines arrive as daemon events, so there is no log file to tail
+            runner = DaemonJobRunner(
+                daemon_client,
+                command,
+                cwd=cwd,
+                on_log=_handle_log,
+                on_event=_handle_event,
+                on_exit=_handle_exit,
+                on_error=_handle_error,
+            )
+            state_payload["daemon_pid"] = daemon_client.info.get("pid")
+        else:
+            runner = SubprocessRunner(
+                command=command,
+                cwd=cwd,
+                on_log=_handle_log,
+                on_event=_handle_event,
+                on_exit=_handle_exit,
+                on_error=_handle_error,
+                tail_log_file=tail_log_file,
+            )
 
         state_payload["runner"] = runner
         with self._lock:
@@ -1,5 +1,7 @@
 # gui/subprocess_runner.py
 # Subprocess management for GUI-controlled CLI execution.
+# DaemonJobRunner runs the same CLI command as a job of a running scraper
+# daemon (scraper_daemon.py) behind the same interface.
 
 import json
 import os
@@ -8,6 +10,8 @@ import threading
 import time
 from typing import Callable, Optional
 
+from daemon_client import DaemonUnavailable, JobFollower, cli_arguments
+
 
 class SubprocessRunner:
     """Runs and monitors a CLI subprocess with optional JSON event parsing."""
@@ -191,3 +195,74 @@ class SubprocessRunner:
                     time.sleep(0.2)
         except Exception as err:
             self._emit_error(f"Log tail error: {err}")
+
+
+class DaemonJobRunner:
+    """SubprocessRunner stand-in that submits the CLI command to the scraper daemon."""
+
+    def __init__(
+        self,
+        client,
+        command,
+        cwd=None,
+        on_log: Optional[Callable[[str], None]] = None,
+        on_event: Optional[Callable[[dict], None]] = None,
+        on_exit: Optional[Callable[[int], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+    ):
+        self.client = client
+        self.command = list(command or [])
+        self.cwd = cwd
+        self.on_log = on_log
+        self.on_event = on_event
+        self.on_exit = on_exit
+        self.on_error = on_error
+        self.job_id = None
+        self._follower = None
+
+    def is_running(self):
+        return self._follower is not None and self._follower.is_alive()
+
+    def start(self):
+        if not self.command:
+            raise ValueError("Subprocess command is empty")
+        if self.is_running():
+            raise RuntimeError("Daemon job is already running")
+
+        # Relative paths in the command are relative to cwd, as for a subprocess
+        job = self.client.submit(cli_arguments(self.command), cwd=self.cwd)
+        self.job_id = job.get("job_id")
+        self._emit(self.on_log, f"Submitted to scraper daemon (pid {self.client.info.get('pid')}) as job {self.job_id}")
+        self._follower = JobFollower(
+            self.client,
+            self.job_id,
+            on_event=self._handle_event,
+            on_exit=lambda code: self._emit(self.on_exit, int(code)),
+            on_error=lambda message: self._emit(self.on_error, message),
+        ).start()
+
+    def stop(self, timeout_sec=3.0):
+        if not self.job_id or not self.is_running():
+            return
+        try:
+            # timeout 0 is the supervisor's force stop: the daemon closes the job's browser too
+            self.client.stop(self.job_id, force=not timeout_sec)
+        except (DaemonUnavailable, RuntimeError) as err:
+            self._emit(self.on_error, f"Could not stop daemon job {self.job_id}: {err}")
+
+    def _handle_event(self, event):
+        kind = event.get("type")
+        if kind == "log":
+            self._emit(self.on_log, event.get("message", ""))
+        elif kind == "exit":
+            self._emit(self.on_log, f"Daemon job exited with code: {event.get('exit_code')}")
+        else:
+            self._emit(self.on_event, event)
+
+    @staticmethod
+    def _emit(callback, value):
+        if callback:
+            try:
+                callback(value)
+            except Exception:
+                pass
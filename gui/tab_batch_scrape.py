@@ -5,7 +5,6 @@ import json
 import os
 import random
 import re
-import sqlite3
 import sys
 import threading
 import time
@@ -17,11 +16,14 @@ from urllib.parse import urlparse
 
 from batch_config_memory import get_batch_memory
 from gui import gui_utils
+from gui.log_view import DEFAULT_MAX_LINES, LogStore, VirtualLogView
 from scraper.driver_manager import setup_driver, safe_quit_driver
+from scraper.known_id_index import open_known_id_filter
 from scraper.logic import fetch_department_list_from_site_v2, run_scraping_logic
 from scraper.playwright_logic import fetch_department_list_from_site_playwright
+from scraper.scheduler import unit_priority
 from tender_store import TenderDataStore
-from utils import get_website_keyword_from_url, sanitise_filename
+from utils import get_website_keyword_from_url, portal_name_candidates, sanitise_filename
 
 try:
     import pandas as pd
@@ -75,13 +77,17 @@ class BatchScrapeTab(ttk.Frame):
         self.batch_log_filter_portal_var = StringVar(value="All")
         self.batch_log_search_var = StringVar(value="")
 
-        self.batch_log_messages = []
+        self.batch_log_store = LogStore(
+            max_lines=(self.main_app.settings or {}).get("log_view_max_lines", DEFAULT_MAX_LINES)
+        )
         self.portal_dashboard_rows = {}
         self.portal_live_stats = {}
         self._dashboard_lock = threading.Lock()
 
+        # Legacy JSON manifest; its contents move into the SQLite manifest tables on startup
         self.manifest_path = os.path.join(os.getcwd(), "batch_tender_manifest.json")
-        self.download_manifest = self._load_manifest()
+        self._manifest_data_store = None
+        self._load_manifest()
 
         self.enable_delta_sweep = True
         self.current_batch_delta_mode = "quick"
@@ -374,17 +380,18 @@ class BatchScrapeTab(ttk.Frame):
         ttk.Label(log_controls, text="Portal:").pack(side=tk.LEFT, padx=(0, 4))
         self.batch_portal_filter_combo = ttk.Combobox(log_controls, textvariable=self.batch_log_filter_portal_var, state="readonly", width=24)
         self.batch_portal_filter_combo.pack(side=tk.LEFT, padx=(0, 12))
-        self.batch_portal_filter_combo.bind("<<ComboboxSelected>>", lambda _e: self._render_batch_logs())
+        self.batch_portal_filter_combo.bind("<<ComboboxSelected>>", lambda _e: self._apply_batch_log_filter())
 
         ttk.Label(log_controls, text="Search:").pack(side=tk.LEFT, padx=(0, 4))
         self.batch_log_search_entry = ttk.Entry(log_controls, textvariable=self.batch_log_search_var, width=30)
         self.batch_log_search_entry.pack(side=tk.LEFT, padx=(0, 8))
-        self.batch_log_search_entry.bind("<KeyRelease>", lambda _e: self._render_batch_logs())
+        self.batch_log_search_entry.bind("<KeyRelease>", lambda _e: self._apply_batch_log_filter())
 
         ttk.Button(log_controls, text="Clear", width=10, command=self._clear_batch_logs).pack(side=tk.LEFT)
 
-        self.batch_log_text = scrolledtext.ScrolledText(log_lab, height=8, wrap=tk.WORD, state=tk.DISABLED, font=self.main_app.log_font)
-        self.batch_log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(2, 5))
+        self.batch_log_view = VirtualLogView(log_lab, self.batch_log_store, styled=True, height=8, font=self.main_app.log_font)
+        self.batch_log_view.pack(fill=tk.BOTH, expand=True, padx=5, pady=(2, 5))
+        self.batch_log_text = self.batch_log_view.text
 
     def _get_all_portal_names(self):
         names = []
@@ -456,6 +463,22 @@ class BatchScrapeTab(ttk.Frame):
             path = os.path.join(os.getcwd(), "data", "blackforest_tenders.sqlite3")
         return path
 
+    def _prioritize_portals(self, portal_names):
+        """Stalest, highest-yield portals first (scraper.scheduler.unit_priority)."""
+        try:
+            stats = TenderDataStore(self._resolve_sqlite_db_path()).get_portal_schedule_stats()
+        except Exception as err:
+            self.log_callback(f"Batch priority lookup failed, keeping selection order: {err}")
+            return list(portal_names)
+
+        now = datetime.now()
+
+        def _priority(portal_name):
+            entry = stats.get(str(portal_name).strip().lower()) or {}
+            return unit_priority(entry.get("last_extracted", 0), 0, entry.get("last_completed_at"), now=now)
+
+        return sorted(portal_names, key=_priority, reverse=True)
+
     def _get_export_policy(self):
         policy = str(self.main_app.settings.get("excel_export_policy", "on_demand") or "on_demand").strip().lower()
         if policy not in ("on_demand", "always", "alternate_days"):
@@ -636,55 +659,62 @@ class BatchScrapeTab(ttk.Frame):
         except Exception:
             pass
 
+    def _manifest_store(self):
+        db_path = ""
+        if hasattr(self.main_app, "_get_sqlite_runtime_settings"):
+            try:
+                runtime = self.main_app._get_sqlite_runtime_settings() or {}
+                db_path = str(runtime.get("sqlite_db_path") or "").strip()
+            except Exception:
+                db_path = ""
+        db_path = db_path or self._resolve_sqlite_db_path()
+        if self._manifest_data_store is None or self._manifest_data_store.db_path != db_path:
+            self._manifest_data_store = TenderDataStore(db_path)
+        return self._manifest_data_store
+
     def _load_manifest(self):
-        if not os.path.exists(self.manifest_path):
-            return self._bootstrap_manifest_from_outputs("missing")
         try:
-            with open(self.manifest_path, "r", encoding="utf-8") as handle:
-                data = json.load(handle)
-            if not isinstance(data, dict):
-                return self._bootstrap_manifest_from_outputs("invalid-structure")
-            data.setdefault("portals", {})
-            if not isinstance(data.get("portals"), dict):
-                return self._bootstrap_manifest_from_outputs("invalid-portals")
-            return data
-        except Exception:
-            return self._bootstrap_manifest_from_outputs("corrupt")
+            store = self._manifest_store()
+            if os.path.exists(self.manifest_path):
+                imported = store.import_manifest_json(self.manifest_path)
+                self.log_callback(f"Batch manifest migrated to SQLite ({imported} portal(s)).")
+            if not store.get_manifest_portals():
+                self._bootstrap_manifest_from_outputs("missing")
+        except Exception as error:
+            self.log_callback(f"Failed to load batch manifest: {error}")
 
     def _bootstrap_manifest_from_outputs(self, reason):
-        fallback = {"portals": {}}
         imported = 0
-
         for config in getattr(self.main_app, "base_urls_data", []):
             portal_name = str(config.get("Name", "")).strip()
             base_url = str(config.get("BaseURL", "")).strip()
             if not portal_name or not base_url:
                 continue
+            if self._seed_manifest_from_output(portal_name, base_url, reason):
+                imported += 1
 
-            latest_file = self._find_latest_output_for_portal(base_url)
-            if not latest_file:
-                continue
+        if imported > 0:
+            self.log_callback(f"Manifest {reason}; auto-imported checkpoint for {imported} portal(s).")
+        return imported
 
-            ids, departments = self._extract_checkpoint_from_output(latest_file)
-            if not ids and not departments:
-                continue
+    def _seed_manifest_from_output(self, portal_name, base_url, reason):
+        latest_file = self._find_latest_output_for_portal(base_url)
+        if not latest_file:
+            return None
 
-            fallback["portals"][portal_name] = {
-                "tender_ids": sorted(ids),
-                "processed_departments": sorted(departments),
-                "last_run": datetime.now().isoformat(timespec="seconds"),
-                "last_expected": None,
-                "last_extracted": len(ids),
-                "seeded_from": latest_file,
-                "seed_reason": reason
-            }
-            imported += 1
+        ids, departments = self._extract_checkpoint_from_output(latest_file)
+        if not ids and not departments:
+            return None
 
-        if imported > 0:
-            self.download_manifest = fallback
-            self._save_manifest()
-            self.log_callback(f"Manifest {reason}; auto-imported checkpoint for {imported} portal(s).")
-        return fallback
+        self._manifest_store().record_manifest_portal(
+            portal_name,
+            tender_ids=ids,
+            departments=departments,
+            last_extracted=len(ids),
+            seeded_from=latest_file,
+            seed_reason=reason,
+        )
+        return latest_file, ids, departments
 
     def _find_latest_output_for_portal(self, base_url):
         keyword = get_website_keyword_from_url(base_url)
@@ -749,16 +779,9 @@ class BatchScrapeTab(ttk.Frame):
 
         return tender_ids, departments
 
-    def _save_manifest(self):
-        try:
-            with open(self.manifest_path, "w", encoding="utf-8") as handle:
-                json.dump(self.download_manifest, handle, indent=2, ensure_ascii=False)
-        except Exception as error:
-            self.log_callback(f"Failed to save batch manifest: {error}")
-
     def _ensure_portal_checkpoint(self, portal_name):
-        portals = self.download_manifest.setdefault("portals", {})
-        if portal_name in portals:
+        store = self._manifest_store()
+        if store.get_manifest_portal(portal_name) is not None:
             return
 
         portal_config = self._portal_config_by_name(portal_name)
@@ -769,134 +792,60 @@ class BatchScrapeTab(ttk.Frame):
         if not base_url:
             return
 
-        latest_file = self._find_latest_output_for_portal(base_url)
-        if not latest_file:
-            return
-
-        ids, departments = self._extract_checkpoint_from_output(latest_file)
-        if not ids and not departments:
+        seeded = self._seed_manifest_from_output(portal_name, base_url, "portal-missing")
+        if not seeded:
             return
-
-        portals[portal_name] = {
-            "tender_ids": sorted(ids),
-            "processed_departments": sorted(departments),
-            "last_run": datetime.now().isoformat(timespec="seconds"),
-            "last_expected": None,
-            "last_extracted": len(ids),
-            "seeded_from": latest_file,
-            "seed_reason": "portal-missing"
-        }
-        self._save_manifest()
+        latest_file, ids, departments = seeded
         self.log_callback(
             f"Resume checkpoint auto-imported for '{portal_name}' from {os.path.basename(latest_file)} "
             f"(ids={len(ids)}, depts={len(departments)})."
         )
 
-    def _get_known_ids_for_portal(self, portal_name):
+    def _seed_known_ids_for_portal(self, portal_name):
+        """Bring the portal's manifest up to date with tenders stored since the last seed."""
         self._ensure_portal_checkpoint(portal_name)
-        portal_data = self.download_manifest.get("portals", {}).get(portal_name, {})
-        known_ids = set(portal_data.get("tender_ids", []))
-
-        sqlite_known_ids = self._get_sqlite_known_ids_for_portal(portal_name)
-        if sqlite_known_ids:
-            added = len(sqlite_known_ids - known_ids)
-            if added > 0:
-                known_ids.update(sqlite_known_ids)
-                portal_data["tender_ids"] = sorted(known_ids)
-                portal_data["last_db_seed"] = datetime.now().isoformat(timespec="seconds")
-                self._save_manifest()
-                self.log_callback(
-                    f"Loaded {len(sqlite_known_ids)} known IDs from SQLite for '{portal_name}' (added {added} to manifest)."
-                )
-
-        return known_ids
-
-    def _get_sqlite_known_ids_for_portal(self, portal_name):
-        db_path = None
-        if hasattr(self.main_app, "_get_sqlite_runtime_settings"):
-            try:
-                runtime = self.main_app._get_sqlite_runtime_settings() or {}
-                db_path = str(runtime.get("sqlite_db_path") or "").strip()
-            except Exception:
-                db_path = None
-
-        if not db_path:
-            db_path = str(getattr(self.main_app, "settings", {}).get("central_sqlite_db_path") or "").strip()
-
-        if not db_path or not os.path.exists(db_path):
-            return set()
-
-        portal_config = self._portal_config_by_name(portal_name) or {}
-        base_url = str(portal_config.get("BaseURL") or "").strip()
-        keyword = str(portal_config.get("Keyword") or "").strip()
-
-        keyword_from_url = ""
         try:
-            if base_url:
-                keyword_from_url = str(get_website_keyword_from_url(base_url) or "").strip()
-        except Exception:
-            keyword_from_url = ""
-
-        candidates_raw = {
-            str(portal_name or "").strip(),
-            keyword,
-            keyword_from_url,
-            keyword.replace(".", "_").replace("-", "_"),
-            keyword_from_url.replace(".", "_").replace("-", "_"),
-        }
-        portal_candidates = sorted({item.lower() for item in candidates_raw if item})
-        if not portal_candidates:
-            return set()
-
-        placeholders = ",".join(["?"] * len(portal_candidates))
-        query = (
-            "SELECT DISTINCT trim(tender_id_extracted) "
-            "FROM tenders "
-            "WHERE trim(coalesce(tender_id_extracted, '')) <> '' "
-            f"AND lower(trim(coalesce(portal_name, ''))) IN ({placeholders})"
-        )
-
-        try:
-            conn = sqlite3.connect(db_path)
-            try:
-                rows = conn.execute(query, portal_candidates).fetchall()
-            finally:
-                conn.close()
+            added = self._manifest_store().seed_manifest_from_tenders(
+                portal_name,
+                self._portal_name_candidates(portal_name),
+            )
         except Exception as error:
             self.log_callback(f"SQLite known-ID seed failed for '{portal_name}': {error}")
-            return set()
+            return
+        if added > 0:
+            self.log_callback(f"Added {added} known IDs from SQLite to the manifest for '{portal_name}'.")
+
+    def _open_known_ids_for_portal(self, portal_name, log_callback=None):
+        """Known-ID filter over the portal's stored tenders plus manifest-only IDs (caller closes it)."""
+        self._seed_known_ids_for_portal(portal_name)
+        store = self._manifest_store()
+        portal_keys = self._portal_name_candidates(portal_name)
+        # Memory-mapped index instead of a set of every known ID; all stored IDs count as known
+        known_ids = open_known_id_filter(
+            store.db_path,
+            portal_name,
+            portal_keys=portal_keys,
+            live_only=False,
+            log_callback=log_callback,
+        )
+        known_ids.update(store.get_manifest_only_tender_ids(portal_name, portal_keys))
+        return known_ids
 
-        return {
-            str(row[0]).strip()
-            for row in rows
-            if row and str(row[0]).strip()
-        }
+    def _get_known_id_count(self, portal_name):
+        self._seed_known_ids_for_portal(portal_name)
+        row = self._manifest_store().get_manifest_portal(portal_name) or {}
+        return int(row.get("known_ids") or 0)
+
+    def _portal_name_candidates(self, portal_name):
+        return portal_name_candidates(portal_name, self._portal_config_by_name(portal_name) or {})
 
     def _get_known_departments_for_portal(self, portal_name):
         self._ensure_portal_checkpoint(portal_name)
-        portal_data = self.download_manifest.get("portals", {}).get(portal_name, {})
-        return {
-            str(name).strip().lower()
-            for name in portal_data.get("processed_departments", [])
-            if str(name).strip()
-        }
+        return self._manifest_store().get_manifest_departments(portal_name)
 
     def _update_manifest_for_portal(self, portal_name, summary):
-        portals = self.download_manifest.setdefault("portals", {})
-        portal_data = portals.setdefault(portal_name, {})
-        known = set(portal_data.get("tender_ids", []))
-        known.update(summary.get("extracted_tender_ids", []))
-        known_departments = {
-            str(name).strip().lower()
-            for name in portal_data.get("processed_departments", [])
-            if str(name).strip()
-        }
-        known_departments.update(summary.get("processed_department_names", []))
-
-        dept_url_map = portal_data.setdefault("department_url_map", {})
-        if not isinstance(dept_url_map, dict):
-            dept_url_map = {}
-            portal_data["department_url_map"] = dept_url_map
+        now_text = datetime.now().isoformat(timespec="seconds")
+        department_urls = {}
         for dept in summary.get("source_departments", []) or []:
             dept_name = str(dept.get("name", "")).strip()
             direct_url = str(dept.get("direct_url", "") or "").strip()
@@ -905,41 +854,33 @@ class BatchScrapeTab(ttk.Frame):
             dept_key = self._normalize_department_key(dept_name)
             if not dept_key:
                 continue
-            dept_url_map[dept_key] = {
+            department_urls[dept_key] = {
                 "name": dept_name,
                 "direct_url": direct_url,
-                "last_seen": datetime.now().isoformat(timespec="seconds")
+                "last_seen": now_text
             }
 
-        portal_data["tender_ids"] = sorted(known)
-        portal_data["processed_departments"] = sorted(known_departments)
-        portal_data["last_run"] = datetime.now().isoformat(timespec="seconds")
-        portal_data["last_expected"] = summary.get("expected_total_tenders", 0)
-        portal_data["last_extracted"] = summary.get("extracted_total_tenders", 0)
-        self._save_manifest()
-        return len(known)
+        return self._manifest_store().record_manifest_portal(
+            portal_name,
+            tender_ids=summary.get("extracted_tender_ids", []),
+            departments=summary.get("processed_department_names", []),
+            department_urls=department_urls,
+            last_expected=summary.get("expected_total_tenders", 0),
+            last_extracted=summary.get("extracted_total_tenders", 0),
+        )
 
     def _get_department_url_stats(self, portal_name):
-        portal_data = self.download_manifest.get("portals", {}).get(portal_name, {})
-        known_departments = {
-            str(name).strip().lower()
-            for name in portal_data.get("processed_departments", [])
-            if str(name).strip()
-        }
+        store = self._manifest_store()
         known_department_keys = {
             self._normalize_department_key(name)
-            for name in known_departments
+            for name in store.get_manifest_departments(portal_name)
             if self._normalize_department_key(name)
         }
-        dept_url_map = portal_data.get("department_url_map", {})
-        if not isinstance(dept_url_map, dict):
-            dept_url_map = {}
+        dept_url_map = store.get_manifest_department_urls(portal_name)
 
         mapped_total = 0
         mapped_known = 0
         for key, row in dept_url_map.items():
-            if not isinstance(row, dict):
-                continue
             if str(row.get("direct_url", "") or "").strip():
                 mapped_total += 1
                 dept_key = self._normalize_department_key(key)
@@ -959,12 +900,7 @@ class BatchScrapeTab(ttk.Frame):
     def _append_batch_log(self, portal_name, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
         message_text = str(message)
-        entry = {
-            "timestamp": timestamp,
-            "portal": portal_name,
-            "message": message_text
-        }
-        self.batch_log_messages.append(entry)
+        self.batch_log_store.append(f"[{timestamp}][{portal_name}] {message_text}", keys=(portal_name,))
 
         live_updates, progress_note = self._update_live_stats_from_message(portal_name, message_text)
         combined_message = message_text
@@ -977,7 +913,7 @@ class BatchScrapeTab(ttk.Frame):
             extracted=live_updates.get("extracted") if live_updates else None,
             message=combined_message
         )
-        self._render_batch_logs()
+        self.batch_log_view.refresh()
 
     def _update_live_stats_from_message(self, portal_name, message_text):
         stats = self.portal_live_stats.setdefault(
@@ -1047,26 +983,15 @@ class BatchScrapeTab(ttk.Frame):
         self.main_app.root.after(0, self._append_batch_log, portal_name, message)
 
     def _clear_batch_logs(self):
-        self.batch_log_messages = []
-        self._render_batch_logs()
+        self.batch_log_view.clear()
 
-    def _render_batch_logs(self):
+    def _apply_batch_log_filter(self):
         portal_filter = self.batch_log_filter_portal_var.get().strip()
         search_term = self.batch_log_search_var.get().strip().lower()
 
-        self.batch_log_text.config(state=tk.NORMAL)
-        self.batch_log_text.delete("1.0", tk.END)
-
-        for entry in self.batch_log_messages:
-            if portal_filter and portal_filter != "All" and entry["portal"] != portal_filter:
-                continue
-            line = f"[{entry['timestamp']}][{entry['portal']}] {entry['message']}"
-            if search_term and search_term not in line.lower():
-                continue
-            gui_utils.append_styled_log_line(self.batch_log_text, line)
-
-        self.batch_log_text.see(tk.END)
-        self.batch_log_text.config(state=tk.DISABLED)
+        keys = (portal_filter,) if portal_filter and portal_filter != "All" else None
+        predicate = (lambda line: search_term in line.lower()) if search_term else None
+        self.batch_log_view.set_filter(keys=keys, predicate=predicate)
 
     def _refresh_portal_filter_values(self):
         values = ["All"] + self._get_all_portal_names()
@@ -1088,7 +1013,7 @@ class BatchScrapeTab(ttk.Frame):
                 pass
 
         for portal in selected_portals:
-            known_total = len(self._get_known_ids_for_portal(portal))
+            known_total = self._get_known_id_count(portal)
             item_id = self.dashboard_tree.insert(
                 "", tk.END,
                 values=(portal, "Idle", 0, 0, 0, known_total, "Waiting to start...", "--:--:--")
@@ -1101,7 +1026,7 @@ class BatchScrapeTab(ttk.Frame):
         with self._dashboard_lock:
             item_id = self.portal_dashboard_rows.get(portal)
             if not item_id:
-                known_total = len(self._get_known_ids_for_portal(portal))
+                known_total = self._get_known_id_count(portal)
                 item_id = self.dashboard_tree.insert("", tk.END, values=(portal, "Idle", 0, 0, 0, known_total, "Waiting to start...", "--:--:--"))
                 self.portal_dashboard_rows[portal] = item_id
 
@@ -1515,6 +1440,7 @@ class BatchScrapeTab(ttk.Frame):
         ip_safety = self._get_ip_safety_settings()
 
         delta_mode = self._get_selected_delta_mode()
+        selected_portals = self._prioritize_portals(selected_portals)
 
         if confirm:
             if not gui_utils.show_message(
@@ -1558,6 +1484,7 @@ class BatchScrapeTab(ttk.Frame):
             f"Starting batch scrape for {len(selected_portals)} portal(s) in {mode} mode "
             f"(scope={'Only New' if only_new else 'All'}, delta={delta_mode.title()}, reason={reason})."
         )
+        self.log_callback(f"Batch order (stalest / highest expected yield first): {', '.join(selected_portals)}")
 
         use_subprocess = bool(hasattr(self.main_app, "start_supervised_cli_job"))
         if use_subprocess:
@@ -2082,11 +2009,11 @@ class BatchScrapeTab(ttk.Frame):
 
         valid_departments, expected_total = self._build_valid_departments(departments)
 
-        known_ids = self._get_known_ids_for_portal(portal_name) if only_new else set()
-        known_ids.update({str(item).strip() for item in (known_ids_seed or set()) if str(item).strip()})
+        known_ids = self._open_known_ids_for_portal(portal_name, portal_log) if only_new else None
+        seed_ids = {str(item).strip() for item in (known_ids_seed or set()) if str(item).strip()}
         known_departments = self._get_known_departments_for_portal(portal_name) if (only_new and resume_departments) else set()
         if only_new:
-            portal_log(f"Known tender IDs for resume/new-only: {len(known_ids)}")
+            portal_log(f"Known tender IDs for resume/new-only: {len(known_ids) + len(seed_ids)}")
             if resume_departments:
                 portal_log(f"Known processed departments for resume: {len(known_departments)}")
             else:
@@ -2116,22 +2043,28 @@ class BatchScrapeTab(ttk.Frame):
         if dept_workers > 1:
             portal_log(f"Department parallel workers enabled: {dept_workers}")
 
-        summary = run_scraping_logic(
-            departments_to_scrape=valid_departments,
-            base_url_config=portal_config,
-            download_dir=download_dir,
-            log_callback=portal_log,
-            progress_callback=lambda *_args: None,
-            timer_callback=lambda *_args: None,
-            status_callback=lambda *_args: None,
-            stop_event=stop_event,
-            driver=shared_driver,
-            deep_scrape=deep_scrape,
-            existing_tender_ids=known_ids,
-            existing_department_names=known_departments,
-            department_parallel_workers=dept_workers,
-            **sqlite_runtime_kwargs
-        )
+        try:
+            summary = run_scraping_logic(
+                departments_to_scrape=valid_departments,
+                base_url_config=portal_config,
+                download_dir=download_dir,
+                log_callback=portal_log,
+                progress_callback=lambda *_args: None,
+                timer_callback=lambda *_args: None,
+                status_callback=lambda *_args: None,
+                stop_event=stop_event,
+                driver=shared_driver,
+                deep_scrape=deep_scrape,
+                existing_tender_ids=seed_ids,
+                existing_tender_filter=known_ids,
+                existing_department_names=known_departments,
+                department_parallel_workers=dept_workers,
+                log_mode=(self.main_app.settings or {}).get("scraper_log_mode", "normal"),
+                **sqlite_runtime_kwargs
+            )
+        finally:
+            if known_ids is not None:
+                known_ids.close()
         summary.setdefault("expected_total_tenders", expected_total)
         summary.setdefault("extracted_total_tenders", 0)
         summary.setdefault("skipped_existing_total", 0)
@@ -2230,14 +2163,14 @@ class BatchScrapeTab(ttk.Frame):
         json_path = os.path.join(report_dir, f"department_url_coverage_{stamp}.json")
         csv_path = os.path.join(report_dir, f"department_url_coverage_{stamp}.csv")
 
-        portals = self.download_manifest.get("portals", {})
+        portals = self._manifest_store().get_manifest_portals()
         rows = []
         mapped_total = 0
         known_total = 0
 
         for portal_name in sorted(portals.keys()):
             stats = self._get_department_url_stats(portal_name)
-            portal_data = portals.get(portal_name, {}) if isinstance(portals.get(portal_name, {}), dict) else {}
+            portal_data = portals.get(portal_name) or {}
             row = {
                 "portal": portal_name,
                 "mapped_departments": int(stats.get("mapped_departments", 0)),
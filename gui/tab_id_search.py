@@ -97,6 +97,7 @@ except ImportError:
 from scraper.logic import search_and_download_tenders
 from gui import gui_utils # Absolute import
 from utils import get_website_keyword_from_url
+from config import ID_SEARCH_PARALLEL_WORKERS
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +108,9 @@ class IdSearchTab(ttk.Frame):
         super().__init__(parent, **kwargs)
         self.main_app = main_app_ref
         self.log_callback = self.main_app.update_log
+        self.id_search_workers_var = tk.StringVar(
+            value=str(self.main_app.settings.get("id_search_parallel_workers", ID_SEARCH_PARALLEL_WORKERS))
+        )
         # Remove the local portal_var - use main app's selection instead
         # self.portal_var = tk.StringVar(value=self.main_app.base_urls_data[0]['Name'])
         self._create_widgets()
@@ -182,6 +186,11 @@ class IdSearchTab(ttk.Frame):
         )
         self.clear_button.pack(side=tk.LEFT)
 
+        # IDs not stored in the database are searched by this many browsers at once
+        self.id_search_workers_spin = ttk.Spinbox(main_button_frame, from_=1, to=5, width=4, textvariable=self.id_search_workers_var)
+        self.id_search_workers_spin.pack(side=tk.RIGHT)
+        ttk.Label(main_button_frame, text="Browsers:").pack(side=tk.RIGHT, padx=(10, 4))
+
         # Extraction Buttons Frame
         extract_frame = ttk.LabelFrame(section, text="Import IDs from:")
         extract_frame.pack(fill=tk.X, padx=5, pady=(0, 10))
@@ -656,10 +665,18 @@ class IdSearchTab(ttk.Frame):
             if not self.main_app.validate_download_dir(download_dir):
                 return
 
+            try:
+                id_search_workers = max(1, min(5, int(self.id_search_workers_var.get() or 1)))
+            except (TypeError, ValueError):
+                id_search_workers = 1
+            self.id_search_workers_var.set(str(id_search_workers))
+            self.main_app.settings["id_search_parallel_workers"] = id_search_workers
+
             # Start background task with only the required positional arguments
             self.main_app.start_background_task(  # type: ignore
                 self._search_worker,
                 args=(tender_ids, url_config, download_dir),
+                kwargs={"id_search_workers": id_search_workers},
                 task_name="Tender ID Search"
             )
             
@@ -671,7 +688,8 @@ class IdSearchTab(ttk.Frame):
     def _search_worker(self, tender_ids, base_url_config, download_dir, driver=None,
                       log_callback=None, progress_callback=None, timer_callback=None,
                       status_callback=None, stop_event=None, deep_scrape=False,
-                      dl_more_details=True, dl_zip=True, dl_notice_pdfs=True):
+                      dl_more_details=True, dl_zip=True, dl_notice_pdfs=True,
+                      sqlite_db_path=None, id_search_workers=1, **_unused):
         """Worker function to process tender ID search."""
         try:
             from scraper.logic import search_and_download_tenders
@@ -688,7 +706,9 @@ class IdSearchTab(ttk.Frame):
                 deep_scrape=deep_scrape,
                 dl_more_details=dl_more_details,
                 dl_zip=dl_zip,
-                dl_notice_pdfs=dl_notice_pdfs
+                dl_notice_pdfs=dl_notice_pdfs,
+                sqlite_db_path=sqlite_db_path,
+                id_search_workers=id_search_workers
             )
         except Exception as e:
             logger.error(f"Error in tender ID search worker: {e}", exc_info=True)
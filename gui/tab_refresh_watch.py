@@ -14,7 +14,9 @@ from typing import Any, cast
 from app_settings import save_settings
 from batch_config_memory import get_batch_memory
 from gui import gui_utils
+from scraper.http_probe import probe_portals
 from scraper.logic import fetch_department_list_from_site_v2
+from scraper.watch_schedule import next_check_epoch, record_check, timeline_from_events
 from utils import get_website_keyword_from_url
 
 try:
@@ -39,6 +41,7 @@ class RefreshWatchTab(ttk.Frame):
         self.portal_var = tk.StringVar(value="")
         self.interval_var = tk.StringVar(value=str(self.DEFAULT_INTERVAL_MIN))
         self.enabled_var = tk.BooleanVar(value=True)
+        self.adaptive_var = tk.BooleanVar(value=True)
 
         self._watch_thread = None
         self._watch_stop_event = threading.Event()
@@ -49,7 +52,6 @@ class RefreshWatchTab(ttk.Frame):
         self._diagnostics_file = None
         self._portal_health_job = None
         self._portal_health_refresh_ms = 15000
-        self._manifest_path = os.path.join(os.getcwd(), "batch_tender_manifest.json")
         self._health_sort_col = "portal"
         self._health_sort_reverse = False
         self._portal_alias_map = {}
@@ -96,6 +98,7 @@ class RefreshWatchTab(ttk.Frame):
 
         ttk.Label(health_top, text="Every (min):", font=self.main_app.label_font).pack(side=tk.LEFT, padx=(10, 4))
         ttk.Entry(health_top, textvariable=self.interval_var, width=8).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(health_top, text="Adaptive", variable=self.adaptive_var).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Checkbutton(health_top, text="Enable Selected", variable=self.enabled_var).pack(side=tk.LEFT, padx=(0, 8))
         self.add_update_button = ttk.Button(health_top, text="Apply Selected", width=14, command=self._add_or_update_rule)
         self.add_update_button.pack(side=tk.LEFT, padx=(0, 6))
@@ -204,6 +207,7 @@ class RefreshWatchTab(ttk.Frame):
                 self._portal_rules[name] = {
                     "enabled": bool(rule.get("enabled", True)),
                     "interval_min": interval_min,
+                    "adaptive": bool(rule.get("adaptive", True)),
                 }
 
         self._build_portal_alias_map()
@@ -225,6 +229,36 @@ class RefreshWatchTab(ttk.Frame):
                     "detail": detail,
                 })
 
+        self._seed_watch_timelines()
+
+    def _seed_watch_timelines(self):
+        """Rebuild check timelines of watched portals that have none from logged CHECK/CHANGE events."""
+        missing = [
+            name for name, rule in self._portal_rules.items()
+            if rule.get("enabled", True) and not self._watch_state.get(name, {}).get("timeline")
+        ]
+        if not missing:
+            return
+        events = []
+        if self._diagnostics_file and os.path.exists(self._diagnostics_file):
+            try:
+                with open(self._diagnostics_file, "r", encoding="utf-8") as handle:
+                    for line in handle:
+                        if '"CHECK"' not in line and '"CHANGE"' not in line:
+                            continue
+                        try:
+                            events.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                events = []
+        events.extend(self._history_events)
+        now_epoch = time.time()
+        for portal_name in missing:
+            timeline = timeline_from_events(events, portal_name, now_epoch)
+            if timeline:
+                self._watch_state.setdefault(portal_name, {})["timeline"] = timeline
+
     def _record_event(self, portal_name, event_name, detail):
         portal = str(portal_name or "-").strip() or "-"
         item = {
@@ -314,6 +348,7 @@ class RefreshWatchTab(ttk.Frame):
                 "name": portal_name,
                 "enabled": bool(rule.get("enabled", True)),
                 "interval_min": int(rule.get("interval_min", self.DEFAULT_INTERVAL_MIN)),
+                "adaptive": bool(rule.get("adaptive", True)),
             })
         return rows
 
@@ -429,28 +464,26 @@ class RefreshWatchTab(ttk.Frame):
         return ", ".join(groups)
 
     def _load_manifest_last_runs(self):
-        if not os.path.exists(self._manifest_path):
+        db_path = self._sqlite_db_path()
+        if not db_path:
             return {}
         try:
-            with open(self._manifest_path, "r", encoding="utf-8") as handle:
-                data = json.load(handle)
+            conn = sqlite3.connect(db_path)
+            try:
+                rows = conn.execute(
+                    "SELECT portal_name, last_run FROM manifest_portals WHERE trim(coalesce(last_run, '')) <> ''"
+                ).fetchall()
+            finally:
+                conn.close()
         except Exception:
-            return {}
-
-        portals = data.get("portals", {}) if isinstance(data, dict) else {}
-        if not isinstance(portals, dict):
+            # Databases not yet opened by TenderDataStore have no manifest tables
             return {}
 
         output = {}
-        for portal_name, row in portals.items():
-            if not isinstance(row, dict):
-                continue
+        for portal_name, last_run in rows:
             key = self._canonical_portal_key(portal_name)
-            if not key:
-                continue
-            last_run = str(row.get("last_run", "")).strip()
-            if last_run:
-                output[key] = last_run
+            if key:
+                output[key] = str(last_run).strip()
         return output
 
     def _sqlite_db_path(self):
@@ -737,13 +770,17 @@ class RefreshWatchTab(ttk.Frame):
             total_live += live_count
             total_expired += expired_count
 
+            rule_name = portal_name
             rule = self._portal_rules.get(portal_name, {})
             if not rule:
-                for rule_name, rule_value in self._portal_rules.items():
-                    if self._canonical_portal_key(rule_name) == key:
-                        rule = rule_value
+                for candidate_name, rule_value in self._portal_rules.items():
+                    if self._canonical_portal_key(candidate_name) == key:
+                        rule_name, rule = candidate_name, rule_value
                         break
             interval_text = str(int(rule.get("interval_min", self.DEFAULT_INTERVAL_MIN)))
+            if rule and rule.get("adaptive", True):
+                next_check = self._watch_state.get(rule_name, {}).get("next_check_epoch")
+                interval_text += f" auto, next {self._format_ts(next_check)[:5]}" if next_check else " auto"
             enabled_text = "Yes" if bool(rule.get("enabled", False)) else "No"
 
             last_run = db_last_runs.get(key) or manifest_last_runs.get(key) or ""
@@ -792,7 +829,7 @@ class RefreshWatchTab(ttk.Frame):
             value = str(entry[1]).strip()
             if self._health_sort_col in {"live", "expired", "interval"}:
                 try:
-                    return int(value)
+                    return int(value.split()[0])
                 except Exception:
                     return -1
             if self._health_sort_col == "enabled":
@@ -1033,6 +1070,7 @@ class RefreshWatchTab(ttk.Frame):
         self.portal_var.set(portal_name)
         self.interval_var.set(str(int(rule.get("interval_min", self.DEFAULT_INTERVAL_MIN))))
         self.enabled_var.set(bool(rule.get("enabled", False)))
+        self.adaptive_var.set(bool(rule.get("adaptive", True)))
 
     def _add_or_update_rule(self):
         portal_name = str(self.portal_var.get() or "").strip()
@@ -1051,9 +1089,17 @@ class RefreshWatchTab(ttk.Frame):
         self._portal_rules[display_name] = {
             "enabled": bool(self.enabled_var.get()),
             "interval_min": interval_min,
+            "adaptive": bool(self.adaptive_var.get()),
         }
-        self._watch_state.setdefault(display_name, {}).setdefault("status", "Waiting")
-        self._record_event(display_name, "RULE", f"Rule updated (enabled={bool(self.enabled_var.get())}, interval={interval_min}m)")
+        state = self._watch_state.setdefault(display_name, {})
+        state.setdefault("status", "Waiting")
+        # Reschedule from the last check under the new rule
+        state.pop("next_check_epoch", None)
+        self._record_event(
+            display_name,
+            "RULE",
+            f"Rule updated (enabled={bool(self.enabled_var.get())}, interval={interval_min}m, adaptive={bool(self.adaptive_var.get())})",
+        )
         self._refresh_tree()
         self._save_watch_settings(log_message=True)
 
@@ -1077,6 +1123,7 @@ class RefreshWatchTab(ttk.Frame):
         self._portal_rules[target_name] = {
             "enabled": False,
             "interval_min": self.DEFAULT_INTERVAL_MIN,
+            "adaptive": True,
         }
         self._watch_state.setdefault(target_name, {}).setdefault("status", "Watch Disabled")
         self._pending_portals.discard(portal_name)
@@ -1090,6 +1137,7 @@ class RefreshWatchTab(ttk.Frame):
         now_epoch = time.time()
         if checked:
             state["last_check_epoch"] = now_epoch
+            state["next_check_epoch"] = self._next_check_epoch(portal_name, now_epoch)
         if changed:
             state["last_change_epoch"] = now_epoch
 
@@ -1101,9 +1149,10 @@ class RefreshWatchTab(ttk.Frame):
     def _compute_department_signature(self, departments):
         normalized = []
         for dept in departments or []:
-            s_no = str(dept.get("s_no", "")).strip()
-            name = str(dept.get("name", "")).strip().lower()
-            count_text = str(dept.get("count_text", "")).strip()
+            # Collapse whitespace so HTTP-parsed and browser-rendered text hash alike
+            s_no = " ".join(str(dept.get("s_no", "")).split())
+            name = " ".join(str(dept.get("name", "")).split()).lower()
+            count_text = " ".join(str(dept.get("count_text", "")).split())
             if not s_no and not name:
                 continue
             if name in ["organisation name", "department name", "organization", "organization name"]:
@@ -1114,7 +1163,12 @@ class RefreshWatchTab(ttk.Frame):
         payload = json.dumps(normalized, ensure_ascii=False)
         return hashlib.sha1(payload.encode("utf-8")).hexdigest(), len(normalized)
 
-    def _check_portal_for_change(self, portal_name):
+    def _check_portal_for_change(self, portal_name, departments=None):
+        """Compare the portal's department signature with the last one.
+
+        departments comes from the HTTP probe; without it the list is fetched
+        with a browser, which waits while a scrape is running.
+        """
         portal_cfg = self._portal_config_by_name(portal_name)
         if not portal_cfg:
             self._set_portal_status(portal_name, "Config not found", checked=True)
@@ -1128,7 +1182,12 @@ class RefreshWatchTab(ttk.Frame):
         def _watch_log(msg):
             self.main_app.update_log(f"[WATCH:{portal_name}] {msg}")
 
-        departments, _ = fetch_department_list_from_site_v2(org_url, _watch_log)
+        if departments is None:
+            if self.main_app.scraping_in_progress:
+                self._set_portal_status(portal_name, "HTTP probe failed; browser check deferred (scrape running)", checked=False)
+                return False
+            _watch_log("HTTP probe failed, checking with the browser")
+            departments, _ = fetch_department_list_from_site_v2(org_url, _watch_log)
         if not departments:
             self._set_portal_status(portal_name, "No departments fetched", checked=True)
             return False
@@ -1138,6 +1197,7 @@ class RefreshWatchTab(ttk.Frame):
         previous = str(state.get("signature", "")).strip()
         state["signature"] = signature
         state["department_count"] = dept_count
+        record_check(state, time.time(), bool(previous) and previous != signature)
 
         if not previous:
             self._set_portal_status(portal_name, f"Baseline captured ({dept_count} depts)", checked=True)
@@ -1194,6 +1254,49 @@ class RefreshWatchTab(ttk.Frame):
         self.main_app.update_log(f"[WATCH] Manual trigger queued for {portal_name}.")
         self._record_event(portal_name, "MANUAL", "Manual trigger queued")
 
+    def _next_check_epoch(self, portal_name, from_epoch):
+        """Fixed interval, or adaptive from the portal's check timeline (see scraper/watch_schedule.py)."""
+        rule = self._portal_rules.get(portal_name, {})
+        interval_min = max(1, int(rule.get("interval_min", self.DEFAULT_INTERVAL_MIN)))
+        if not rule.get("adaptive", True):
+            return from_epoch + max(60, interval_min * 60)
+        timeline = self._watch_state.get(portal_name, {}).get("timeline") or []
+        return next_check_epoch(timeline, from_epoch, interval_min)
+
+    def _due_portals(self, now_epoch):
+        due = []
+        for portal_name, rule in list(self._portal_rules.items()):
+            if not rule.get("enabled", True):
+                continue
+            state = self._watch_state.setdefault(portal_name, {})
+            next_check = state.get("next_check_epoch")
+            if not next_check:
+                last_check = float(state.get("last_check_epoch", 0) or 0)
+                next_check = self._next_check_epoch(portal_name, last_check) if last_check else 0
+                state["next_check_epoch"] = next_check
+            if now_epoch >= float(next_check):
+                due.append(portal_name)
+        return due
+
+    def _probe_portals(self, portal_names):
+        """{portal: (departments or None, total)} from concurrent HTTP probes."""
+        urls = {}
+        for portal_name in portal_names:
+            portal_cfg = self._portal_config_by_name(portal_name) or {}
+            org_url = str(portal_cfg.get("OrgListURL") or "").strip()
+            if org_url:
+                urls[portal_name] = (org_url, str(portal_cfg.get("BaseURL") or "").strip())
+        results = probe_portals(
+            urls,
+            log_callback=lambda msg: self.main_app.update_log(f"[WATCH] {msg}"),
+            stop_event=self._watch_stop_event,
+        )
+        # Portals without an org list URL go straight to _check_portal_for_change for its status message
+        for portal_name in portal_names:
+            if portal_name not in urls:
+                results[portal_name] = (None, 0)
+        return results
+
     def _watcher_loop(self):
         while not self._watch_stop_event.is_set():
             try:
@@ -1209,21 +1312,20 @@ class RefreshWatchTab(ttk.Frame):
                     if not started:
                         self._pending_portals.add(portal_name)
 
-                now_epoch = time.time()
-                if not self.main_app.scraping_in_progress:
-                    for portal_name, rule in list(self._portal_rules.items()):
-                        if not rule.get("enabled", True):
-                            continue
-
-                        interval_sec = max(60, int(rule.get("interval_min", 60)) * 60)
-                        state = self._watch_state.setdefault(portal_name, {})
-                        last_check = float(state.get("last_check_epoch", 0) or 0)
-                        if now_epoch - last_check < interval_sec:
-                            continue
-
+                # HTTP probes are cheap, so due portals are checked together even during a scrape
+                due_portals = self._due_portals(time.time())
+                if due_portals:
+                    for portal_name in due_portals:
                         self._set_portal_status(portal_name, "Checking for changes...", checked=False)
-                        changed = self._check_portal_for_change(portal_name)
-                        if changed:
+                    probe_results = self._probe_portals(due_portals)
+                    for portal_name in due_portals:
+                        if self._watch_stop_event.is_set():
+                            break
+                        if portal_name not in probe_results:
+                            self._set_portal_status(portal_name, "Portal host busy; retrying next round", checked=False)
+                            continue
+                        departments, _ = probe_results[portal_name]
+                        if self._check_portal_for_change(portal_name, departments):
                             self._pending_portals.add(portal_name)
                 self._save_watch_settings(log_message=False)
                 if self._watch_stop_event.wait(loop_seconds):
@@ -0,0 +1,226 @@
+# scraper/checkpoint_journal.py
+# Append-only resume journal for run_scraping_logic
+#
+# One JSON line per completed department, flushed and fsynced as soon as the
+# department finishes, so a checkpoint costs only the new department's rows
+# and a crash loses at most the department in flight. Resume replays the
+# lines; a torn last line (crash mid-write) is ignored. On a failed run the
+# journal is compacted into a single snapshot line; a completed run deletes it.
+#
+# Large departments are also journaled per completed row window ("range"
+# lines), so a crash deep inside one resumes after its last finished window.
+# The department's closing "dept" line then carries only the tenders not
+# already written as ranges.
+#
+# Line types:
+#   {"type": "run", "portal_name": ..., "run_started_at": ...}
+#   {"type": "range", "department": ..., "next_row": n, "dom_rows": n, "tenders": [...]}
+#   {"type": "dept", "department": <normalized name>, "tenders": [...]}
+#   {"type": "snapshot", "departments": [...], "partial": {dept: [next_row, dom_rows]}, "tenders": [...]}
+
+import json
+import os
+import re
+import threading
+
+
+def _portal_slug(portal_name):
+    return re.sub(r'[^\w]+', '_', str(portal_name).lower()).strip('_') or 'portal'
+
+
+class CheckpointJournal:
+    """Per-portal JSONL checkpoint journal. Thread-safe appends."""
+
+    def __init__(self, checkpoint_dir, portal_name):
+        self.portal_name = str(portal_name)
+        slug = _portal_slug(portal_name)
+        self.path = os.path.join(checkpoint_dir, f'{slug}_checkpoint.jsonl')
+        # Whole-file JSON checkpoint written by earlier versions; read once on resume
+        self.legacy_path = os.path.join(checkpoint_dir, f'{slug}_checkpoint.json')
+        self.stale = False
+        self.torn_lines = 0
+        # department -> (next_row, dom_rows) for departments with ranges but no dept line
+        self.resume_rows = {}
+        self._lock = threading.Lock()
+        self._handle = None
+        self._range_counts = {}  # department -> tenders written as ranges this run
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def exists(self):
+        return os.path.exists(self.path) or os.path.exists(self.legacy_path)
+
+    def has_data(self):
+        """True if a department or snapshot was recorded (reads at most two lines)."""
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                for line in handle:
+                    if '"type": "run"' not in line and line.strip():
+                        return True
+        if os.path.exists(self.legacy_path):
+            with open(self.legacy_path, 'r', encoding='utf-8') as handle:
+                legacy = json.load(handle)
+            return bool(legacy.get('tenders') or legacy.get('processed_departments'))
+        return False
+
+    def replay(self):
+        """(tenders, department names) recorded by earlier runs of this portal.
+
+        Also fills resume_rows for departments that stopped part-way.
+        """
+        tenders = []
+        departments = set()
+        partial = {}
+        self.stale = False
+        self.torn_lines = 0
+        self.resume_rows = {}
+
+        if os.path.exists(self.legacy_path):
+            with open(self.legacy_path, 'r', encoding='utf-8') as handle:
+                legacy = json.load(handle)
+            if str(legacy.get('portal_name', '')).lower() == self.portal_name.lower():
+                tenders.extend(legacy.get('tenders', []))
+                departments.update(legacy.get('processed_departments', []))
+            else:
+                self.stale = True
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        self.torn_lines += 1
+                        continue
+                    kind = record.get('type')
+                    if kind == 'run':
+                        if str(record.get('portal_name', '')).lower() != self.portal_name.lower():
+                            # Another portal with the same slug: nothing here is ours
+                            self.stale = True
+                            return [], set()
+                    elif kind == 'range':
+                        tenders.extend(record.get('tenders', []))
+                        if record.get('department'):
+                            partial[record['department']] = (int(record['next_row']), int(record['dom_rows']))
+                    elif kind == 'dept':
+                        tenders.extend(record.get('tenders', []))
+                        if record.get('department'):
+                            departments.add(record['department'])
+                    elif kind == 'snapshot':
+                        tenders.extend(record.get('tenders', []))
+                        departments.update(record.get('departments', []))
+                        for department, point in (record.get('partial') or {}).items():
+                            partial[department] = (int(point[0]), int(point[1]))
+        self.resume_rows = {dept: point for dept, point in partial.items() if dept not in departments}
+        return tenders, departments
+
+    def open(self, run_started_at):
+        """Start appending; writes the header line for a new journal."""
+        with self._lock:
+            if self._handle is not None:
+                return
+            self._drop_torn_tail()
+            is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._handle = open(self.path, 'a', encoding='utf-8')
+            if is_new:
+                self._write_locked({
+                    'type': 'run',
+                    'portal_name': self.portal_name,
+                    'run_started_at': run_started_at,
+                })
+
+    def append_range(self, department, next_row, dom_rows, tenders):
+        """Durably record one completed row window of a department still in progress."""
+        with self._lock:
+            if self._handle is None:
+                return
+            tenders = list(tenders or [])
+            self._write_locked({
+                'type': 'range',
+                'department': department,
+                'next_row': next_row,
+                'dom_rows': dom_rows,
+                'tenders': tenders,
+            })
+            self._range_counts[department] = self._range_counts.get(department, 0) + len(tenders)
+
+    def append_department(self, department, tenders):
+        """Durably record one completed department.
+
+        tenders is the department's full list; the leading entries already
+        written by append_range this run are not repeated.
+        """
+        with self._lock:
+            if self._handle is None:
+                return
+            already = self._range_counts.pop(department, 0)
+            self._write_locked({'type': 'dept', 'department': department, 'tenders': list(tenders or [])[already:]})
+
+    def _drop_torn_tail(self):
+        # Cut a half-written last line so the next record starts on a fresh line
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as handle:
+            size = handle.seek(0, os.SEEK_END)
+            if not size:
+                return
+            handle.seek(size - 1)
+            if handle.read(1) == b'\n':
+                return
+            keep = 0
+            position = size
+            while position > 0:
+                step = min(65536, position)
+                position -= step
+                handle.seek(position)
+                newline = handle.read(step).rfind(b'\n')
+                if newline >= 0:
+                    keep = position + newline + 1
+                    break
+            handle.truncate(keep)
+
+    def _write_locked(self, record):
+        self._handle.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def compact(self, run_started_at):
+        """Rewrite the journal (and any legacy checkpoint) as one snapshot line. Returns tender count."""
+        self.close()
+        tenders, departments = self.replay()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            for record in (
+                {'type': 'run', 'portal_name': self.portal_name, 'run_started_at': run_started_at},
+                {
+                    'type': 'snapshot',
+                    'departments': sorted(departments),
+                    'partial': {dept: list(point) for dept, point in self.resume_rows.items()},
+                    'tenders': tenders,
+                },
+            ):
+                handle.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+        return len(tenders)
+
+    def discard(self):
+        """Delete the journal after a completed run."""
+        self.close()
+        removed = False
+        for path in (self.path, self.legacy_path):
+            if os.path.exists(path):
+                os.remove(path)
+                removed = True
+        return removed
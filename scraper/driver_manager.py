@@ -22,6 +22,7 @@ except ImportError: WDM_AVAILABLE = False; logging.warning("webdriver-manager no
 
 # Absolute imports from project root
 from config import PAGE_LOAD_TIMEOUT, DEFAULT_DOWNLOAD_DIR_NAME # Import relative name
+from scraper.scheduler import BROWSER_LEASE_TIMEOUT, attach_lease, lease_browser
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +32,14 @@ _CHROMEDRIVER_LOCK = threading.Lock()
 # --- Configuration ---
 USE_UNDETECTED = UNDETECTED_AVAILABLE # Default: use UC if available
 HEADLESS_MODE = False # Default: run with browser window visible
-
-def setup_driver(initial_download_dir=None):
-    """Setup and return a configured ChromeDriver instance."""
+def setup_driver(initial_download_dir=None, stop_event=None, lease_timeout=None):
+    """Setup and return a configured ChromeDriver instance.
+
+    Waits (up to lease_timeout seconds, default BROWSER_LEASE_TIMEOUT) for a slot
+    in the machine-wide browser budget first (scraper.scheduler); the slot is
+    released when the driver quits.
+    """
+    lease = lease_browser(stop_event=stop_event, timeout=lease_timeout or BROWSER_LEASE_TIMEOUT)
     try:
         logger.info("Setting up Chrome WebDriver...")
 
@@ -112,14 +118,16 @@ def setup_driver(initial_download_dir=None):
         driver_instance.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
         logger.info("Chrome WebDriver setup completed successfully")
-        return driver_instance
+        return attach_lease(driver_instance, lease)
 
     except SessionNotCreatedException as snce:
+        lease.release()
         logger.error(f"Session creation failed: {snce}")
         logger.error("This usually means ChromeDriver version doesn't match Chrome version")
         logger.error("Please check Chrome version and ensure ChromeDriver is compatible")
         raise
     except Exception as e:
+        lease.release()
         logger.error(f"Failed driver setup: {e}", exc_info=True)
         raise
 
@@ -0,0 +1,193 @@
+# scraper/http_probe.py
+# Browser-free department-list probe for the refresh watcher
+#
+# NIC "Tenders by Organisation" pages are served as static HTML, so the
+# watcher can fetch the org list with a plain HTTP GET and parse the
+# department table (id="table") with the standard-library HTML parser
+# instead of starting Chrome. Probes for many portals run on a thread pool;
+# each one holds a host slot from the machine-wide scheduler, so probes and
+# scrapes together never exceed the per-host concurrency cap.
+#
+# probe_department_list returns departments shaped like
+# fetch_department_list_from_site_v2's (s_no, name, count_text, direct_url),
+# or None when the page could not be fetched or has no department table; the
+# caller then falls back to the browser fetch.
+
+import concurrent.futures
+import http.cookiejar
+import logging
+import urllib.request
+from html.parser import HTMLParser
+from urllib.error import URLError
+from urllib.parse import urljoin
+
+from config import DEPT_LIST_LINK_COLUMN_INDEX, DEPT_LIST_NAME_COLUMN_INDEX, DEPT_LIST_SNO_COLUMN_INDEX, MAIN_TABLE_LOCATOR
+from scraper.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 20  # seconds per HTTP request
+PROBE_WORKERS = 8
+HOST_WAIT_SECONDS = 30  # give up on a busy host and retry the portal next round
+PROBE_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+HEADER_NAMES = ("organisation name", "department name", "organization", "organization name")
+HEADER_SERIALS = ("s.no", "sr.no", "serial", "#")
+
+
+class _DepartmentTableParser(HTMLParser):
+    """Collects [(cell text, first link href), ...] per row of the table with the given id."""
+
+    def __init__(self, table_id):
+        super().__init__(convert_charrefs=True)
+        self.table_id = table_id
+        self.found = False
+        self.rows = []
+        self._depth = 0  # table nesting depth inside the target table (0 = outside)
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self._depth:
+                self._depth += 1
+            elif dict(attrs).get("id") == self.table_id and not self.found:
+                self.found = True
+                self._depth = 1
+            return
+        if self._depth != 1:
+            return
+        if tag == "tr":
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = {"header": tag == "th", "text": [], "href": ""}
+        elif tag == "a" and self._cell is not None and not self._cell["href"]:
+            self._cell["href"] = dict(attrs).get("href") or ""
+
+    def handle_endtag(self, tag):
+        if not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+            return
+        if self._depth != 1:
+            return
+        if tag in ("td", "th") and self._cell is not None and self._row is not None:
+            self._row.append(self._cell)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell["text"].append(data)
+
+
+def _cell_text(cell):
+    return " ".join("".join(cell["text"]).split())
+
+
+def parse_department_table(html, page_url):
+    """Departments from an org-list page, or None if it has no department table."""
+    parser = _DepartmentTableParser(MAIN_TABLE_LOCATOR[1])
+    parser.feed(html)
+    parser.close()
+    if not parser.found:
+        return None
+
+    required_cols = max(DEPT_LIST_SNO_COLUMN_INDEX, DEPT_LIST_NAME_COLUMN_INDEX, DEPT_LIST_LINK_COLUMN_INDEX) + 1
+    departments = []
+    for row in parser.rows:
+        cells = [cell for cell in row if not cell["header"]]
+        if len(cells) < required_cols:
+            continue
+        s_no = _cell_text(cells[DEPT_LIST_SNO_COLUMN_INDEX])
+        name = _cell_text(cells[DEPT_LIST_NAME_COLUMN_INDEX])
+        count_cell = cells[DEPT_LIST_LINK_COLUMN_INDEX]
+        if s_no.lower() in HEADER_SERIALS or name.lower() in HEADER_NAMES:
+            continue
+        if not s_no and not name:
+            continue
+        href = count_cell["href"].strip()
+        departments.append({
+            "s_no": s_no,
+            "name": name,
+            "count_text": _cell_text(count_cell),
+            "direct_url": urljoin(page_url, href) if href and not href.lower().startswith("javascript") else "",
+        })
+    return departments
+
+
+def _fetch(opener, url, timeout):
+    request = urllib.request.Request(url, headers={"User-Agent": PROBE_USER_AGENT, "Accept": "text/html"})
+    with opener.open(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset, errors="replace")
+
+
+def probe_department_list(org_url, base_url=None, log_callback=None, timeout=PROBE_TIMEOUT):
+    """
+    (departments, estimated tender total) from org_url over plain HTTP, or (None, 0).
+
+    If the org list does not come back with a department table (NIC portals
+    may want a session cookie first), base_url is fetched once to obtain one
+    and the org list is retried.
+    """
+    log = log_callback or (lambda _msg: None)
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    departments = None
+    try:
+        departments = parse_department_table(_fetch(opener, org_url, timeout), org_url)
+        if departments is None and base_url:
+            _fetch(opener, base_url, timeout)
+            departments = parse_department_table(_fetch(opener, org_url, timeout), org_url)
+    except (URLError, OSError, ValueError) as err:
+        log(f"HTTP probe failed for {org_url}: {err}")
+        return None, 0
+    if not departments:
+        log(f"HTTP probe found no department table at {org_url}")
+        return None, 0
+
+    total_tenders = sum(int(dept["count_text"]) for dept in departments if dept["count_text"].isdigit())
+    return departments, total_tenders
+
+
+def probe_portals(portal_urls, log_callback=None, stop_event=None, max_workers=PROBE_WORKERS):
+    """
+    Probe several portals concurrently.
+
+    portal_urls maps portal name -> (org list URL, base URL). Each probe holds
+    one host slot of the global scheduler. Returns {portal name: (departments,
+    estimated total)}; departments is None if the probe failed, and portals
+    whose host stayed busy (or that were stopped) are left out.
+    """
+    scheduler = get_scheduler()
+
+    def _probe(org_url, base_url):
+        lease = scheduler.host(org_url, timeout=HOST_WAIT_SECONDS, stop_event=stop_event)
+        if lease is None:
+            return None
+        with lease:
+            return probe_department_list(org_url, base_url, log_callback)
+
+    results = {}
+    if not portal_urls:
+        return results
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(portal_urls))),
+        thread_name_prefix="HttpProbe",
+    ) as executor:
+        futures = {
+            executor.submit(_probe, org_url, base_url): portal_name
+            for portal_name, (org_url, base_url) in portal_urls.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            portal_name = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as err:
+                logger.warning(f"HTTP probe crashed for {portal_name}: {err}", exc_info=True)
+                outcome = (None, 0)
+            if outcome is not None:
+                results[portal_name] = outcome
+    return results
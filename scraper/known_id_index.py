@@ -0,0 +1,319 @@
+# scraper/known_id_index.py
+# Persisted per-portal index of known tender IDs for only-new duplicate checks
+#
+# Instead of every scraping process loading all of a portal's tender IDs into
+# Python sets (plus a closing-date snapshot dict), the IDs are written once to
+# a compact file next to the tender database and memory-mapped by every
+# process that needs them:
+#
+#   header   magic, entry count, Bloom size and hash count, byte order, source rowid
+#   bloom    Bloom filter over the ID hashes (~1% false positives)
+#   hashes   sorted 64-bit blake2b hashes of the normalized tender IDs
+#   rowids   tenders.id of the newest row carrying each hash (parallel array)
+#
+# A lookup rejects most new IDs in the Bloom filter, binary-searches the hash
+# array for the rest, and only then reads the tender row from SQLite to
+# confirm the ID exactly and get its closing date. Rows stored after the file
+# was built are read at open time (tenders.id above the source rowid) and the
+# file is rebuilt from itself plus that tail once the tail grows large.
+
+import hashlib
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from tender_store import TenderDataStore, _IST
+
+MAGIC = b"BFKIDX01"
+HEADER = struct.Struct("<8sQQIIqq")  # magic, count, bloom bits, hash count, byte order, source rowid, built at
+BLOOM_BITS_PER_ID = 10
+BLOOM_HASHES = 7
+INDEX_DIRNAME = "known_id_index"
+REBUILD_MIN_TAIL = 5000  # tail rows tolerated before the file is rebuilt...
+REBUILD_TAIL_RATIO = 0.1  # ...or this fraction of the indexed IDs, whichever is larger
+
+_BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+_normalize = TenderDataStore._normalize_tender_id_text
+_normalize_date = TenderDataStore._normalize_date_text
+
+
+def id_hash(normalized_id):
+    """64-bit hash of a normalized tender ID."""
+    return int.from_bytes(hashlib.blake2b(normalized_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _bloom_bits(h, bloom_bits):
+    # Double hashing: the two 32-bit halves give every probe position
+    h1 = h & 0xFFFFFFFF
+    h2 = (h >> 32) | 1
+    return [(h1 + i * h2) % bloom_bits for i in range(BLOOM_HASHES)]
+
+
+def index_path_for(db_path, portal_name, portal_keys):
+    slug = re.sub(r"[^\w]+", "_", str(portal_name).lower()).strip("_") or "portal"
+    keys_digest = hashlib.blake2b("\n".join(portal_keys).encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), INDEX_DIRNAME, f"{slug}_{keys_digest}.kidx")
+
+
+def write_index(path, entries, source_rowid):
+    """Write {hash: rowid} to path atomically. Returns the entry count."""
+    hashes = array("Q", sorted(entries))
+    rowids = array("q", (entries[h] for h in hashes))
+    bloom_bits = max(64, -(-len(hashes) * BLOOM_BITS_PER_ID // 64) * 64)
+    bloom = bytearray(bloom_bits // 8)
+    for h in hashes:
+        for bit in _bloom_bits(h, bloom_bits):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(HEADER.pack(
+            MAGIC, len(hashes), bloom_bits, BLOOM_HASHES, _BYTE_ORDER,
+            int(source_rowid), int(datetime.now().timestamp()),
+        ))
+        handle.write(bloom)
+        handle.write(hashes.tobytes())
+        handle.write(rowids.tobytes())
+        handle.flush()
+        os.fsync(handle.fileno())
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+    return len(hashes)
+
+
+class KnownIdIndex:
+    """Read-only memory-mapped view of one index file. Raises ValueError if the file is unusable."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < HEADER.size:
+                raise ValueError("truncated header")
+            magic, count, bloom_bits, hash_count, byte_order, source_rowid, _built = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC or byte_order != _BYTE_ORDER or hash_count != BLOOM_HASHES:
+                raise ValueError("unsupported index format")
+            hashes_at = HEADER.size + bloom_bits // 8
+            rowids_at = hashes_at + count * 8
+            if len(self._mmap) != rowids_at + count * 8:
+                raise ValueError("index size does not match its header")
+        except ValueError:
+            self._mmap.close()
+            raise
+        self.count = count
+        self.source_rowid = source_rowid
+        self._bloom_size = bloom_bits
+        view = memoryview(self._mmap)
+        self._bloom = view[HEADER.size:hashes_at]
+        self._hashes = view[hashes_at:rowids_at].cast("Q")
+        self._rowids = view[rowids_at:].cast("q")
+        self._view = view
+
+    def __len__(self):
+        return self.count
+
+    def might_contain(self, h):
+        bloom = self._bloom
+        return all(bloom[bit >> 3] & (1 << (bit & 7)) for bit in _bloom_bits(h, self._bloom_size))
+
+    def rowid_for(self, h):
+        """Rowid stored for hash h, or None (Bloom check first, then binary search)."""
+        if not self.count or not self.might_contain(h):
+            return None
+        position = bisect_left(self._hashes, h)
+        if position < self.count and self._hashes[position] == h:
+            return self._rowids[position]
+        return None
+
+    def entries(self):
+        """{hash: rowid} of the whole file (used when rebuilding)."""
+        return dict(zip(self._hashes, self._rowids))
+
+    def close(self):
+        if self._mmap is None:
+            return
+        for view in (self._bloom, self._hashes, self._rowids, self._view):
+            view.release()
+        self._mmap.close()
+        self._mmap = None
+
+
+class KnownIdFilter:
+    """
+    Membership and closing-date lookups over a portal's stored tenders.
+
+    Drop-in for the normalized-ID set and the closing-date snapshot dict that
+    run_scraping_logic used to build: supports `in`, len(), get(), add(),
+    update() and item assignment (tenders found during this run are kept in
+    memory). With live_only, tenders whose closing date has passed in IST are
+    not known, as in get_existing_tender_snapshot_for_portal; otherwise every
+    stored ID is known and get() carries no closing date.
+    """
+
+    def __init__(self, db_path, portal_keys, index=None, tail=None, live_only=True):
+        self.portal_keys = list(portal_keys)
+        self.live_only = live_only
+        self._index = index
+        self._tail = tail or {}  # hash -> rowid of rows newer than the index file
+        self._fresh = {}  # normalized id -> record, added during this run
+        self._confirmed = {}  # normalized id -> record or None, from SQLite
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        # The fallback lookup must match IDs exactly as the index normalized them
+        self._conn.create_function("normalize_tender_id", 1, _normalize)
+
+    def __len__(self):
+        return (len(self._index) if self._index else 0) + len(self._tail) + len(self._fresh)
+
+    def __contains__(self, normalized_id):
+        return self._lookup(normalized_id) is not None
+
+    def get(self, normalized_id, default=None):
+        record = self._lookup(normalized_id)
+        return default if record is None else record
+
+    def __setitem__(self, normalized_id, record):
+        self._fresh[normalized_id] = dict(record or {})
+
+    def add(self, normalized_id):
+        self._fresh.setdefault(normalized_id, {})
+
+    def update(self, normalized_ids):
+        for normalized_id in normalized_ids:
+            self.add(normalized_id)
+
+    def _lookup(self, normalized_id):
+        if not normalized_id:
+            return None
+        record = self._fresh.get(normalized_id)
+        if record is not None:
+            return record
+        if normalized_id in self._confirmed:
+            return self._confirmed[normalized_id]
+        h = id_hash(normalized_id)
+        rowid = self._tail.get(h)
+        if rowid is None and self._index is not None:
+            rowid = self._index.rowid_for(h)
+        if rowid is None:
+            return None
+        record = self._confirm(normalized_id, rowid)
+        self._confirmed[normalized_id] = record
+        return record
+
+    def _confirm(self, normalized_id, rowid):
+        """Exact check of a probable hit against SQLite."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tender_id_extracted, closing_date FROM tenders WHERE id = ?",
+                (rowid,),
+            ).fetchone()
+            if row is None or _normalize(row[0]) != normalized_id:
+                # Row deleted or replaced since indexing: look the ID up directly
+                placeholders = ",".join("?" * len(self.portal_keys))
+                row = self._conn.execute(
+                    f"""
+                    SELECT tender_id_extracted, closing_date
+                    FROM tenders
+                    WHERE LOWER(TRIM(COALESCE(portal_name, ''))) IN ({placeholders})
+                      AND normalize_tender_id(tender_id_extracted) = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                    """,
+                    (*self.portal_keys, normalized_id),
+                ).fetchone()
+                if row is None:
+                    return None
+        if not self.live_only:
+            return {}
+        parsed = TenderDataStore._parse_closing_date_ist(row[1])
+        if parsed is not None and parsed <= datetime.now(tz=_IST):
+            return None
+        return {"tender_id": str(row[0]).strip(), "closing_date": _normalize_date(row[1])}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+        if self._index is not None:
+            self._index.close()
+
+
+def _read_tail(conn, portal_keys, after_rowid):
+    placeholders = ",".join("?" * len(portal_keys))
+    cursor = conn.execute(
+        f"""
+        SELECT id, tender_id_extracted
+        FROM tenders
+        WHERE id > ?
+          AND TRIM(COALESCE(tender_id_extracted, '')) != ''
+          AND LOWER(TRIM(COALESCE(portal_name, ''))) IN ({placeholders})
+        ORDER BY id
+        """,
+        (after_rowid, *portal_keys),
+    )
+    tail = {}
+    for rowid, tender_id in cursor:
+        normalized_id = _normalize(tender_id)
+        if normalized_id:
+            # Ascending ids: the newest row of a tender wins
+            tail[id_hash(normalized_id)] = rowid
+    return tail
+
+
+def open_known_id_filter(db_path, portal_name, portal_keys=None, live_only=True, log_callback=None):
+    """
+    KnownIdFilter for a portal, building or refreshing its index file as needed.
+
+    portal_keys are the lower-cased portal_name values the portal's tenders
+    are stored under (default: the portal name itself).
+    """
+    log = log_callback or (lambda _msg: None)
+    keys = sorted({str(key or "").strip().lower() for key in (portal_keys or [portal_name]) if str(key or "").strip()})
+    path = index_path_for(db_path, portal_name, keys)
+
+    index = None
+    try:
+        index = KnownIdIndex(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as err:
+        log(f"[KNOWN-IDS] Rebuilding unreadable index {os.path.basename(path)}: {err}")
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        high_rowid = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tenders").fetchone()[0]
+        source_rowid = index.source_rowid if index is not None else 0
+        if index is not None and source_rowid > high_rowid:
+            # Database replaced or restored from backup: start over
+            index.close()
+            index, source_rowid = None, 0
+        tail = _read_tail(conn, keys, source_rowid) if high_rowid > source_rowid else {}
+    finally:
+        conn.close()
+
+    if index is None or len(tail) > max(REBUILD_MIN_TAIL, len(index) * REBUILD_TAIL_RATIO):
+        entries = index.entries() if index is not None else {}
+        entries.update(tail)
+        if index is not None:
+            index.close()
+        try:
+            count = write_index(path, entries, high_rowid)
+            index, tail = KnownIdIndex(path), {}
+            log(f"[KNOWN-IDS] Indexed {count} known tender IDs for '{portal_name}'")
+        except OSError as err:
+            # Keep working from memory; another process may hold the file open (Windows)
+            log(f"[KNOWN-IDS] Could not write index {os.path.basename(path)}: {err}")
+            index, tail = None, entries
+
+    return KnownIdFilter(db_path, keys, index=index, tail=tail, live_only=live_only)
@@ -0,0 +1,96 @@
+# scraper/log_facade.py
+# Category-aware, rate-limited wrapper around the scraper's log_callback
+#
+# Hot loops (locator attempts, per-row retries, per-department steps) report
+# through ScraperLog.event(category, template, *args). The template is only
+# formatted when the line is actually emitted, and every event is counted so
+# suppressed detail still shows up in the end-of-run summary.
+#
+# Modes:
+#   verbose  every event is emitted (the old behaviour)
+#   normal   sampled categories emit their first `head` events, then one in
+#            every `every`; other categories are emitted
+#   quiet    no events are emitted, only counted; plain log lines (calls to
+#            the object itself) and summaries still go through
+
+import threading
+
+LOG_MODE_VERBOSE = "verbose"
+LOG_MODE_NORMAL = "normal"
+LOG_MODE_QUIET = "quiet"
+LOG_MODES = (LOG_MODE_VERBOSE, LOG_MODE_NORMAL, LOG_MODE_QUIET)
+
+# category -> (head, every) used in normal mode
+DEFAULT_SAMPLING = {
+    "locator": (5, 100),
+    "row": (10, 100),
+    "row_progress": (1, 10),
+    "table": (20, 50),
+}
+
+
+class ScraperLog:
+    """Callable drop-in for log_callback that adds categorised, sampled events."""
+
+    def __init__(self, log_callback=None, mode=LOG_MODE_NORMAL, sampling=None):
+        self.log_callback = log_callback or (lambda _msg: None)
+        self.mode = mode if mode in LOG_MODES else LOG_MODE_NORMAL
+        self.sampling = DEFAULT_SAMPLING if sampling is None else sampling
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._emitted = {}
+
+    def __call__(self, message):
+        self.log_callback(message)
+
+    @property
+    def quiet(self):
+        return self.mode == LOG_MODE_QUIET
+
+    def enabled(self, category):
+        """Count one event of category and return whether it should be emitted."""
+        with self._lock:
+            count = self._counts.get(category, 0) + 1
+            self._counts[category] = count
+            if self.mode == LOG_MODE_QUIET:
+                return False
+            if self.mode == LOG_MODE_NORMAL and category in self.sampling:
+                head, every = self.sampling[category]
+                if count > head and (count - head) % max(1, every):
+                    return False
+            self._emitted[category] = self._emitted.get(category, 0) + 1
+            return True
+
+    def event(self, category, template, *args):
+        """Emit template.format(*args) if the category's policy allows it."""
+        if self.enabled(category):
+            self.log_callback(template.format(*args) if args else template)
+
+    def counts(self):
+        """{category: (events, emitted)} so far."""
+        with self._lock:
+            return {category: (count, self._emitted.get(category, 0)) for category, count in self._counts.items()}
+
+    def emit_summary(self):
+        """Log one line per category that had events suppressed."""
+        suppressed = {
+            category: (count, emitted)
+            for category, (count, emitted) in sorted(self.counts().items())
+            if emitted < count
+        }
+        if not suppressed:
+            return
+        self.log_callback("")
+        self.log_callback(f"📝 LOG EVENTS ({self.mode} mode):")
+        for category, (count, emitted) in suppressed.items():
+            self.log_callback(f"   {category}: {count} events, {count - emitted} not shown")
+
+
+def as_scraper_log(log_callback, mode=LOG_MODE_VERBOSE):
+    """Reuse a ScraperLog passed down as log_callback, or wrap a plain callable.
+
+    Plain callables keep the old every-line behaviour unless a mode is given.
+    """
+    if isinstance(log_callback, ScraperLog):
+        return log_callback
+    return ScraperLog(log_callback, mode=mode)
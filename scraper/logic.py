@@ -1,4 +1,8 @@
-print("scraper.logic module imported")  # DEBUG
+# scraper/logic.py
+# Selenium scraping logic: department lists, tender extraction, ID search
+#
+# pandas and the Tk CAPTCHA dialog are imported where they are used, so
+# importing this module does not load them.
 
 # Add project root to sys.path
 import os, sys
@@ -14,7 +18,6 @@ import concurrent.futures
 import socket
 import json
 import tempfile
-import pandas as pd
 import logging
 from datetime import datetime
 import re
@@ -68,11 +71,13 @@ try:
         CONTRACT_TYPE_LOCATOR, TENDER_FEE_LOCATOR, EMD_AMOUNT_LOCATOR, TENDER_VALUE_LOCATOR, WORK_LOCATION_LOCATOR, INVITING_OFFICER_LOCATOR, INVITING_OFFICER_ADDRESS_LOCATOR,
         TENDERS_BY_ORG_LOCATORS, SITE_COMPATIBILITY_URL_PATTERN, TENDERS_BY_ORG_URL_PATTERN  # Add the new constants
     )
-    from utils import sanitise_filename, get_website_keyword_from_url, generate_tender_urls
+    from utils import sanitise_filename, get_website_keyword_from_url, generate_tender_urls, portal_name_candidates
     from tender_store import TenderDataStore
     from scraper.driver_manager import setup_driver, set_download_directory, safe_quit_driver
     from scraper.actions import safe_extract_text, click_element, wait_for_downloads, save_page_as_pdf
-    from scraper.captcha_handler import handle_captcha
+    from scraper.log_facade import LOG_MODE_NORMAL, as_scraper_log
+    from scraper.checkpoint_journal import CheckpointJournal
+    from scraper.scheduler import WorkQueue, get_scheduler, unit_priority
     from portal_config_memory import get_portal_memory
 except ImportError as e:
     print(f"Error importing local modules: {e}")
@@ -94,6 +99,16 @@ ORGANISATION_NAME_LITERAL = 'organisation name'
 HEADER_SNO_KEYWORDS = ['s.no', 'sr.no', 'serial', '#']
 HEADER_NAME_KEYWORDS = ['organisation name', 'department name', 'organization']
 
+# Departments above this many tenders are announced as windowed/resumable
+# (formerly skipped outright to avoid browser freezes)
+LARGE_DEPT_SIZE = 15000
+
+# Seconds extra department workers (W2+) wait for a global browser budget slot
+WORKER_BROWSER_LEASE_TIMEOUT = 60
+
+# Parallel ID-search workers show one CAPTCHA prompt at a time
+_CAPTCHA_PROMPT_LOCK = threading.Lock()
+
 # Constants for search processing
 SEARCH_ID_KEY = 'Search ID'
 SEARCH_INDEX_KEY = 'Search Index'
@@ -261,21 +276,6 @@ def sanitize_department_direct_url(url):
     except Exception:
         return raw
 
-# --- GUI Import Check ---
-# Use absolute import based on sys.path modification in main.py
-try:
-    from gui import gui_utils # Absolute import
-    GUI_UTILS_IMPORTED = True
-    logger.debug("Successfully imported gui_utils.") # logger is now defined
-except ImportError:
-    gui_utils = None # Define gui_utils as None if import fails
-    GUI_UTILS_IMPORTED = False
-    logger.warning("gui_utils could not be imported. GUI messages will be disabled in scraper logic.") # logger is now defined
-except Exception as import_err:
-    gui_utils = None
-    GUI_UTILS_IMPORTED = False
-    logger.error(f"Unexpected error importing gui_utils: {import_err}", exc_info=True) # logger is now defined
-
 # New: import sound helper (safe fallback)
 try:
     from scraper.sound_helper import play_sound, SOUND_SUCCESS, SOUND_ERROR, SOUND_DING  # type: ignore
@@ -295,34 +295,34 @@ def find_element_with_fallbacks(driver, locators, description="element", timeout
     If preferred_index is provided, tries that locator first.
     Returns (element, successful_locator) or (None, None) if all fail.
     """
-    log_callback = log_callback or (lambda x: None)
+    log = as_scraper_log(log_callback)
     
     # Create ordered list - try preferred first if specified
     indices = list(range(len(locators)))
     if preferred_index is not None and 0 <= preferred_index < len(locators):
-        log_callback(f"  Using preferred locator index {preferred_index} based on portal history")
+        log.event("locator", "  Using preferred locator index {} based on portal history", preferred_index)
         indices.remove(preferred_index)
         indices.insert(0, preferred_index)
     
     for i in indices:
         locator = locators[i]
         try:
-            log_callback(f"  Trying locator {i+1}/{len(locators)} for {description}: {locator}")
+            log.event("locator", "  Trying locator {}/{} for {}: {}", i + 1, len(locators), description, locator)
             if hasattr(driver, 'find_element') and hasattr(WebDriverWait, '__call__'):
                 element = WebDriverWait(driver, timeout).until(
                     EC.element_to_be_clickable(locator)
                 )
                 if element:
-                    log_callback(f"  ✓ Found {description} using locator {i+1}: {locator}")
+                    log.event("locator", "  ✓ Found {} using locator {}: {}", description, i + 1, locator)
                     return element, locator
         except (TimeoutException, NoSuchElementException) as e:
-            log_callback(f"  ✗ Locator {i+1} failed for {description}: {e}")
+            log.event("locator", "  ✗ Locator {} failed for {}: {}", i + 1, description, e)
             continue
         except Exception as e:
-            log_callback(f"  ⚠ Unexpected error with locator {i+1} for {description}: {e}")
+            log.event("locator", "  ⚠ Unexpected error with locator {} for {}: {}", i + 1, description, e)
             continue
     
-    log_callback(f"  ✗ All {len(locators)} locators failed for {description}")
+    log(f"  ✗ All {len(locators)} locators failed for {description}")
     return None, None
 
 # ==============================================================================
@@ -658,56 +658,58 @@ def _js_extract_table_rows(driver, start_row=0, end_row=None):
         return None
 
 
-def _js_extract_table_rows_batched(driver, total_rows, batch_size=2000, log_callback=None):
-    """Extract large tables in batches to prevent browser timeout/memory issues.
-    
-    For departments with 3000+ rows (like West Bengal with 13,000+ rows),
-    extracting all rows in one JS call causes browser hangs/timeouts.
-    This function batches extraction in chunks of 2000 rows.
-    
-    Args:
-        driver: Selenium WebDriver
-        total_rows: Total number of rows to extract
-        batch_size: Rows per batch (default: 2000)
-        log_callback: Optional logging function
-    
+def _js_rows_to_tenders(js_rows, department_name, base_url, portal_skill=PORTAL_SKILL_NIC):
+    """Build tender dicts from _js_extract_table_rows output (already duplicate-filtered).
+
     Returns:
-        Combined list of {c: [cell_texts...], h: href_or_None} dicts, or None on failure.
+        Tuple: (tenders, skipped_count) - skipped_count counts non-empty rows with < 3 cells
     """
-    if total_rows <= batch_size:
-        # Small table - extract all at once
-        return _js_extract_table_rows(driver)
-    
-    # Large table - extract in batches
-    if log_callback:
-        log_callback(f"    [JS] Large table ({total_rows} rows) - extracting in batches of {batch_size}...")
-    
-    all_rows = []
-    num_batches = (total_rows + batch_size - 1) // batch_size  # Ceiling division
-    
-    for batch_num in range(num_batches):
-        start_row = batch_num * batch_size
-        end_row = min(start_row + batch_size, total_rows)
-        
-        if log_callback:
-            log_callback(f"    [JS] Batch {batch_num + 1}/{num_batches}: rows {start_row}-{end_row-1}...")
-        
-        batch_rows = _js_extract_table_rows(driver, start_row, end_row)
-        
-        if batch_rows is None:
-            if log_callback:
-                log_callback(f"    [JS] Batch {batch_num + 1} failed - falling back to element mode")
-            return None
-        
-        all_rows.extend(batch_rows)
-        
-        if log_callback and len(all_rows) % 2000 == 0:
-            log_callback(f"    [JS] Extracted {len(all_rows)}/{total_rows} rows so far...")
-    
-    if log_callback:
-        log_callback(f"    [JS] Batched extraction complete: {len(all_rows)} rows extracted")
-    
-    return all_rows
+    tenders = []
+    skipped_count = 0
+    for js_row in js_rows:
+        cells_text = js_row.get('c', []) if isinstance(js_row, dict) else []
+        href       = js_row.get('h')       if isinstance(js_row, dict) else None
+        num_cells  = len(cells_text)
+
+        if num_cells < 3:
+            if any(str(t).strip() for t in cells_text):
+                skipped_count += 1
+            continue
+
+        data = {DEPARTMENT_NAME_KEY: department_name}
+        data["S.No"]             = cells_text[0] if num_cells > 0 else "N/A"
+        data["e-Published Date"] = cells_text[1] if num_cells > 1 else "N/A"
+        data["Closing Date"]     = cells_text[2] if num_cells > 2 else "N/A"
+        data["Opening Date"]     = cells_text[3] if num_cells > 3 else "N/A"
+
+        if num_cells == 3:
+            c1, c2 = cells_text[1], cells_text[2]
+            if re.search(r'\[.*?\]', c1):
+                data[TITLE_REF_KEY]  = c1
+                data["Closing Date"] = c2
+            else:
+                data["Closing Date"] = c1
+                data[TITLE_REF_KEY]  = c2
+            data["Opening Date"]       = "N/A"
+            data["Organisation Chain"] = "N/A"
+        else:
+            data[TITLE_REF_KEY]        = cells_text[DETAILS_COL_TITLE_REF]  if DETAILS_COL_TITLE_REF  < num_cells else "N/A"
+            data["Organisation Chain"] = cells_text[DETAILS_COL_ORG_CHAIN] if DETAILS_COL_ORG_CHAIN < num_cells else "N/A"
+
+        direct_url = status_url = None
+        if href:
+            urls       = generate_tender_urls(href, base_url)
+            direct_url = urls.get('direct_url')
+            status_url = urls.get('status_url')
+
+        final_title = data.get(TITLE_REF_KEY, "") or ""
+        t_id = extract_tender_id_by_skill(final_title, portal_skill) if final_title else None
+
+        data["Tender ID (Extracted)"] = t_id
+        data["Direct URL"]            = direct_url
+        data["Status URL"]            = status_url
+        tenders.append(data)
+    return tenders, skipped_count
 
 
 def _bulk_filter_new_tenders(
@@ -728,8 +730,8 @@ def _bulk_filter_new_tenders(
     
     Args:
         js_rows: List of {c: [cell_texts], h: href} from _js_extract_table_rows
-        existing_tender_ids_normalized: Set of normalized tender IDs already in DB
-        existing_tender_snapshot: Dict mapping tender_id -> {closing_date, ...}
+        existing_tender_ids_normalized: Set (or KnownIdFilter) of normalized tender IDs already in DB
+        existing_tender_snapshot: Dict (or KnownIdFilter) mapping tender_id -> {closing_date, ...}
         portal_skill: Portal type for tender ID extraction
         log_callback: Optional logging function
         
@@ -796,7 +798,7 @@ def _bulk_filter_new_tenders(
             filtered_rows.append(row)
     
     # Log results with comprehensive metrics
-    if log_callback and isinstance(log_callback, type(lambda: None)):
+    if callable(log_callback):
         total_rows = len(js_rows)
         new_count = len(filtered_rows) - changed_closing_date_count
         if skipped_count > 0 or changed_closing_date_count > 0:
@@ -825,8 +827,17 @@ def _scrape_tender_details(
     stop_event=None,
     js_batch_threshold=300,
     js_batch_size=2000,
+    resume_point=None,
+    range_callback=None,
 ):
-    """ Scrapes tender details from the department's tender list page with enhanced retry logic for large tables."""
+    """ Scrapes tender details from the department's tender list page with enhanced retry logic for large tables.
+
+    Tables above js_batch_threshold rows are extracted in windows of js_batch_size
+    table rows. After each window range_callback(next_row, dom_rows, tenders) is
+    called with that window's new tenders, and resume_point=(next_row, dom_rows)
+    from an earlier run skips the windows already recorded, as long as the table
+    still has dom_rows rows.
+    """
     tender_data = []
     existing_tender_ids = existing_tender_ids or set()
     if existing_tender_ids_normalized is None:
@@ -838,7 +849,9 @@ def _scrape_tender_details(
     skipped_existing_count = 0
     changed_closing_date_count = 0
     existing_tender_snapshot = existing_tender_snapshot or {}
-    log_callback(f"  Scraping details for: {department_name}...")
+    log = as_scraper_log(log_callback)
+    log_callback = log
+    log(f"  Scraping details for: {department_name}...")
 
     if stop_event and stop_event.is_set():
         log_callback(f"  Stop requested before scraping rows for {department_name}.")
@@ -861,12 +874,12 @@ def _scrape_tender_details(
         try:
             # Add extra stabilization wait for large tables
             if table_attempt > 0:
-                log_callback(f"    Retry {table_attempt}/{MAX_TABLE_REFETCH_RETRIES-1} for table fetch...")
+                log.event("table", "    Retry {}/{} for table fetch...", table_attempt, MAX_TABLE_REFETCH_RETRIES - 1)
                 if not _sleep_with_stop(STABILIZE_WAIT * 1.5, stop_event=stop_event):
                     return tender_data, skipped_existing_count, changed_closing_date_count
             
             table = _wait_for_presence_with_stop(driver, DETAILS_TABLE_LOCATOR, ELEMENT_WAIT_TIMEOUT, stop_event=stop_event)
-            log_callback("    Details table located.")
+            log.event("table", "    Details table located.")
             # Reduced wait for faster processing
             if not _sleep_with_stop(STABILIZE_WAIT * 0.5, stop_event=stop_event):
                 return tender_data, skipped_existing_count, changed_closing_date_count
@@ -874,10 +887,11 @@ def _scrape_tender_details(
             try: 
                 body = table.find_element(*DETAILS_TABLE_BODY_LOCATOR)
             except NoSuchElementException: 
-                log_callback("    Details tbody not found, use table.")
+                log.event("table", "    Details tbody not found, use table.")
                 body = table
                 
             rows = body.find_elements(By.TAG_NAME, "tr")
+            dom_rows = len(rows)
             if not rows: 
                 log_callback(f"    No rows found in details table for {department_name}.")
                 return [], 0
@@ -885,23 +899,23 @@ def _scrape_tender_details(
             first_row_cells = rows[0].find_elements(By.XPATH, ".//th|.//td")
             if first_row_cells:
                 if rows[0].find_elements(By.TAG_NAME, "th"): 
-                    log_callback("    Skipping header row (<th>).")
+                    log.event("table", "    Skipping header row (<th>).")
                     rows = rows[1:]
                 elif DETAILS_TABLE_HEADER_FRAGMENTS:
                     first_row_text = " ".join(c.text.strip().lower() for c in first_row_cells)
                     matches = [f.lower() for f in DETAILS_TABLE_HEADER_FRAGMENTS if f.lower() in first_row_text]
                     if len(matches) >= 2: 
-                        log_callback(f"    Skipping header row (content match: {matches}).")
+                        log.event("table", "    Skipping header row (content match: {}).", matches)
                         rows = rows[1:]
                     else: 
-                        log_callback("    First row not matching header content.")
+                        log.event("table", "    First row not matching header content.")
                         
             if not rows: 
                 log_callback(f"    No data rows after header check for {department_name}.")
                 return [], 0
                 
             total_rows = len(rows)
-            log_callback(f"    Found {total_rows} data rows for {department_name}.")
+            log.event("table", "    Found {} data rows for {}.", total_rows, department_name)
             
             # For large tables, add progress logging every N rows
             progress_interval = 100 if total_rows > 1000 else 500
@@ -916,121 +930,116 @@ def _scrape_tender_details(
                 first_data_row_cells = rows[0].find_elements(By.TAG_NAME, "td")
                 actual_cols = len(first_data_row_cells)
                 if actual_cols < req_cols:
-                    log_callback(f"    INFO: Table has {actual_cols} columns (expected {req_cols}). Using flexible column detection.")
+                    log.event("table", "    INFO: Table has {} columns (expected {}). Using flexible column detection.", actual_cols, req_cols)
                     req_cols = min(req_cols, actual_cols)
 
             # ================================================================
-            # JS FAST PATH — batch-extract all row data in ONE browser call.
-            # For large departments (configurable threshold), extract in batches
-            # to prevent browser timeout/memory issues.
+            # JS FAST PATH — batch-extract row data with browser-side JS.
+            # Large departments (configurable threshold) are extracted, filtered
+            # and checkpointed one window of js_batch_size table rows at a time,
+            # so a restart resumes after the last completed window.
             # Falls back to element-by-element mode automatically on any failure.
             # ================================================================
-            if total_rows > js_batch_threshold:
-                # Large department - use batched extraction
-                log_callback(f"    [JS] Large department detected ({total_rows} rows > {js_batch_threshold} threshold) - using batched extraction")
-                _js_rows = _js_extract_table_rows_batched(driver, total_rows, batch_size=js_batch_size, log_callback=log_callback)
-            else:
-                # Normal department - extract all at once
-                _js_rows = _js_extract_table_rows(driver)
-            
             _use_js = False
-            if _js_rows is not None:
-                if abs(len(_js_rows) - total_rows) <= 2:   # ≤2 tolerance for edge header rows
-                    _use_js = True
-                    if total_rows >= 200:
-                        if total_rows > js_batch_threshold:
-                            log_callback(f"    [JS] Batched mode successful: {len(_js_rows)} rows extracted")
-                        else:
-                            log_callback(f"    [JS] Fast mode: {len(_js_rows)} rows batch-extracted ({total_rows} DOM rows)")
-                else:
-                    log_callback(
-                        f"    [JS] Row count mismatch (JS={len(_js_rows)}, DOM={total_rows}) "
-                        f"\u2014 using element mode"
-                    )
-
-            # ================================================================
-            # BULK DUPLICATE FILTERING (10-50x speedup for high-duplicate portals)
-            # ================================================================
-            if _use_js and existing_tender_ids_normalized:
-                # Apply bulk filtering to skip duplicates before processing
-                _js_rows, bulk_skipped, bulk_changed = _bulk_filter_new_tenders(
-                    _js_rows,
-                    existing_tender_ids_normalized,
-                    existing_tender_snapshot,
-                    portal_skill,
-                    log_callback
-                )
-                skipped_existing_count += bulk_skipped
-                changed_closing_date_count += bulk_changed
+            element_start = 0
+            if total_rows > js_batch_threshold:
+                window_size = max(1, int(js_batch_size or 2000))
+                start_row = 0
+                if resume_point:
+                    resume_row, resume_dom_rows = resume_point
+                    if resume_dom_rows == dom_rows and 0 < resume_row <= dom_rows:
+                        start_row = resume_row
+                        log_callback(f"    [RESUME] {department_name}: rows before {start_row}/{dom_rows} already checkpointed")
+                    else:
+                        log_callback(
+                            f"    [RESUME] {department_name}: table changed ({resume_dom_rows} -> {dom_rows} rows), "
+                            f"restarting department"
+                        )
+                log.event("table", "    [JS] Large department detected ({} rows > {} threshold) - extracting in windows of {}", total_rows, js_batch_threshold, window_size)
 
-            if _use_js:
-                # Process filtered rows (duplicates already removed via bulk filter)
-                for i, js_row in enumerate(_js_rows, 1):
+                _use_js = True
+                extracted_count = 0
+                for window_start in range(start_row, dom_rows, window_size):
                     if stop_event and stop_event.is_set():
-                        log_callback(f"  Stop requested at JS row {i}/{len(_js_rows)}.")
+                        log_callback(f"  Stop requested at JS row {window_start}/{dom_rows} for {department_name}.")
                         return tender_data, skipped_existing_count, changed_closing_date_count
-
-                    if total_rows > 1000 and i % progress_interval == 0:
-                        log_callback(f"    [JS] Row {i}/{len(_js_rows)} ({int(i/len(_js_rows)*100)}%)...")
-
-                    cells_text = js_row.get('c', []) if isinstance(js_row, dict) else []
-                    href       = js_row.get('h')       if isinstance(js_row, dict) else None
-                    num_cells  = len(cells_text)
-
-                    if num_cells < 3:
-                        if any(str(t).strip() for t in cells_text):
-                            skipped_count += 1
-                        continue
-
-                    # Build full data dict (no duplicate checking - already done in bulk filter)
-                    data = {DEPARTMENT_NAME_KEY: department_name}
-                    data["S.No"]             = cells_text[0] if num_cells > 0 else "N/A"
-                    data["e-Published Date"] = cells_text[1] if num_cells > 1 else "N/A"
-                    data["Closing Date"]     = cells_text[2] if num_cells > 2 else "N/A"
-                    data["Opening Date"]     = cells_text[3] if num_cells > 3 else "N/A"
-
-                    if num_cells == 3:
-                        c1, c2 = cells_text[1], cells_text[2]
-                        if re.search(r'\[.*?\]', c1):
-                            data[TITLE_REF_KEY]  = c1
-                            data["Closing Date"] = c2
-                        else:
-                            data["Closing Date"] = c1
-                            data[TITLE_REF_KEY]  = c2
-                        data["Opening Date"]       = "N/A"
-                        data["Organisation Chain"] = "N/A"
+                    window_end = min(window_start + window_size, dom_rows)
+                    window_rows = _js_extract_table_rows(driver, window_start, window_end)
+                    if window_rows is None:
+                        log_callback(f"    [JS] Window {window_start}-{window_end - 1} failed - element mode from row {window_start}")
+                        _use_js = False
+                        element_start = max(0, window_start - (dom_rows - total_rows))
+                        break
+                    extracted_count += len(window_rows)
+                    if existing_tender_ids_normalized:
+                        window_rows, bulk_skipped, bulk_changed = _bulk_filter_new_tenders(
+                            window_rows,
+                            existing_tender_ids_normalized,
+                            existing_tender_snapshot,
+                            portal_skill,
+                            log_callback
+                        )
+                        skipped_existing_count += bulk_skipped
+                        changed_closing_date_count += bulk_changed
+                    window_tenders, window_skipped = _js_rows_to_tenders(window_rows, department_name, base_url, portal_skill)
+                    skipped_count += window_skipped
+                    tender_data.extend(window_tenders)
+                    processed_count += len(window_tenders)
+                    if range_callback:
+                        range_callback(window_end, dom_rows, window_tenders)
+                    # A table refetch retry continues after this window too
+                    resume_point = (window_end, dom_rows)
+                    log.event("row_progress", "    [JS] Rows {}-{} of {}: {} new tenders", window_start, window_end - 1, dom_rows, len(window_tenders))
+                if _use_js:
+                    log.event("table", "    [JS] Windowed mode successful: {} rows extracted", extracted_count)
+            else:
+                _js_rows = _js_extract_table_rows(driver)
+                if _js_rows is not None:
+                    if abs(len(_js_rows) - total_rows) <= 2:   # ≤2 tolerance for edge header rows
+                        _use_js = True
+                        if total_rows >= 200:
+                            log.event("table", "    [JS] Fast mode: {} rows batch-extracted ({} DOM rows)", len(_js_rows), total_rows)
                     else:
-                        data[TITLE_REF_KEY]        = cells_text[DETAILS_COL_TITLE_REF]  if DETAILS_COL_TITLE_REF  < num_cells else "N/A"
-                        data["Organisation Chain"] = cells_text[DETAILS_COL_ORG_CHAIN] if DETAILS_COL_ORG_CHAIN < num_cells else "N/A"
-
-                    direct_url = status_url = None
-                    if href:
-                        urls       = generate_tender_urls(href, base_url)
-                        direct_url = urls.get('direct_url')
-                        status_url = urls.get('status_url')
+                        log_callback(
+                            f"    [JS] Row count mismatch (JS={len(_js_rows)}, DOM={total_rows}) "
+                            f"\u2014 using element mode"
+                        )
 
-                    final_title = data.get(TITLE_REF_KEY, "") or ""
-                    t_id = extract_tender_id_by_skill(final_title, portal_skill) if final_title else None
+                # ================================================================
+                # BULK DUPLICATE FILTERING (10-50x speedup for high-duplicate portals)
+                # ================================================================
+                if _use_js and existing_tender_ids_normalized:
+                    # Apply bulk filtering to skip duplicates before processing
+                    _js_rows, bulk_skipped, bulk_changed = _bulk_filter_new_tenders(
+                        _js_rows,
+                        existing_tender_ids_normalized,
+                        existing_tender_snapshot,
+                        portal_skill,
+                        log_callback
+                    )
+                    skipped_existing_count += bulk_skipped
+                    changed_closing_date_count += bulk_changed
 
-                    data["Tender ID (Extracted)"] = t_id
-                    data["Direct URL"]            = direct_url
-                    data["Status URL"]            = status_url
-                    tender_data.append(data)
-                    processed_count += 1
+                if _use_js:
+                    # Duplicates already removed via bulk filter
+                    js_tenders, js_skipped = _js_rows_to_tenders(_js_rows, department_name, base_url, portal_skill)
+                    skipped_count += js_skipped
+                    tender_data.extend(js_tenders)
+                    processed_count += len(js_tenders)
 
             # ================================================================
             # ELEMENT FALLBACK — original row-by-row Selenium extraction.
             # Runs only when JS fast path was not used.
             # ================================================================
-            _rows_for_element_loop = [] if _use_js else rows
-            for i, row in enumerate(_rows_for_element_loop, 1):
+            _rows_for_element_loop = [] if _use_js else rows[element_start:]
+            for i, row in enumerate(_rows_for_element_loop, element_start + 1):
                 if stop_event and stop_event.is_set():
                     log_callback(f"  Stop requested during row scan for {department_name} at row {i}/{total_rows}.")
                     return tender_data, skipped_existing_count, changed_closing_date_count
 
                 # Progress logging for large tables
                 if total_rows > 1000 and i % progress_interval == 0:
-                    log_callback(f"    Processing row {i}/{total_rows} ({int(i/total_rows*100)}%)...")
+                    log.event("row_progress", "    Processing row {}/{} ({}%)...", i, total_rows, int(i / total_rows * 100))
                 
                 data = {DEPARTMENT_NAME_KEY: department_name}
                 prefix = f"    Row {i}:"
@@ -1053,7 +1062,7 @@ def _scrape_tender_details(
                         if num_cells < 3:
                             if any(c.text.strip() for c in cells):
                                 if row_attempt == 0:
-                                    log_callback(f"{prefix} WARN - Skip: Only {num_cells} cells, need at least 3.")
+                                    log.event("row", "{} WARN - Skip: Only {} cells, need at least 3.", prefix, num_cells)
                                 skipped_count += 1
                             break
                         
@@ -1091,7 +1100,7 @@ def _scrape_tender_details(
                         # Not a duplicate or no tender ID found yet - proceed with full extraction
                         # Proceed with flexible extraction
                         if num_cells < req_cols and row_attempt == 0:
-                            log_callback(f"{prefix} INFO - Processing with {num_cells}/{req_cols} columns (flexible mode)")
+                            log.event("row", "{} INFO - Processing with {}/{} columns (flexible mode)", prefix, num_cells, req_cols)
                             
                         # Extract data with bounds checking
                         data["S.No"] = cells[0].text.strip() if num_cells > 0 else "N/A"
@@ -1140,18 +1149,18 @@ def _scrape_tender_details(
                                     urls = generate_tender_urls(href, base_url)
                                     direct_url = urls.get('direct_url')
                                     status_url = urls.get('status_url')
-                                    logger.debug(f"{prefix} Processed link: {direct_url}")
+                                    logger.debug("%s Processed link: %s", prefix, direct_url)
                                 else: 
-                                    logger.debug(f"{prefix} No link in title cell.")
+                                    logger.debug("%s No link in title cell.", prefix)
                                     
                                 t_id = extract_tender_id_by_skill(title_text, portal_skill)
                                 if t_id:
-                                    logger.debug(f"{prefix} Extracted ID: {t_id}")
+                                    logger.debug("%s Extracted ID: %s", prefix, t_id)
                                 else: 
-                                    logger.debug(f"{prefix} No ID pattern in title: '{title_text[:50]}...'")
+                                    logger.debug("%s No ID pattern in title: '%.50s...'", prefix, title_text)
                                     
                             except Exception as title_err: 
-                                log_callback(f"{prefix} WARN - Error processing title cell: {title_err}")
+                                log.event("row", "{} WARN - Error processing title cell: {}", prefix, title_err)
                                 if TITLE_REF_KEY not in data:
                                     data[TITLE_REF_KEY] = "Error"
 
@@ -1180,7 +1189,7 @@ def _scrape_tender_details(
                         if row_attempt < MAX_ROW_RETRIES - 1:
                             if stop_event and stop_event.is_set():
                                 return tender_data, skipped_existing_count, changed_closing_date_count
-                            log_callback(f"{prefix} WARN - Stale element, retrying ({row_attempt + 1}/{MAX_ROW_RETRIES})...")
+                            log.event("row", "{} WARN - Stale element, retrying ({}/{})...", prefix, row_attempt + 1, MAX_ROW_RETRIES)
                             if not _sleep_with_stop(0.3, stop_event=stop_event):
                                 return tender_data, skipped_existing_count, changed_closing_date_count
                             # Re-fetch the row from the table
@@ -1201,7 +1210,7 @@ def _scrape_tender_details(
                             skipped_count += 1
                             break
                     except Exception as row_err:
-                        log_callback(f"{prefix} WARN - Unexpected row error: {row_err}")
+                        log.event("row", "{} WARN - Unexpected row error: {}", prefix, row_err)
                         logger.warning(f"Error tender detail row {i}", exc_info=True)
                         skipped_count += 1
                         break
@@ -1224,9 +1233,10 @@ def _scrape_tender_details(
                 log_callback(f"  ↻ PROCESSED {changed_closing_date_count} tender(s) due to closing date change in {department_name}")
             if skipped_count > 0:
                 log_callback(f"  ⚠ Skipped {skipped_count} rows due to errors or insufficient data.")
-            log_callback("")  # Blank line for readability
-            log_callback("*" * 80)  # Department completion separator
-            log_callback("")  # Blank line
+            if not log.quiet:
+                log_callback("")  # Blank line for readability
+                log_callback("*" * 80)  # Department completion separator
+                log_callback("")  # Blank line
             
             return tender_data, skipped_existing_count, changed_closing_date_count
             
@@ -1415,69 +1425,34 @@ def _prepare_department_tasks(departments, log_callback, base_reference_url=None
     return prepared
 
 
-def _build_worker_assignments(departments, worker_count):
+def _prioritize_departments(departments, known_counts=None):
     """
-    Distribute departments across workers using smart load balancing.
-    
-    CRITICAL: Time is dominated by per-department overhead (navigation, page load)
-    NOT by tender count. Use a hybrid formula that heavily weights department count.
-    
-    Formula: estimated_time = (dept_count * FIXED_OVERHEAD) + (tender_count * PER_TENDER_TIME)
-    Where FIXED_OVERHEAD (~30s) >> PER_TENDER_TIME (~0.5s)
-    
+    Order departments for the scheduler: highest expected new-tender yield first.
+
+    Expected yield is the listed tender count minus the department's live tenders
+    already stored (scraper.scheduler.unit_priority). The sort is stable, so equal
+    departments keep the portal's listing order.
+
     Args:
         departments: List of department dictionaries with 'count_text' field
-        worker_count: Number of workers to distribute across
-        
+        known_counts: {lower-cased department name: live tender count}
+
     Returns:
-        List of department lists, one per worker
+        List of (department, priority) tuples, highest priority first
     """
-    worker_count = max(1, int(worker_count or 1))
-    if worker_count == 1:
-        return [departments or []]
-    
-    # Empirical constants based on actual performance data
-    # Per-department overhead: navigation (15s) + page load (10s) + parsing (5s) = 30s
-    DEPT_OVERHEAD_SECONDS = 30.0
-    # Per-tender scraping time: ~0.5s average
-    PER_TENDER_SECONDS = 0.5
-    
-    # Calculate realistic estimated time for each department
-    departments_with_estimates = []
+    known_counts = known_counts or {}
+    scored = []
     for dept in (departments or []):
         count_text = str(dept.get('count_text', '0')).strip()
-        tender_count = int(count_text) if count_text.isdigit() else 0
-        
-        # Hybrid formula: department overhead dominates
-        estimated_time = DEPT_OVERHEAD_SECONDS + (tender_count * PER_TENDER_SECONDS)
-        departments_with_estimates.append((dept, tender_count, estimated_time))
-    
-    # Sort by estimated time descending (largest jobs first for better balancing)
-    departments_with_estimates.sort(key=lambda x: x[2], reverse=True)
-    
-    # Initialize workers with empty lists and track their total estimated time
-    worker_times = [0.0] * worker_count
-    worker_dept_counts = [0] * worker_count
-    worker_tender_counts = [0] * worker_count
-    assignments = [[] for _ in range(worker_count)]
-    
-    # Greedy assignment: Always assign next department to least-loaded worker (by time)
-    for dept, tender_count, estimated_time in departments_with_estimates:
-        # Find worker with minimum estimated time
-        min_time_idx = worker_times.index(min(worker_times))
-        assignments[min_time_idx].append(dept)
-        worker_times[min_time_idx] += estimated_time
-        worker_dept_counts[min_time_idx] += 1
-        worker_tender_counts[min_time_idx] += tender_count
-    
-    # Log the load distribution for verification
-    logger.debug(f"Smart load balancing (time-based): Worker times = {[f'{t:.0f}s' for t in worker_times]}")
-    logger.debug(f"  Dept counts: {worker_dept_counts}, Tender counts: {worker_tender_counts}")
-    
-    return assignments
+        expected = int(count_text) if count_text.isdigit() else 0
+        known = known_counts.get(str(dept.get('name', '')).strip().lower(), 0)
+        scored.append((dept, unit_priority(expected, known, last_scraped_at=datetime.now())))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
 
 
-def _write_department_links_snapshot(portal_name, departments, assignments, log_callback):
+def _write_department_links_snapshot(portal_name, prioritized_departments, log_callback):
+    """Save the department queue (highest priority first) for debugging."""
     try:
         safe_portal = sanitise_filename(str(portal_name or "portal")) or "portal"
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1488,27 +1463,17 @@ def _write_department_links_snapshot(portal_name, departments, assignments, log_
         payload = {
             "portal": portal_name,
             "generated_at": datetime.now().isoformat(timespec="seconds"),
-            "department_count": len(departments or []),
+            "department_count": len(prioritized_departments or []),
             "departments": [
                 {
                     "s_no": str(item.get("s_no", "")).strip(),
                     "name": str(item.get("name", "")).strip(),
                     "direct_url": str(item.get("direct_url", "")).strip(),
                     "count_text": str(item.get("count_text", "")).strip(),
+                    "priority": round(priority, 2),
                 }
-                for item in (departments or [])
+                for item, priority in (prioritized_departments or [])
             ],
-            "worker_assignments": {
-                f"W{idx + 1}": [
-                    {
-                        "s_no": str(item.get("s_no", "")).strip(),
-                        "name": str(item.get("name", "")).strip(),
-                        "direct_url": str(item.get("direct_url", "")).strip(),
-                    }
-                    for item in bucket
-                ]
-                for idx, bucket in enumerate(assignments or [])
-            },
         }
 
         with open(path, "w", encoding="utf-8") as handle:
@@ -1530,7 +1495,8 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
         raise ValueError("WebDriver instance required")
 
     # Create no-op callbacks if None provided
-    log_callback = log_callback or (lambda x: None)
+    # log_mode: verbose | normal (sampled hot-loop detail) | quiet (counters + summaries)
+    log_callback = as_scraper_log(log_callback, mode=kwargs.get("log_mode") or LOG_MODE_NORMAL)
     progress_callback = progress_callback or (lambda *args: None) 
     timer_callback = timer_callback or (lambda x: None)
     status_callback = status_callback or (lambda x: None)
@@ -1556,6 +1522,15 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
             existing_tender_snapshot[normalized_id] = {
                 "closing_date": normalize_closing_date(value_dict.get("closing_date", ""))
             }
+    # existing_tender_filter: scraper.known_id_index.KnownIdFilter over the portal's
+    # stored tenders; stands in for the normalized ID set and the snapshot dict
+    existing_tender_filter = kwargs.get("existing_tender_filter")
+    if existing_tender_filter is not None:
+        existing_tender_filter.update(existing_tender_ids_normalized)
+        for normalized_id, record in existing_tender_snapshot.items():
+            existing_tender_filter[normalized_id] = record
+        existing_tender_ids_normalized = existing_tender_filter
+        existing_tender_snapshot = existing_tender_filter
     existing_department_names = {
         str(name).strip().lower()
         for name in (kwargs.get("existing_department_names") or [])
@@ -1580,7 +1555,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
     portal_name = str(base_url_config.get('Name', 'Unknown')).strip() or "Unknown"
     portal_base_url = str(base_url_config.get('BaseURL', '')).strip()
     portal_skill = resolve_portal_skill(base_url_config)
-    scope_mode = "only_new" if existing_tender_ids or existing_department_names else "all"
+    scope_mode = "only_new" if existing_tender_ids or existing_department_names or existing_tender_filter is not None else "all"
     departments_to_scrape = _prepare_department_tasks(
         departments_to_scrape,
         log_callback,
@@ -1615,25 +1590,24 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
     js_batch_size = int(kwargs.get("js_batch_size", 2000))  # Default: 2000 rows per batch
 
     # --- Checkpoint setup (resume on kill/crash) ---
-    _portal_slug = re.sub(r'[^\w]+', '_', portal_name.lower()).strip('_') or 'portal'
+    # Append-only journal: one fsynced line per completed department
     _checkpoint_dir = os.path.join(os.path.dirname(os.path.abspath(sqlite_db_path or 'data')), 'checkpoints')
-    _checkpoint_path = os.path.join(_checkpoint_dir, f'{_portal_slug}_checkpoint.json')
     _ckpt_stop_event = threading.Event()
     _ckpt_thread = None
     try:
         os.makedirs(_checkpoint_dir, exist_ok=True)
+        _journal = CheckpointJournal(_checkpoint_dir, portal_name)
     except Exception:
-        _checkpoint_path = None
+        _journal = None
 
-    # Load existing checkpoint if it exists (auto-resume after kill)
-    if _checkpoint_path and os.path.exists(_checkpoint_path):
+    # Replay an existing journal (auto-resume after kill)
+    if _journal and _journal.exists():
         try:
-            with open(_checkpoint_path, 'r', encoding='utf-8') as _f:
-                _ckpt = json.load(_f)
-            if _ckpt.get('portal_name', '').lower() == portal_name.lower():
-                _ckpt_tenders = _ckpt.get('tenders', [])
-                _ckpt_depts = set(_ckpt.get('processed_departments', []))
-                if _ckpt_tenders:
+            _ckpt_tenders, _ckpt_depts = _journal.replay()
+            if _journal.torn_lines:
+                log_callback(f"[CHECKPOINT] Ignored {_journal.torn_lines} incomplete journal line(s) from an interrupted write")
+            if not _journal.stale:
+                if _ckpt_tenders or _ckpt_depts:
                     all_tender_details.extend(_ckpt_tenders)
                     total_tenders = len(all_tender_details)
                     existing_department_names.update(_ckpt_depts)
@@ -1648,10 +1622,22 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                         f"[CHECKPOINT] Resumed: loaded {len(_ckpt_tenders)} tenders, "
                         f"{len(_ckpt_depts)} departments already done from previous run"
                     )
+                    if _journal.resume_rows:
+                        log_callback(
+                            f"[CHECKPOINT] {len(_journal.resume_rows)} large department(s) resume "
+                            f"after their last completed row window"
+                        )
             else:
+                _journal.discard()
                 log_callback(f"[CHECKPOINT] Stale checkpoint (portal mismatch) — ignored")
         except Exception as _ckpt_load_err:
             log_callback(f"[CHECKPOINT] Could not load checkpoint: {_ckpt_load_err}")
+    if _journal:
+        try:
+            _journal.open(start_time.isoformat())
+        except Exception as _ckpt_open_err:
+            log_callback(f"[CHECKPOINT] Journal unavailable, resume disabled for this run: {_ckpt_open_err}")
+            _journal = None
 
     data_store = None
     sqlite_run_id = None
@@ -1799,6 +1785,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 log_callback(f"[PERSIST] File export skipped ({export_reason})")
                 return None, None
 
+            import pandas as pd
             df = pd.DataFrame(prepared_rows)
             if DEPARTMENT_NAME_KEY in df.columns:
                 df = df.sort_values(DEPARTMENT_NAME_KEY)
@@ -1883,6 +1870,8 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
         if not _sleep_with_stop(STABILIZE_WAIT, stop_event=stop_event):
             status_callback("Scraping stopped by user")
             timer_callback(start_time)
+            if _journal:
+                _journal.close()
             return {
                 "status": "Scraping stopped by user",
                 "processed_departments": 0,
@@ -1904,34 +1893,39 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 "partial_saved": False,
             }
 
+        # --- Global scheduler: priority order, per-host caps, browser budget ---
+        scheduler = get_scheduler()
+        known_dept_counts = {}
+        if data_store is not None:
+            try:
+                known_dept_counts = data_store.get_live_department_counts(portal_name)
+            except Exception as yield_err:
+                log_callback(f"[SCHEDULER] Department yield lookup failed: {yield_err}")
+        prioritized_departments = _prioritize_departments(departments_to_scrape, known_dept_counts)
+        departments_to_scrape = [dept for dept, _priority in prioritized_departments]
+        log_callback(
+            f"[SCHEDULER] Departments ordered by expected new tenders | "
+            f"browser budget={scheduler.browser_budget or 'unlimited'}, "
+            f"per-host limit={scheduler.per_host_limit or 'unlimited'}"
+        )
+
         total_depts = len(departments_to_scrape)
         log_callback(f"Starting to process {total_depts} departments...")
         state_lock = threading.Lock()
         dept_queue = Queue()
 
-        # Start background checkpoint saver — writes every 2 minutes
+        # Resume data goes to the journal per department (_checkpoint_department);
+        # this loop only mirrors progress into the database every 2 minutes
         def _checkpoint_saver_loop():
             while not _ckpt_stop_event.wait(120):  # wake every 120s or on stop
-                if not _checkpoint_path:
-                    continue
                 try:
                     with state_lock:
                         _snap_tenders = list(all_tender_details)
-                        _snap_depts = list(processed_department_names)
                         _snap_total = total_tenders
                         _snap_skipped = skipped_existing_total
                     
-                    # Save to JSON checkpoint file (for resume capability)
-                    with open(_checkpoint_path, 'w', encoding='utf-8') as _cf:
-                        json.dump({
-                            'portal_name': portal_name,
-                            'run_started_at': start_time.isoformat(),
-                            'tenders': _snap_tenders,
-                            'processed_departments': _snap_depts,
-                        }, _cf)
-                    
-                    # Also save to database (for data persistence)
-                    if data_store is not None and sqlite_run_id is not None and _snap_tenders:
+                    # Save to database (for data persistence)
+                    if _snap_tenders:
                         try:
                             # Prepare rows same as in _save_tender_data_snapshot
                             prepared_rows = []
@@ -1972,33 +1966,40 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                             
                             log_callback(
                                 f"[CHECKPOINT] DB saved {saved_rows} tenders "
-                                f"(extracted={_extracted}, skipped={_snap_skipped}, total={_snap_total}) | "
-                                f"JSON: {os.path.basename(_checkpoint_path)}"
+                                f"(extracted={_extracted}, skipped={_snap_skipped}, total={_snap_total})"
                             )
                         except Exception as db_err:
                             log_callback(f"[CHECKPOINT] Database save failed: {db_err}")
-                            log_callback(
-                                f"[CHECKPOINT] JSON saved {len(_snap_tenders)} tenders "
-                                f"({len(_snap_depts)} depts) → {os.path.basename(_checkpoint_path)}"
-                            )
-                    else:
-                        log_callback(
-                            f"[CHECKPOINT] Auto-saved {len(_snap_tenders)} tenders "
-                            f"({len(_snap_depts)} depts) → {os.path.basename(_checkpoint_path)}"
-                        )
                 except Exception as _ce:
                     log_callback(f"[CHECKPOINT] Save failed: {_ce}")
 
-        if _checkpoint_path:
+        def _checkpoint_department(dept_name_norm, tender_data):
+            # A stopped department may be partial: leave it for the next run
+            if not _journal or not dept_name_norm or (stop_event and stop_event.is_set()):
+                return
+            try:
+                _journal.append_department(dept_name_norm, tender_data)
+            except Exception as _je:
+                log_callback(f"[CHECKPOINT] Journal write failed for {dept_name_norm}: {_je}")
+
+        def _checkpoint_range(dept_name_norm, next_row, dom_rows, tenders):
+            # Windows are complete when reported, so they are kept even on stop
+            if not _journal or not dept_name_norm:
+                return
+            try:
+                _journal.append_range(dept_name_norm, next_row, dom_rows, tenders)
+            except Exception as _je:
+                log_callback(f"[CHECKPOINT] Journal write failed for {dept_name_norm} rows <{next_row}: {_je}")
+
+        if _journal:
+            log_callback(f"[CHECKPOINT] Journaling each completed department → {_journal.name}")
+        if data_store is not None and sqlite_run_id is not None:
             _ckpt_thread = threading.Thread(target=_checkpoint_saver_loop, name="ckpt-saver", daemon=True)
             _ckpt_thread.start()
-            log_callback(f"[CHECKPOINT] Background saver started (every 2 min) → {os.path.basename(_checkpoint_path)}")
+            log_callback("[CHECKPOINT] Background DB saver started (every 2 min)")
 
         def _process_department_with_driver(active_driver, dept_info, worker_label="W1"):
-            nonlocal processed_depts, total_tenders, skipped_existing_total, closing_date_reprocessed_total
-            nonlocal skipped_resume_departments, direct_nav_attempted, direct_nav_success
-            nonlocal direct_nav_fallback_click, click_only_success
-            nonlocal total_nav_time, total_scrape_time, total_dept_processing_time
+            nonlocal processed_depts, skipped_resume_departments
 
             if stop_event and stop_event.is_set():
                 return
@@ -2027,23 +2028,14 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 log_callback(f"[{worker_label}] SKIP: Department name '{dept_name}' appears to be a header")
                 return
 
-            # Check for abnormally large departments (safety limit)
+            # Very large departments are scraped in resumable row windows
+            # (js_batch_size rows each, journaled as they complete)
             dept_count_text = str(dept_info.get('count_text', '')).strip()
-            if dept_count_text.isdigit():
-                dept_tender_count = int(dept_count_text)
-                MAX_DEPT_SIZE = 15000  # Safety limit (increased for West Bengal Zila Parishad = 13k)
-                if dept_tender_count > MAX_DEPT_SIZE:
-                    log_callback(f"[{worker_label}] ⚠️  WARNING: Department '{dept_name}' has {dept_tender_count:,} tenders (exceeds limit of {MAX_DEPT_SIZE:,})")
-                    log_callback(f"[{worker_label}] SKIP: Skipping this department to prevent memory/freeze issues")
-                    log_callback(f"[{worker_label}] SUGGESTION: Process this department separately or increase MAX_DEPT_SIZE in code")
-                    with state_lock:
-                        department_summaries.append({
-                            "department": dept_name,
-                            "expected": dept_tender_count,
-                            "scraped": 0,
-                            "skip_reason": f"Exceeds size limit ({dept_tender_count:,} > {MAX_DEPT_SIZE:,})"
-                        })
-                    return
+            if dept_count_text.isdigit() and int(dept_count_text) > LARGE_DEPT_SIZE:
+                log_callback(
+                    f"[{worker_label}] Large department '{dept_name}': {int(dept_count_text):,} tenders, "
+                    f"processing in windows of {js_batch_size:,} rows"
+                )
 
             with state_lock:
                 processed_depts += 1
@@ -2052,13 +2044,16 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 current_total_tenders = total_tenders
 
             dept_start_time = time.time()
-            log_callback("")
-            log_callback("**************")
+            if not log_callback.quiet:
+                log_callback("")
+                log_callback("**************")
             log_callback(f"[{worker_label}] Processing department {current_processed}/{total_depts}: {dept_name}")
-            log_callback("**************")
+            if not log_callback.quiet:
+                log_callback("**************")
             
-            # Send non-blocking log message
-            send_log(worker_label, f"Processing department {current_processed}/{total_depts}: {dept_name}")
+            # Send non-blocking log message (progress below carries the same numbers)
+            if log_callback.enabled("ui_queue"):
+                send_log(worker_label, f"Processing department {current_processed}/{total_depts}: {dept_name}")
             
             if progress_callback:
                 progress_details = (
@@ -2084,11 +2079,34 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
 
             try:
                 current_url = active_driver.current_url
-                log_callback(f"[{worker_label}] Current URL before processing: {current_url}")
+                log_callback.event("dept_step", "[{}] Current URL before processing: {}", worker_label, current_url)
             except Exception as session_err:
                 log_callback(f"[{worker_label}] Driver session lost before dept {dept_name}: {session_err}")
                 return
 
+            host_lease = scheduler.host(
+                portal_base_url or base_url_config.get('OrgListURL') or '',
+                stop_event=stop_event,
+                on_wait=lambda _pool, limit: log_callback.event(
+                    "dept_step", "[{}] Waiting for a host slot (per-host limit {})...", worker_label, limit
+                ),
+            )
+            if host_lease is None:
+                return
+            # Navigation, table scrape and the way back all count against the host cap
+            with host_lease:
+                _open_and_scrape_department(
+                    active_driver, dept_info, worker_label, dept_name, dept_name_norm,
+                    dept_start_time, current_processed, pending_depts
+                )
+
+        def _open_and_scrape_department(active_driver, dept_info, worker_label, dept_name, dept_name_norm,
+                                        dept_start_time, current_processed, pending_depts):
+            nonlocal total_tenders, skipped_existing_total, closing_date_reprocessed_total
+            nonlocal direct_nav_attempted, direct_nav_success
+            nonlocal direct_nav_fallback_click, click_only_success
+            nonlocal total_nav_time, total_scrape_time, total_dept_processing_time
+
             has_direct_url = bool(str(dept_info.get('direct_url', '')).strip())
             if has_direct_url:
                 with state_lock:
@@ -2103,10 +2121,10 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
             )
             nav_time = time.time() - nav_start_time
             if not opened_dept:
-                log_callback(f"[{worker_label}] ⏱️ Navigation time: {nav_time:.2f}s (failed)")
+                log_callback.event("dept_step", "[{}] ⏱️ Navigation time: {:.2f}s (failed)", worker_label, nav_time)
                 return
 
-            log_callback(f"[{worker_label}] ⏱️ Navigation time: {nav_time:.2f}s")
+            log_callback.event("dept_step", "[{}] ⏱️ Navigation time: {:.2f}s", worker_label, nav_time)
             
             with state_lock:
                 if nav_mode == "direct":
@@ -2138,10 +2156,12 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 portal_skill=portal_skill,
                 stop_event=stop_event,
                 js_batch_threshold=js_batch_threshold,
-                js_batch_size=js_batch_size
+                js_batch_size=js_batch_size,
+                resume_point=_journal.resume_rows.get(dept_name_norm) if _journal else None,
+                range_callback=lambda next_row, dom_rows, tenders: _checkpoint_range(dept_name_norm, next_row, dom_rows, tenders),
             )
             scrape_time = time.time() - scrape_start_time
-            log_callback(f"[{worker_label}] ⏱️ Table scraping time: {scrape_time:.2f}s")
+            log_callback.event("dept_step", "[{}] ⏱️ Table scraping time: {:.2f}s", worker_label, scrape_time)
 
             expected_for_dept = int(str(dept_info.get('count_text', '0')).strip()) if str(dept_info.get('count_text', '')).strip().isdigit() else None
             with state_lock:
@@ -2149,6 +2169,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 closing_date_reprocessed_total += changed_closing_date_count
                 if dept_name_norm:
                     processed_department_names.add(dept_name_norm)
+            _checkpoint_department(dept_name_norm, tender_data)
 
             if tender_data:
                 dept_tender_count = len(tender_data)
@@ -2192,11 +2213,17 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                     total_dept_processing_time += dept_total_time
                 
                 log_callback(f"[{worker_label}] Found {dept_tender_count} tenders in department {dept_name}")
-                log_callback(f"[{worker_label}] ⏱️ Total department time: {dept_total_time:.2f}s (Nav: {nav_time:.2f}s, Scrape: {scrape_time:.2f}s)")
+                log_callback.event(
+                    "dept_step", "[{}] ⏱️ Total department time: {:.2f}s (Nav: {:.2f}s, Scrape: {:.2f}s)",
+                    worker_label, dept_total_time, nav_time, scrape_time
+                )
                 if skipped_existing > 0:
-                    log_callback(f"[{worker_label}] ⏭️  Skipped {skipped_existing} duplicates in {dept_name}")
+                    log_callback.event("dept_step", "[{}] ⏭️  Skipped {} duplicates in {}", worker_label, skipped_existing, dept_name)
                 if changed_closing_date_count > 0:
-                    log_callback(f"[{worker_label}] ↻ Reprocessed {changed_closing_date_count} due to closing date changes in {dept_name}")
+                    log_callback.event(
+                        "dept_step", "[{}] ↻ Reprocessed {} due to closing date changes in {}",
+                        worker_label, changed_closing_date_count, dept_name
+                    )
 
                 if progress_callback:
                     progress_details = (
@@ -2240,10 +2267,10 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 dept_info['tenders_found'] = 0
                 dept_total_time = time.time() - dept_start_time
                 log_callback(f"[{worker_label}] No tenders found/extracted from department {dept_name}")
-                log_callback(f"[{worker_label}] ⏱️ Department processing time: {dept_total_time:.2f}s")
+                log_callback.event("dept_step", "[{}] ⏱️ Department processing time: {:.2f}s", worker_label, dept_total_time)
 
             if nav_mode == "direct":
-                log_callback(f"[{worker_label}] Direct navigation mode: skipping return-to-org and proceeding to next department")
+                log_callback.event("dept_step", "[{}] Direct navigation mode: skipping return-to-org and proceeding to next department", worker_label)
                 return
 
             try:
@@ -2275,23 +2302,28 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
 
         if department_parallel_workers > 1 and total_depts > 1:
             active_workers = min(department_parallel_workers, total_depts)
+            if scheduler.per_host_limit > 0:
+                # More workers than host slots would only hold idle browsers
+                active_workers = min(active_workers, scheduler.per_host_limit)
             if active_workers < department_parallel_workers:
                 log_callback(
-                    f"Department worker cap applied: requested={department_parallel_workers}, active={active_workers}, departments={total_depts}"
+                    f"Department worker cap applied: requested={department_parallel_workers}, active={active_workers}, "
+                    f"departments={total_depts}, per-host limit={scheduler.per_host_limit or 'unlimited'}"
                 )
             log_callback(f"Department parallel mode enabled: workers={active_workers} (instance-based for true parallelism)")
 
-            worker_assignments = _build_worker_assignments(departments_to_scrape, active_workers)
-            _write_department_links_snapshot(portal_name, departments_to_scrape, worker_assignments, log_callback)
+            # Workers pull the next highest-priority department from one shared queue
+            department_queue = WorkQueue(prioritized_departments)
+            _write_department_links_snapshot(portal_name, prioritized_departments, log_callback)
             
-            # Show load balancing distribution with time estimates
-            log_callback("📊 Smart Load Balancing - Worker Assignments (Time-Based):")
             DEPT_OVERHEAD = 30.0  # seconds per department
             PER_TENDER = 0.5      # seconds per tender
-            for idx, bucket in enumerate(worker_assignments, 1):
-                total_tenders = sum(int(dept.get('count_text', '0') or '0') for dept in bucket)
-                estimated_time = (len(bucket) * DEPT_OVERHEAD) + (total_tenders * PER_TENDER)
-                log_callback(f"   W{idx}: {len(bucket)} depts, ~{total_tenders} tenders, est. {estimated_time/60:.1f} min")
+            queued_tenders = sum(int(dept.get('count_text', '0') or '0') for dept in departments_to_scrape if str(dept.get('count_text', '')).strip().isdigit())
+            estimated_time = (total_depts * DEPT_OVERHEAD + queued_tenders * PER_TENDER) / active_workers
+            log_callback(
+                f"📊 Priority queue: {total_depts} depts, ~{queued_tenders} tenders, "
+                f"{active_workers} workers, est. {estimated_time/60:.1f} min"
+            )
 
             # Close the initial driver since we'll create separate instances for each worker
             log_callback("Closing initial browser instance (will create separate instances per worker)...")
@@ -2319,7 +2351,12 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                         worker_org_url = str(base_url_config.get('OrgListURL') or base_url_config.get('BaseURL') or '').strip()
                         for prime_attempt in range(2):
                             if worker_driver is None:
-                                worker_driver = setup_driver(initial_download_dir=download_dir)
+                                # W1 waits for a browser slot; extra workers give up sooner
+                                worker_driver = setup_driver(
+                                    initial_download_dir=download_dir,
+                                    stop_event=stop_event,
+                                    lease_timeout=None if worker_idx == 0 else WORKER_BROWSER_LEASE_TIMEOUT,
+                                )
 
                             if not worker_org_url:
                                 break
@@ -2385,12 +2422,10 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 actual_workers = len(worker_drivers)
                 log_callback(f"✓ {actual_workers} browser instances initialized in {browser_init_time:.2f}s (parallel startup)")
                 
-                # Adjust active_workers if some browsers failed
+                # Adjust active_workers if some browsers failed (the shared queue needs no re-balancing)
                 if actual_workers < active_workers:
                     log_callback(f"⚠️  Reduced worker count from {active_workers} to {actual_workers} due to initialization failures")
                     active_workers = actual_workers
-                    # Re-balance work assignments
-                    worker_assignments = _build_worker_assignments(departments_to_scrape, active_workers)
                 
             except Exception as driver_err:
                 log_callback(f"ERROR: Could not create worker browser instances: {driver_err}")
@@ -2415,19 +2450,22 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                     _process_department_with_driver(driver, dept_info, "W1")
                 return _prepare_summary()
 
-            def _worker_loop(worker_index, label, assigned_departments, worker_driver):
-                """Worker loop with dedicated browser instance for true parallelism."""
+            def _worker_loop(worker_index, label, worker_driver):
+                """Worker loop with dedicated browser instance, pulling from the shared priority queue."""
                 # Register this worker with message queue
                 register_worker(label)
                 log_callback(f"[{label}] Worker registered with dedicated browser instance")
                 
                 worker_success = True
                 departments_completed = 0
+                departments_taken = 0
                 
                 try:
-                    for dept_task in assigned_departments or []:
-                        if stop_event and stop_event.is_set():
+                    while not (stop_event and stop_event.is_set()):
+                        dept_task = department_queue.pop()
+                        if dept_task is None:
                             break
+                        departments_taken += 1
                         
                         # Process with dedicated driver (no locks, true parallel execution)
                         try:
@@ -2441,7 +2479,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                             # Continue with next department even if one fails
                     
                     # Worker completed all departments
-                    log_callback(f"[{label}] Worker completed {departments_completed}/{len(assigned_departments or [])} departments")
+                    log_callback(f"[{label}] Worker completed {departments_completed}/{departments_taken} departments")
                     send_complete(label, {"departments": departments_completed})
                     
                 except Exception as worker_critical_err:
@@ -2464,7 +2502,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                         "worker_id": label,
                         "success": worker_success,
                         "departments_completed": departments_completed,
-                        "departments_assigned": len(assigned_departments or [])
+                        "departments_assigned": departments_taken
                     }
 
             # Track worker results for error isolation
@@ -2473,7 +2511,7 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
             try:
                 with concurrent.futures.ThreadPoolExecutor(max_workers=active_workers) as executor:
                     futures = [
-                        executor.submit(_worker_loop, idx, f"W{idx + 1}", worker_assignments[idx], worker_drivers[idx])
+                        executor.submit(_worker_loop, idx, f"W{idx + 1}", worker_drivers[idx])
                         for idx in range(active_workers)
                     ]
                     for fut in concurrent.futures.as_completed(futures):
@@ -2664,6 +2702,9 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
                 total_processed = total_tenders + skipped_existing_total
                 total_per_minute = (total_processed / total_elapsed_time) * 60
                 log_callback(f"   Total Processed: {total_per_minute:.1f} per minute (incl. duplicates)")
+
+        # Detail lines held back by log_mode sampling
+        log_callback.emit_summary()
         
         log_callback("")
         log_callback("=" * 80)
@@ -2704,10 +2745,10 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
         _ckpt_stop_event.set()
         if _ckpt_thread and _ckpt_thread.is_alive():
             _ckpt_thread.join(timeout=5)
-        if _checkpoint_path and os.path.exists(_checkpoint_path):
+        if _journal:
             try:
-                os.remove(_checkpoint_path)
-                log_callback(f"[CHECKPOINT] Deleted on successful completion")
+                if _journal.discard():
+                    log_callback(f"[CHECKPOINT] Deleted on successful completion")
             except Exception:
                 pass
 
@@ -2772,16 +2813,11 @@ def run_scraping_logic(departments_to_scrape, base_url_config, download_dir,
         _ckpt_stop_event.set()
         if _ckpt_thread and _ckpt_thread.is_alive():
             _ckpt_thread.join(timeout=3)
-        if _checkpoint_path and all_tender_details:
+        if _journal:
+            # Every finished department is already journaled; fold it into one line for a fast replay
             try:
-                with open(_checkpoint_path, 'w', encoding='utf-8') as _cf:
-                    json.dump({
-                        'portal_name': portal_name,
-                        'run_started_at': start_time.isoformat(),
-                        'tenders': list(all_tender_details),
-                        'processed_departments': list(processed_department_names),
-                    }, _cf)
-                log_callback(f"[CHECKPOINT] Final save on error: {len(all_tender_details)} tenders kept for resume")
+                kept = _journal.compact(start_time.isoformat())
+                log_callback(f"[CHECKPOINT] Journal compacted on error: {kept} tenders kept for resume")
             except Exception:
                 pass
 
@@ -3042,7 +3078,9 @@ def _find_and_trigger_downloads(driver, identifier, target_subfolder, log_callba
             captcha_handled = True  # Mark as handled to proceed
         else:
             log_callback(f"    🔐 Checking for CAPTCHA requirements for '{identifier}'...")
-            captcha_handled = handle_captcha(driver, identifier, log_callback, status_callback, stop_event)
+            from scraper.captcha_handler import handle_captcha  # Tk dialog, loaded on first CAPTCHA
+            with _CAPTCHA_PROMPT_LOCK:
+                captcha_handled = handle_captcha(driver, identifier, log_callback, status_callback, stop_event)
 
         # Check if user cancelled via stop_event
         if stop_event.is_set():
@@ -3220,14 +3258,77 @@ def _perform_tender_processing(driver, identifier, base_download_dir, log_callba
     return True
 
 
+def _lookup_stored_tender_urls(tender_ids, base_url_config, sqlite_db_path, log_callback):
+    """{normalized tender ID: stored direct URL} for IDs already in the tenders table."""
+    if not sqlite_db_path or not os.path.exists(sqlite_db_path):
+        return {}
+    try:
+        portal_keys = portal_name_candidates(base_url_config.get('Name'), base_url_config)
+        return TenderDataStore(sqlite_db_path).get_direct_urls_for_tender_ids(tender_ids, portal_keys)
+    except Exception as lookup_err:
+        log_callback(f"Stored tender URL lookup failed, searching every ID: {lookup_err}")
+        return {}
+
+
+def _wait_for_tender_page(driver, timeout):
+    WebDriverWait(driver, timeout).until(EC.any_of(
+        EC.presence_of_element_located(TENDER_ID_ON_PAGE_LOCATOR),
+        EC.presence_of_element_located(TENDER_TITLE_LOCATOR),
+    ))
+
+
+def _open_stored_tender_url(driver, tender_id, direct_url):
+    """Open a stored tender link; True if the page shows tender_id (links can expire with the portal session)."""
+    try:
+        driver.get(direct_url)
+        _wait_for_tender_page(driver, ELEMENT_WAIT_TIMEOUT)
+        shown_id = safe_extract_text(driver, TENDER_ID_ON_PAGE_LOCATOR, "Tender ID", quick_mode=True)
+        return normalize_tender_id(shown_id) == normalize_tender_id(tender_id)
+    except (TimeoutException, WebDriverException):
+        return False
+
+
+def _open_tender_via_search(driver, tender_id, base_url):
+    """Search the portal for tender_id and open the first result. Raises TimeoutException if nothing is found."""
+    driver.get(base_url)
+    id_input = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+        EC.presence_of_element_located(BASE_PAGE_TENDER_ID_INPUT_LOCATOR)
+    )
+    id_input.clear()
+    id_input.send_keys(tender_id)
+
+    search_button = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+        EC.element_to_be_clickable(BASE_PAGE_SEARCH_BUTTON_LOCATOR)
+    )
+    search_button.click()
+    # Wait for the results page itself instead of fixed stabilize sleeps
+    try:
+        WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(EC.staleness_of(search_button))
+    except TimeoutException:
+        pass
+    results_table = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+        EC.presence_of_element_located(SEARCH_RESULTS_TABLE_LOCATOR)
+    )
+    tender_link = results_table.find_element(By.XPATH, SEARCH_RESULT_TITLE_LINK_XPATH)
+    tender_link.click()
+    _wait_for_tender_page(driver, ELEMENT_WAIT_TIMEOUT)
+
+
 def search_and_download_tenders(tender_ids, base_url_config, download_dir, driver,
                               log_callback=None, progress_callback=None,
                               timer_callback=None, status_callback=None,
                               stop_event=None, deep_scrape=False, **kwargs):
-    """Search and process tenders by ID."""
+    """
+    Search and process tenders by ID.
+
+    IDs already stored in the tenders table (sqlite_db_path) are opened from
+    their stored direct URL; the rest, and stored links that no longer open,
+    go through the portal search. With id_search_workers > 1 extra browsers
+    take IDs from a shared queue; every ID holds a host slot of the global
+    scheduler while its page is open. Results are merged in input order.
+    """
     from config import EXCEL_ID_SEARCH_FILENAME_FORMAT
     
-    all_tender_details = []  # List to store all tender details
     if not driver:
         raise ValueError("WebDriver instance required")
 
@@ -3236,121 +3337,200 @@ def search_and_download_tenders(tender_ids, base_url_config, download_dir, drive
     progress_callback = progress_callback or (lambda *args: None)
     timer_callback = timer_callback or (lambda x: None)
     status_callback = status_callback or (lambda x: None)
+    stop_event = stop_event or threading.Event()
+    dl_more_details = kwargs.get('dl_more_details', True)
+    dl_zip = kwargs.get('dl_zip', True)
+    dl_notice_pdfs = kwargs.get('dl_notice_pdfs', True)
     
     start_time = datetime.now()
+    portal_label = base_url_config.get('Name', 'Unknown')
+    base_url = base_url_config['BaseURL']
+    results = {}  # search index -> details row
+    summary = {"total": len(tender_ids), "found": 0, "not_found": 0, "errors": 0, "via_stored_url": 0, "excel_path": None}
 
     try:
         total_tenders = len(tender_ids)
         portal_skill = resolve_portal_skill(base_url_config)
         log_callback(f"Processing {total_tenders} tender IDs...")
 
-        for idx, tender_id in enumerate(tender_ids, 1):
-            if stop_event and stop_event.is_set():
-                break
+        stored_urls = _lookup_stored_tender_urls(tender_ids, base_url_config, kwargs.get('sqlite_db_path'), log_callback)
+        if stored_urls:
+            log_callback(f"{len(stored_urls)} of {total_tenders} IDs have a stored tender URL; opening those directly")
 
-            try:
-                log_callback(f"Searching for tender ID: {tender_id} ({idx}/{total_tenders})")
-                
-                # Check driver session
-                try:
-                    driver.current_url
-                except Exception as session_err:
-                    log_callback(f"Driver session lost for {tender_id}: {session_err}")
-                    continue
-
-                # Navigate to base URL
-                driver.get(base_url_config['BaseURL'])
-                time.sleep(STABILIZE_WAIT)
+        # Stored links first: they are quick and give early results
+        work = WorkQueue(
+            ((idx, tender_id, stored_urls.get(normalize_tender_id(tender_id), '')),
+             1 if normalize_tender_id(tender_id) in stored_urls else 0)
+            for idx, tender_id in enumerate(tender_ids, 1)
+        )
 
-                # Find and fill tender ID input
-                id_input = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                    EC.presence_of_element_located(BASE_PAGE_TENDER_ID_INPUT_LOCATOR)
-                )
-                id_input.clear()
-                id_input.send_keys(tender_id)
+        scheduler = get_scheduler()
+        try:
+            requested_workers = max(1, min(5, int(kwargs.get('id_search_workers') or 1)))
+        except (TypeError, ValueError):
+            requested_workers = 1
+        active_workers = min(requested_workers, max(1, total_tenders))
+        if scheduler.per_host_limit > 0:
+            active_workers = min(active_workers, scheduler.per_host_limit)
+        if active_workers > 1:
+            log_callback(f"Searching with {active_workers} browsers (requested {requested_workers}, per-host limit {scheduler.per_host_limit or 'unlimited'})")
 
-                # Click search button
-                search_button = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                    EC.element_to_be_clickable(BASE_PAGE_SEARCH_BUTTON_LOCATOR)
-                )
-                search_button.click()
-                time.sleep(STABILIZE_WAIT)
+        state_lock = threading.Lock()
+        completed = [0]
 
-                # Handle search results
+        def _record(idx, row):
+            with state_lock:
+                results[idx] = row
+                completed[0] += 1
+                done = completed[0]
+            progress_callback(done, total_tenders, f"Tender IDs: {done}/{total_tenders}")
+
+        def _process_id(active_driver, label, idx, tender_id, direct_url):
+            log_callback(f"[{label}] Searching for tender ID: {tender_id} ({idx}/{total_tenders})")
+            host_lease = scheduler.host(base_url, stop_event=stop_event)
+            if host_lease is None:
+                return False
+            with host_lease:
+                opened_directly = bool(direct_url) and _open_stored_tender_url(active_driver, tender_id, direct_url)
+                if direct_url and not opened_directly:
+                    log_callback(f"[{label}] Stored link for {tender_id} did not open the tender; searching instead")
                 try:
-                    results_table = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                        EC.presence_of_element_located(SEARCH_RESULTS_TABLE_LOCATOR)
-                    )
-                    # Find and click tender link
-                    tender_link = results_table.find_element(By.XPATH, SEARCH_RESULT_TITLE_LINK_XPATH)
-                    tender_link.click()
-                    time.sleep(STABILIZE_WAIT)
-
-                    # Process the tender details page and collect details
-                    details = extract_tender_details(driver, deep_scrape=deep_scrape)
-                    details[SEARCH_ID_KEY] = tender_id  # Add search ID to details
-                    details[SEARCH_INDEX_KEY] = idx
-                    details['Portal'] = base_url_config.get('Name', 'Unknown')
-                    all_tender_details.append(details)
-                    
-                    _perform_tender_processing(
-                        driver=driver,
-                        identifier=tender_id,
-                        base_download_dir=download_dir,
-                        log_callback=log_callback,
-                        status_callback=status_callback,
-                        stop_event=stop_event,
-                        dl_more_details=True,
-                        dl_zip=True,
-                        dl_notice_pdfs=True,
-                        portal_skill=portal_skill
-                    )
-
-                except TimeoutException:
+                    if not opened_directly:
+                        _open_tender_via_search(active_driver, tender_id, base_url)
+                except (TimeoutException, NoSuchElementException):
                     log_callback(f"No results found for tender ID: {tender_id}")
-                    all_tender_details.append({
+                    _record(idx, {
                         SEARCH_ID_KEY: tender_id,
                         SEARCH_INDEX_KEY: idx,
-                        'Portal': base_url_config.get('Name', 'Unknown'),
+                        'Portal': portal_label,
                         TENDER_ID_KEY: 'N/A',
                         'Title': 'No results found',
                         'Status': 'Not Found'
                     })
-                    continue
+                    with state_lock:
+                        summary["not_found"] += 1
+                    return True
 
-                if progress_callback:
-                    progress_callback(idx, idx, total_tenders, None)
+                # Process the tender details page and collect details
+                details = extract_tender_details(active_driver, deep_scrape=deep_scrape)
+                details[SEARCH_ID_KEY] = tender_id  # Add search ID to details
+                details[SEARCH_INDEX_KEY] = idx
+                details['Portal'] = portal_label
 
-            except Exception as e:
-                log_callback(f"Error processing tender ID {tender_id}: {e}")
-                all_tender_details.append({
+                _perform_tender_processing(
+                    driver=active_driver,
+                    identifier=tender_id,
+                    base_download_dir=download_dir,
+                    log_callback=log_callback,
+                    status_callback=status_callback,
+                    stop_event=stop_event,
+                    dl_more_details=dl_more_details,
+                    dl_zip=dl_zip,
+                    dl_notice_pdfs=dl_notice_pdfs,
+                    portal_skill=portal_skill
+                )
+            _record(idx, details)
+            with state_lock:
+                summary["found"] += 1
+                summary["via_stored_url"] += int(opened_directly)
+            return True
+
+        def _worker_loop(worker_index):
+            label = f"W{worker_index + 1}"
+            active_driver = driver
+            if worker_index > 0:
+                try:
+                    active_driver = setup_driver(
+                        initial_download_dir=download_dir,
+                        stop_event=stop_event,
+                        lease_timeout=WORKER_BROWSER_LEASE_TIMEOUT,
+                    )
+                except Exception as init_err:
+                    log_callback(f"[{label}] Browser not started, the other workers continue: {init_err}")
+                    return
+            try:
+                while not stop_event.is_set():
+                    task = work.pop()
+                    if task is None:
+                        break
+                    idx, tender_id, direct_url = task
+                    try:
+                        active_driver.current_url
+                    except Exception as session_err:
+                        log_callback(f"[{label}] Driver session lost at {tender_id}: {session_err}")
+                        work.push(task, 0)
+                        break
+                    try:
+                        if not _process_id(active_driver, label, idx, tender_id, direct_url):
+                            work.push(task, 0)
+                            break
+                    except Exception as e:
+                        log_callback(f"Error processing tender ID {tender_id}: {e}")
+                        _record(idx, {
+                            SEARCH_ID_KEY: tender_id,
+                            SEARCH_INDEX_KEY: idx,
+                            'Portal': portal_label,
+                            TENDER_ID_KEY: 'N/A',
+                            'Title': 'Processing error',
+                            'Error': str(e)
+                        })
+                        with state_lock:
+                            summary["errors"] += 1
+            finally:
+                if active_driver is not driver:
+                    safe_quit_driver(active_driver, lambda _msg: None)
+
+        if active_workers == 1:
+            _worker_loop(0)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=active_workers, thread_name_prefix="IdSearch") as executor:
+                for future in [executor.submit(_worker_loop, idx) for idx in range(active_workers)]:
+                    future.result()
+
+        # IDs left behind by lost browser sessions
+        if not stop_event.is_set():
+            while True:
+                task = work.pop()
+                if task is None:
+                    break
+                idx, tender_id, _direct_url = task
+                results[idx] = {
                     SEARCH_ID_KEY: tender_id,
                     SEARCH_INDEX_KEY: idx,
-                    'Portal': base_url_config.get('Name', 'Unknown'),
+                    'Portal': portal_label,
                     TENDER_ID_KEY: 'N/A',
                     'Title': 'Processing error',
-                    'Error': str(e)
-                })
-                continue
+                    'Error': 'Browser session lost'
+                }
+                summary["errors"] += 1
+
+        all_tender_details = [results[idx] for idx in sorted(results)]
+        log_callback(
+            f"Tender ID search finished: {summary['found']} found "
+            f"({summary['via_stored_url']} via stored URL), {summary['not_found']} not found, {summary['errors']} errors"
+        )
 
         # Generate Excel file after all tenders are processed
         if all_tender_details:
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                website_keyword = get_website_keyword_from_url(base_url_config['BaseURL'])
+                website_keyword = get_website_keyword_from_url(base_url)
                 excel_filename = f"{website_keyword}_tender_ids_{timestamp}.xlsx"
                 excel_path = os.path.join(download_dir, excel_filename)
                 
                 # Convert details to DataFrame and save
+                import pandas as pd
                 df = pd.DataFrame(all_tender_details)
                 df = df.sort_values('Search Index')
                 df.to_excel(excel_path, index=False, engine='openpyxl')
+                summary["excel_path"] = excel_path
                 
                 log_callback(f"Saved tender details to Excel: {excel_filename}")
             except Exception as excel_err:
                 log_callback(f"Error saving Excel file: {excel_err}")
         else:
             log_callback("No tender details collected to save to Excel.")
+        return summary
 
     except Exception as e:
         log_callback(f"Error in search and download process: {e}")
@@ -0,0 +1,295 @@
+# scraper/scheduler.py
+# Machine-wide scrape scheduling: one browser budget and per-host concurrency
+# caps shared by every scraping process, plus priority ordering of
+# (portal, department) work units.
+#
+# Limits are enforced with slot files under the state directory. A lease is
+# an OS file lock on one of N slot files (browser_0.slot ... browser_{N-1}.slot,
+# host_<host>_0.slot ...), so GUI batch subprocesses, dashboard worker
+# processes and department worker threads all draw from the same pool without
+# a broker process, and a crashed process's leases are released by the OS
+# together with its file handles.
+#
+# The active limits live in limits.json next to the slot files; the GUI and
+# CLI write them from settings (configure_limits) and every process reads them.
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+try:
+    import msvcrt
+    fcntl = None
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+from config import GLOBAL_BROWSER_BUDGET, PER_HOST_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+LEASE_POLL_SECONDS = 0.5
+BROWSER_LEASE_TIMEOUT = 1800  # max seconds a new browser waits for a budget slot
+STALENESS_CAP_HOURS = 168  # a week; never-scraped work counts as this stale
+LIMITS_FILENAME = "limits.json"
+
+
+def default_state_dir():
+    return os.path.join(tempfile.gettempdir(), "blackforest_scheduler")
+
+
+def host_of(url):
+    """Lower-case host name of url ('' if it has none)."""
+    try:
+        return (urlparse(str(url or "").strip()).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def _parse_time(value):
+    if isinstance(value, datetime):
+        return value
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.replace("Z", "").replace("T", " ")[:19])
+    except ValueError:
+        return None
+
+
+def unit_priority(expected_count=None, known_count=0, last_scraped_at=None, now=None):
+    """Higher runs first: expected new tenders, scaled up by hours since the last scrape."""
+    try:
+        expected_new = max(0, int(expected_count or 0) - int(known_count or 0))
+    except (TypeError, ValueError):
+        expected_new = 0
+    last = _parse_time(last_scraped_at)
+    if last is None:
+        hours = STALENESS_CAP_HOURS
+    else:
+        elapsed = ((now or datetime.now()) - last).total_seconds() / 3600.0
+        hours = min(STALENESS_CAP_HOURS, max(0.0, elapsed))
+    return (1 + expected_new) * (1 + hours / 24.0)
+
+
+def _try_lock(handle):
+    try:
+        if msvcrt:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle):
+    try:
+        if msvcrt:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+    finally:
+        handle.close()
+
+
+class Lease:
+    """One held slot of a pool; release() is idempotent. A None handle is an unlimited pool."""
+
+    def __init__(self, pool, slot=None, handle=None):
+        self.pool = pool
+        self.slot = slot
+        self._handle = handle
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            handle, self._handle = self._handle, None
+        if handle is not None:
+            _unlock(handle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class WorkQueue:
+    """Thread-safe max-priority queue of work units (e.g. department dicts)."""
+
+    def __init__(self, items=()):
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        for item, priority in items:
+            self.push(item, priority)
+
+    def push(self, item, priority):
+        with self._lock:
+            # Ties keep insertion order
+            heapq.heappush(self._heap, (-float(priority), next(self._order), item))
+
+    def pop(self):
+        """Highest-priority item, or None when empty."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+
+class GlobalScheduler:
+    """Browser budget and per-host caps leased from slot files shared across processes."""
+
+    def __init__(self, state_dir=None, browser_budget=None, per_host_limit=None):
+        self.state_dir = state_dir or default_state_dir()
+        os.makedirs(self.state_dir, exist_ok=True)
+        limits = read_limits(self.state_dir)
+        self.browser_budget = limits["browser_budget"] if browser_budget is None else int(browser_budget)
+        self.per_host_limit = limits["per_host_limit"] if per_host_limit is None else int(per_host_limit)
+
+    def _slot_path(self, pool, slot):
+        return os.path.join(self.state_dir, f"{pool}_{slot}.slot")
+
+    def try_acquire(self, pool, limit):
+        """Lease a free slot of pool without waiting; None if all limit slots are held."""
+        if not limit or limit <= 0:
+            return Lease(pool)
+        for slot in range(limit):
+            handle = open(self._slot_path(pool, slot), "a+")
+            if _try_lock(handle):
+                return Lease(pool, slot, handle)
+            handle.close()
+        return None
+
+    def acquire(self, pool, limit, timeout=None, stop_event=None, on_wait=None):
+        """Lease a slot of pool, polling until one frees up.
+
+        Returns None on timeout or when stop_event is set. on_wait(pool, limit)
+        is called once if the first attempt has to wait.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            lease = self.try_acquire(pool, limit)
+            if lease is not None:
+                return lease
+            if not waited:
+                waited = True
+                if on_wait:
+                    on_wait(pool, limit)
+            if stop_event is not None and stop_event.is_set():
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            if stop_event is not None:
+                stop_event.wait(LEASE_POLL_SECONDS)
+            else:
+                time.sleep(LEASE_POLL_SECONDS)
+
+    def browser(self, timeout=None, stop_event=None, on_wait=None):
+        """Lease one browser of the machine-wide budget."""
+        return self.acquire("browser", self.browser_budget, timeout, stop_event, on_wait)
+
+    def host(self, url_or_host, timeout=None, stop_event=None, on_wait=None):
+        """Lease one concurrent-request slot for a portal host."""
+        host = host_of(url_or_host) or str(url_or_host or "").strip().lower()
+        slug = re.sub(r"[^\w.-]+", "_", host) or "unknown"
+        return self.acquire(f"host_{slug}", self.per_host_limit, timeout, stop_event, on_wait)
+
+
+def lease_browser(stop_event=None, timeout=BROWSER_LEASE_TIMEOUT):
+    """Wait for a browser budget slot; raises RuntimeError on timeout or stop."""
+    lease = get_scheduler().browser(
+        timeout=timeout,
+        stop_event=stop_event,
+        on_wait=lambda _pool, limit: logger.info(f"Browser budget ({limit}) in use, waiting for a free slot..."),
+    )
+    if lease is None:
+        raise RuntimeError("No browser slot available in the global browser budget")
+    return lease
+
+
+def attach_lease(driver, lease):
+    """Make driver.quit() also release lease; returns driver."""
+    original_quit = driver.quit
+
+    def quit_and_release(*args, **kwargs):
+        try:
+            return original_quit(*args, **kwargs)
+        finally:
+            lease.release()
+
+    driver.quit = quit_and_release
+    return driver
+
+
+def read_limits(state_dir=None):
+    """Limits from limits.json, falling back to config defaults."""
+    limits = {"browser_budget": GLOBAL_BROWSER_BUDGET, "per_host_limit": PER_HOST_CONCURRENCY}
+    path = os.path.join(state_dir or default_state_dir(), LIMITS_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+        for key in limits:
+            if key in stored:
+                limits[key] = max(0, int(stored[key]))
+    except (OSError, ValueError, TypeError):
+        pass
+    return limits
+
+
+def configure_limits(browser_budget, per_host_limit, state_dir=None):
+    """Publish the limits every scraping process on this machine should use."""
+    state_dir = state_dir or default_state_dir()
+    try:
+        os.makedirs(state_dir, exist_ok=True)
+        path = os.path.join(state_dir, LIMITS_FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "browser_budget": max(0, int(browser_budget or 0)),
+                "per_host_limit": max(0, int(per_host_limit or 0)),
+            }, handle)
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Could not write scheduler limits: {e}")
+        return False
+
+
+_scheduler = None
+_scheduler_stamp = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler; limits are re-read when limits.json changes."""
+    global _scheduler, _scheduler_stamp
+    state_dir = default_state_dir()
+    try:
+        stamp = os.path.getmtime(os.path.join(state_dir, LIMITS_FILENAME))
+    except OSError:
+        stamp = None
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler_stamp != stamp:
+            _scheduler = GlobalScheduler(state_dir)
+            _scheduler_stamp = stamp
+        return _scheduler
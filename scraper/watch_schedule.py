@@ -0,0 +1,145 @@
+# scraper/watch_schedule.py
+# Adaptive check scheduling for the refresh watcher
+#
+# Each watched portal keeps a timeline of signature checks ([epoch, changed]
+# pairs). From it the change rate is estimated per IST hour of day, split into
+# weekdays and weekends, because NIC portals publish mostly in Indian office
+# hours. Sparse buckets are pulled towards the working-hours/off-hours rate,
+# and that towards the portal's overall rate, whose prior is the rule's
+# configured interval. The next check is placed where the expected number of
+# changes since the last check reaches TARGET_CHANGES, clamped to bounds
+# derived from the configured interval. Busy portals are therefore checked
+# sooner, dormant ones and night/weekend hours less often.
+
+from datetime import datetime, timedelta, timezone
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+TIMELINE_MAX_ENTRIES = 300
+TIMELINE_MAX_DAYS = 28
+MAX_GAP_HOURS = 36  # longer gaps between checks (watcher off) carry no rate information
+TARGET_CHANGES = 1.0  # expected changes per check interval
+MIN_INTERVAL_FACTOR = 0.25  # bounds relative to the rule's interval_min
+MAX_INTERVAL_FACTOR = 4.0
+MIN_INTERVAL_FLOOR_MIN = 10
+MAX_INTERVAL_CAP_MIN = 24 * 60
+WORK_START_HOUR = 9  # IST, Monday to Friday
+WORK_END_HOUR = 18
+WORK_HOURS_PRIOR = 2.0  # prior rate multiplier for working hours...
+OFF_HOURS_PRIOR = 0.5  # ...and for nights and weekends
+PRIOR_HOURS = 24.0  # weight of the configured interval in the overall rate
+SHRINK_HOURS = 6.0  # weight of the parent rate in class and hour buckets
+STEP_SECONDS = 300
+
+
+def _bucket(epoch):
+    """(weekend, IST hour) for epoch."""
+    moment = datetime.fromtimestamp(epoch, tz=IST)
+    return int(moment.weekday() >= 5), moment.hour
+
+
+def is_working_hours(epoch):
+    weekend, hour = _bucket(epoch)
+    return not weekend and WORK_START_HOUR <= hour < WORK_END_HOUR
+
+
+def _is_working_bucket(bucket):
+    weekend, hour = bucket
+    return not weekend and WORK_START_HOUR <= hour < WORK_END_HOUR
+
+
+def interval_bounds(interval_min):
+    """(min, max) seconds between checks for a rule's configured interval."""
+    interval_min = max(1, int(interval_min))
+    low = max(MIN_INTERVAL_FLOOR_MIN, interval_min * MIN_INTERVAL_FACTOR)
+    high = max(interval_min, min(interval_min * MAX_INTERVAL_FACTOR, MAX_INTERVAL_CAP_MIN))
+    return min(low, interval_min) * 60, high * 60
+
+
+def record_check(state, epoch, changed):
+    """Append one signature check to state["timeline"], trimming old entries."""
+    timeline = [entry for entry in state.get("timeline", []) if isinstance(entry, (list, tuple)) and len(entry) == 2]
+    timeline.append([int(epoch), 1 if changed else 0])
+    cutoff = epoch - TIMELINE_MAX_DAYS * 86400
+    state["timeline"] = [entry for entry in timeline if entry[0] >= cutoff][-TIMELINE_MAX_ENTRIES:]
+    return state["timeline"]
+
+
+def timeline_from_events(events, portal_name, now_epoch):
+    """Timeline rebuilt from CHECK/CHANGE watch events (history or diagnostics lines) of one portal."""
+    timeline = []
+    cutoff = now_epoch - TIMELINE_MAX_DAYS * 86400
+    for event in events:
+        if str(event.get("portal", "")).strip() != portal_name:
+            continue
+        kind = str(event.get("event", "")).strip().upper()
+        if kind not in ("CHECK", "CHANGE"):
+            continue
+        try:
+            epoch = datetime.fromisoformat(str(event.get("iso_ts") or event.get("timestamp") or "")).timestamp()
+        except ValueError:
+            continue
+        if epoch >= cutoff:
+            timeline.append([int(epoch), 1 if kind == "CHANGE" else 0])
+    timeline.sort()
+    return timeline[-TIMELINE_MAX_ENTRIES:]
+
+
+def _exposure(timeline):
+    """({bucket: hours watched}, {bucket: changes seen}) from consecutive checks."""
+    hours = {}
+    changes = {}
+    for (start, _), (end, changed) in zip(timeline, timeline[1:]):
+        if end <= start or end - start > MAX_GAP_HOURS * 3600:
+            continue
+        spans = {}
+        position = start
+        while position < end:
+            # IST hours start at half past the UTC hour
+            step_end = min(end, (int(position - 1800) // 3600 + 1) * 3600 + 1800)
+            bucket = _bucket(position)
+            spans[bucket] = spans.get(bucket, 0.0) + (step_end - position) / 3600.0
+            position = step_end
+        total = sum(spans.values())
+        for bucket, span in spans.items():
+            hours[bucket] = hours.get(bucket, 0.0) + span
+            if changed:
+                # The change happened somewhere in the interval: spread it by exposure
+                changes[bucket] = changes.get(bucket, 0.0) + span / total
+    return hours, changes
+
+
+def change_rates(timeline, interval_min):
+    """{(weekend, IST hour): expected changes per hour} for all 48 buckets."""
+    hours, changes = _exposure(timeline)
+    prior_rate = TARGET_CHANGES / (max(1, int(interval_min)) / 60.0)
+    overall = (sum(changes.values()) + PRIOR_HOURS * prior_rate) / (sum(hours.values()) + PRIOR_HOURS)
+
+    class_rates = {}
+    for working, multiplier in ((True, WORK_HOURS_PRIOR), (False, OFF_HOURS_PRIOR)):
+        members = [bucket for bucket in hours if _is_working_bucket(bucket) == working]
+        class_hours = sum(hours[bucket] for bucket in members)
+        class_changes = sum(changes.get(bucket, 0.0) for bucket in members)
+        class_rates[working] = (class_changes + SHRINK_HOURS * overall * multiplier) / (class_hours + SHRINK_HOURS)
+
+    rates = {}
+    for weekend in (0, 1):
+        for hour in range(24):
+            bucket = (weekend, hour)
+            parent = class_rates[_is_working_bucket(bucket)]
+            rates[bucket] = (changes.get(bucket, 0.0) + SHRINK_HOURS * parent) / (hours.get(bucket, 0.0) + SHRINK_HOURS)
+    return rates
+
+
+def next_check_epoch(timeline, from_epoch, interval_min):
+    """When to check next after a check at from_epoch."""
+    low, high = interval_bounds(interval_min)
+    rates = change_rates(timeline or [], interval_min)
+    expected = 0.0
+    elapsed = 0
+    while elapsed < high:
+        expected += rates[_bucket(from_epoch + elapsed)] * STEP_SECONDS / 3600.0
+        elapsed += STEP_SECONDS
+        if expected >= TARGET_CHANGES and elapsed >= low:
+            break
+    return from_epoch + max(low, min(high, elapsed))
@@ -3,10 +3,13 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from scraper.scheduler import attach_lease, lease_browser
+
 logger = logging.getLogger(__name__)
 
 def get_driver(use_undetected=True, headless=False, download_dir=None):
     """Creates or returns a WebDriver instance with the specified configuration."""
+    lease = lease_browser()
     try:
         options = webdriver.ChromeOptions()
         
@@ -45,9 +48,10 @@ def get_driver(use_undetected=True, headless=False, download_dir=None):
         driver.implicitly_wait(10)
         
         logger.info(f"WebDriver initialized (Undetected mode: {use_undetected}, Headless: {headless})")
-        return driver
+        return attach_lease(driver, lease)
 
     except Exception as e:
+        lease.release()
         logger.error(f"Error initializing WebDriver: {e}")
         raise
 
@@ -0,0 +1,602 @@
+"""
+Scraper daemon: one long-lived process that runs CLI department jobs.
+
+Started with `python cli_main.py serve`. Instead of every GUI batch, dashboard
+run or scheduled task paying for a cold interpreter (pandas/selenium imports,
+settings and base_urls parsing) plus a fresh Chrome, jobs are submitted to
+this process over a loopback HTTP API (see daemon_client.py for the
+protocol) and run as DaemonCLIRunner threads:
+
+    - settings.json and base_urls.csv are parsed once and re-read only when
+      the file changes
+    - up to DAEMON_WARM_BROWSERS browsers are kept open between jobs (each
+      holds its slot of the machine-wide browser budget) and closed after
+      DAEMON_BROWSER_IDLE_SECONDS idle
+    - known-ID indexes stay memory-mapped files (scraper/known_id_index.py),
+      so reopening them per job is already cheap
+
+Job output is the CLI's --json-events stream plus log lines, buffered per job
+for clients to long-poll. Only `department` commands are accepted.
+"""
+
+import copy
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+
+from app_settings import load_settings
+from cli_parser import CLIParser
+from cli_runner import CLIRunner
+from config import DAEMON_BROWSER_IDLE_SECONDS, DAEMON_MAX_JOBS, DAEMON_PORT, DAEMON_WARM_BROWSERS
+from daemon_client import DAEMON_COMMANDS, DAEMON_STATE_DIR, TOKEN_HEADER, connect, daemon_info_path
+from scraper.driver_manager import safe_quit_driver, set_download_directory, setup_driver
+
+logger = logging.getLogger(__name__)
+
+DAEMON_HOST = "127.0.0.1"
+MAX_JOB_EVENTS = 20000  # per job; the oldest are dropped beyond this
+MAX_POLL_WAIT = 30
+JOB_RETENTION_SECONDS = 3600  # finished jobs stay visible this long
+MAINTENANCE_SECONDS = 30
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def _utc_stamp():
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+class _FileCache:
+    """Values loaded from files, reloaded when a file's mtime changes."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, *args):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        key = (str(path),) + args
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != mtime:
+                entry = (mtime, self._loader(path, *args))
+                self._entries[key] = entry
+            return entry[1]
+
+
+class WarmDriverPool:
+    """Idle browsers kept between jobs; acquire() falls back to a new one."""
+
+    def __init__(self, size, idle_seconds):
+        self.size = max(0, int(size))
+        self.idle_seconds = max(30, int(idle_seconds))
+        self._idle = []  # (driver, idle since)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._idle)
+
+    @staticmethod
+    def _alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, download_dir, log):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                driver, _since = self._idle.pop()
+            if self._alive(driver) and set_download_directory(driver, download_dir, log):
+                log("Reusing a warm browser from the scraper daemon")
+                return driver
+            safe_quit_driver(driver, lambda _msg: None)
+        return setup_driver(initial_download_dir=download_dir)
+
+    def release(self, driver, log):
+        # run_scraping_logic quits the driver itself when it switches to worker browsers
+        if driver is None or not self._alive(driver):
+            return
+        with self._lock:
+            keep = len(self._idle) < self.size
+        if keep:
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+            except Exception:
+                keep = False
+        if not keep:
+            safe_quit_driver(driver, log)
+            return
+        with self._lock:
+            self._idle.append((driver, time.monotonic()))
+
+    def reap(self):
+        """Close browsers idle longer than idle_seconds."""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            stale = [driver for driver, since in self._idle if since < cutoff]
+            self._idle = [(driver, since) for driver, since in self._idle if since >= cutoff]
+        for driver in stale:
+            safe_quit_driver(driver, lambda _msg: None)
+        return len(stale)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver, _since in idle:
+            safe_quit_driver(driver, lambda _msg: None)
+
+
+class DaemonJob:
+    """One submitted CLI command and its buffered events."""
+
+    def __init__(self, job_id, argv, args):
+        self.job_id = job_id
+        self.argv = list(argv)
+        self.args = args
+        self.state = "queued"
+        self.exit_code = None
+        self.created_at = _utc_stamp()
+        self.started_at = None
+        self.finished_at = None
+        self.finished_monotonic = None
+        self.stop_event = threading.Event()
+        self.runner = None
+        self._events = []
+        self._events_base = 0  # index of _events[0] after old events were dropped
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.state in TERMINAL_STATES
+
+    def add_event(self, event):
+        with self._cond:
+            self._events.append(event)
+            if len(self._events) > MAX_JOB_EVENTS:
+                dropped = len(self._events) - MAX_JOB_EVENTS
+                del self._events[:dropped]
+                self._events_base += dropped
+            self._cond.notify_all()
+
+    def events_since(self, after, wait=0):
+        """(events from index after, next index), waiting up to wait seconds for new ones."""
+        deadline = time.monotonic() + max(0, wait)
+        with self._cond:
+            while self._events_base + len(self._events) <= after and not self.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            start = max(0, after - self._events_base)
+            return list(self._events[start:]), self._events_base + len(self._events)
+
+    def set_running(self):
+        with self._cond:
+            self.state = "running"
+            self.started_at = _utc_stamp()
+            self._cond.notify_all()
+
+    def finish(self, state, exit_code):
+        with self._cond:
+            self.state = state
+            self.exit_code = exit_code
+            self.finished_at = _utc_stamp()
+            self.finished_monotonic = time.monotonic()
+            self.runner = None
+            self.add_event({'type': 'exit', 'timestamp': self.finished_at, 'job_id': self.job_id, 'exit_code': exit_code, 'state': state})
+
+    def summary(self):
+        return {
+            'job_id': self.job_id,
+            'state': self.state,
+            'argv': self.argv,
+            'portal': getattr(self.args, 'url', None) or 'HP Tenders',
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'exit_code': self.exit_code,
+        }
+
+
+class _JobLogHandler(logging.Handler):
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def emit(self, record):
+        try:
+            self.job.add_event({'type': 'log', 'level': record.levelname, 'message': self.format(record)})
+        except Exception:
+            self.handleError(record)
+
+
+class DaemonCLIRunner(CLIRunner):
+    """CLIRunner for one daemon job: output goes to the job, settings and browsers come from the daemon."""
+
+    def __init__(self, args, job, daemon):
+        self.job = job
+        self.daemon = daemon
+        self._job_handlers = []
+        super().__init__(args)
+        self.stop_event = job.stop_event
+
+    def setup_logging(self):
+        log_level = logging.DEBUG if self.args.verbose else logging.INFO
+        # Not registered with the logging manager, so finished jobs' loggers
+        # are garbage-collected; still propagates to the daemon's log.
+        self.logger = logging.Logger(f"{__name__}.job.{self.job.job_id}")
+        self.logger.parent = logger
+        self.logger.setLevel(log_level)
+        handlers = [_JobLogHandler(self.job)]
+        if self.paths['log_file']:
+            try:
+                self.paths['log_file'].parent.mkdir(parents=True, exist_ok=True)
+                handlers.append(logging.FileHandler(self.paths['log_file'], encoding='utf-8'))
+            except OSError as e:
+                logger.warning(f"Job {self.job.job_id}: could not open log file {self.paths['log_file']}: {e}")
+        for handler in handlers:
+            handler.setLevel(log_level)
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            self.logger.addHandler(handler)
+        self._job_handlers = handlers
+
+    def close_logging(self):
+        for handler in self._job_handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        self._job_handlers = []
+
+    def load_configuration(self):
+        self.settings = self.daemon.settings_for(self.paths['config_file'], str(self.paths['output_dir']))
+        if self.args.output:
+            self.settings['download_directory'] = str(self.paths['output_dir'])
+
+    def _publish_event(self, event_data):
+        self.job.add_event(event_data)
+
+    def _read_base_urls(self):
+        return self.daemon.base_urls(self.paths['base_urls_file'])
+
+    def _open_driver(self):
+        return self.daemon.drivers.acquire(str(self.paths['output_dir']), self.logger.info)
+
+    def _close_driver(self):
+        self.daemon.drivers.release(self.driver, self.logger.info)
+
+
+class ScraperDaemon:
+    """Job table, worker threads, caches and the loopback HTTP server."""
+
+    def __init__(self, port=DAEMON_PORT, max_jobs=DAEMON_MAX_JOBS, warm_browsers=DAEMON_WARM_BROWSERS,
+                 browser_idle_seconds=DAEMON_BROWSER_IDLE_SECONDS, state_dir=None):
+        self.port = int(port or 0)
+        self.max_jobs = max(1, int(max_jobs))
+        self.state_dir = state_dir or DAEMON_STATE_DIR
+        self.token = secrets.token_urlsafe(24)
+        self.parser = CLIParser()
+        self.drivers = WarmDriverPool(warm_browsers, browser_idle_seconds)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="DaemonJob")
+        self.started_at = _utc_stamp()
+        self.server = None
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._settings_cache = _FileCache(load_settings)
+        self._base_urls_cache = _FileCache(pd.read_csv)
+
+    # --- caches -----------------------------------------------------------
+
+    def settings_for(self, config_path, default_download_dir):
+        """A private copy of the parsed settings file."""
+        return copy.deepcopy(self._settings_cache.get(str(config_path), default_download_dir))
+
+    def base_urls(self, path):
+        return self._base_urls_cache.get(path).copy()
+
+    # --- jobs -------------------------------------------------------------
+
+    def submit(self, argv):
+        """Queue a CLI command; raises ValueError for commands the daemon does not run."""
+        argv = [str(part) for part in argv or [] if str(part) != '--daemon']
+        try:
+            args = self.parser.parse_args(argv)
+        except SystemExit:
+            raise ValueError(f"Invalid CLI arguments: {' '.join(argv)}")
+        if args.command not in DAEMON_COMMANDS:
+            raise ValueError(f"The scraper daemon only runs {', '.join(DAEMON_COMMANDS)} commands")
+        args.json_events = True
+
+        with self._jobs_lock:
+            job_id = str(args.job_id or '').strip() or f"daemon_{uuid.uuid4().hex[:10]}"
+            existing = self._jobs.get(job_id)
+            if existing is not None and not existing.finished:
+                raise ValueError(f"Job '{job_id}' is already active")
+            args.job_id = job_id
+            job = DaemonJob(job_id, argv, args)
+            self._jobs[job_id] = job
+        self.executor.submit(self._run_job, job)
+        logger.info(f"Job {job_id} queued: {' '.join(argv)}")
+        return job
+
+    def _run_job(self, job):
+        if job.stop_event.is_set() or self._stopped.is_set():
+            job.finish("cancelled", 1)
+            return
+        job.set_running()
+        exit_code = 0
+        runner = None
+        try:
+            runner = DaemonCLIRunner(job.args, job, self)
+            job.runner = runner
+            runner.run_department_scraping()
+        except SystemExit as exit_err:
+            code = exit_err.code
+            exit_code = code if isinstance(code, int) else (0 if code is None else 1)
+        except Exception as err:
+            logger.error(f"Job {job.job_id} crashed: {err}", exc_info=True)
+            job.add_event({'type': 'error', 'timestamp': _utc_stamp(), 'job_id': job.job_id, 'message': str(err)})
+            exit_code = 1
+        finally:
+            if runner is not None:
+                runner.close_logging()
+
+        if job.stop_event.is_set():
+            # Same outcome as a terminated CLI subprocess
+            state, exit_code = "cancelled", exit_code or 1
+        else:
+            state = "completed" if exit_code == 0 else "failed"
+        job.finish(state, exit_code)
+        logger.info(f"Job {job.job_id} {state} (exit code {exit_code})")
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def job_summaries(self):
+        with self._jobs_lock:
+            return [job.summary() for job in self._jobs.values()]
+
+    def stop_job(self, job_id, force=False):
+        job = self.get_job(job_id)
+        if job is None:
+            return False
+        job.stop_event.set()
+        runner = job.runner
+        if force and runner is not None and runner.driver is not None:
+            # Closing the browser makes the scrape fail fast instead of finishing its department
+            safe_quit_driver(runner.driver, runner.logger.info)
+        return True
+
+    def health(self):
+        states = {}
+        for summary in self.job_summaries():
+            states[summary['state']] = states.get(summary['state'], 0) + 1
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'max_jobs': self.max_jobs,
+            'jobs': states,
+            'warm_browsers': len(self.drivers),
+        }
+
+    def _maintenance_loop(self):
+        while not self._stopped.wait(MAINTENANCE_SECONDS):
+            closed = self.drivers.reap()
+            if closed:
+                logger.info(f"Closed {closed} idle warm browser(s)")
+            cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+            with self._jobs_lock:
+                for job_id in [
+                    job_id for job_id, job in self._jobs.items()
+                    if job.finished and job.finished_monotonic is not None and job.finished_monotonic < cutoff
+                ]:
+                    del self._jobs[job_id]
+
+    # --- server -----------------------------------------------------------
+
+    def _write_info_file(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = daemon_info_path(self.state_dir)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # Owner-only: the token is what lets a client submit jobs
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({
+                'host': DAEMON_HOST,
+                'port': self.server.server_address[1],
+                'pid': os.getpid(),
+                'token': self.token,
+                'started_at': self.started_at,
+            }, handle)
+        os.replace(tmp_path, path)
+        return path
+
+    def _remove_info_file(self):
+        path = daemon_info_path(self.state_dir)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                if json.load(handle).get('pid') != os.getpid():
+                    return  # a newer daemon owns it
+            os.remove(path)
+        except (OSError, ValueError):
+            pass
+
+    def serve_forever(self):
+        self.server = ThreadingHTTPServer((DAEMON_HOST, self.port), _DaemonRequestHandler)
+        self.server.daemon_threads = True
+        self.server.scraper_daemon = self
+        info_path = self._write_info_file()
+        maintenance = threading.Thread(target=self._maintenance_loop, name="DaemonMaintenance", daemon=True)
+        maintenance.start()
+        logger.info(
+            f"Scraper daemon listening on http://{DAEMON_HOST}:{self.server.server_address[1]} "
+            f"(pid {os.getpid()}, jobs={self.max_jobs}, warm browsers={self.drivers.size}); info file {info_path}"
+        )
+        try:
+            self.server.serve_forever(poll_interval=0.5)
+        except KeyboardInterrupt:
+            logger.info("Scraper daemon interrupted")
+        finally:
+            self.close()
+
+    def request_shutdown(self):
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, name="DaemonShutdown", daemon=True).start()
+
+    def close(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._remove_info_file()
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.stop_event.set()
+        self.executor.shutdown(wait=False)
+        self.drivers.close()
+        if self.server is not None:
+            self.server.server_close()
+        logger.info("Scraper daemon stopped")
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    server_version = "BlackForestDaemon/1.0"
+
+    @property
+    def daemon(self):
+        return self.server.scraper_daemon
+
+    def log_message(self, format, *args):
+        logger.debug("HTTP " + format % args)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        token = self.headers.get(TOKEN_HEADER) or ""
+        if hmac.compare_digest(token.encode("utf-8"), self.daemon.token.encode("utf-8")):
+            return True
+        self._reply(403, {'error': 'missing or wrong daemon token'})
+        return False
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        payload = json.loads(self.rfile.read(length).decode("utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError("JSON object expected")
+        return payload
+
+    def _route(self):
+        parsed = urlparse(self.path)
+        parts = [unquote(part) for part in parsed.path.strip("/").split("/") if part]
+        return parts, parse_qs(parsed.query)
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts, query = self._route()
+        if parts == ["health"]:
+            self._reply(200, self.daemon.health())
+        elif parts == ["jobs"]:
+            self._reply(200, {'jobs': self.daemon.job_summaries()})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.daemon.get_job(parts[1])
+            if job is None:
+                self._reply(404, {'error': f"unknown job '{parts[1]}'"})
+                return
+            try:
+                after = max(0, int(query.get("after", ["0"])[0]))
+                wait = min(MAX_POLL_WAIT, max(0, int(query.get("wait", ["0"])[0])))
+            except ValueError:
+                self._reply(400, {'error': 'after and wait must be integers'})
+                return
+            events, next_index = job.events_since(after, wait)
+            self._reply(200, {'job': job.summary(), 'events': events, 'next': next_index})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        parts, _query = self._route()
+        try:
+            payload = self._read_json()
+        except ValueError as err:
+            self._reply(400, {'error': f"invalid JSON body: {err}"})
+            return
+        if parts == ["jobs"]:
+            argv = payload.get("argv")
+            if not isinstance(argv, list):
+                self._reply(400, {'error': 'argv list required'})
+                return
+            try:
+                job = self.daemon.submit(argv)
+            except ValueError as err:
+                self._reply(400, {'error': str(err)})
+                return
+            self._reply(202, job.summary())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "stop":
+            if self.daemon.stop_job(parts[1], force=bool(payload.get("force"))):
+                self._reply(200, self.daemon.get_job(parts[1]).summary())
+            else:
+                self._reply(404, {'error': f"unknown job '{parts[1]}'"})
+        elif parts == ["shutdown"]:
+            self._reply(200, {'status': 'shutting down'})
+            self.daemon.request_shutdown()
+        else:
+            self._reply(404, {'error': 'not found'})
+
+
+def serve(args):
+    """Entry point of `cli_main.py serve`."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    if connect() is not None:
+        logger.error("A scraper daemon is already running; not starting another one")
+        return 1
+
+    # The CLI imports the scraping modules lazily; load them once here so jobs start warm
+    import scraper.logic  # noqa: F401
+    import scraper.playwright_logic  # noqa: F401
+
+    def _option(name, default):
+        value = getattr(args, name, None)
+        return default if value is None else value
+
+    daemon = ScraperDaemon(
+        port=_option('port', DAEMON_PORT),
+        max_jobs=_option('jobs', DAEMON_MAX_JOBS),
+        warm_browsers=_option('warm_browsers', DAEMON_WARM_BROWSERS),
+        browser_idle_seconds=_option('browser_idle_seconds', DAEMON_BROWSER_IDLE_SECONDS),
+    )
+    daemon.serve_forever()
+    return 0
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import reflex as rx
 
+from tender_dashboard_reflex import maintenance
 from tender_dashboard_reflex.state import DashboardState, TenderRow
 from dashboard_app.portal_management import portal_management_page
 from dashboard_app.data_visualization import data_visualization_page
@@ -688,6 +689,12 @@ def index() -> rx.Component:
             # Toast notification
             toast_notification(),
             
+            # Background export job poller
+            rx.cond(
+                DashboardState.export_job_id != "",
+                rx.moment(interval=1000, on_change=DashboardState.poll_export_job, display="none"),
+            ),
+            
             spacing="4", width="100%",
             on_mount=DashboardState.load_initial_data,
         ),
@@ -698,6 +705,9 @@ def index() -> rx.Component:
 
 
 app = rx.App()
+# Keep is_live current and verify the integrity counters while the dashboard runs
+app.register_lifespan_task(maintenance.expiry_sweep_task)
+app.register_lifespan_task(maintenance.integrity_reconcile_task)
 app.add_page(index, route="/", title="Tender Dashboard - Enhanced v2.1")
 app.add_page(portal_management_page, route="/portals", title="Portal Management")
 app.add_page(data_visualization_page, route="/data", title="Data Visualization")
@@ -3,13 +3,17 @@
 
 from __future__ import annotations
 
-import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
 
 import reflex as rx
 
+from tender_dashboard_reflex import db, integrity, jobs
+
+_WORKSPACE_ROOT = Path(__file__).parent.parent.parent
+_BACKUP_DIR = _WORKSPACE_ROOT / "db_backups"
+
 
 class IntegrityMetric(rx.Base):
     """Data class for integrity metrics."""
@@ -73,6 +77,11 @@ class DataIntegrityState(rx.State):
     cleanup_running: bool = False
     check_log: List[str] = []
     
+    # Background job tracking (see tender_dashboard_reflex.jobs)
+    job_id: str = ""
+    job_progress: int = 0
+    job_message: str = ""
+    
     # Action modals and dialogs
     show_detail_modal: bool = False
     selected_portal_detail: str = ""
@@ -88,311 +97,107 @@ class DataIntegrityState(rx.State):
     portal_detail_missing_dates: List[Dict] = []
     
     def on_load(self):
-        """Run integrity check on page load."""
-        self.run_integrity_check()
+        """Show the incrementally maintained counters; deep check only if they are missing."""
+        if self.job_id:
+            return
+        try:
+            report = integrity.read_integrity_counters(db.DB_PATH)
+        except Exception as e:
+            self.check_log = [f"⚠️ Could not read integrity counters: {str(e)}"]
+            report = None
+        if report is None:
+            self.run_integrity_check()
+            return
+        self._apply_metrics(report)
+        self.last_check_time = f"{report['updated_at'] or 'Never'} (live counters)"
+        self.check_log = [
+            f"📊 Live counters loaded (last reconciled {report['reconciled_at'] or 'never'})",
+            "ℹ️ Run a deep check for duplicate and missing-field details",
+        ]
     
-    def run_integrity_check(self):
-        """Run comprehensive data integrity check."""
-        self.checking = True
-        self.check_log = []
-        yield
-        
+    def _apply_metrics(self, report: dict):
+        self.total_tenders = report["total_tenders"]
+        self.distinct_portals = report["distinct_portals"]
+        self.duplicate_groups = report["duplicate_groups"]
+        self.duplicate_extra_rows = report["duplicate_extra_rows"]
+        self.missing_tender_ids = report["missing_tender_ids"]
+        self.invalid_tender_ids = report["invalid_tender_ids"]
+        self.missing_closing_dates = report["missing_closing_dates"]
+        self.portal_metrics = [PortalIntegrity(**row) for row in report["portal_metrics"]]
+    
+    def _apply_report(self, report: dict):
+        """Copy an integrity report produced by a background job into state."""
+        self.check_log = self.check_log + report.get("log", [])
+        if "portal_metrics" not in report:
+            return
+        self._apply_metrics(report)
+        self.duplicate_records = [DuplicateRecord(**row) for row in report["duplicate_records"]]
+        self.missing_field_records = [MissingFieldRecord(**row) for row in report["missing_field_records"]]
+        self.last_check_time = report["last_check_time"]
+    
+    def _submit(self, kind: str, params: dict) -> bool:
+        if self.job_id:
+            self.check_log.append("⏳ Another integrity job is still running")
+            return False
         try:
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
-            
-            if not db_path.exists():
-                self.check_log.append("❌ Database not found")
-                self.checking = False
-                yield
-                return
-            
-            self.check_log.append(f"📂 Checking database: {db_path.name}")
-            yield
-            
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 1. Total tenders
-            cursor.execute("SELECT COUNT(*) as count FROM tenders")
-            self.total_tenders = cursor.fetchone()["count"]
-            self.check_log.append(f"✅ Total tenders: {self.total_tenders:,}")
-            yield
-            
-            # 2. Distinct portals
-            cursor.execute("SELECT COUNT(DISTINCT LOWER(TRIM(COALESCE(portal_name, '')))) as count FROM tenders WHERE portal_name IS NOT NULL")
-            self.distinct_portals = cursor.fetchone()["count"]
-            self.check_log.append(f"✅ Active portals: {self.distinct_portals}")
-            yield
-            
-            # 3. Check duplicates
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM (
-                    SELECT
-                        LOWER(TRIM(COALESCE(portal_name, ''))) as portal_key,
-                        TRIM(COALESCE(tender_id_extracted, '')) as tender_key,
-                        COUNT(*) as c
-                    FROM tenders
-                    WHERE TRIM(COALESCE(tender_id_extracted, '')) <> ''
-                    GROUP BY portal_key, tender_key
-                    HAVING c > 1
-                )
-            """)
-            self.duplicate_groups = cursor.fetchone()["count"]
-            
-            cursor.execute("""
-                SELECT SUM(c - 1) as count
-                FROM (
-                    SELECT
-                        LOWER(TRIM(COALESCE(portal_name, ''))) as portal_key,
-                        TRIM(COALESCE(tender_id_extracted, '')) as tender_key,
-                        COUNT(*) as c
-                    FROM tenders
-                    WHERE TRIM(COALESCE(tender_id_extracted, '')) <> ''
-                    GROUP BY portal_key, tender_key
-                    HAVING c > 1
-                )
-            """)
-            result = cursor.fetchone()
-            self.duplicate_extra_rows = result["count"] if result["count"] else 0
-            
-            if self.duplicate_groups > 0:
-                self.check_log.append(f"⚠️ Found {self.duplicate_groups} duplicate groups ({self.duplicate_extra_rows} extra rows)")
-            else:
-                self.check_log.append("✅ No duplicate tender IDs found")
-            yield
-            
-            # Get duplicate details (top 20)
-            cursor.execute("""
-                SELECT 
-                    portal_name,
-                    tender_id_extracted as tender_id,
-                    COUNT(*) as count
-                FROM tenders
-                WHERE TRIM(COALESCE(tender_id_extracted, '')) <> ''
-                GROUP BY LOWER(TRIM(COALESCE(portal_name, ''))), TRIM(COALESCE(tender_id_extracted, ''))
-                HAVING COUNT(*) > 1
-                ORDER BY count DESC, portal_name ASC
-                LIMIT 20
-            """)
-            self.duplicate_records = [
-                DuplicateRecord(
-                    portal_name=row["portal_name"],
-                    tender_id=row["tender_id"],
-                    count=row["count"]
-                )
-                for row in cursor.fetchall()
-            ]
-            
-            # 4. Missing tender IDs
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM tenders
-                WHERE tender_id_extracted IS NULL
-                   OR TRIM(tender_id_extracted) = ''
-                   OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'na', 'n/a', '-')
-            """)
-            self.missing_tender_ids = cursor.fetchone()["count"]
-            
-            if self.missing_tender_ids > 0:
-                self.check_log.append(f"⚠️ Found {self.missing_tender_ids} records with missing/invalid tender IDs")
-            else:
-                self.check_log.append("✅ All records have valid tender IDs")
-            yield
-            
-            # 5. Invalid tender IDs (placeholder values)
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM tenders
-                WHERE LOWER(TRIM(COALESCE(tender_id_extracted, ''))) IN ('nan', 'none', 'null', 'na', 'n/a', '-')
-            """)
-            self.invalid_tender_ids = cursor.fetchone()["count"]
-            
-            if self.invalid_tender_ids > 0:
-                self.check_log.append(f"⚠️ Found {self.invalid_tender_ids} records with placeholder tender IDs")
-            yield
-            
-            # 6. Missing closing dates
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM tenders
-                WHERE closing_date IS NULL
-                   OR TRIM(closing_date) = ''
-            """)
-            self.missing_closing_dates = cursor.fetchone()["count"]
-            
-            if self.missing_closing_dates > 0:
-                self.check_log.append(f"⚠️ Found {self.missing_closing_dates} records with missing closing dates")
-            else:
-                self.check_log.append("✅ All records have closing dates")
-            yield
-            
-            # Get missing field details (top 20 departments)
-            cursor.execute("""
-                SELECT 
-                    portal_name,
-                    department_name,
-                    COUNT(*) as missing_count
-                FROM tenders
-                WHERE closing_date IS NULL OR TRIM(closing_date) = ''
-                GROUP BY portal_name, department_name
-                ORDER BY missing_count DESC
-                LIMIT 20
-            """)
-            self.missing_field_records = [
-                MissingFieldRecord(
-                    portal_name=row["portal_name"] or "Unknown",
-                    department_name=row["department_name"] or "Unknown",
-                    missing_count=row["missing_count"],
-                    field_name="closing_date"
-                )
-                for row in cursor.fetchall()
-            ]
-            
-            # 7. Per-portal integrity metrics
-            self.check_log.append("📊 Calculating per-portal metrics...")
-            yield
-            
-            cursor.execute("""
-                SELECT 
-                    COALESCE(portal_name, 'Unknown') as portal_name,
-                    COUNT(*) as total_tenders,
-                    -- Duplicates for this portal
-                    (SELECT COUNT(*) FROM (
-                        SELECT COUNT(*) as c
-                        FROM tenders t2
-                        WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
-                          AND TRIM(COALESCE(t2.tender_id_extracted, '')) <> ''
-                        GROUP BY TRIM(COALESCE(t2.tender_id_extracted, ''))
-                        HAVING c > 1
-                    )) as duplicate_groups,
-                    -- Extra duplicate rows
-                    (SELECT COALESCE(SUM(c - 1), 0) FROM (
-                        SELECT COUNT(*) as c
-                        FROM tenders t2
-                        WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
-                          AND TRIM(COALESCE(t2.tender_id_extracted, '')) <> ''
-                        GROUP BY TRIM(COALESCE(t2.tender_id_extracted, ''))
-                        HAVING c > 1
-                    )) as duplicate_rows,
-                    -- Missing tender IDs
-                    (SELECT COUNT(*) FROM tenders t2
-                     WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
-                       AND (t2.tender_id_extracted IS NULL 
-                            OR TRIM(t2.tender_id_extracted) = ''
-                            OR LOWER(TRIM(t2.tender_id_extracted)) IN ('nan', 'none', 'null', 'na', 'n/a', '-'))
-                    ) as missing_tender_ids,
-                    -- Missing closing dates
-                    (SELECT COUNT(*) FROM tenders t2
-                     WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
-                       AND (t2.closing_date IS NULL OR TRIM(t2.closing_date) = '')
-                    ) as missing_closing_dates
-                FROM tenders t1
-                WHERE portal_name IS NOT NULL
-                GROUP BY LOWER(TRIM(COALESCE(portal_name, '')))
-                ORDER BY total_tenders DESC
-            """)
-            
-            portal_rows = cursor.fetchall()
-            self.portal_metrics = []
-            
-            for row in portal_rows:
-                total = row["total_tenders"]
-                dup_groups = row["duplicate_groups"]
-                dup_rows = row["duplicate_rows"]
-                missing_ids = row["missing_tender_ids"]
-                missing_dates = row["missing_closing_dates"]
-                
-                # Calculate portal-specific integrity score
-                score = 100
-                if total > 0:
-                    if dup_rows > 0:
-                        score -= min(30, (dup_rows / total) * 100)
-                    if missing_ids > 0:
-                        score -= min(40, (missing_ids / total) * 100)
-                    if missing_dates > 0:
-                        score -= min(20, (missing_dates / total) * 100)
-                score = max(0, int(score))
-                
-                # Determine status
-                if score >= 95:
-                    status = "excellent"
-                elif score >= 85:
-                    status = "good"
-                elif score >= 70:
-                    status = "fair"
-                else:
-                    status = "poor"
-                
-                self.portal_metrics.append(PortalIntegrity(
-                    portal_name=row["portal_name"],
-                    total_tenders=total,
-                    duplicate_groups=dup_groups,
-                    duplicate_rows=dup_rows,
-                    missing_tender_ids=missing_ids,
-                    missing_closing_dates=missing_dates,
-                    integrity_score=score,
-                    status=status
-                ))
-            
-            self.check_log.append(f"✅ Analyzed {len(self.portal_metrics)} portal(s)")
-            yield
-            
-            conn.close()
-            
-            self.last_check_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.check_log.append(f"✅ Integrity check complete at {self.last_check_time}")
-            
+            self.job_id = str(jobs.submit_job(kind, params))
         except Exception as e:
-            self.check_log.append(f"❌ Error during integrity check: {str(e)}")
-        
+            self.check_log.append(f"❌ Could not start background job: {str(e)}")
+            return False
+        self.job_progress = 0
+        self.job_message = "Queued"
+        return True
+    
+    def _finish_job(self):
+        self.job_id = ""
         self.checking = False
-        yield
+        self.cleanup_running = False
+    
+    def poll_job(self, _value=None):
+        """Poll the background job table and apply results when the job ends."""
+        if not self.job_id:
+            return
+        job = jobs.get_job(int(self.job_id))
+        if job is None:
+            self.check_log.append("❌ Background job record disappeared")
+            self._finish_job()
+            return
+        self.job_progress = job["progress"]
+        self.job_message = job["message"]
+        if job["status"] in jobs.ACTIVE_STATUSES:
+            return
+        if job["status"] == "completed":
+            self._apply_report(job["result"] or {})
+        elif job["status"] == "cancelled":
+            self.check_log.append("⏹️ Job cancelled")
+        else:
+            self.check_log.append(f"❌ Job failed: {job['message']}")
+        self._finish_job()
+    
+    def cancel_job(self):
+        """Request cancellation of the running integrity job."""
+        if self.job_id:
+            jobs.cancel_job(int(self.job_id))
+            self.job_message = "Cancelling..."
+    
+    def run_integrity_check(self):
+        """Run comprehensive data integrity check in a background job."""
+        if self.job_id:
+            return
+        self.check_log = []
+        if self._submit("integrity_check", {"db_path": str(db.DB_PATH)}):
+            self.checking = True
     
     def run_cleanup(self):
         """Run cleanup script to remove duplicates and invalid records."""
-        self.cleanup_running = True
         self.check_log.append("🧹 Starting cleanup process...")
-        yield
-        
-        try:
-            import subprocess
-            import sys
-            
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
-            backup_dir = Path(__file__).parent.parent.parent / "db_backups"
-            backup_dir.mkdir(exist_ok=True)
-            
-            cleanup_script = Path(__file__).parent.parent.parent / "tools" / "cleanup_tender_records.py"
-            
-            if not cleanup_script.exists():
-                self.check_log.append("❌ Cleanup script not found")
-                self.cleanup_running = False
-                yield
-                return
-            
-            # Run cleanup script
-            result = subprocess.run(
-                [sys.executable, str(cleanup_script), "--db", str(db_path), "--backup-dir", str(backup_dir)],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode == 0:
-                self.check_log.append("✅ Cleanup completed successfully")
-                self.check_log.append(result.stdout)
-                # Re-run integrity check
-                yield from self.run_integrity_check()
-            else:
-                self.check_log.append(f"❌ Cleanup failed: {result.stderr}")
-        
-        except Exception as e:
-            self.check_log.append(f"❌ Error during cleanup: {str(e)}")
-        
-        self.cleanup_running = False
-        yield
+        params = {
+            "db_path": str(db.DB_PATH),
+            "backup_dir": str(_BACKUP_DIR),
+            "script_path": str(_WORKSPACE_ROOT / "tools" / "cleanup_tender_records.py"),
+        }
+        if self._submit("integrity_cleanup_script", params):
+            self.cleanup_running = True
     
     @rx.var
     def integrity_score(self) -> int:
@@ -454,56 +259,52 @@ class DataIntegrityState(rx.State):
         self.show_detail_modal = True
         
         try:
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Load duplicate records
-            cursor.execute("""
-                SELECT portal_name, tender_id_extracted as tender_id, COUNT(*) as count
-                FROM tenders
-                WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
-                    AND tender_id_extracted IS NOT NULL
-                    AND TRIM(tender_id_extracted) != ''
-                GROUP BY LOWER(TRIM(portal_name)), LOWER(TRIM(tender_id_extracted))
-                HAVING COUNT(*) > 1
-                ORDER BY count DESC
-                LIMIT 100
-            """, (portal_name,))
-            self.portal_detail_duplicates = [dict(row) for row in cursor.fetchall()]
-            
-            # Load records with invalid/missing tender IDs
-            cursor.execute("""
-                SELECT id, department_name, tender_id_extracted as tender_id, closing_date
-                FROM tenders
-                WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
-                    AND (
-                        tender_id_extracted IS NULL
-                        OR TRIM(tender_id_extracted) = ''
-                        OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                ORDER BY department_name
-                LIMIT 100
-            """, (portal_name,))
-            self.portal_detail_invalid_ids = [dict(row) for row in cursor.fetchall()]
-            
-            # Load records with missing closing dates
-            cursor.execute("""
-                SELECT id, department_name, tender_id_extracted as tender_id, closing_date
-                FROM tenders
-                WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
-                    AND (
-                        closing_date IS NULL
-                        OR TRIM(closing_date) = ''
-                        OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                ORDER BY department_name
-                LIMIT 100
-            """, (portal_name,))
-            self.portal_detail_missing_dates = [dict(row) for row in cursor.fetchall()]
+            with db.read_connection() as conn:
+                cursor = conn.cursor()
             
-            conn.close()
+                # Load duplicate records
+                cursor.execute("""
+                    SELECT portal_name, tender_id_extracted as tender_id, COUNT(*) as count
+                    FROM tenders
+                    WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
+                        AND tender_id_extracted IS NOT NULL
+                        AND TRIM(tender_id_extracted) != ''
+                    GROUP BY LOWER(TRIM(portal_name)), LOWER(TRIM(tender_id_extracted))
+                    HAVING COUNT(*) > 1
+                    ORDER BY count DESC
+                    LIMIT 100
+                """, (portal_name,))
+                self.portal_detail_duplicates = [dict(row) for row in cursor.fetchall()]
+            
+                # Load records with invalid/missing tender IDs
+                cursor.execute("""
+                    SELECT id, department_name, tender_id_extracted as tender_id, closing_date
+                    FROM tenders
+                    WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
+                        AND (
+                            tender_id_extracted IS NULL
+                            OR TRIM(tender_id_extracted) = ''
+                            OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
+                        )
+                    ORDER BY department_name
+                    LIMIT 100
+                """, (portal_name,))
+                self.portal_detail_invalid_ids = [dict(row) for row in cursor.fetchall()]
+            
+                # Load records with missing closing dates
+                cursor.execute("""
+                    SELECT id, department_name, tender_id_extracted as tender_id, closing_date
+                    FROM tenders
+                    WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
+                        AND (
+                            closing_date IS NULL
+                            OR TRIM(closing_date) = ''
+                            OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
+                        )
+                    ORDER BY department_name
+                    LIMIT 100
+                """, (portal_name,))
+                self.portal_detail_missing_dates = [dict(row) for row in cursor.fetchall()]
             
         except Exception as e:
             self.check_log.append(f"❌ Error loading portal details: {str(e)}")
@@ -522,99 +323,16 @@ class DataIntegrityState(rx.State):
         self.cleanup_portal = portal
         
         try:
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            portal_filter = ""
-            params = []
-            if portal != "All Portals":
-                portal_filter = "AND LOWER(TRIM(portal_name)) = LOWER(TRIM(?))"
-                params.append(portal)
+            with db.read_connection() as conn:
+                dup_count, inv_count = integrity.count_cleanup_targets(conn, action, portal)
             
+            self.cleanup_preview_count = dup_count + inv_count
             if action == "duplicates":
-                # Count duplicate rows that will be deleted (keeping newest)
-                query = f"""
-                    SELECT COUNT(*) as count
-                    FROM tenders t1
-                    WHERE tender_id_extracted IS NOT NULL 
-                        AND TRIM(tender_id_extracted) != ''
-                        {portal_filter}
-                        AND id NOT IN (
-                            SELECT MAX(id)
-                            FROM tenders t2
-                            WHERE LOWER(TRIM(t2.tender_id_extracted)) = LOWER(TRIM(t1.tender_id_extracted))
-                                AND LOWER(TRIM(t2.portal_name)) = LOWER(TRIM(t1.portal_name))
-                                {portal_filter.replace('?', '?' if not params else '?')}
-                            GROUP BY LOWER(TRIM(t2.tender_id_extracted)), LOWER(TRIM(t2.portal_name))
-                        )
-                """
-                cursor.execute(query, params * 2 if params else [])
-                count = cursor.fetchone()[0]
-                self.cleanup_preview_count = count
-                self.cleanup_preview_details = f"Will delete {count} duplicate tender(s), keeping the newest record for each tender ID."
-                
+                self.cleanup_preview_details = f"Will delete {dup_count} duplicate tender(s), keeping the newest record for each tender ID."
             elif action == "invalid":
-                # Count records with invalid/missing IDs or dates
-                query = f"""
-                    SELECT COUNT(*) as count
-                    FROM tenders
-                    WHERE (
-                        tender_id_extracted IS NULL
-                        OR TRIM(tender_id_extracted) = ''
-                        OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                        OR closing_date IS NULL
-                        OR TRIM(closing_date) = ''
-                        OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                    {portal_filter}
-                """
-                cursor.execute(query, params)
-                count = cursor.fetchone()[0]
-                self.cleanup_preview_count = count
-                self.cleanup_preview_details = f"Will delete {count} record(s) with missing or invalid tender IDs or closing dates."
-                
+                self.cleanup_preview_details = f"Will delete {inv_count} record(s) with missing or invalid tender IDs or closing dates."
             elif action == "all":
-                # Count all problematic records
-                query_dup = f"""
-                    SELECT COUNT(*) as count
-                    FROM tenders t1
-                    WHERE tender_id_extracted IS NOT NULL 
-                        AND TRIM(tender_id_extracted) != ''
-                        {portal_filter}
-                        AND id NOT IN (
-                            SELECT MAX(id)
-                            FROM tenders t2
-                            WHERE LOWER(TRIM(t2.tender_id_extracted)) = LOWER(TRIM(t1.tender_id_extracted))
-                                AND LOWER(TRIM(t2.portal_name)) = LOWER(TRIM(t1.portal_name))
-                                {portal_filter.replace('?', '?' if not params else '?')}
-                            GROUP BY LOWER(TRIM(t2.tender_id_extracted)), LOWER(TRIM(t2.portal_name))
-                        )
-                """
-                cursor.execute(query_dup, params * 2 if params else [])
-                dup_count = cursor.fetchone()[0]
-                
-                query_inv = f"""
-                    SELECT COUNT(*) as count
-                    FROM tenders
-                    WHERE (
-                        tender_id_extracted IS NULL
-                        OR TRIM(tender_id_extracted) = ''
-                        OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                        OR closing_date IS NULL
-                        OR TRIM(closing_date) = ''
-                        OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                    {portal_filter}
-                """
-                cursor.execute(query_inv, params)
-                inv_count = cursor.fetchone()[0]
-                
-                total_count = dup_count + inv_count
-                self.cleanup_preview_count = total_count
-                self.cleanup_preview_details = f"Will delete {dup_count} duplicate(s) and {inv_count} invalid record(s). Total: {total_count} records."
-            
-            conn.close()
+                self.cleanup_preview_details = f"Will delete {dup_count} duplicate(s) and {inv_count} invalid record(s). Total: {dup_count + inv_count} records."
             self.show_cleanup_dialog = True
             
         except Exception as e:
@@ -629,143 +347,59 @@ class DataIntegrityState(rx.State):
         self.cleanup_preview_details = ""
     
     def confirm_cleanup(self):
-        """Execute the confirmed cleanup action."""
+        """Execute the confirmed cleanup action in a background job."""
         self.show_cleanup_dialog = False
-        self.cleanup_running = True
-        yield
-        
-        try:
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
-            
-            # Create backup
-            backup_dir = Path(__file__).parent.parent.parent / "db_backups"
-            backup_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = backup_dir / f"backup_before_cleanup_{timestamp}.sqlite3"
-            
-            import shutil
-            shutil.copy2(db_path, backup_path)
-            self.check_log.append(f"💾 Backup created: {backup_path.name}")
-            yield
-            
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            portal_filter = ""
-            params = []
-            if self.cleanup_portal != "All Portals":
-                portal_filter = "AND LOWER(TRIM(portal_name)) = LOWER(TRIM(?))"
-                params.append(self.cleanup_portal)
-            
-            deleted_total = 0
-            
-            if self.cleanup_action in ["duplicates", "all"]:
-                # Delete duplicate records (keep newest)
-                query = f"""
-                    DELETE FROM tenders
-                    WHERE id IN (
-                        SELECT t1.id
-                        FROM tenders t1
-                        WHERE tender_id_extracted IS NOT NULL 
-                            AND TRIM(tender_id_extracted) != ''
-                            {portal_filter}
-                            AND t1.id NOT IN (
-                                SELECT MAX(id)
-                                FROM tenders t2
-                                WHERE LOWER(TRIM(t2.tender_id_extracted)) = LOWER(TRIM(t1.tender_id_extracted))
-                                    AND LOWER(TRIM(t2.portal_name)) = LOWER(TRIM(t1.portal_name))
-                                GROUP BY LOWER(TRIM(t2.tender_id_extracted)), LOWER(TRIM(t2.portal_name))
-                            )
-                    )
-                """
-                cursor.execute(query, params)
-                dup_deleted = cursor.rowcount
-                deleted_total += dup_deleted
-                self.check_log.append(f"🗑️ Deleted {dup_deleted} duplicate record(s)")
-                yield
-            
-            if self.cleanup_action in ["invalid", "all"]:
-                # Delete records with invalid/missing data
-                query = f"""
-                    DELETE FROM tenders
-                    WHERE (
-                        tender_id_extracted IS NULL
-                        OR TRIM(tender_id_extracted) = ''
-                        OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                        OR closing_date IS NULL
-                        OR TRIM(closing_date) = ''
-                        OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                    {portal_filter}
-                """
-                cursor.execute(query, params)
-                inv_deleted = cursor.rowcount
-                deleted_total += inv_deleted
-                self.check_log.append(f"🗑️ Deleted {inv_deleted} invalid record(s)")
-                yield
-            
-            conn.commit()
-            conn.close()
-            
-            portal_msg = f"for '{self.cleanup_portal}'" if self.cleanup_portal != "All Portals" else "across all portals"
-            self.check_log.append(f"✅ Cleanup complete {portal_msg}: {deleted_total} records deleted")
-            
-            # Re-run integrity check
-            yield from self.run_integrity_check()
-            
-        except Exception as e:
-            self.check_log.append(f"❌ Error during cleanup: {str(e)}")
-        
-        self.cleanup_running = False
+        params = {
+            "db_path": str(db.DB_PATH),
+            "backup_dir": str(_BACKUP_DIR),
+            "action": self.cleanup_action,
+            "portal": self.cleanup_portal,
+        }
+        if self._submit("integrity_cleanup", params):
+            self.cleanup_running = True
         self.cleanup_action = ""
         self.cleanup_portal = ""
         self.cleanup_preview_count = 0
         self.cleanup_preview_details = ""
-        yield
     
     def export_portal_issues(self, portal: str):
         """Export problematic records for a portal to Excel."""
         try:
-            db_path = Path(__file__).parent.parent.parent / "database" / "blackforest_tenders.sqlite3"
             export_dir = Path(__file__).parent.parent.parent / "Tender84_Exports"
             export_dir.mkdir(exist_ok=True)
             
             import pandas as pd
-            import sqlite3
-            
-            conn = sqlite3.connect(str(db_path))
-            
-            # Get duplicates
-            query_dup = """
-                SELECT portal_name, tender_id_extracted as tender_id, department_name, closing_date, COUNT(*) as duplicate_count
-                FROM tenders
-                WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
-                    AND tender_id_extracted IS NOT NULL
-                    AND TRIM(tender_id_extracted) != ''
-                GROUP BY LOWER(TRIM(tender_id_extracted))
-                HAVING COUNT(*) > 1
-                ORDER BY duplicate_count DESC
-            """
-            df_duplicates = pd.read_sql_query(query_dup, conn, params=(portal,))
             
-            # Get invalid records
-            query_invalid = """
-                SELECT id, portal_name, department_name, tender_id_extracted as tender_id, closing_date
-                FROM tenders
-                WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
-                    AND (
-                        tender_id_extracted IS NULL
-                        OR TRIM(tender_id_extracted) = ''
-                        OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                        OR closing_date IS NULL
-                        OR TRIM(closing_date) = ''
-                        OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
-                    )
-                ORDER BY department_name
-            """
-            df_invalid = pd.read_sql_query(query_invalid, conn, params=(portal,))
+            with db.read_connection() as conn:
+                # Get duplicates
+                query_dup = """
+                    SELECT portal_name, tender_id_extracted as tender_id, department_name, closing_date, COUNT(*) as duplicate_count
+                    FROM tenders
+                    WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
+                        AND tender_id_extracted IS NOT NULL
+                        AND TRIM(tender_id_extracted) != ''
+                    GROUP BY LOWER(TRIM(tender_id_extracted))
+                    HAVING COUNT(*) > 1
+                    ORDER BY duplicate_count DESC
+                """
+                df_duplicates = pd.read_sql_query(query_dup, conn, params=(portal,))
             
-            conn.close()
+                # Get invalid records
+                query_invalid = """
+                    SELECT id, portal_name, department_name, tender_id_extracted as tender_id, closing_date
+                    FROM tenders
+                    WHERE LOWER(TRIM(portal_name)) = LOWER(TRIM(?))
+                        AND (
+                            tender_id_extracted IS NULL
+                            OR TRIM(tender_id_extracted) = ''
+                            OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
+                            OR closing_date IS NULL
+                            OR TRIM(closing_date) = ''
+                            OR LOWER(TRIM(closing_date)) IN ('nan', 'none', 'null', 'n/a', 'na', '-', '--')
+                        )
+                    ORDER BY department_name
+                """
+                df_invalid = pd.read_sql_query(query_invalid, conn, params=(portal,))
             
             # Export to Excel
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1481,7 +1115,7 @@ def data_integrity_page() -> rx.Component:
                 rx.hstack(
                     rx.button(
                         rx.icon("refresh-cw"),
-                        "Re-check",
+                        "Deep Check",
                         on_click=DataIntegrityState.run_integrity_check,
                         variant="soft",
                         color_scheme="blue",
@@ -1518,6 +1152,27 @@ def data_integrity_page() -> rx.Component:
                 color="gray.10",
             ),
             
+            # Background job progress; the hidden moment ticks poll_job while a job is active
+            rx.cond(
+                DataIntegrityState.job_id != "",
+                rx.hstack(
+                    rx.moment(interval=1000, on_change=DataIntegrityState.poll_job, display="none"),
+                    rx.progress(value=DataIntegrityState.job_progress, width="300px"),
+                    rx.text(DataIntegrityState.job_message, size="2", color="gray.10"),
+                    rx.button(
+                        rx.icon("x"),
+                        "Cancel",
+                        on_click=DataIntegrityState.cancel_job,
+                        variant="soft",
+                        color_scheme="gray",
+                        size="1",
+                    ),
+                    align="center",
+                    spacing="3",
+                    width="100%",
+                ),
+            ),
+            
             rx.divider(),
             
             # Overall integrity score
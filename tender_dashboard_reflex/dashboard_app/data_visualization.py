@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import reflex as rx
 
-from tender_dashboard_reflex.state import DataVisualizationState, DataRow
+from tender_dashboard_reflex.state import DataVisualizationState, DataRow, QueryStatRow, SlowQueryRow
 
 
 def header_cell_listing(text: str) -> rx.Component:
@@ -687,6 +687,128 @@ def schema_visualization_tab() -> rx.Component:
     )
 
 
+def query_stat_row(row: QueryStatRow) -> rx.Component:
+    """One aggregated statement in the profiler panel."""
+    return rx.table.row(
+        rx.table.cell(rx.text(row.sql, size="1", font_family="monospace"), max_width="600px"),
+        rx.table.cell(row.calls, justify="end"),
+        rx.table.cell(row.total_ms, justify="end"),
+        rx.table.cell(row.max_ms, justify="end"),
+        rx.table.cell(row.rows, justify="end"),
+    )
+
+
+def slow_query_row(row: SlowQueryRow) -> rx.Component:
+    """One slow-query log entry in the profiler panel."""
+    return rx.table.row(
+        rx.table.cell(rx.text(row.ts, size="1")),
+        rx.table.cell(row.ms, justify="end"),
+        rx.table.cell(row.rows, justify="end"),
+        rx.table.cell(
+            rx.vstack(
+                rx.text(row.sql, size="1", font_family="monospace"),
+                rx.text(row.plan, size="1", color="gray.10"),
+                spacing="1",
+                align="start",
+            ),
+            max_width="600px",
+        ),
+        rx.table.cell(
+            rx.cond(
+                row.full_scan,
+                rx.badge("Full scan", color_scheme="red", size="1"),
+                rx.badge("Indexed", color_scheme="green", size="1"),
+            ),
+        ),
+    )
+
+
+def query_profiler_tab() -> rx.Component:
+    """Tab 3: Dev panel for the opt-in query profiler and slow-query log."""
+    return rx.vstack(
+        rx.callout(
+            rx.vstack(
+                rx.text("🛠️ Query Profiler (developer tool)", size="3", weight="bold"),
+                rx.text(
+                    f"Times every dashboard query while enabled. Queries slower than {DataVisualizationState.profiler_slow_ms} ms are EXPLAINed and logged to {DataVisualizationState.profiler_log_path}.",
+                    size="2",
+                ),
+                rx.text("Enable at startup with TENDER_DB_PROFILE=1; set the threshold with TENDER_DB_SLOW_MS.", size="2"),
+                spacing="1",
+                align="start",
+            ),
+            icon="info",
+            size="1",
+            color_scheme="gray",
+        ),
+        rx.hstack(
+            rx.hstack(
+                rx.switch(
+                    checked=DataVisualizationState.profiler_enabled,
+                    on_change=DataVisualizationState.toggle_profiler,
+                ),
+                rx.text("Profiling enabled", size="2", weight="medium"),
+                spacing="2",
+                align="center",
+            ),
+            rx.spacer(),
+            rx.button(
+                rx.icon("refresh-cw"),
+                "Refresh",
+                on_click=DataVisualizationState.load_profiler,
+                variant="soft",
+                size="2",
+            ),
+            rx.button(
+                rx.icon("eraser"),
+                "Clear Timings",
+                on_click=DataVisualizationState.clear_profiler,
+                variant="soft",
+                color_scheme="gray",
+                size="2",
+            ),
+            width="100%",
+            align="center",
+        ),
+        rx.heading("Top Statements (this process)", size="4"),
+        rx.table.root(
+            rx.table.header(
+                rx.table.row(
+                    rx.table.column_header_cell("SQL"),
+                    rx.table.column_header_cell("Calls", justify="end"),
+                    rx.table.column_header_cell("Total ms", justify="end"),
+                    rx.table.column_header_cell("Max ms", justify="end"),
+                    rx.table.column_header_cell("Rows", justify="end"),
+                ),
+            ),
+            rx.table.body(rx.foreach(DataVisualizationState.query_stats, query_stat_row)),
+            width="100%",
+            variant="surface",
+            size="1",
+        ),
+        rx.heading("Slow Query Log", size="4"),
+        rx.table.root(
+            rx.table.header(
+                rx.table.row(
+                    rx.table.column_header_cell("Time"),
+                    rx.table.column_header_cell("ms", justify="end"),
+                    rx.table.column_header_cell("Rows", justify="end"),
+                    rx.table.column_header_cell("SQL / Query Plan"),
+                    rx.table.column_header_cell("Plan"),
+                ),
+            ),
+            rx.table.body(rx.foreach(DataVisualizationState.slow_queries, slow_query_row)),
+            width="100%",
+            variant="surface",
+            size="1",
+        ),
+        spacing="4",
+        width="100%",
+        padding_top="1rem",
+        on_mount=DataVisualizationState.load_profiler,
+    )
+
+
 def data_visualization_page() -> rx.Component:
     """Main data visualization page with tabs."""
     return rx.box(
@@ -765,6 +887,7 @@ def data_visualization_page() -> rx.Component:
                 rx.tabs.list(
                     rx.tabs.trigger("📋 Data Grid", value="grid"),
                     rx.tabs.trigger("🗄️ Database Schema", value="schema"),
+                    rx.tabs.trigger("🛠️ Query Profiler", value="profiler"),
                 ),
                 rx.tabs.content(
                     data_grid_tab(),
@@ -774,6 +897,10 @@ def data_visualization_page() -> rx.Component:
                     schema_visualization_tab(),
                     value="schema",
                 ),
+                rx.tabs.content(
+                    query_profiler_tab(),
+                    value="profiler",
+                ),
                 default_value="grid",
                 width="100%",
             ),
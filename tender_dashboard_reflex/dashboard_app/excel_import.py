@@ -426,7 +426,22 @@ def import_action_section() -> rx.Component:
                 ExcelImportState.importing,
                 rx.box(
                     rx.vstack(
-                        rx.heading("Importing...", size="4", color="blue.11"),
+                        # Hidden ticker that polls the background import job
+                        rx.moment(interval=1000, on_change=ExcelImportState.poll_import_job, display="none"),
+                        rx.hstack(
+                            rx.heading("Importing...", size="4", color="blue.11"),
+                            rx.spacer(),
+                            rx.button(
+                                rx.icon("x"),
+                                "Cancel",
+                                on_click=ExcelImportState.cancel_import,
+                                variant="soft",
+                                color_scheme="gray",
+                                size="1",
+                            ),
+                            width="100%",
+                            align="center",
+                        ),
                         rx.progress(
                             value=ExcelImportState.import_progress,
                             max=100,
@@ -65,6 +65,11 @@ def public_export_interface() -> rx.Component:
                 width="100%",
                 loading=DashboardState.public_exporting,
             ),
+            # Background export job poller
+            rx.cond(
+                DashboardState.export_job_id != "",
+                rx.moment(interval=1000, on_change=DashboardState.poll_export_job, display="none"),
+            ),
             align="start",
             spacing="3",
             width="100%",
@@ -638,10 +643,35 @@ def portal_management_page() -> rx.Component:
                     width="100%",
                     align="center",
                 ),
+
+                # Export progress (streamed from the export engine)
+                rx.cond(
+                    PortalManagementState.exporting,
+                    rx.vstack(
+                        # Hidden ticker that polls the background export job
+                        rx.moment(interval=1000, on_change=PortalManagementState.poll_export_job, display="none"),
+                        rx.progress(value=PortalManagementState.export_progress, width="100%"),
+                        rx.hstack(
+                            rx.text(PortalManagementState.export_progress_message, size="1", color="gray"),
+                            rx.spacer(),
+                            rx.button(
+                                "Cancel",
+                                on_click=PortalManagementState.cancel_export,
+                                variant="ghost",
+                                color_scheme="gray",
+                                size="1",
+                            ),
+                            width="100%",
+                            align="center",
+                        ),
+                        spacing="1",
+                        width="100%",
+                    ),
+                ),
                 spacing="2",
                 width="100%",
             ),
-            
+
             rx.divider(),
             
             # Portal table
@@ -14,6 +14,8 @@ from typing import Dict, List, Optional
 import reflex as rx
 from pydantic import BaseModel
 
+from tender_dashboard_reflex import db
+
 logger = logging.getLogger(__name__)
 
 
@@ -232,7 +234,6 @@ class ScrapingControlState(rx.State):
         """Load portal status from database and base_urls.csv"""
         try:
             import csv
-            import sqlite3
             
             # Read all configured portals
             portals_config = {}
@@ -249,29 +250,27 @@ class ScrapingControlState(rx.State):
                             }
             
             # Get portal stats from database
-            db_path = Path("database/blackforest_tenders.sqlite3")
             portal_stats = {}
-            if db_path.exists():
-                conn = sqlite3.connect(str(db_path))
-                cursor = conn.cursor()
-                results = cursor.execute("""
-                    SELECT 
-                        portal_name,
-                        COUNT(*) as tender_count,
-                        MAX(published_date) as latest_published,
-                        MAX(run_id) as latest_run_id
-                    FROM tenders
-                    WHERE portal_name IS NOT NULL
-                    GROUP BY portal_name
-                """).fetchall()
+            if db.DB_PATH.exists():
+                with db.read_connection() as conn:
+                    cursor = conn.cursor()
+                    results = cursor.execute("""
+                        SELECT 
+                            portal_name,
+                            COUNT(*) as tender_count,
+                            MAX(published_date) as latest_published,
+                            MAX(run_id) as latest_run_id
+                        FROM tenders
+                        WHERE portal_name IS NOT NULL
+                        GROUP BY portal_name
+                    """).fetchall()
                 
-                for portal, count, latest_pub, latest_run in results:
-                    portal_stats[portal] = {
-                        'tender_count': count,
-                        'latest_published': latest_pub or '',
-                        'latest_run_id': latest_run or 0
-                    }
-                conn.close()
+                    for portal, count, latest_pub, latest_run in results:
+                        portal_stats[portal] = {
+                            'tender_count': count,
+                            'latest_published': latest_pub or '',
+                            'latest_run_id': latest_run or 0
+                        }
             
             # Combine data
             status_list = []
@@ -1,6 +1,14 @@
 """
 Scraping Worker Manager - Process-based workers to avoid GIL/freezing.
 Imports existing scraper logic without modifications.
+
+Workers report back over worker_event_bus (project root): progress numbers
+go into shared-memory counters, log lines and status text go over a pipe
+as batched struct-packed records, so nothing is pickled per message.
+
+When a scraper daemon (cli_main.py serve) is running, portals are submitted
+to it as department jobs instead and its job events are relayed in the same
+update shapes, so no cold worker processes are started.
 """
 
 import multiprocessing as mp
@@ -11,6 +19,9 @@ from pathlib import Path
 from typing import List, Callable, Dict, Optional, Set
 import sys
 
+# From this many worker processes on, scrapers default to the quiet log mode
+QUIET_LOG_WORKER_COUNT = 4
+
 
 class ScrapingWorkerManager:
     """Manages multiprocessing workers for concurrent scraping without freezing."""
@@ -23,6 +34,7 @@ class ScrapingWorkerManager:
         portal_resume_data: Optional[Dict[str, Dict]] = None,
         js_batch_threshold: int = 300,
         js_batch_size: int = 2000,
+        log_mode: Optional[str] = None,
     ):
         self.selected_portals = selected_portals
         self.worker_count = worker_count
@@ -30,10 +42,12 @@ class ScrapingWorkerManager:
         self.portal_resume_data = portal_resume_data or {}
         self.js_batch_threshold = js_batch_threshold
         self.js_batch_size = js_batch_size
+        # Many workers share one UI: keep only counters and summaries unless asked otherwise
+        self.log_mode = log_mode or ("quiet" if worker_count >= QUIET_LOG_WORKER_COUNT else "normal")
         
-        # Multiprocessing queues for communication
+        # Portal configs go out on a queue; events come back over worker_event_bus
         self.task_queue = mp.Queue()
-        self.result_queue = mp.Queue()
+        self.counters = None
         
         # Worker processes
         self.workers = []
@@ -52,12 +66,21 @@ class ScrapingWorkerManager:
             if str(self.project_root) not in sys.path:
                 sys.path.insert(0, str(self.project_root))
             
+            # Checkpoint resumes need the in-process workers (they skip completed departments)
+            if not any(self.portal_resume_data.values()):
+                from daemon_client import connect
+                daemon_client = connect()
+                if daemon_client is not None:
+                    self._scrape_with_daemon(daemon_client, progress_callback)
+                    return
+            
             # Import required modules
             import pandas as pd
             from scraper.playwright_logic import fetch_department_list_from_site_playwright
             from scraper.logic import run_scraping_logic
             from scraper.driver_manager import setup_driver, safe_quit_driver
             from tender_store import TenderDataStore
+            from worker_event_bus import EventBusReader, WorkerCounters
             
             # Load portal configurations
             base_urls_csv = self.project_root / "base_urls.csv"
@@ -110,14 +133,23 @@ class ScrapingWorkerManager:
                 "message": f"Starting {self.worker_count} worker processes..."
             })
             
+            self.counters = WorkerCounters.create(mp, self.worker_count)
+            event_readers = []
             try:
                 for worker_id in range(self.worker_count):
+                    reader_conn, writer_conn = mp.Pipe(duplex=False)
                     process = mp.Process(
                         target=ScrapingWorkerManager._worker_process,
-                        args=(worker_id, self.task_queue, self.result_queue, str(self.project_root), self.js_batch_threshold, self.js_batch_size)
+                        args=(
+                            worker_id, self.task_queue, writer_conn, self.counters.array, self.worker_count,
+                            str(self.project_root), self.js_batch_threshold, self.js_batch_size, self.log_mode,
+                        )
                     )
                     process.daemon = True
                     process.start()
+                    # Only the worker holds the write end, so its exit shows up as EOF
+                    writer_conn.close()
+                    event_readers.append(reader_conn)
                     self.workers.append(process)
                     
                     progress_callback({
@@ -132,52 +164,29 @@ class ScrapingWorkerManager:
                 return
             
             # Monitor progress
-            active_workers = self.worker_count
-            while active_workers > 0:
+            reader = EventBusReader(event_readers, self.counters)
+            worker_portals = {}
+            while reader.active > 0:
                 try:
-                    # Non-blocking check for results
-                    result = self.result_queue.get(timeout=1)
-                    
-                    if result is None:
-                        # Worker finished
-                        active_workers -= 1
-                        continue
-                    
-                    # Process result
-                    result_type = result.get("type", "log")
-                    
-                    if result_type == "log":
-                        progress_callback(result)
-                    
-                    elif result_type == "worker_status":
-                        progress_callback(result)
-                    
-                    elif result_type == "portal_complete":
-                        self.portals_completed += 1
-                        self.total_tenders += result.get("tenders_found", 0)
-                        self.total_departments += result.get("departments_processed", 0)
-                        self.total_skipped_existing += result.get("skipped_existing_total", 0)
-                        self.total_closing_date_reprocessed += result.get("closing_date_reprocessed_total", 0)
+                    for result in reader.poll(timeout=1):
+                        result_type = result.get("type", "log")
                         
-                        progress_callback({
-                            "type": "totals",
-                            "total_tenders": self.total_tenders,
-                            "total_departments": self.total_departments,
-                            "portals_completed": self.portals_completed,
-                            "skipped_existing_total": self.total_skipped_existing,
-                            "closing_date_reprocessed_total": self.total_closing_date_reprocessed,
-                        })
+                        if result_type == "log":
+                            # DEBUG lines repeat log_callback output (scraper's ui_message_queue calls)
+                            if result.get("level") != "DEBUG":
+                                progress_callback(result)
                         
-                        progress_callback({
-                            "type": "log",
-                            "message": f"✓ Portal '{result.get('portal_name')}' completed: "
-                                      f"{result.get('tenders_found', 0)} tenders, "
-                                      f"{result.get('departments_processed', 0)} departments"
-                        })
+                        elif result_type == "worker_status":
+                            # Counter-only updates carry no text: tag them with the worker's portal
+                            if result.get("portal_name"):
+                                worker_portals[result["worker_id"]] = result["portal_name"]
+                            elif result["worker_id"] in worker_portals:
+                                result["portal_name"] = worker_portals[result["worker_id"]]
+                            progress_callback(result)
+                        
+                        elif result_type == "portal_complete":
+                            self._record_portal_complete(result, progress_callback)
                 
-                except queue.Empty:
-                    # No results yet, continue monitoring
-                    continue
                 except Exception as e:
                     progress_callback({
                         "type": "log",
@@ -200,25 +209,124 @@ class ScrapingWorkerManager:
                 "message": f"FATAL ERROR: {str(e)}"
             })
     
+    def _record_portal_complete(self, result: Dict, progress_callback: Callable[[Dict], None]):
+        self.portals_completed += 1
+        self.total_tenders += result.get("tenders_found", 0)
+        self.total_departments += result.get("departments_processed", 0)
+        self.total_skipped_existing += result.get("skipped_existing_total", 0)
+        self.total_closing_date_reprocessed += result.get("closing_date_reprocessed_total", 0)
+        
+        progress_callback({
+            "type": "totals",
+            "total_tenders": self.total_tenders,
+            "total_departments": self.total_departments,
+            "portals_completed": self.portals_completed,
+            "skipped_existing_total": self.total_skipped_existing,
+            "closing_date_reprocessed_total": self.total_closing_date_reprocessed,
+        })
+        
+        progress_callback({
+            "type": "log",
+            "message": f"✓ Portal '{result.get('portal_name')}' completed: "
+                      f"{result.get('tenders_found', 0)} tenders, "
+                      f"{result.get('departments_processed', 0)} departments"
+        })
+    
+    def _scrape_with_daemon(self, client, progress_callback: Callable[[Dict], None]):
+        """Run each selected portal as a scraper daemon job and relay the job events."""
+        from daemon_client import DaemonUnavailable, JobFollower
+        
+        updates = queue.Queue()
+        followers = []
+        for position, portal_name in enumerate(self.selected_portals):
+            argv = ["--url", portal_name, "department", "--all", "--log-mode", self.log_mode]
+            try:
+                job = client.submit(argv)
+            except (DaemonUnavailable, RuntimeError) as e:
+                progress_callback({"type": "log", "message": f"ERROR submitting '{portal_name}' to the scraper daemon: {e}"})
+                continue
+            slot = position % max(1, self.worker_count)
+            followers.append(JobFollower(
+                client,
+                job["job_id"],
+                on_event=lambda event, s=slot, p=portal_name: updates.put((s, p, event)),
+                on_error=lambda message, s=slot, p=portal_name: updates.put((s, p, {"type": "error", "message": message})),
+            ).start())
+        
+        progress_callback({
+            "type": "log",
+            "message": f"Submitted {len(followers)} portal(s) to the scraper daemon (pid {client.info.get('pid')})"
+        })
+        
+        while followers:
+            try:
+                slot, portal_name, event = updates.get(timeout=1)
+            except queue.Empty:
+                if not any(follower.is_alive() for follower in followers):
+                    break
+                continue
+            
+            event_type = event.get("type")
+            if event_type == "log":
+                if event.get("level") != "DEBUG":
+                    progress_callback({"type": "log", "message": f"[{portal_name}] {event.get('message', '')}"})
+            elif event_type == "departments_loaded":
+                progress_callback({
+                    "type": "worker_status",
+                    "worker_id": slot,
+                    "status": "running",
+                    "portal_name": portal_name,
+                    "expected_departments": int(event.get("total_departments", 0) or 0),
+                    "expected_tenders": int(event.get("estimated_total_tenders", 0) or 0),
+                })
+            elif event_type == "progress":
+                progress_callback({
+                    "type": "worker_status",
+                    "worker_id": slot,
+                    "status": "running",
+                    "portal_name": portal_name,
+                    "department_name": event.get("details", ""),
+                    "dept_current": int(event.get("current", 0) or 0),
+                    "dept_total": int(event.get("total", 0) or 0),
+                    "tenders_found": int(event.get("scraped_tenders", 0) or 0),
+                    "progress_percent": float(event.get("percent", 0) or 0),
+                })
+            elif event_type == "completed":
+                self._record_portal_complete({
+                    "portal_name": portal_name,
+                    "tenders_found": int(event.get("extracted_total_tenders", 0) or 0),
+                    "departments_processed": int(event.get("processed_departments", 0) or 0),
+                    "skipped_existing_total": int(event.get("skipped_existing_total", 0) or 0),
+                }, progress_callback)
+                progress_callback({"type": "worker_status", "worker_id": slot, "status": "completed", "portal_name": portal_name})
+            elif event_type == "error":
+                progress_callback({"type": "log", "message": f"ERROR [{portal_name}]: {event.get('message', '')}"})
+                progress_callback({"type": "worker_status", "worker_id": slot, "status": "failed", "portal_name": portal_name})
+            elif event_type == "exit" and int(event.get("exit_code", 1) or 0) != 0:
+                progress_callback({"type": "log", "message": f"[{portal_name}] daemon job exited with code {event.get('exit_code')}"})
+                progress_callback({"type": "worker_status", "worker_id": slot, "status": "failed", "portal_name": portal_name})
+        
+        progress_callback({
+            "type": "log",
+            "message": f"All daemon jobs completed! Total: {self.total_tenders} tenders, "
+                      f"{self.total_departments} departments, {self.portals_completed} portals"
+        })
+    
     @staticmethod
-    def _worker_process(worker_id: int, task_queue: mp.Queue, result_queue: mp.Queue, project_root: str, js_batch_threshold: int = 300, js_batch_size: int = 2000):
+    def _worker_process(worker_id: int, task_queue: mp.Queue, event_conn, counters_array, worker_count: int, project_root: str, js_batch_threshold: int = 300, js_batch_size: int = 2000, log_mode: str = "normal"):
         """Worker process function - runs in separate process."""
+        # Add project root to path (worker_event_bus lives there)
+        project_root_path = Path(project_root)
+        if str(project_root_path) not in sys.path:
+            sys.path.insert(0, str(project_root_path))
+        
+        from worker_event_bus import EventPublisher, WorkerCounters
+        
+        events = EventPublisher(event_conn, WorkerCounters(counters_array, worker_count), worker_id)
         try:
             # Send immediate startup log
-            result_queue.put({
-                "type": "log",
-                "message": f"[DEBUG] Worker {worker_id + 1} process started"
-            })
-            
-            # Add project root to path
-            project_root_path = Path(project_root)
-            if str(project_root_path) not in sys.path:
-                sys.path.insert(0, str(project_root_path))
-            
-            result_queue.put({
-                "type": "log",
-                "message": f"[DEBUG] Worker {worker_id + 1} added project root to path: {project_root}"
-            })
+            events.log(f"[DEBUG] Worker {worker_id + 1} process started")
+            events.log(f"[DEBUG] Worker {worker_id + 1} added project root to path: {project_root}")
             
             # Import required modules (inside worker process)
             try:
@@ -226,24 +334,18 @@ class ScrapingWorkerManager:
                 from scraper.logic import run_scraping_logic, fetch_department_list_from_site_v2
                 from scraper.driver_manager import setup_driver, safe_quit_driver
                 from tender_store import TenderDataStore
+                import ui_message_queue
                 import os
                 
-                result_queue.put({
-                    "type": "log",
-                    "message": f"[DEBUG] Worker {worker_id + 1} imported modules successfully"
-                })
+                # Nothing drains the in-process UI queue here: forward it to the parent
+                ui_message_queue.set_event_sink(events.ui_message)
+                
+                events.log(f"[DEBUG] Worker {worker_id + 1} imported modules successfully")
             except Exception as import_error:
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1} IMPORT ERROR: {str(import_error)}"
-                })
-                result_queue.put(None)  # Signal worker completion
+                events.log(f"Worker {worker_id + 1} IMPORT ERROR: {str(import_error)}", "ERROR")
                 return
             
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1} initialized (PID: {os.getpid()})"
-            })
+            events.log(f"Worker {worker_id + 1} initialized (PID: {os.getpid()})")
             
             # Process tasks until poison pill
             while True:
@@ -253,42 +355,48 @@ class ScrapingWorkerManager:
                     
                     if portal_config is None:
                         # Poison pill - worker is done
-                        result_queue.put({
-                            "type": "log",
-                            "message": f"Worker {worker_id + 1} shutting down"
-                        })
-                        result_queue.put(None)  # Signal worker completion
+                        events.log(f"Worker {worker_id + 1} shutting down")
                         break
                     
                     # Scrape this portal
                     ScrapingWorkerManager._scrape_portal_worker(
                         worker_id,
                         portal_config,
-                        result_queue,
+                        events,
                         project_root_path,
                         js_batch_threshold,
-                        js_batch_size
+                        js_batch_size,
+                        log_mode
                     )
                 
                 except queue.Empty:
                     # No tasks available yet
                     continue
                 except Exception as e:
-                    result_queue.put({
-                        "type": "log",
-                        "message": f"Worker {worker_id + 1} ERROR: {str(e)}"
-                    })
+                    events.log(f"Worker {worker_id + 1} ERROR: {str(e)}", "ERROR")
         
         except Exception as e:
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1} FATAL ERROR: {str(e)}"
-            })
+            events.log(f"Worker {worker_id + 1} FATAL ERROR: {str(e)}", "ERROR")
+        finally:
+            # Signal worker completion
+            events.close()
+    
+    @staticmethod
+    def _emit_status(events, **fields):
+        """Split a worker_status update: numbers to shared counters, text over the pipe."""
+        from worker_event_bus import COUNTER_FIELDS
+        
+        counters = {name: fields.pop(name) for name in list(fields) if name in COUNTER_FIELDS}
+        if counters:
+            events.progress(**counters)
+        if fields:
+            events.status(**fields)
     
     @staticmethod
-    def _scrape_portal_worker(worker_id: int, portal_config: Dict, result_queue: mp.Queue, project_root: Path, js_batch_threshold: int = 300, js_batch_size: int = 2000):
+    def _scrape_portal_worker(worker_id: int, portal_config: Dict, events, project_root: Path, js_batch_threshold: int = 300, js_batch_size: int = 2000, log_mode: str = "normal"):
         """Scrape a single portal (runs in worker process)."""
         driver = None
+        db_known_tenders = None
         portal_name = portal_config.get('Name', 'Unknown') if portal_config else 'Unknown'
         safe_quit_driver = None
         log_callback = lambda msg: None
@@ -298,6 +406,7 @@ class ScrapingWorkerManager:
             from scraper.logic import run_scraping_logic
             from scraper.driver_manager import setup_driver, safe_quit_driver
             from tender_store import TenderDataStore
+            from scraper.known_id_index import open_known_id_filter
             import os
             
             base_url = portal_config.get('BaseURL', '')
@@ -309,111 +418,80 @@ class ScrapingWorkerManager:
                 if str(name).strip()
             }
 
-            db_known_tender_ids: Set[str] = set()
-            db_tender_snapshot: Dict[str, Dict[str, str]] = {}
+            db_path = project_root / "database" / "blackforest_tenders.sqlite3"
             try:
-                db_path = project_root / "database" / "blackforest_tenders.sqlite3"
-                store = TenderDataStore(str(db_path))
-                db_known_tender_ids = set(store.get_existing_tender_ids_for_portal(portal_name) or [])
-                db_tender_snapshot = dict(store.get_existing_tender_snapshot_for_portal(portal_name) or {})
+                TenderDataStore(str(db_path))  # create/upgrade the schema before indexing
+                # Memory-mapped known-ID index; live tenders are skipped, extended ones re-scraped
+                db_known_tenders = open_known_id_filter(str(db_path), portal_name, live_only=True)
                 
                 # Log duplicate detection status
-                if db_known_tender_ids:
-                    result_queue.put({
-                        "type": "log",
-                        "message": f"Worker {worker_id + 1}: 🔍 Duplicate detection active - {len(db_known_tender_ids)} existing tender(s) in DB will be skipped"
-                    })
+                if len(db_known_tenders):
+                    events.log(f"Worker {worker_id + 1}: 🔍 Duplicate detection active - {len(db_known_tenders)} known tender ID(s) in DB will be checked")
             except Exception as known_ids_err:
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1}: WARNING could not load existing tender IDs for resume: {known_ids_err}"
-                })
+                events.log(f"Worker {worker_id + 1}: WARNING could not load existing tender IDs for resume: {known_ids_err}")
 
             resume_dept_count = len(processed_department_names)
             
-            result_queue.put({
-                "type": "worker_status",
-                "worker_id": worker_id,
-                "status": "running",
-                "portal_name": portal_name,
-                "current_department": "Fetching departments..." if resume_dept_count == 0 else f"Resuming: {resume_dept_count} department(s) already completed",
-                "tenders_found": 0,
-                "expected_tenders": 0,
-                "expected_departments": 0,
-                "tender_percent": 0,
-                "progress_percent": 10,
-            })
+            # The counter row still holds this worker's previous portal
+            events.reset_progress()
+            ScrapingWorkerManager._emit_status(
+                events,
+                status="running",
+                portal_name=portal_name,
+                current_department="Fetching departments..." if resume_dept_count == 0 else f"Resuming: {resume_dept_count} department(s) already completed",
+                tenders_found=0,
+                expected_tenders=0,
+                expected_departments=0,
+                tender_percent=0,
+                progress_percent=10,
+            )
             
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1}: Starting portal '{portal_name}'"
-            })
+            events.log(f"Worker {worker_id + 1}: Starting portal '{portal_name}'")
             
             # Fetch department list using Playwright (faster)
             def log_callback(msg):
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1}: {msg}"
-                })
+                events.log(f"Worker {worker_id + 1}: {msg}")
             
             # Construct the proper OrgListURL with FrontEndTendersByOrganisation query parameter
             org_list_url = portal_config.get('OrgListURL', None)
             if not org_list_url:
                 # Auto-construct the direct URL pattern for faster navigation
                 org_list_url = f"{base_url}?page=FrontEndTendersByOrganisation&service=page"
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1}: 🚀 Using direct URL pattern: {org_list_url}"
-                })
+                events.log(f"Worker {worker_id + 1}: 🚀 Using direct URL pattern: {org_list_url}")
             departments, total_count = fetch_department_list_from_site_playwright(
                 org_list_url,
                 log_callback=log_callback
             )
             
             if not departments:
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1}: No departments found for '{portal_name}'"
-                })
-                result_queue.put({
-                    "type": "portal_complete",
-                    "worker_id": worker_id,
-                    "portal_name": portal_name,
-                    "tenders_found": 0,
-                    "departments_processed": 0,
-                })
+                events.log(f"Worker {worker_id + 1}: No departments found for '{portal_name}'")
+                events.portal_complete(
+                    portal_name=portal_name,
+                    tenders_found=0,
+                    departments_processed=0,
+                )
                 return
             
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1}: Found {len(departments)} departments (expected {total_count} tenders)"
-            })
-            
-            result_queue.put({
-                "type": "worker_status",
-                "worker_id": worker_id,
-                "status": "running",
-                "portal_name": portal_name,
-                "current_department": f"Processing {len(departments)} departments...",
-                "tenders_found": 0,
-                "expected_tenders": int(total_count or 0),
-                "expected_departments": len(departments),
-                "tender_percent": 0,
-                "progress_percent": 30,
-            })
+            events.log(f"Worker {worker_id + 1}: Found {len(departments)} departments (expected {total_count} tenders)")
+            
+            ScrapingWorkerManager._emit_status(
+                events,
+                status="running",
+                portal_name=portal_name,
+                current_department=f"Processing {len(departments)} departments...",
+                tenders_found=0,
+                expected_tenders=int(total_count or 0),
+                expected_departments=len(departments),
+                tender_percent=0,
+                progress_percent=30,
+            )
 
             if resume_dept_count > 0:
-                result_queue.put({
-                    "type": "log",
-                    "message": f"Worker {worker_id + 1}: ✓ Resume mode for '{portal_name}' - {resume_dept_count} department(s) will be skipped"
-                })
+                events.log(f"Worker {worker_id + 1}: ✓ Resume mode for '{portal_name}' - {resume_dept_count} department(s) will be skipped")
                 # Show first few department names for verification
                 if processed_department_names:
                     sample_depts = list(processed_department_names)[:3]
-                    result_queue.put({
-                        "type": "log",
-                        "message": f"Worker {worker_id + 1}: Completed depts (sample): {', '.join(sample_depts)}"
-                    })
+                    events.log(f"Worker {worker_id + 1}: Completed depts (sample): {', '.join(sample_depts)}")
             
             # Setup WebDriver for scraping
             download_dir = project_root / "Tender_Downloads" / portal_name
@@ -432,6 +510,7 @@ class ScrapingWorkerManager:
             
             # Track cumulative skipped duplicates for this worker
             worker_skipped_existing = [0]  # Use list for mutable reference
+            last_status_dept = [None]  # Department of the last status text sent
             
             # Callbacks for progress updates
             def progress_callback(*args, **kwargs):
@@ -496,48 +575,37 @@ class ScrapingWorkerManager:
                     dept_display = dept_name[:40] if dept_name else "Processing..."
                     detailed_status = f"Dept {current}/{total}: {dept_display}"
                     
-                    result_queue.put({
-                        "type": "worker_status",
-                        "worker_id": worker_id,
-                        "status": "running",
-                        "portal_name": portal_name,
-                        "current_department": detailed_status,
-                        "department_name": dept_name or "",
-                        "dept_current": current,
-                        "dept_total": total,
-                        "tenders_found": tenders_scraped,
-                        "expected_tenders": expected_tenders,
-                        "expected_departments": total,
-                        "tender_percent": tender_percent,
-                        "pending_depts": pending_depts,
-                        "progress_percent": percent,
-                        "skipped_existing": worker_skipped_existing[0],
-                        "checkpoint_department_completed": checkpoint_department_completed,
-                    })
+                    # Numbers on every call: shared counters only, no IPC
+                    events.progress(
+                        dept_current=current,
+                        dept_total=total,
+                        tenders_found=tenders_scraped,
+                        expected_tenders=expected_tenders,
+                        expected_departments=total,
+                        tender_percent=tender_percent,
+                        pending_depts=pending_depts,
+                        progress_percent=percent,
+                        skipped_existing=worker_skipped_existing[0],
+                    )
+                    # Text only when it changes (or a department finished)
+                    if dept_name != last_status_dept[0] or checkpoint_department_completed:
+                        last_status_dept[0] = dept_name
+                        events.status(
+                            status="running",
+                            portal_name=portal_name,
+                            current_department=detailed_status,
+                            department_name=dept_name or "",
+                            checkpoint_department_completed=checkpoint_department_completed,
+                        )
                     
                     # Periodic checkpoint save (every 2 minutes for large departments)
                     current_time = time.time()
                     time_since_last_checkpoint = current_time - last_checkpoint_time[0]
                     if time_since_last_checkpoint >= CHECKPOINT_INTERVAL:
-                        result_queue.put({
-                            "type": "log",
-                            "message": f"Worker {worker_id + 1}: 💾 Periodic checkpoint (2min timer) - {current}/{total} depts, {tenders_scraped} tenders"
-                        })
+                        events.log(f"Worker {worker_id + 1}: 💾 Periodic checkpoint (2min timer) - {current}/{total} depts, {tenders_scraped} tenders")
                         # Send checkpoint signal
-                        result_queue.put({
-                            "type": "worker_status",
-                            "worker_id": worker_id,
-                            "checkpoint_department_completed": normalized_dept if dept_name else "",
-                        })
+                        events.status(checkpoint_department_completed=normalized_dept if dept_name else "")
                         last_checkpoint_time[0] = current_time
-                    
-                    # Also send totals update
-                    result_queue.put({
-                        "type": "totals",
-                        "total_tenders": tenders_scraped,
-                        "total_departments": current,
-                        "portals_completed": 0,
-                    })
             
             tenders_found = [0]  # Use list to allow modification in nested function
             
@@ -547,12 +615,11 @@ class ScrapingWorkerManager:
                     try:
                         count_str = msg.split("Total tenders extracted:")[1].strip()
                         tenders_found[0] = int(count_str)
-                        result_queue.put({
-                            "type": "worker_status",
-                            "worker_id": worker_id,
-                            "tenders_found": tenders_found[0],
-                            "skipped_existing": worker_skipped_existing[0],
-                        })
+                        ScrapingWorkerManager._emit_status(
+                            events,
+                            tenders_found=tenders_found[0],
+                            skipped_existing=worker_skipped_existing[0],
+                        )
                     except:
                         pass
             
@@ -574,14 +641,14 @@ class ScrapingWorkerManager:
                 status_callback=status_callback,
                 driver=driver,
                 deep_scrape=False,  # Only listing page for now
-                existing_tender_ids=db_known_tender_ids,  # Skip duplicates
-                existing_tender_snapshot=db_tender_snapshot,  # Check for closing date changes
+                existing_tender_filter=db_known_tenders,  # Skip duplicates, re-scrape closing date changes
                 existing_department_names=processed_department_names,  # Resume from checkpoint
                 sqlite_db_path=str(db_path),
                 export_policy="always",
                 department_parallel_workers=3,  # Enable 3-worker parallel department processing (3x faster!)
                 js_batch_threshold=js_batch_threshold,  # User-configurable via GUI
                 js_batch_size=js_batch_size,  # User-configurable via GUI
+                log_mode=log_mode,
             )
             
             # Extract results
@@ -598,52 +665,44 @@ class ScrapingWorkerManager:
             processed_department_names.update(normalized_summary_departments)
             
             # Log duplicate detection summary
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1}: ✅ '{portal_name}' complete - New: {final_tender_count}, Skipped: {skipped_existing_total}, Extended: {closing_date_reprocessed_total}"
-            })
-            
-            result_queue.put({
-                "type": "worker_status",
-                "worker_id": worker_id,
-                "status": "completed",
-                "portal_name": portal_name,
-                "dept_current": departments_processed,
-                "dept_total": max(departments_processed, len(departments)),
-                "expected_departments": max(departments_processed, len(departments)),
-                "tenders_found": final_tender_count,
-                "expected_tenders": int(total_count or final_tender_count),
-                "tender_percent": 100,
-                "progress_percent": 100,
-                "skipped_existing": skipped_existing_total,
-                "checkpoint_processed_departments": sorted(processed_department_names),
-            })
+            events.log(f"Worker {worker_id + 1}: ✅ '{portal_name}' complete - New: {final_tender_count}, Skipped: {skipped_existing_total}, Extended: {closing_date_reprocessed_total}")
+            
+            ScrapingWorkerManager._emit_status(
+                events,
+                status="completed",
+                portal_name=portal_name,
+                dept_current=departments_processed,
+                dept_total=max(departments_processed, len(departments)),
+                expected_departments=max(departments_processed, len(departments)),
+                tenders_found=final_tender_count,
+                expected_tenders=int(total_count or final_tender_count),
+                tender_percent=100,
+                progress_percent=100,
+                skipped_existing=skipped_existing_total,
+                checkpoint_processed_departments=sorted(processed_department_names),
+            )
             
-            result_queue.put({
-                "type": "portal_complete",
-                "worker_id": worker_id,
-                "portal_name": portal_name,
-                "tenders_found": final_tender_count,
-                "departments_processed": departments_processed,
-                "skipped_existing_total": skipped_existing_total,
-                "closing_date_reprocessed_total": closing_date_reprocessed_total,
-                "checkpoint_processed_departments": sorted(processed_department_names),
-            })
+            events.portal_complete(
+                portal_name=portal_name,
+                tenders_found=final_tender_count,
+                departments_processed=departments_processed,
+                skipped_existing_total=skipped_existing_total,
+                closing_date_reprocessed_total=closing_date_reprocessed_total,
+                checkpoint_processed_departments=sorted(processed_department_names),
+            )
         
         except Exception as e:
-            result_queue.put({
-                "type": "log",
-                "message": f"Worker {worker_id + 1} ERROR scraping '{portal_name}': {str(e)}"
-            })
+            events.log(f"Worker {worker_id + 1} ERROR scraping '{portal_name}': {str(e)}")
             
-            result_queue.put({
-                "type": "worker_status",
-                "worker_id": worker_id,
-                "status": "failed",
-                "portal_name": portal_name,
-            })
+            ScrapingWorkerManager._emit_status(
+                events,
+                status="failed",
+                portal_name=portal_name,
+            )
         
         finally:
+            if db_known_tenders is not None:
+                db_known_tenders.close()
             # Cleanup WebDriver
             if driver and safe_quit_driver:
                 try:
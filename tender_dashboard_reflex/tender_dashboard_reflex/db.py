@@ -2,19 +2,24 @@ from __future__ import annotations
 
 import sqlite3
 import csv
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 import json
 
+from . import query_profiler
+
 
 # IST = UTC+5:30 (Indian Standard Time used by all NIC portals)
 _IST = timezone(timedelta(hours=5, minutes=30))
 
 
 def _resolve_db_path() -> Path:
+    """Locate the tender database. Every dashboard module reads DB_PATH."""
     env_path = os.getenv("TENDER_DB_PATH", "").strip()
     if env_path:
         return Path(env_path).expanduser().resolve()
@@ -23,10 +28,15 @@ def _resolve_db_path() -> Path:
     if fixed_workspace_path.exists():
         return fixed_workspace_path
 
+    workspace_root = Path(__file__).resolve().parents[2]
     candidates = [
-        Path(__file__).resolve().parents[2] / "data" / "blackforest_tenders.sqlite3",
+        workspace_root / "data" / "blackforest_tenders.sqlite3",
         Path.cwd() / "data" / "blackforest_tenders.sqlite3",
         Path.cwd().parent / "data" / "blackforest_tenders.sqlite3",
+        # Default location written by the scraper (tender_store/cleanup_service)
+        workspace_root / "database" / "blackforest_tenders.sqlite3",
+        Path.cwd() / "database" / "blackforest_tenders.sqlite3",
+        Path.cwd().parent / "database" / "blackforest_tenders.sqlite3",
     ]
     for candidate in candidates:
         if candidate.exists():
@@ -91,19 +101,92 @@ class TenderFilters:
     show_expired_only: bool = False
 
 
-def _get_connection() -> sqlite3.Connection:
-    db_path_str = str(DB_PATH)
+# Read-only connection pool
+# Dashboard sessions only read the tender database, so connections are opened
+# with mode=ro + query_only and kept warm: a large page cache and mmap window
+# let concurrent sessions reuse hot pages instead of cold-starting each query.
+READ_POOL_SIZE = int(os.getenv("TENDER_DB_POOL_SIZE", "8"))
+READ_CACHE_SIZE_KB = 65536  # PRAGMA cache_size, negative value = KiB
+READ_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class ReadOnlyConnectionPool:
+    """Small LIFO pool of read-only SQLite connections for one database file."""
+
+    def __init__(self, db_path: str | Path, max_size: int = READ_POOL_SIZE):
+        self.db_path = str(db_path)
+        self.max_size = max(1, max_size)
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _open(self) -> sqlite3.Connection:
+        uri = f"file:{Path(self.db_path).as_posix()}?mode=ro"
+        factory = query_profiler.ProfilingConnection
+        try:
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=factory)
+        except sqlite3.OperationalError:
+            # e.g. WAL database in a directory we cannot create -shm in
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=factory)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA cache_size = -{READ_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {READ_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if isinstance(conn, query_profiler.ProfilingConnection):
+            conn.flush_profile()
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_size and os.getpid() == self._pid:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_read_pools: dict[str, ReadOnlyConnectionPool] = {}
+_read_pools_lock = threading.Lock()
+
+
+def _get_read_pool(db_path: str | Path) -> ReadOnlyConnectionPool:
+    key = str(db_path)
+    with _read_pools_lock:
+        pool = _read_pools.get(key)
+        if pool is None or pool._pid != os.getpid():
+            # Connections inherited across fork are not safe to reuse
+            pool = ReadOnlyConnectionPool(key)
+            _read_pools[key] = pool
+        return pool
+
+
+@contextmanager
+def read_connection(db_path: str | Path | None = None) -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled read-only connection to DB_PATH (or `db_path`)."""
+    pool = _get_read_pool(db_path or DB_PATH)
+    conn = pool.acquire()
     try:
-        conn = sqlite3.connect(db_path_str)
-    except sqlite3.OperationalError:
-        uri = f"file:{Path(db_path_str).as_posix()}?mode=ro"
-        conn = sqlite3.connect(uri, uri=True)
-    conn.row_factory = sqlite3.Row
-    return conn
+        yield conn
+    finally:
+        pool.release(conn)
 
 
 def _table_exists(table_name: str) -> bool:
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [table_name])
         return cursor.fetchone() is not None
@@ -113,6 +196,36 @@ def _is_v3_schema() -> bool:
     return _table_exists("portals") and _table_exists("tender_items")
 
 
+# (db path, table) -> lower-cased column names; filter builders ask on every query
+_table_columns: dict[tuple[str, str], frozenset[str]] = {}
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    key = (str(DB_PATH), table_name)
+    columns = _table_columns.get(key)
+    if columns is None:
+        with read_connection() as conn:
+            rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+        columns = frozenset(str(row[1]).lower() for row in rows)
+        if columns:
+            _table_columns[key] = columns
+    return column_name.lower() in columns
+
+
+def _legacy_live_clause(live: bool = True, alias: str = "ti") -> str:
+    """Live/expired predicate for the legacy `tenders` table.
+
+    Uses the materialized `is_live` flag (kept current by the expiry sweeper
+    in cleanup_service) when the column exists, so the filter is an indexed
+    equality check. Older databases fall back to the lifecycle_status text.
+    """
+    prefix = f"{alias}." if alias else ""
+    if _column_exists("tenders", "is_live"):
+        return f"{prefix}is_live = {1 if live else 0}"
+    operator = "=" if live else "!="
+    return f"LOWER(COALESCE({prefix}lifecycle_status, '')) {operator} 'active'"
+
+
 def _parse_portal_datetime(value: str | None) -> datetime | None:
     """
     Parse portal datetime string as IST (Indian Standard Time).
@@ -142,12 +255,12 @@ def _build_where(filters: TenderFilters) -> tuple[str, list[Any]]:
         if use_v3:
             clauses.append("ti.is_live = 1")
         else:
-            clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) = 'active'")
+            clauses.append(_legacy_live_clause(True))
     elif filters.show_expired_only:
         if use_v3:
             clauses.append("ti.is_live = 0")
         else:
-            clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) != 'active'")
+            clauses.append(_legacy_live_clause(False))
 
     # Portal group filter
     if filters.portal_group and filters.portal_group != "All":
@@ -179,9 +292,9 @@ def _build_where(filters: TenderFilters) -> tuple[str, list[Any]]:
                 params.append(filters.status)
         else:
             if filters.status == "Live":
-                clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) = 'active'")
+                clauses.append(_legacy_live_clause(True))
             elif filters.status == "Archived":
-                clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) != 'active'")
+                clauses.append(_legacy_live_clause(False))
             else:
                 clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) = LOWER(?)")
                 params.append(filters.status)
@@ -274,7 +387,7 @@ def _get_portal_group_mapping() -> dict[str, list[str]]:
 
 def _list_distinct(column: str, where: str = "1=1", params: list[Any] | None = None) -> list[str]:
     params = params or []
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             f"""
@@ -289,7 +402,7 @@ def _list_distinct(column: str, where: str = "1=1", params: list[Any] | None = N
 
 
 def get_portal_options() -> list[str]:
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         if _is_v3_schema():
             cursor.execute(
@@ -317,7 +430,7 @@ def get_portal_statistics(days_filter: int = 0) -> list[dict[str, Any]]:
     Args:
         days_filter: If > 0, only include portals updated in last X days (0 = all portals)
     """
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         
         if _is_v3_schema():
@@ -346,6 +459,7 @@ def get_portal_statistics(days_filter: int = 0) -> list[dict[str, Any]]:
             date_filter = ""
             if days_filter > 0:
                 date_filter = f"HAVING MAX(r.completed_at) >= datetime('now', '-{days_filter} days')"
+            live_clause = _legacy_live_clause(True, alias="t")
             
             query = f"""
                 SELECT 
@@ -354,8 +468,8 @@ def get_portal_statistics(days_filter: int = 0) -> list[dict[str, Any]]:
                     (SELECT base_url FROM runs WHERE portal_name = t.portal_name ORDER BY completed_at DESC LIMIT 1) as base_url,
                     (SELECT MAX(completed_at) FROM runs WHERE portal_name = t.portal_name) as last_updated,
                     COUNT(*) as total_tenders,
-                    SUM(CASE WHEN LOWER(COALESCE(t.lifecycle_status, '')) = 'active' THEN 1 ELSE 0 END) as live_tenders,
-                    SUM(CASE WHEN LOWER(COALESCE(t.lifecycle_status, '')) != 'active' OR t.lifecycle_status IS NULL THEN 1 ELSE 0 END) as expired_tenders
+                    SUM(CASE WHEN {live_clause} THEN 1 ELSE 0 END) as live_tenders,
+                    SUM(CASE WHEN {live_clause} THEN 0 ELSE 1 END) as expired_tenders
                 FROM tenders t
                 WHERE t.portal_name IS NOT NULL AND TRIM(t.portal_name) != ''
                 GROUP BY t.portal_name
@@ -442,7 +556,7 @@ def get_summary(filters: TenderFilters) -> dict[str, Any]:
     where_sql, where_params = _build_where(filters)
     use_v3 = _is_v3_schema()
 
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
 
         cursor.execute("SELECT COUNT(*) AS c FROM tender_items" if use_v3 else "SELECT COUNT(*) AS c FROM tenders")
@@ -451,14 +565,14 @@ def get_summary(filters: TenderFilters) -> dict[str, Any]:
         cursor.execute(
             "SELECT COUNT(*) AS c FROM tender_items WHERE is_live = 1"
             if use_v3
-            else "SELECT COUNT(*) AS c FROM tenders WHERE LOWER(COALESCE(lifecycle_status, '')) = 'active'"
+            else f"SELECT COUNT(*) AS c FROM tenders WHERE {_legacy_live_clause(True, alias='')}"
         )
         live_tenders = int(cursor.fetchone()["c"])
 
         cursor.execute(
             "SELECT COUNT(*) AS c FROM tender_items WHERE is_live = 0"
             if use_v3
-            else "SELECT COUNT(*) AS c FROM tenders WHERE LOWER(COALESCE(lifecycle_status, '')) != 'active'"
+            else f"SELECT COUNT(*) AS c FROM tenders WHERE {_legacy_live_clause(False, alias='')}"
         )
         expired_tenders = int(cursor.fetchone()["c"])
 
@@ -598,7 +712,7 @@ def get_recommendations(filters: TenderFilters) -> list[dict[str, str]]:
     recommendations: list[dict[str, str]] = []
     use_v3 = _is_v3_schema()
 
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
 
         cursor.execute(
@@ -761,7 +875,7 @@ def search_tenders(
 
     offset = max(page - 1, 0) * page_size
 
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
 
         cursor.execute(
@@ -837,17 +951,22 @@ def search_tenders(
     return [dict(row) for row in rows], total_count
 
 
-def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) -> dict[str, list[dict[str, Any]]]:
-    """
-    Export tenders grouped by portal for Excel export.
-    Returns dict with portal_name as key and list of tender dicts as value.
-    Columns match: Department Name, S.No, e-Published Date, Closing Date, Opening Date,
-                  Organisation Chain, Title and Ref.No./Tender ID, Tender ID (Extracted),
-                  Direct URL, Status URL
-    """
-    use_v3 = _is_v3_schema()
-    
-    # Build WHERE clause with expired tenders option
+EXPORT_COLUMNS = [
+    "Department Name",
+    "S.No",
+    "e-Published Date",
+    "Closing Date",
+    "Opening Date",
+    "Organisation Chain",
+    "Title and Ref.No./Tender ID",
+    "Tender ID (Extracted)",
+    "Direct URL",
+    "Status URL",
+]
+
+
+def _build_export_where(filters: TenderFilters, expired_days: int, use_v3: bool) -> tuple[str, list[Any]]:
+    """Build the WHERE clause shared by the list and streaming export paths."""
     where_clauses: list[str] = ["1=1"]
     params: list[Any] = []
     
@@ -856,7 +975,7 @@ def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) ->
         if use_v3:
             where_clauses.append("ti.is_live = 1")
         else:
-            where_clauses.append("LOWER(COALESCE(ti.lifecycle_status, '')) = 'active'")
+            where_clauses.append(_legacy_live_clause(True))
     elif expired_days > 0:
         # Include expired tenders from last X days
         if use_v3:
@@ -864,6 +983,13 @@ def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) ->
                 (ti.is_live = 1 OR 
                  julianday('now') - julianday(ti.closing_at) <= {expired_days})
             """)
+        elif _column_exists("tenders", "closing_at"):
+            # closing_at is parsed IST text, so the window is a plain range check
+            where_clauses.append("""
+                (ti.is_live = 1 OR ti.closing_at >= ?)
+            """)
+            cutoff = datetime.now(tz=_IST) - timedelta(days=int(expired_days))
+            params.append(cutoff.strftime("%Y-%m-%d %H:%M:%S"))
         else:
             where_clauses.append(f"""
                 (LOWER(COALESCE(ti.lifecycle_status, '')) = 'active' OR
@@ -879,15 +1005,18 @@ def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) ->
             if use_v3:
                 where_clauses.append(f"p.portal_slug IN ({placeholders})")
             else:
-                where_clauses.append(f"LOWER(ti.portal_name) IN ({placeholders})")
-            params.extend([p.lower() for p in portals_in_group])
+                where_clauses.append(f"LOWER(TRIM(COALESCE(ti.portal_name, ''))) IN ({placeholders})")
+            params.extend([p.strip().lower() for p in portals_in_group])
     
     if filters.portal and filters.portal != "All":
         if use_v3:
             where_clauses.append("p.portal_slug = ?")
+            params.append(filters.portal)
         else:
-            where_clauses.append("ti.portal_name = ?")
-        params.append(filters.portal)
+            # Same key as idx_tenders_portal_tender_norm, so stored names that
+            # differ only in case or whitespace still match
+            where_clauses.append("LOWER(TRIM(COALESCE(ti.portal_name, ''))) = ?")
+            params.append(filters.portal.strip().lower())
     
     if filters.search_query:
         search_terms = [term.strip() for term in filters.search_query.split(",") if term.strip()]
@@ -917,79 +1046,109 @@ def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) ->
             operator = " OR " if filters.department_logic == "OR" else " AND "
             where_clauses.append(f"({operator.join(dept_clauses)})")
     
-    where_sql = " AND ".join(where_clauses)
-    
-    # Query all matching tenders
-    with _get_connection() as conn:
+    return " AND ".join(where_clauses), params
+
+
+def iter_export_rows(filters: TenderFilters, expired_days: int = 30, batch_size: int = 2000, with_live: bool = False):
+    """
+    Stream export rows ordered by portal without materializing the result set.
+
+    Yields (portal_name, row) tuples where row is a list in EXPORT_COLUMNS order,
+    or (portal_name, row, is_live) with `with_live`. S.No restarts at 1 for
+    each portal.
+    """
+    use_v3 = _is_v3_schema()
+    where_sql, params = _build_export_where(filters, expired_days, use_v3)
+    live_sql = f"CASE WHEN {'ti.is_live = 1' if use_v3 else _legacy_live_clause(True)} THEN 1 ELSE 0 END"
+    query = (
+        f"""
+        SELECT
+            p.portal_name,
+            ti.department_name,
+            ti.published_at AS e_published_date,
+            ti.closing_at AS closing_date,
+            ti.opening_at AS opening_date,
+            ti.organization_chain AS organisation_chain,
+            ti.title_ref AS title_and_ref,
+            ti.tender_id_extracted,
+            COALESCE(ti.tender_url, '') AS direct_url,
+            COALESCE(ti.status_url, '') AS status_url,
+            {live_sql} AS is_live
+        FROM tender_items ti
+        JOIN portals p ON p.id = ti.portal_id
+        WHERE {where_sql}
+        ORDER BY p.portal_name, ti.closing_at
+        """
+        if use_v3
+        else f"""
+        SELECT
+            ti.portal_name,
+            ti.department_name,
+            ti.published_date AS e_published_date,
+            ti.closing_date AS closing_date,
+            '' AS opening_date,
+            ti.organisation_chain AS organisation_chain,
+            ti.title_ref AS title_and_ref,
+            ti.tender_id_extracted,
+            COALESCE(ti.direct_url, '') AS direct_url,
+            COALESCE(ti.status_url, '') AS status_url,
+            {live_sql} AS is_live
+        FROM tenders ti
+        WHERE {where_sql}
+        ORDER BY LOWER(TRIM(COALESCE(ti.portal_name, ''))), ti.closing_date
+        """
+    )
+
+    with read_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            (
-                f"""
-                SELECT
-                    p.portal_name,
-                    ti.department_name,
-                    ti.published_at AS e_published_date,
-                    ti.closing_at AS closing_date,
-                    ti.opening_date,
-                    ti.organisation_chain,
-                    ti.title_ref AS title_and_ref,
-                    ti.tender_id_extracted,
-                    COALESCE(ti.tender_url, '') AS direct_url,
-                    COALESCE(ti.status_url, '') AS status_url
-                FROM tender_items ti
-                JOIN portals p ON p.id = ti.portal_id
-                WHERE {where_sql}
-                ORDER BY p.portal_name, ti.closing_at
-                """
-                if use_v3
-                else f"""
-                SELECT
-                    ti.portal_name,
-                    ti.department_name,
-                    ti.published_date AS e_published_date,
-                    ti.closing_date AS closing_date,
-                    '' AS opening_date,
-                    ti.organization_chain AS organisation_chain,
-                    ti.title_ref AS title_and_ref,
-                    ti.tender_id_extracted,
-                    COALESCE(ti.direct_url, '') AS direct_url,
-                    COALESCE(ti.status_url, '') AS status_url
-                FROM tenders ti
-                WHERE {where_sql}
-                ORDER BY ti.portal_name, ti.closing_date
-                """
-            ),
-            params,
-        )
-        rows = cursor.fetchall()
-    
-    # Group by portal
+        cursor.execute(query, params)
+        current_key = None
+        portal = ""
+        serial = 0
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                # Spellings differing only in case/whitespace are one portal,
+                # reported under the first spelling seen
+                key = str(row[0] or "").strip().lower()
+                if key != current_key:
+                    current_key = key
+                    portal = str(row[0])
+                    serial = 0
+                serial += 1
+                values = [
+                    row[1] or "",
+                    serial,
+                    row[2] or "",
+                    row[3] or "",
+                    row[4] or "",
+                    row[5] or "",
+                    row[6] or "",
+                    row[7] or "",
+                    row[8] or "",
+                    row[9] or "",
+                ]
+                if with_live:
+                    yield portal, values, bool(row[10])
+                else:
+                    yield portal, values
+
+
+def export_tenders_by_portal(filters: TenderFilters, expired_days: int = 30) -> dict[str, list[dict[str, Any]]]:
+    """
+    Export tenders grouped by portal for Excel export.
+    Returns dict with portal_name as key and list of tender dicts as value.
+    Columns match: Department Name, S.No, e-Published Date, Closing Date, Opening Date,
+                  Organisation Chain, Title and Ref.No./Tender ID, Tender ID (Extracted),
+                  Direct URL, Status URL
+
+    Large exports should use iter_export_rows() instead, which streams.
+    """
     portals_dict: dict[str, list[dict[str, Any]]] = {}
-    for idx, row in enumerate(rows, start=1):
-        portal = str(row["portal_name"])
-        if portal not in portals_dict:
-            portals_dict[portal] = []
-        
-        # Format data to match Excel columns
-        tender_dict = {
-            "Department Name": row["department_name"] or "",
-            "S.No": idx if portal not in portals_dict else len(portals_dict[portal]) + 1,
-            "e-Published Date": row["e_published_date"] or "",
-            "Closing Date": row["closing_date"] or "",
-            "Opening Date": row["opening_date"] or "",
-            "Organisation Chain": row["organisation_chain"] or "",
-            "Title and Ref.No./Tender ID": row["title_and_ref"] or "",
-            "Tender ID (Extracted)": row["tender_id_extracted"] or "",
-            "Direct URL": row["direct_url"] or "",
-            "Status URL": row["status_url"] or "",
-        }
-        portals_dict[portal].append(tender_dict)
-    
-    # Renumber S.No for each portal
-    for portal_data in portals_dict.values():
-        for idx, tender in enumerate(portal_data, start=1):
-            tender["S.No"] = idx
-    
+    for portal, values in iter_export_rows(filters, expired_days):
+        portals_dict.setdefault(portal, []).append(dict(zip(EXPORT_COLUMNS, values)))
     return portals_dict
 
 def portal_url_to_filename(base_url: str, portal_name: str) -> str:
@@ -1131,7 +1290,7 @@ def get_tender_count(filters: TenderFilters) -> int:
     where_sql, where_params = _build_where(filters)
     use_v3 = _is_v3_schema()
     
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         
         if use_v3:
@@ -1170,7 +1329,7 @@ def get_tender_data_paginated(filters: TenderFilters, limit: int = 50, offset: i
     where_sql, where_params = _build_where(filters)
     use_v3 = _is_v3_schema()
     
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         
         if use_v3:
@@ -1293,7 +1452,7 @@ def get_database_statistics() -> dict[str, int]:
     """
     use_v3 = _is_v3_schema()
     
-    with _get_connection() as conn:
+    with read_connection() as conn:
         cursor = conn.cursor()
         
         # Total records
@@ -1307,7 +1466,7 @@ def get_database_statistics() -> dict[str, int]:
         if use_v3:
             cursor.execute("SELECT COUNT(*) as count FROM tender_items WHERE is_live = 1")
         else:
-            cursor.execute("SELECT COUNT(*) as count FROM tenders WHERE LOWER(COALESCE(lifecycle_status, '')) = 'active'")
+            cursor.execute(f"SELECT COUNT(*) as count FROM tenders WHERE {_legacy_live_clause(True, alias='')}")
         active_records = int(cursor.fetchone()["count"])
         
         # Portal count
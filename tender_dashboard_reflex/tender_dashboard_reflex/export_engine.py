@@ -0,0 +1,273 @@
+"""Streaming Excel export engine for the Portal Management page.
+
+Rows are streamed from SQLite via db.iter_export_rows() straight into
+openpyxl write-only workbooks, so memory stays flat regardless of how many
+tenders a portal has. Per-portal files are written in a process pool.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from openpyxl import Workbook
+
+from . import db
+
+
+# progress_callback(done, total, message)
+ProgressCallback = Callable[[int, int, str], None]
+
+COMBINED_SHEET_NAME = "All_Portals"
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class PortalExportJob:
+    portal_slug: str
+    portal_name: str
+    base_url: str = ""
+
+
+def _portal_filters(job: PortalExportJob, live_only: bool) -> db.TenderFilters:
+    return db.TenderFilters(portal=job.portal_slug, show_live_only=live_only)
+
+
+def _iter_portal_rows(job: PortalExportJob, expired_days: int, live_only: bool):
+    # The portal filter is applied in SQL (see db._build_export_where)
+    for _portal, row in db.iter_export_rows(_portal_filters(job, live_only), expired_days):
+        yield row
+
+
+def _unique_sheet_name(job: PortalExportJob, used: set[str]) -> str:
+    base = (job.portal_slug or job.portal_name)[:31] or f"portal_{len(used) + 1}"
+    name = base
+    suffix = 2
+    while name.lower() in used:
+        tag = f"_{suffix}"
+        name = f"{base[:31 - len(tag)]}{tag}"
+        suffix += 1
+    used.add(name.lower())
+    return name
+
+
+def write_portal_workbook(job: PortalExportJob, filepath: str | Path, expired_days: int, live_only: bool) -> int:
+    """Stream one portal into its own workbook. Returns rows written (0 = no file)."""
+    workbook = Workbook(write_only=True)
+    sheet = None
+    row_count = 0
+    for row in _iter_portal_rows(job, expired_days, live_only):
+        if sheet is None:
+            sheet = workbook.create_sheet(_unique_sheet_name(job, set()))
+            sheet.append(db.EXPORT_COLUMNS)
+        sheet.append(row)
+        row_count += 1
+
+    if row_count:
+        workbook.save(str(filepath))
+    return row_count
+
+
+def _init_export_worker(db_path: str) -> None:
+    # Child processes must read the same database the dashboard resolved
+    db.DB_PATH = Path(db_path)
+
+
+def _export_portal_file(job: PortalExportJob, export_dir: str, timestamp: str, expired_days: int, live_only: bool) -> dict[str, Any]:
+    filename_base = db.portal_url_to_filename(job.base_url, job.portal_name)
+    filename = f"{filename_base}_tenders_{timestamp}.xlsx"
+    row_count = write_portal_workbook(job, Path(export_dir) / filename, expired_days, live_only)
+    return {
+        "portal_name": job.portal_name,
+        "filename": filename if row_count else "",
+        "row_count": row_count,
+    }
+
+
+def export_portals_to_files(
+    jobs: list[PortalExportJob],
+    export_dir: str | Path,
+    expired_days: int = 30,
+    live_only: bool = False,
+    max_workers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Export each portal to its own workbook, in parallel worker processes.
+
+    Returns one result dict per portal (portal_name, filename, row_count),
+    in the order of `jobs`. Portals with no rows get an empty filename.
+    """
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    total = len(jobs)
+    results: dict[int, dict[str, Any]] = {}
+
+    def _report(result: dict[str, Any]) -> None:
+        if progress_callback:
+            progress_callback(len(results), total, f"{result['portal_name']}: {result['row_count']} tenders")
+
+    workers = max(1, min(total, max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)))
+    if workers == 1:
+        for index, job in enumerate(jobs):
+            results[index] = _export_portal_file(job, str(export_dir), timestamp, expired_days, live_only)
+            _report(results[index])
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_export_worker,
+            initargs=(str(db.DB_PATH),),
+        ) as pool:
+            futures = {
+                pool.submit(_export_portal_file, job, str(export_dir), timestamp, expired_days, live_only): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                _report(results[index])
+
+    return [results[index] for index in range(total)]
+
+
+def export_portals_to_workbook(
+    jobs: list[PortalExportJob],
+    filepath: str | Path,
+    expired_days: int = 30,
+    live_only: bool = False,
+    progress_callback: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """
+    Export portals into one workbook: a sheet per portal plus a combined sheet.
+
+    Each portal is streamed once; every row goes to its portal sheet and to
+    the combined sheet. Returns portals written and total rows.
+    """
+    workbook = Workbook(write_only=True)
+    used_names: set[str] = {COMBINED_SHEET_NAME.lower()}
+    written_jobs: list[PortalExportJob] = []
+    total_rows = 0
+    steps = len(jobs)
+
+    # Write-only sheets can be appended to in any order, so the combined
+    # sheet is filled alongside the portal sheets, which are inserted before it
+    combined = workbook.create_sheet(COMBINED_SHEET_NAME)
+    combined.append(db.EXPORT_COLUMNS)
+
+    for index, job in enumerate(jobs, start=1):
+        sheet = None
+        row_count = 0
+        for row in _iter_portal_rows(job, expired_days, live_only):
+            if sheet is None:
+                sheet = workbook.create_sheet(_unique_sheet_name(job, used_names), len(workbook.sheetnames) - 1)
+                sheet.append(db.EXPORT_COLUMNS)
+            sheet.append(row)
+            combined.append(row)
+            row_count += 1
+
+        if row_count:
+            written_jobs.append(job)
+            total_rows += row_count
+        if progress_callback:
+            progress_callback(index, steps, f"{job.portal_name}: {row_count} tenders")
+
+    workbook.save(str(filepath))
+    return {"portals": [job.portal_name for job in written_jobs], "row_count": total_rows}
+
+
+def _safe_portal_filename(portal_name: str) -> str:
+    safe = "".join(c if c.isalnum() or c in (' ', '_') else '_' for c in portal_name)
+    return safe.replace(' ', '_').lower()
+
+
+def export_filtered_to_files(
+    filters: db.TenderFilters,
+    export_dir: str | Path,
+    expired_days: int = 30,
+    file_suffix: str = "tenders",
+    progress_callback: ProgressCallback | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Export dashboard-filtered tenders to one workbook per portal in a single pass.
+
+    iter_export_rows() yields rows ordered by portal, so each workbook is
+    saved as soon as the next portal starts; the portal count is not known up
+    front, so progress is reported with total=0. Returns one result dict per
+    file (portal_name, filename, row_count, live_count).
+    """
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    results: list[dict[str, Any]] = []
+    workbook = sheet = None
+    current: dict[str, Any] | None = None
+
+    def _close_current() -> None:
+        if workbook is not None and current is not None:
+            workbook.save(str(export_dir / current["filename"]))
+            results.append(current)
+            if progress_callback:
+                progress_callback(len(results), 0, f"{current['portal_name']}: {current['row_count']} tenders")
+
+    for portal, row, is_live in db.iter_export_rows(filters, expired_days, with_live=True):
+        if current is None or portal != current["portal_name"]:
+            _close_current()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            current = {
+                "portal_name": portal,
+                "filename": f"{_safe_portal_filename(portal)}_{file_suffix}_{timestamp}.xlsx",
+                "row_count": 0,
+                "live_count": 0,
+            }
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Sheet1")
+            sheet.append(db.EXPORT_COLUMNS)
+        sheet.append(row)
+        current["row_count"] += 1
+        if is_live:
+            current["live_count"] += 1
+    _close_current()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Job entry points (see jobs.JOB_TASKS)
+# ---------------------------------------------------------------------------
+
+def _jobs_from_params(params: dict[str, Any]) -> list[PortalExportJob]:
+    return [PortalExportJob(**job) for job in params["jobs"]]
+
+
+def run_portal_files_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    results = export_portals_to_files(
+        _jobs_from_params(params),
+        params["export_dir"],
+        expired_days=params["expired_days"],
+        live_only=params["live_only"],
+        progress_callback=ctx.progress_callback,
+    )
+    return {"results": results}
+
+
+def run_portal_workbook_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    return export_portals_to_workbook(
+        _jobs_from_params(params),
+        params["filepath"],
+        expired_days=params["expired_days"],
+        live_only=params["live_only"],
+        progress_callback=ctx.progress_callback,
+    )
+
+
+def run_filtered_files_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    results = export_filtered_to_files(
+        db.TenderFilters(**params["filters"]),
+        params["export_dir"],
+        expired_days=params["expired_days"],
+        file_suffix=params.get("file_suffix", "tenders"),
+        progress_callback=ctx.progress_callback,
+    )
+    return {"results": results}
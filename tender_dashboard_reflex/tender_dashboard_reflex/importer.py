@@ -0,0 +1,203 @@
+"""Excel/CSV tender import, runnable as a background job.
+
+Holds the import that used to run inside ExcelImportState.start_import so
+large files are processed in a job worker process (see jobs.py). The file
+is streamed in chunks by tender_file_reader, each chunk is transformed
+column-at-a-time with pandas (rename, string cleanup, tender-ID extraction,
+closing-date parsing) and handed to TenderDataStore.bulk_import_run_tenders,
+so memory stays flat however large the upload is.
+"""
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+MAX_REPORTED_ERRORS = 200
+INSERT_CHUNK_SIZE = 5000
+PREVIEW_SAMPLE_ROWS = 100
+PLACEHOLDER_IDS = ("nan", "none", "null", "na", "n/a", "-")
+
+# Last [YEAR_PORTAL_NUMBER_VERSION] stamp in a title (see state._extract_real_tender_id)
+_EMBEDDED_TENDER_ID_RE = r".*\[(\d{4}_[A-Z0-9]+_\d+_\d+)\]"
+
+
+def _format_duration(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{minutes} minute{'s' if minutes != 1 else ''} {secs} second{'s' if secs != 1 else ''}"
+
+
+def _workspace_root_on_path() -> None:
+    # tender_store and tender_file_reader live at the workspace root
+    workspace_root = Path(__file__).parent.parent.parent
+    if str(workspace_root) not in sys.path:
+        sys.path.insert(0, str(workspace_root))
+
+
+def _tender_store():
+    _workspace_root_on_path()
+    import tender_store
+    return tender_store
+
+
+def _file_reader():
+    _workspace_root_on_path()
+    import tender_file_reader
+    return tender_file_reader
+
+
+def preview_file(file_path: str):
+    """(sample frame, total row count) for the upload preview, without reading the whole file."""
+    return _file_reader().read_table_sample(file_path, nrows=PREVIEW_SAMPLE_ROWS)
+
+
+def _closing_at(closing_dates, formats):
+    """Vectorised TenderDataStore._closing_at_text: sortable IST text or ''."""
+    import pandas as pd
+
+    parsed = pd.Series(pd.NaT, index=closing_dates.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        pending = parsed.isna() & (closing_dates != "")
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(closing_dates[pending], format=fmt, errors="coerce")
+    return parsed.dt.strftime("%Y-%m-%d %H:%M:%S").fillna("")
+
+
+def prepare_import_frame(df, excel_to_db: dict[str, str], portal_name: str, store_module):
+    """Map, clean and enrich an uploaded frame. Returns a frame of IMPORT_COLUMNS."""
+    import pandas as pd
+
+    columns = store_module.TenderDataStore.IMPORT_COLUMNS
+    frame = df[[col for col in excel_to_db if col in df.columns]].rename(columns=excel_to_db)
+    frame = frame.fillna("").astype(str)
+    for col in frame.columns:
+        frame[col] = frame[col].str.strip()
+    for col in columns:
+        if col not in frame.columns:
+            frame[col] = ""
+    frame["portal_name"] = portal_name
+
+    # Serial numbers in the ID column: use the stamped ID from the title
+    tender_ids = frame["tender_id_extracted"]
+    is_real_id = tender_ids.str.contains("_", regex=False) & (tender_ids.str.len() > 8)
+    embedded = frame["title_ref"].str.extract(_EMBEDDED_TENDER_ID_RE, expand=False)
+    frame["tender_id_extracted"] = tender_ids.where(is_real_id | embedded.isna(), embedded)
+
+    frame["emd_amount_numeric"] = pd.to_numeric(
+        frame["emd_amount"].str.replace(r"[^\d.]", "", regex=True), errors="coerce"
+    )
+
+    frame["closing_at"] = _closing_at(frame["closing_date"], store_module.CLOSING_DATE_FORMATS)
+    now_ist_text = store_module.TenderDataStore._now_ist_text()
+    expired = (frame["closing_at"] != "") & (frame["closing_at"] <= now_ist_text)
+    frame["is_live"] = (~expired).astype(int)
+    frame["lifecycle_status"] = expired.map({True: "expired", False: "active"})
+
+    # Original mapped values, one JSON object per row
+    source_columns = [col for col in excel_to_db.values() if col in frame.columns]
+    if len(frame):
+        records = frame[source_columns].to_json(orient="records", lines=True, force_ascii=False)
+        # to_json escapes "\n" inside values; splitlines() would also split on U+2028 etc.
+        frame["tender_json"] = records.rstrip("\n").split("\n")
+    return frame[list(columns)]
+
+
+def import_file(
+    file_path: str,
+    excel_to_db: dict[str, str],
+    db_path: str,
+    portal_name: str = "imported",
+    base_url: str = "",
+    validate_data: bool = True,
+    skip_duplicates: bool = True,
+    total_rows: int = 0,
+    ctx=None,
+) -> dict[str, Any]:
+    """Import one uploaded file into a new run. Returns counters and error messages.
+
+    total_rows is only a progress hint (the upload preview already counted
+    the file); the import itself never needs the whole file in memory.
+    """
+    store_module = _tender_store()
+    reader = _file_reader()
+
+    start_time = datetime.now()
+    counts = {"processed": 0, "skipped": 0, "errors": 0}
+    error_messages: list[str] = []
+
+    def prepared_chunks():
+        for chunk in reader.iter_table_chunks(file_path, chunk_size=INSERT_CHUNK_SIZE):
+            counts["processed"] += len(chunk)
+            frame = prepare_import_frame(chunk, excel_to_db, portal_name, store_module)
+
+            # Rows without a usable tender ID cannot be keyed and are never imported
+            tender_ids = frame["tender_id_extracted"]
+            missing_id = (tender_ids == "") | tender_ids.str.lower().isin(PLACEHOLDER_IDS)
+            missing_count = int(missing_id.sum())
+            if validate_data:
+                counts["errors"] += missing_count
+                room = MAX_REPORTED_ERRORS - len(error_messages)
+                if room > 0:
+                    error_messages.extend(
+                        f"Row {int(idx) + 1}: Missing tender ID" for idx in frame.index[missing_id][:room]
+                    )
+            else:
+                counts["skipped"] += missing_count
+            frame = frame[~missing_id]
+
+            # Same tender repeated within the chunk; repeats across chunks are
+            # resolved by the store the same way (first wins when skipping
+            # existing tenders, otherwise the last row wins)
+            before = len(frame)
+            frame = frame.drop_duplicates(
+                subset=["tender_id_extracted"], keep="first" if skip_duplicates else "last"
+            )
+            counts["skipped"] += before - len(frame)
+
+            if ctx:
+                done = counts["processed"]
+                percent = int(95 * done / total_rows) if total_rows else 50
+                total_text = f"/{total_rows:,}" if total_rows else ""
+                ctx.report(min(95, percent), f"Imported {done:,}{total_text} rows...")
+            yield frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+
+    store = store_module.TenderDataStore(str(db_path))
+    run_id = store.start_run(portal_name=portal_name, base_url=base_url, scope_mode="import")
+    try:
+        if ctx:
+            ctx.report(0, "Reading file...", force=True)
+        # One transaction for the whole file: a failure or cancel keeps nothing
+        success, skipped_existing = store.bulk_import_run_tenders(
+            run_id, prepared_chunks(), skip_existing=skip_duplicates
+        )
+    except BaseException:
+        store.finalize_run(run_id, "failed", counts["processed"], 0, 0)
+        raise
+    skipped = counts["skipped"] + skipped_existing
+    store.finalize_run(run_id, "completed", counts["processed"], success, skipped)
+
+    return {
+        "processed": counts["processed"],
+        "success": success,
+        "skipped": skipped,
+        "errors": counts["errors"],
+        "error_messages": error_messages,
+        "duration": _format_duration((datetime.now() - start_time).total_seconds()),
+    }
+
+
+def run_import_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    return import_file(
+        params["file_path"],
+        params["excel_to_db"],
+        params["db_path"],
+        portal_name=params.get("portal_name") or "imported",
+        base_url=params.get("base_url") or "",
+        validate_data=params.get("validate_data", True),
+        skip_duplicates=params.get("skip_duplicates", True),
+        total_rows=params.get("total_rows") or 0,
+        ctx=ctx,
+    )
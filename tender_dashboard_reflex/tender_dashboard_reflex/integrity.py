@@ -0,0 +1,430 @@
+"""Data integrity scans and cleanup actions, runnable as background jobs.
+
+These functions hold the SQL that used to live inside DataIntegrityState
+handlers so the work can run in a job worker process (see jobs.py) while
+the page polls for progress. Results are plain dicts for JSON transport.
+"""
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from . import db
+
+INVALID_ID_VALUES = "('nan', 'none', 'null', 'n/a', 'na', '-', '--')"
+
+
+class _NullContext:
+    def report(self, progress: int | None = None, message: str = "", force: bool = False) -> None:
+        pass
+
+
+def score_portal(total: int, dup_rows: int, missing_ids: int, missing_dates: int) -> tuple[int, str]:
+    """Integrity score (0-100) and status band used on the dashboard."""
+    score = 100
+    if total > 0:
+        if dup_rows > 0:
+            score -= min(30, (dup_rows / total) * 100)
+        if missing_ids > 0:
+            score -= min(40, (missing_ids / total) * 100)
+        if missing_dates > 0:
+            score -= min(20, (missing_dates / total) * 100)
+    score = max(0, int(score))
+
+    if score >= 95:
+        status = "excellent"
+    elif score >= 85:
+        status = "good"
+    elif score >= 70:
+        status = "fair"
+    else:
+        status = "poor"
+    return score, status
+
+
+# One streaming pass over tenders. Only raw columns are selected: computing
+# LOWER/TRIM keys in SQL doubles the cost of materialising 1M rows.
+INTEGRITY_SCAN_SQL = "SELECT portal_name, department_name, tender_id_extracted, closing_date FROM tenders"
+PLACEHOLDER_IDS = frozenset(("nan", "none", "null", "na", "n/a", "-"))
+SCAN_BATCH_SIZE = 20_000
+TOP_DETAIL_ROWS = 20
+
+# SQLite's LOWER() and TRIM() only fold ASCII letters and strip spaces
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def portal_key(portal_name: str | None) -> str:
+    """Python equivalent of LOWER(TRIM(COALESCE(portal_name, '')))."""
+    return (portal_name or "").strip(" ").translate(_ASCII_LOWER)
+
+
+class _PortalStats:
+    __slots__ = ("display_name", "listed_rows", "tender_keys", "missing_ids", "missing_dates")
+
+    def __init__(self) -> None:
+        self.display_name: str | None = None
+        self.listed_rows = 0  # rows with a non-NULL portal_name
+        self.tender_keys: dict[str, int] = {}
+        self.missing_ids = 0
+        self.missing_dates = 0
+
+
+class IntegrityScan:
+    """Accumulates every integrity metric from a single pass over tenders.
+
+    Feed rows from INTEGRITY_SCAN_SQL to add_rows(), then call finish().
+    Duplicate detection keeps one counter per (portal, tender ID) pair, so
+    memory grows with distinct IDs rather than with checks or portals.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.missing_ids = 0
+        self.placeholder_ids = 0
+        self.missing_dates = 0
+        self.portals: dict[str, _PortalStats] = {}
+        self._stats_by_name: dict[str | None, _PortalStats] = {}
+        # (portal_name, department_name) -> rows with a missing closing date
+        self.missing_dates_by_department: dict[tuple[str | None, str | None], int] = {}
+
+    def add_rows(self, rows) -> None:
+        portals = self.portals
+        # Raw portal_name -> stats; a handful of spellings map to each portal key
+        by_name = self._stats_by_name
+        by_department = self.missing_dates_by_department
+        for portal_name, department_name, tender_id, closing_date in rows:
+            self.total += 1
+            stats = by_name.get(portal_name)
+            if stats is None:
+                key = portal_key(portal_name)
+                stats = portals.get(key)
+                if stats is None:
+                    stats = portals[key] = _PortalStats()
+                by_name[portal_name] = stats
+                # Prefer a clean spelling ("Haryana" over "  haryana ") for display
+                if portal_name is not None and (
+                    stats.display_name is None or stats.display_name != stats.display_name.strip()
+                ):
+                    stats.display_name = portal_name
+            if portal_name is not None:
+                stats.listed_rows += 1
+
+            tender_key = str(tender_id).strip(" ") if tender_id is not None else ""
+            if tender_key:
+                keys = stats.tender_keys
+                keys[tender_key] = keys.get(tender_key, 0) + 1
+                placeholder_id = len(tender_key) <= 4 and tender_key.lower() in PLACEHOLDER_IDS
+                if placeholder_id:
+                    self.placeholder_ids += 1
+                    self.missing_ids += 1
+                    stats.missing_ids += 1
+            else:
+                self.missing_ids += 1
+                stats.missing_ids += 1
+            if closing_date is None or not str(closing_date).strip(" "):
+                self.missing_dates += 1
+                stats.missing_dates += 1
+                dept = (portal_name, department_name)
+                by_department[dept] = by_department.get(dept, 0) + 1
+
+    def finish(self) -> dict[str, Any]:
+        """Return the report fields consumed by DataIntegrityState."""
+        duplicate_groups = 0
+        duplicate_extra_rows = 0
+        duplicate_records: list[dict[str, Any]] = []
+        portal_metrics: list[dict[str, Any]] = []
+
+        for stats in self.portals.values():
+            groups = 0
+            extra = 0
+            for tender_key, count in stats.tender_keys.items():
+                if count > 1:
+                    groups += 1
+                    extra += count - 1
+                    duplicate_records.append(
+                        {"portal_name": stats.display_name, "tender_id": tender_key, "count": count}
+                    )
+            duplicate_groups += groups
+            duplicate_extra_rows += extra
+
+            if stats.listed_rows:
+                score, status = score_portal(stats.listed_rows, extra, stats.missing_ids, stats.missing_dates)
+                portal_metrics.append({
+                    "portal_name": stats.display_name,
+                    "total_tenders": stats.listed_rows,
+                    "duplicate_groups": groups,
+                    "duplicate_rows": extra,
+                    "missing_tender_ids": stats.missing_ids,
+                    "missing_closing_dates": stats.missing_dates,
+                    "integrity_score": score,
+                    "status": status,
+                })
+
+        duplicate_records.sort(key=lambda item: (-item["count"], item["portal_name"] or ""))
+        portal_metrics.sort(key=lambda item: -item["total_tenders"])
+        departments = sorted(self.missing_dates_by_department.items(), key=lambda item: -item[1])
+
+        return {
+            "total_tenders": self.total,
+            "distinct_portals": len(portal_metrics),
+            "duplicate_groups": duplicate_groups,
+            "duplicate_extra_rows": duplicate_extra_rows,
+            "duplicate_records": duplicate_records[:TOP_DETAIL_ROWS],
+            "missing_tender_ids": self.missing_ids,
+            "invalid_tender_ids": self.placeholder_ids,
+            "missing_closing_dates": self.missing_dates,
+            "missing_field_records": [
+                {
+                    "portal_name": portal_name or "Unknown",
+                    "department_name": department_name or "Unknown",
+                    "missing_count": count,
+                    "field_name": "closing_date",
+                }
+                for (portal_name, department_name), count in departments[:TOP_DETAIL_ROWS]
+            ],
+            "portal_metrics": portal_metrics,
+        }
+
+
+def scan_integrity(conn: sqlite3.Connection, ctx=None) -> dict[str, Any]:
+    """Compute the integrity metrics with one cursor over tenders."""
+    ctx = ctx or _NullContext()
+    # MAX(id) is an O(1) upper bound for progress; COUNT(*) would be a second scan
+    estimate = conn.execute("SELECT MAX(id) FROM tenders").fetchone()[0] or 0
+    scan = IntegrityScan()
+    cursor = conn.execute(INTEGRITY_SCAN_SQL)
+    while True:
+        rows = cursor.fetchmany(SCAN_BATCH_SIZE)
+        if not rows:
+            break
+        scan.add_rows(rows)
+        if estimate:
+            ctx.report(min(90, int(scan.total / estimate * 90)), f"Scanned {scan.total:,} records")
+    ctx.report(95, "Summarising", force=True)
+    return scan.finish()
+
+
+def compute_integrity_report(db_path: str | Path, ctx=None) -> dict[str, Any]:
+    """Run the full integrity scan and return metrics, detail rows and a log."""
+    ctx = ctx or _NullContext()
+    db_path = Path(db_path)
+    log: list[str] = []
+    report: dict[str, Any] = {"log": log}
+
+    if not db_path.exists():
+        log.append("❌ Database not found")
+        return report
+
+    log.append(f"📂 Checking database: {db_path.name}")
+    with db.read_connection(db_path) as conn:
+        report.update(scan_integrity(conn, ctx))
+
+    log.append(f"✅ Total tenders: {report['total_tenders']:,}")
+    log.append(f"✅ Active portals: {report['distinct_portals']}")
+    if report["duplicate_groups"] > 0:
+        log.append(f"⚠️ Found {report['duplicate_groups']} duplicate groups ({report['duplicate_extra_rows']} extra rows)")
+    else:
+        log.append("✅ No duplicate tender IDs found")
+    if report["missing_tender_ids"] > 0:
+        log.append(f"⚠️ Found {report['missing_tender_ids']} records with missing/invalid tender IDs")
+    else:
+        log.append("✅ All records have valid tender IDs")
+    if report["invalid_tender_ids"] > 0:
+        log.append(f"⚠️ Found {report['invalid_tender_ids']} records with placeholder tender IDs")
+    if report["missing_closing_dates"] > 0:
+        log.append(f"⚠️ Found {report['missing_closing_dates']} records with missing closing dates")
+    else:
+        log.append("✅ All records have closing dates")
+    log.append(f"✅ Analyzed {len(report['portal_metrics'])} portal(s)")
+
+    report["last_check_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log.append(f"✅ Integrity check complete at {report['last_check_time']}")
+    return report
+
+
+def read_integrity_counters(db_path: str | Path) -> dict[str, Any] | None:
+    """Headline and per-portal metrics from the trigger-maintained counters.
+
+    Returns None when the database predates portal_integrity_counters (it is
+    created by TenderDataStore), in which case a deep check is required.
+    Detail rows (duplicate_records, missing_field_records) need a deep check.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return None
+    with db.read_connection(db_path) as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'portal_integrity_counters'"
+        ).fetchone()
+        if not exists:
+            return None
+        rows = conn.execute("SELECT * FROM portal_integrity_counters ORDER BY row_count DESC").fetchall()
+
+    report: dict[str, Any] = {
+        "total_tenders": 0,
+        "duplicate_groups": 0,
+        "duplicate_extra_rows": 0,
+        "missing_tender_ids": 0,
+        "invalid_tender_ids": 0,
+        "missing_closing_dates": 0,
+        "portal_metrics": [],
+        "updated_at": "",
+        "reconciled_at": "",
+    }
+    for row in rows:
+        report["total_tenders"] += row["row_count"]
+        report["duplicate_groups"] += row["duplicate_groups"]
+        report["duplicate_extra_rows"] += row["duplicate_rows"]
+        report["missing_tender_ids"] += row["missing_ids"]
+        report["invalid_tender_ids"] += row["placeholder_ids"]
+        report["missing_closing_dates"] += row["missing_dates"]
+        report["updated_at"] = max(report["updated_at"], row["updated_at"] or "")
+        report["reconciled_at"] = max(report["reconciled_at"], row["reconciled_at"] or "")
+        if row["portal_name"] is None or row["row_count"] <= 0:
+            continue
+        score, status = score_portal(row["row_count"], row["duplicate_rows"], row["missing_ids"], row["missing_dates"])
+        report["portal_metrics"].append({
+            "portal_name": row["portal_name"],
+            "total_tenders": row["row_count"],
+            "duplicate_groups": row["duplicate_groups"],
+            "duplicate_rows": row["duplicate_rows"],
+            "missing_tender_ids": row["missing_ids"],
+            "missing_closing_dates": row["missing_dates"],
+            "integrity_score": score,
+            "status": status,
+        })
+    report["distinct_portals"] = len(report["portal_metrics"])
+    return report
+
+
+def backup_database(db_path: str | Path, backup_dir: str | Path) -> Path:
+    backup_dir = Path(backup_dir)
+    backup_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = backup_dir / f"backup_before_cleanup_{timestamp}.sqlite3"
+    shutil.copy2(db_path, backup_path)
+    return backup_path
+
+
+def _dedupe_engine():
+    # tender_dedupe lives at the workspace root
+    workspace_root = Path(__file__).parent.parent.parent
+    if str(workspace_root) not in sys.path:
+        sys.path.insert(0, str(workspace_root))
+    import tender_dedupe
+    return tender_dedupe
+
+
+INVALID_RECORD_WHERE = f"""
+    (
+        tender_id_extracted IS NULL
+        OR TRIM(tender_id_extracted) = ''
+        OR LOWER(TRIM(tender_id_extracted)) IN {INVALID_ID_VALUES}
+        OR closing_date IS NULL
+        OR TRIM(closing_date) = ''
+        OR LOWER(TRIM(closing_date)) IN {INVALID_ID_VALUES}
+    )
+"""
+
+
+def count_cleanup_targets(conn: sqlite3.Connection, action: str, portal: str) -> tuple[int, int]:
+    """(duplicate rows, invalid rows) that apply_cleanup would delete."""
+    engine = _dedupe_engine()
+    duplicates = engine.count_duplicates(conn, portal) if action in ["duplicates", "all"] else 0
+    invalid = 0
+    if action in ["invalid", "all"]:
+        where, params = engine.portal_filter(portal)
+        invalid = conn.execute(f"SELECT COUNT(*) FROM tenders WHERE {INVALID_RECORD_WHERE} {where}", params).fetchone()[0]
+    return duplicates, invalid
+
+
+def apply_cleanup(db_path: str | Path, action: str, portal: str, backup_dir: str | Path, ctx=None) -> dict[str, Any]:
+    """Back up the database, then delete duplicates and/or invalid rows in batches."""
+    ctx = ctx or _NullContext()
+    engine = _dedupe_engine()
+    log: list[str] = []
+
+    backup_path = backup_database(db_path, backup_dir)
+    log.append(f"💾 Backup created: {backup_path.name}")
+    ctx.report(10, "Backup created", force=True)
+
+    def stage_progress(low: int, high: int):
+        def callback(done: int, total: int, message: str) -> None:
+            ctx.report(low + int((high - low) * done / max(1, total)), message)
+        return callback
+
+    deleted_total = 0
+    if action in ["duplicates", "all"]:
+        # Keep the newest row (latest run, then highest id) of each portal + tender ID
+        dup_deleted = engine.remove_duplicates(db_path, portal, progress_callback=stage_progress(10, 55))
+        deleted_total += dup_deleted
+        log.append(f"🗑️ Deleted {dup_deleted} duplicate record(s)")
+        ctx.report(55, "Removed duplicates", force=True)
+
+    if action in ["invalid", "all"]:
+        # Delete records with invalid/missing data
+        where, params = engine.portal_filter(portal)
+        conn = sqlite3.connect(str(db_path), timeout=30)
+        try:
+            ids = [row[0] for row in conn.execute(f"SELECT id FROM tenders WHERE {INVALID_RECORD_WHERE} {where}", params)]
+        finally:
+            conn.close()
+        inv_deleted = engine.delete_ids_in_batches(
+            db_path, ids, progress_callback=stage_progress(55, 90), label="invalid records"
+        )
+        deleted_total += inv_deleted
+        log.append(f"🗑️ Deleted {inv_deleted} invalid record(s)")
+        ctx.report(90, "Removed invalid records", force=True)
+
+    portal_msg = f"for '{portal}'" if portal != "All Portals" else "across all portals"
+    log.append(f"✅ Cleanup complete {portal_msg}: {deleted_total} records deleted")
+    return {"deleted": deleted_total, "backup": backup_path.name, "log": log}
+
+
+def run_cleanup_script(db_path: str | Path, backup_dir: str | Path, script_path: str | Path, timeout: int = 120) -> dict[str, Any]:
+    """Run tools/cleanup_tender_records.py against the database."""
+    script_path = Path(script_path)
+    if not script_path.exists():
+        return {"ok": False, "log": ["❌ Cleanup script not found"]}
+
+    Path(backup_dir).mkdir(exist_ok=True)
+    result = subprocess.run(
+        [sys.executable, str(script_path), "--db", str(db_path), "--backup-dir", str(backup_dir)],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode == 0:
+        return {"ok": True, "log": ["✅ Cleanup completed successfully", result.stdout]}
+    return {"ok": False, "log": [f"❌ Cleanup failed: {result.stderr}"]}
+
+
+# ---------------------------------------------------------------------------
+# Job entry points (see jobs.JOB_TASKS)
+# ---------------------------------------------------------------------------
+
+def run_integrity_check_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    return compute_integrity_report(params["db_path"], ctx)
+
+
+def run_cleanup_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    result = apply_cleanup(params["db_path"], params["action"], params["portal"], params["backup_dir"], ctx)
+    report = compute_integrity_report(params["db_path"], ctx)
+    report["log"] = result["log"] + report["log"]
+    report["cleanup"] = {"deleted": result["deleted"], "backup": result["backup"]}
+    return report
+
+
+def run_cleanup_script_job(params: dict[str, Any], ctx) -> dict[str, Any]:
+    ctx.report(10, "Running cleanup script", force=True)
+    result = run_cleanup_script(params["db_path"], params["backup_dir"], params["script_path"])
+    if not result["ok"]:
+        return {"log": result["log"]}
+    report = compute_integrity_report(params["db_path"], ctx)
+    report["log"] = result["log"] + report["log"]
+    return report
@@ -0,0 +1,368 @@
+"""Local background job runner for long-running dashboard operations.
+
+Event handlers enqueue work with submit_job() and return immediately; the
+job runs in a process pool and reports progress into a SQLite job table
+that pages poll with get_job(). Jobs can be cancelled while queued or
+cooperatively while running (JobContext.report raises JobCancelled).
+
+Job kinds map to "module:function" paths so worker processes can import
+them without sharing a registry. A job function takes (params, ctx) and
+returns a JSON-serializable dict.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from . import db
+
+
+JOB_TASKS: dict[str, str] = {
+    "integrity_check": "tender_dashboard_reflex.integrity:run_integrity_check_job",
+    "integrity_cleanup": "tender_dashboard_reflex.integrity:run_cleanup_job",
+    "integrity_cleanup_script": "tender_dashboard_reflex.integrity:run_cleanup_script_job",
+    "excel_import": "tender_dashboard_reflex.importer:run_import_job",
+    "export_portal_files": "tender_dashboard_reflex.export_engine:run_portal_files_job",
+    "export_portal_workbook": "tender_dashboard_reflex.export_engine:run_portal_workbook_job",
+    "export_filtered_files": "tender_dashboard_reflex.export_engine:run_filtered_files_job",
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+DEFAULT_MAX_WORKERS = 2
+PROGRESS_WRITE_INTERVAL = 0.25  # seconds between progress writes from a job
+JOB_HISTORY_LIMIT = 200
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+
+def _resolve_jobs_db_path() -> Path:
+    env_path = os.getenv("DASHBOARD_JOBS_DB", "").strip()
+    if env_path:
+        return Path(env_path).expanduser().resolve()
+    # Separate file so job bookkeeping never contends with scraper writes
+    return Path(db.DB_PATH).parent / "dashboard_jobs.sqlite3"
+
+
+@contextmanager
+def _connect(jobs_db_path: str | Path) -> Iterator[sqlite3.Connection]:
+    """Short-lived connection that commits on success and is always closed."""
+    Path(jobs_db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(jobs_db_path), timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _ensure_schema(jobs_db_path: str | Path) -> None:
+    with _connect(jobs_db_path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dashboard_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress INTEGER NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                params_json TEXT,
+                result_json TEXT,
+                error TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_dashboard_jobs_status ON dashboard_jobs(status);
+            """
+        )
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobContext:
+    """Handle passed to job functions for progress reporting and cancellation."""
+
+    def __init__(self, job_id: int, jobs_db_path: str):
+        self.job_id = job_id
+        self.jobs_db_path = jobs_db_path
+        self._last_write = 0.0
+
+    def cancel_requested(self) -> bool:
+        with _connect(self.jobs_db_path) as conn:
+            row = conn.execute(
+                "SELECT cancel_requested FROM dashboard_jobs WHERE id = ?", (self.job_id,)
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def report(self, progress: int | None = None, message: str = "", force: bool = False) -> None:
+        """Record progress (0-100) and check for cancellation.
+
+        Writes are throttled to PROGRESS_WRITE_INTERVAL unless force=True, so
+        jobs can call this per chunk without hammering the job table.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < PROGRESS_WRITE_INTERVAL:
+            return
+        self._last_write = now
+        with _connect(self.jobs_db_path) as conn:
+            if progress is None:
+                conn.execute(
+                    "UPDATE dashboard_jobs SET message = ? WHERE id = ?",
+                    (message, self.job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE dashboard_jobs SET progress = ?, message = ? WHERE id = ?",
+                    (max(0, min(100, int(progress))), message, self.job_id),
+                )
+            row = conn.execute(
+                "SELECT cancel_requested FROM dashboard_jobs WHERE id = ?", (self.job_id,)
+            ).fetchone()
+        if row and row["cancel_requested"]:
+            raise JobCancelled()
+
+    def progress_callback(self, done: int, total: int, message: str) -> None:
+        """Adapter for engine-style progress_callback(done, total, message)."""
+        self.report(int(done * 100 / total) if total else None, message)
+
+
+def _load_task(kind: str):
+    target = JOB_TASKS.get(kind)
+    if not target:
+        raise ValueError(f"Unknown job kind: {kind}")
+    module_name, func_name = target.split(":", 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _run_job(job_id: int, kind: str, params: dict[str, Any], jobs_db_path: str, tender_db_path: str) -> None:
+    """Worker-process entry point. All outcomes are recorded in the job table."""
+    db.DB_PATH = Path(tender_db_path)
+    ctx = JobContext(job_id, jobs_db_path)
+
+    with _connect(jobs_db_path) as conn:
+        cur = conn.execute(
+            """
+            UPDATE dashboard_jobs
+            SET status = 'running', started_at = ?
+            WHERE id = ? AND status = 'queued' AND cancel_requested = 0
+            """,
+            (_now(), job_id),
+        )
+        if cur.rowcount == 0:
+            conn.execute(
+                "UPDATE dashboard_jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (_now(), job_id),
+            )
+            return
+
+    try:
+        result = _load_task(kind)(params, ctx) or {}
+        status, error, message = "completed", None, "Completed"
+        result_json = json.dumps(result, default=str)
+    except JobCancelled:
+        status, error, message, result_json = "cancelled", None, "Cancelled", None
+    except Exception as ex:
+        status, error, message, result_json = "failed", traceback.format_exc(), f"{type(ex).__name__}: {ex}", None
+
+    with _connect(jobs_db_path) as conn:
+        conn.execute(
+            """
+            UPDATE dashboard_jobs
+            SET status = ?, message = ?, error = ?, result_json = ?, finished_at = ?,
+                progress = CASE WHEN ? = 'completed' THEN 100 ELSE progress END
+            WHERE id = ?
+            """,
+            (status, message, error, result_json, _now(), status, job_id),
+        )
+
+
+class JobRunner:
+    """Process-pool job runner shared by every dashboard session in this server."""
+
+    def __init__(self, jobs_db_path: str | Path | None = None, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.jobs_db_path = str(jobs_db_path or _resolve_jobs_db_path())
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._futures: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        _ensure_schema(self.jobs_db_path)
+        self._fail_orphaned_jobs()
+
+    def _fail_orphaned_jobs(self) -> None:
+        # Jobs left active by a previous server process can never finish
+        with _connect(self.jobs_db_path) as conn:
+            conn.execute(
+                """
+                UPDATE dashboard_jobs
+                SET status = 'failed', message = 'Interrupted by dashboard restart', finished_at = ?
+                WHERE status IN ('queued', 'running')
+                """,
+                (_now(),),
+            )
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forked workers would inherit the server's open SQLite handles
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, kind: str, params: dict[str, Any] | None = None) -> int:
+        if kind not in JOB_TASKS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        params = params or {}
+        with _connect(self.jobs_db_path) as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO dashboard_jobs (kind, status, message, params_json, created_at)
+                VALUES (?, 'queued', 'Queued', ?, ?)
+                """,
+                (kind, json.dumps(params, default=str), _now()),
+            )
+            job_id = int(cur.lastrowid or 0)
+            conn.execute(
+                """
+                DELETE FROM dashboard_jobs
+                WHERE status IN ('completed', 'failed', 'cancelled')
+                  AND id <= ?
+                """,
+                (job_id - JOB_HISTORY_LIMIT,),
+            )
+
+        with self._lock:
+            future = self._pool().submit(
+                _run_job, job_id, kind, params, self.jobs_db_path, str(db.DB_PATH)
+            )
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f, jid=job_id: self._on_future_done(jid, f))
+        return job_id
+
+    def _on_future_done(self, job_id: int, future: Future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            self._mark_cancelled(job_id)
+            return
+        exc = future.exception()
+        if exc is not None:
+            # The worker died before it could record an outcome (e.g. BrokenProcessPool)
+            with _connect(self.jobs_db_path) as conn:
+                conn.execute(
+                    """
+                    UPDATE dashboard_jobs
+                    SET status = 'failed', message = ?, finished_at = ?
+                    WHERE id = ? AND status IN ('queued', 'running')
+                    """,
+                    (f"{type(exc).__name__}: {exc}", _now(), job_id),
+                )
+            if isinstance(exc, BrokenProcessPool):
+                with self._lock:
+                    self._executor = None
+
+    def _mark_cancelled(self, job_id: int) -> None:
+        with _connect(self.jobs_db_path) as conn:
+            conn.execute(
+                """
+                UPDATE dashboard_jobs
+                SET status = 'cancelled', message = 'Cancelled', finished_at = ?
+                WHERE id = ? AND status IN ('queued', 'running')
+                """,
+                (_now(), job_id),
+            )
+
+    def cancel(self, job_id: int) -> bool:
+        """Request cancellation. Queued jobs stop immediately, running ones at their next report()."""
+        with _connect(self.jobs_db_path) as conn:
+            cur = conn.execute(
+                """
+                UPDATE dashboard_jobs
+                SET cancel_requested = 1, message = 'Cancelling...'
+                WHERE id = ? AND status IN ('queued', 'running')
+                """,
+                (int(job_id),),
+            )
+            if cur.rowcount == 0:
+                return False
+        with self._lock:
+            future = self._futures.get(int(job_id))
+        if future is not None and future.cancel():
+            self._mark_cancelled(int(job_id))
+        return True
+
+    def get(self, job_id: int) -> dict[str, Any] | None:
+        with _connect(self.jobs_db_path) as conn:
+            row = conn.execute("SELECT * FROM dashboard_jobs WHERE id = ?", (int(job_id),)).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job.pop("result_json") or "null")
+        job["params"] = json.loads(job.pop("params_json") or "null")
+        return job
+
+    def list_jobs(self, active_only: bool = False, limit: int = 50) -> list[dict[str, Any]]:
+        where = "WHERE status IN ('queued', 'running')" if active_only else ""
+        with _connect(self.jobs_db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT id, kind, status, progress, message, created_at, started_at, finished_at
+                FROM dashboard_jobs
+                {where}
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (int(limit),),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_runner: JobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> JobRunner:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
+
+
+def submit_job(kind: str, params: dict[str, Any] | None = None) -> int:
+    return get_runner().submit(kind, params)
+
+
+def get_job(job_id: int) -> dict[str, Any] | None:
+    return get_runner().get(job_id)
+
+
+def cancel_job(job_id: int) -> bool:
+    return get_runner().cancel(job_id)
+
+
+def list_jobs(active_only: bool = False, limit: int = 50) -> list[dict[str, Any]]:
+    return get_runner().list_jobs(active_only=active_only, limit=limit)
@@ -0,0 +1,38 @@
+"""Periodic database maintenance run for as long as the dashboard is up.
+
+Registered as Reflex lifespan tasks in dashboard_app.py:
+
+    expiry_sweep_task          flips tenders whose closing time has passed
+                               to is_live = 0 (and backfills closing_at), so
+                               the is_live filters do not drift
+    integrity_reconcile_task   full recount of the trigger-maintained
+                               portal integrity counters, as a verification
+
+Both wrap the loops in cleanup_service (workspace root) against the database
+the dashboard reads (db.DB_PATH). They are cancelled on shutdown.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from . import db
+
+
+def _cleanup_service():
+    # cleanup_service lives at the workspace root
+    workspace_root = Path(__file__).parent.parent.parent
+    if str(workspace_root) not in sys.path:
+        sys.path.insert(0, str(workspace_root))
+    import cleanup_service
+    return cleanup_service
+
+
+async def expiry_sweep_task() -> None:
+    cleanup_service = _cleanup_service()
+    await cleanup_service.async_expiry_sweep_task(db_path=db.DB_PATH)
+
+
+async def integrity_reconcile_task() -> None:
+    cleanup_service = _cleanup_service()
+    await cleanup_service.async_integrity_reconcile_task(db_path=db.DB_PATH)
@@ -0,0 +1,244 @@
+"""Opt-in SQL profiler for the dashboard data layer.
+
+Pooled read connections (db.read_connection) use ProfilingConnection. When
+profiling is enabled (TENDER_DB_PROFILE=1, or set_enabled() from the dev
+panel) every statement is timed from execute() until its rows have been
+fetched. Statements at or above the slow threshold (TENDER_DB_SLOW_MS,
+default 100 ms) are EXPLAINed and appended to a rotating JSONL log, with
+full table scans flagged. Disabled profiling costs one flag check per query.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+SLOW_QUERY_MS = float(os.getenv("TENDER_DB_SLOW_MS", "100"))
+SLOW_LOG_PATH = Path(
+    os.getenv("TENDER_DB_SLOW_LOG", "").strip()
+    or Path(__file__).resolve().parents[2] / "logs" / "dashboard_slow_queries.jsonl"
+)
+SLOW_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_LOG_BACKUPS = 3
+RECENT_QUERY_LIMIT = 500
+
+_enabled = os.getenv("TENDER_DB_PROFILE", "").strip().lower() in ("1", "true", "yes")
+_recent: deque[dict[str, Any]] = deque(maxlen=RECENT_QUERY_LIMIT)
+_recent_lock = threading.Lock()
+_slow_logger: logging.Logger | None = None
+_slow_logger_lock = threading.Lock()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def _normalize_sql(sql: str) -> str:
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def _get_slow_logger() -> logging.Logger:
+    global _slow_logger
+    with _slow_logger_lock:
+        if _slow_logger is None:
+            SLOW_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger("tender_dashboard.slow_queries")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(
+                SLOW_LOG_PATH, maxBytes=SLOW_LOG_MAX_BYTES, backupCount=SLOW_LOG_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _slow_logger = logger
+        return _slow_logger
+
+
+def _explain(conn: sqlite3.Connection, sql: str, params: Any) -> tuple[list[str], bool]:
+    """Return EXPLAIN QUERY PLAN detail lines and whether a full scan was used."""
+    try:
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except sqlite3.Error as ex:
+        return [f"EXPLAIN failed: {ex}"], False
+    plan = [str(row[3]) for row in rows]
+    # "SCAN tenders" (or "SCAN TABLE tenders" on older SQLite) without an index
+    full_scan = any(
+        step.startswith("SCAN ") and "INDEX" not in step and "CONSTANT ROW" not in step
+        for step in plan
+    )
+    return plan, full_scan
+
+
+def _record(conn: sqlite3.Connection, sql: str, params: Any, elapsed_ms: float, rows: int) -> None:
+    entry: dict[str, Any] = {
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "sql": _normalize_sql(sql),
+        "ms": round(elapsed_ms, 2),
+        "rows": rows,
+    }
+    if elapsed_ms >= SLOW_QUERY_MS:
+        plan: list[str] = []
+        full_scan = False
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            plan, full_scan = _explain(conn, sql, params)
+        entry.update({"slow": True, "plan": plan, "full_scan": full_scan, "pid": os.getpid()})
+        try:
+            _get_slow_logger().info(json.dumps(entry, default=str))
+        except OSError:
+            pass
+    with _recent_lock:
+        _recent.append(entry)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor that times a statement from execute() until its rows are consumed.
+
+    Statements whose rows are not fully fetched (e.g. a single fetchone())
+    are recorded when the cursor is reused or closed, or when the pool takes
+    the connection back (ProfilingConnection.flush_profile).
+    """
+
+    _pending: tuple[str, Any, float, int] | None = None
+
+    def _finish(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        sql, params, elapsed_ms, rows = pending
+        _record(self.connection, sql, params, elapsed_ms, rows)
+
+    def _add_fetch(self, started: float, rows: int, exhausted: bool) -> None:
+        if self._pending is None:
+            return
+        sql, params, elapsed_ms, count = self._pending
+        self._pending = (sql, params, elapsed_ms + (time.perf_counter() - started) * 1000, count + rows)
+        if exhausted:
+            self._finish()
+
+    def execute(self, sql, parameters=()):  # type: ignore[override]
+        if not _enabled:
+            return super().execute(sql, parameters)
+        self._finish()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.description is None:
+            # No result set (PRAGMA without output, etc.)
+            _record(self.connection, sql, parameters, elapsed_ms, max(self.rowcount, 0))
+        else:
+            self._pending = (sql, parameters, elapsed_ms, 0)
+            self.connection._track_cursor(self)
+        return self
+
+    def fetchone(self):
+        if self._pending is None:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._add_fetch(started, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = size if size is not None else self.arraysize
+        if self._pending is None:
+            return super().fetchmany(size)
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._add_fetch(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        if self._pending is None:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._add_fetch(started, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors report to the profiler."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._profiled_cursors: list[ProfilingCursor] = []
+
+    def cursor(self, factory=ProfilingCursor):  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def _track_cursor(self, cursor: ProfilingCursor) -> None:
+        # Strong refs: conn.execute(...).fetchone() cursors are otherwise gone
+        # before their statement can be recorded
+        self._profiled_cursors.append(cursor)
+
+    def flush_profile(self) -> None:
+        """Record statements still pending on this connection's cursors."""
+        cursors, self._profiled_cursors = self._profiled_cursors, []
+        for cursor in cursors:
+            cursor._finish()
+
+
+def get_recent_queries(limit: int = 100) -> list[dict[str, Any]]:
+    """Most recent profiled statements in this process, newest first."""
+    with _recent_lock:
+        entries = list(_recent)
+    return entries[::-1][:limit]
+
+
+def get_query_summary(limit: int = 25) -> list[dict[str, Any]]:
+    """Recent statements grouped by SQL text, ordered by total time."""
+    summary: dict[str, dict[str, Any]] = {}
+    for entry in get_recent_queries(RECENT_QUERY_LIMIT):
+        item = summary.setdefault(entry["sql"], {"sql": entry["sql"], "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        item["calls"] += 1
+        item["total_ms"] += entry["ms"]
+        item["max_ms"] = max(item["max_ms"], entry["ms"])
+        item["rows"] += entry["rows"]
+    ordered = sorted(summary.values(), key=lambda item: item["total_ms"], reverse=True)
+    for item in ordered:
+        item["total_ms"] = round(item["total_ms"], 2)
+    return ordered[:limit]
+
+
+def read_slow_query_log(limit: int = 50) -> list[dict[str, Any]]:
+    """Newest entries from the slow-query JSONL log (covers job workers too)."""
+    if not SLOW_LOG_PATH.exists():
+        return []
+    with open(SLOW_LOG_PATH, "r", encoding="utf-8") as handle:
+        lines = deque(handle, maxlen=limit)
+    entries = []
+    for line in reversed(lines):
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+def clear_recent() -> None:
+    with _recent_lock:
+        _recent.clear()
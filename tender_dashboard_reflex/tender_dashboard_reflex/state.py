@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import datetime
 from pydantic import BaseModel
 from typing import Any
@@ -10,6 +11,8 @@ from pathlib import Path
 import reflex as rx
 
 from . import db
+from . import jobs
+from . import query_profiler
 
 
 def _extract_real_tender_id(raw_id: str, title_ref: str) -> str:
@@ -74,6 +77,9 @@ class DashboardState(rx.State):
     public_export_portal: str = "All"
     public_export_expired_days: int = 30
     public_exporting: bool = False
+    export_job_id: str = ""  # Background job id while an export runs
+    _export_job_public: bool = False
+    _export_job_dir: str = ""
 
     portal_options: list[str] = ["All"]
     portal_group_options: list[str] = ["All", "North India", "PSUs", "CPPP", "State Portals", "Others"]
@@ -449,86 +455,79 @@ class DashboardState(rx.State):
         except ValueError:
             self.export_expired_days = 30
     
-    async def export_to_excel(self):
-        """Export filtered tenders to Excel files (one per portal)."""
-        self.exporting = True
-        self.loading = True
-        yield
-        
+    def _submit_export(self, kind: str, params: dict[str, Any], public: bool) -> bool:
+        if self.export_job_id:
+            self.show_toast_notification("Another export is still running", "error")
+            return False
         try:
-            # Import pandas and openpyxl for Excel export
-            try:
-                import pandas as pd
-            except ImportError:
-                self.show_toast_notification("pandas not installed. Run: pip install pandas openpyxl", "error")
-                self.exporting = False
-                self.loading = False
-                yield
-                return
-            
-            # Get export data grouped by portal
-            filters = self._filters()
-            portals_data = db.export_tenders_by_portal(filters, self.export_expired_days)
-            
-            if not portals_data:
-                self.show_toast_notification("No tenders to export with current filters", "error")
-                self.exporting = False
-                self.loading = False
-                yield
-                return
-            
-            # Create exports directory if it doesn't exist
-            export_dir = Path("Tender84_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Export each portal to separate file
-            exported_files = []
-            for portal_name, tenders in portals_data.items():
-                # Clean portal name for filename
-                safe_portal_name = "".join(c if c.isalnum() or c in (' ', '_') else '_' for c in portal_name)
-                safe_portal_name = safe_portal_name.replace(' ', '_').lower()
-                
-                # Create DataFrame with exact column order
-                df = pd.DataFrame(tenders)
-                
-                # Ensure column order matches template
-                column_order = [
-                    "Department Name",
-                    "S.No",
-                    "e-Published Date",
-                    "Closing Date",
-                    "Opening Date",
-                    "Organisation Chain",
-                    "Title and Ref.No./Tender ID",
-                    "Tender ID (Extracted)",
-                    "Direct URL",
-                    "Status URL"
-                ]
-                df = df[column_order]
-                
-                # Export to Excel
-                filename = f"{safe_portal_name}_tenders_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                filepath = export_dir / filename
-                df.to_excel(filepath, index=False, engine='openpyxl')
-                exported_files.append(filename)
-            
-            # Show success message
-            total_files = len(exported_files)
-            total_tenders = sum(len(tenders) for tenders in portals_data.values())
-            message = f"✅ Exported {total_tenders} tenders to {total_files} file(s) in {export_dir.name}"
-            self.show_toast_notification(message, "success")
-            
+            self.export_job_id = str(jobs.submit_job(kind, params))
         except Exception as ex:
-            error_msg = f"Export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
-        
-        finally:
-            self.exporting = False
-            self.loading = False
-            self.show_export_dialog = False
-            yield
-            self.loading = True
-            self.refresh_data()
+            prefix = "Public export failed" if public else "Export failed"
+            self.show_toast_notification(f"{prefix}: {type(ex).__name__}: {ex}", "error")
+            return False
+        self._export_job_public = public
+        self._export_job_dir = Path(params["export_dir"]).name
+        if public:
+            self.public_exporting = True
+        else:
+            self.exporting = True
+        return True
+
+    def export_to_excel(self):
+        """Export filtered tenders to Excel files (one per portal) in a background job."""
+        export_dir = Path("Tender84_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._submit_export(
+            "export_filtered_files",
+            {
+                "filters": asdict(self._filters()),
+                "export_dir": str(export_dir),
+                "expired_days": self.export_expired_days,
+            },
+            public=False,
+        )
+        self.show_export_dialog = False
+
+    def poll_export_job(self, _value=None):
+        """Poll the background export job and report the outcome."""
+        if not self.export_job_id:
+            return
+        job = jobs.get_job(int(self.export_job_id))
+        if job is not None and job["status"] in jobs.ACTIVE_STATUSES:
+            return
+
+        public = self._export_job_public
+        prefix = "Public export failed" if public else "Export failed"
+        if job is None or job["status"] == "failed":
+            self.show_toast_notification(f"{prefix}: {job['message'] if job else 'job record missing'}", "error")
+        elif job["status"] == "cancelled":
+            self.show_toast_notification("Export cancelled", "info")
+        else:
+            results = (job["result"] or {}).get("results", [])
+            if not results:
+                if public:
+                    self.show_toast_notification(f"No tenders found for {self.public_export_portal}", "error")
+                else:
+                    self.show_toast_notification("No tenders to export with current filters", "error")
+            elif public:
+                live_count = sum(r["live_count"] for r in results)
+                expired_count = sum(r["row_count"] for r in results) - live_count
+                message = f"✅ Public export: {live_count} live + {expired_count} expired tenders → {results[0]['filename']}"
+                self.show_toast_notification(message, "success")
+            else:
+                total_tenders = sum(r["row_count"] for r in results)
+                message = f"✅ Exported {total_tenders} tenders to {len(results)} file(s) in {self._export_job_dir}"
+                self.show_toast_notification(message, "success")
+
+        self.export_job_id = ""
+        self.exporting = False
+        self.public_exporting = False
+        self.loading = True
+        self.refresh_data()
+
+    def cancel_export(self):
+        """Request cancellation of the running export job."""
+        if self.export_job_id:
+            jobs.cancel_job(int(self.export_job_id))
 
     def toggle_public_export(self):
         """Toggle public export interface."""
@@ -545,107 +544,38 @@ class DashboardState(rx.State):
         except ValueError:
             self.public_export_expired_days = 30
     
-    async def public_export_to_excel(self):
+    def public_export_to_excel(self):
         """Export all live tenders + X days expired for a specific portal (for website)."""
-        self.public_exporting = True
-        self.loading = True
-        yield
+        # Validate portal selection
+        if self.public_export_portal == "All":
+            self.show_toast_notification("Please select a specific portal for public export", "error")
+            return
         
-        try:
-            # Import pandas
-            try:
-                import pandas as pd
-            except ImportError:
-                self.show_toast_notification("pandas not installed. Run: pip install openpyxl", "error")
-                self.public_exporting = False
-                self.loading = False
-                yield
-                return
-            
-            # Validate portal selection
-            if self.public_export_portal == "All":
-                self.show_toast_notification("Please select a specific portal for public export", "error")
-                self.public_exporting = False
-                self.loading = False
-                yield
-                return
-            
-            # Create filters for live + expired tenders
-            from datetime import date, timedelta
-            from . import db
-            
-            # Set cutoff date for expired tenders
-            cutoff_date = (date.today() - timedelta(days=self.public_export_expired_days)).strftime("%Y-%m-%d")
-            
-            # Build filter for specific portal, no lifecycle filter (get all)
-            filters = db.TenderFilters(
-                portal=self.public_export_portal,
-                show_live_only=False,
-                show_expired_only=False,
-                from_date=cutoff_date,  # Only get tenders from last X days
-                to_date=""
-            )
-            
-            # Get tenders for this portal
-            portals_data = db.export_tenders_by_portal(filters, self.public_export_expired_days)
-            
-            if not portals_data or self.public_export_portal not in portals_data:
-                self.show_toast_notification(f"No tenders found for {self.public_export_portal}", "error")
-                self.public_exporting = False
-                self.loading = False
-                yield
-                return
-            
-            # Create public exports directory
-            export_dir = Path("Public_Exports") / datetime.now().strftime("%Y%m%d")
-            export_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Get tenders for selected portal
-            tenders = portals_data[self.public_export_portal]
-            
-            # Clean portal name for filename
-            safe_portal_name = "".join(c if c.isalnum() or c in (' ', '_') else '_' for c in self.public_export_portal)
-            safe_portal_name = safe_portal_name.replace(' ', '_').lower()
-            
-            # Create DataFrame
-            df = pd.DataFrame(tenders)
-            
-            # Column order
-            column_order = [
-                "Department Name",
-                "S.No",
-                "e-Published Date",
-                "Closing Date",
-                "Opening Date",
-                "Organisation Chain",
-                "Title and Ref.No./Tender ID",
-                "Tender ID (Extracted)",
-                "Direct URL",
-                "Status URL"
-            ]
-            df = df[column_order]
-            
-            # Export to Excel
-            filename = f"{safe_portal_name}_public_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filepath = export_dir / filename
-            df.to_excel(filepath, index=False, engine='openpyxl')
-            
-            # Success message
-            live_count = len([t for t in tenders if t.get("Status URL", "").lower() == "live"])
-            expired_count = len(tenders) - live_count
-            message = f"✅ Public export: {live_count} live + {expired_count} expired tenders → {filename}"
-            self.show_toast_notification(message, "success")
-            
-        except Exception as ex:
-            error_msg = f"Public export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
+        from datetime import date, timedelta
         
-        finally:
-            self.public_exporting = False
-            self.loading = False
-            yield
-            self.loading = True
-            self.refresh_data()
+        # Set cutoff date for expired tenders
+        cutoff_date = (date.today() - timedelta(days=self.public_export_expired_days)).strftime("%Y-%m-%d")
+        
+        # Build filter for specific portal, no lifecycle filter (get all)
+        filters = db.TenderFilters(
+            portal=self.public_export_portal,
+            show_live_only=False,
+            show_expired_only=False,
+            from_date=cutoff_date,  # Only get tenders from last X days
+            to_date=""
+        )
+        
+        export_dir = Path("Public_Exports") / datetime.now().strftime("%Y%m%d")
+        self._submit_export(
+            "export_filtered_files",
+            {
+                "filters": asdict(filters),
+                "export_dir": str(export_dir),
+                "expired_days": self.public_export_expired_days,
+                "file_suffix": "public",
+            },
+            public=True,
+        )
 
     def prev_page(self):
         if self.page > 1:
@@ -709,6 +639,25 @@ class DataRow(BaseModel):
     last_seen_at: str = ""
 
 
+class QueryStatRow(BaseModel):
+    """Aggregated timing for one SQL statement (query profiler dev panel)."""
+    sql: str = ""
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+
+
+class SlowQueryRow(BaseModel):
+    """One slow-query log entry (query profiler dev panel)."""
+    ts: str = ""
+    ms: float = 0.0
+    rows: int = 0
+    sql: str = ""
+    plan: str = ""
+    full_scan: bool = False
+
+
 class PortalManagementState(rx.State):
     """State for Portal Management page."""
     loading: bool = False
@@ -721,6 +670,10 @@ class PortalManagementState(rx.State):
     export_live_only: bool = False  # Export only live tenders
     export_selected_portals: list[str] = []  # Selected portal slugs for export
     exporting: bool = False
+    export_progress: int = 0  # 0-100 while an export runs
+    export_progress_message: str = ""
+    export_job_id: str = ""  # Background job id while an export runs
+    _export_job_meta: dict[str, Any] = {}
     export_base_dir: str = "Portal_Exports"
     last_export_path: str = ""
     
@@ -949,322 +902,163 @@ class PortalManagementState(rx.State):
         """Deselect all portals."""
         self.export_selected_portals = []
     
-    async def export_selected_portals_to_excel(self):
-        """Export selected portals to individual Excel files."""
-        self.exporting = True
-        yield
-        
+    def _submit_export(self, kind: str, params: dict[str, Any], meta: dict[str, Any]):
+        """Enqueue an export job; poll_export_job finishes it using `meta`."""
+        if self.export_job_id:
+            self.show_toast_notification("Another export is still running", "error")
+            return
         try:
-            import pandas as pd
-            
-            if not self.export_selected_portals:
-                self.show_toast_notification("Please select at least one portal to export", "error")
-                self.exporting = False
-                yield
-                return
-            
-            # Create export directory
-            export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir.mkdir(parents=True, exist_ok=True)
-            
-            exported_files = []
-            total_tenders = 0
-            
-            # Export each selected portal
-            for portal_slug in self.export_selected_portals:
-                # Find portal data
-                portal = next((p for p in self.portal_rows if p.portal_slug == portal_slug), None)
-                if not portal:
-                    continue
-                
-                # Get tender data
-                tenders = db.export_portal_data(
-                    portal_slug=portal.portal_slug,
-                    portal_name=portal.portal_name,
-                    base_url=portal.base_url,
-                    expired_days=self.export_expired_days,
-                    live_only=self.export_live_only
-                )
-                
-                if not tenders:
-                    continue
-                
-                # Create filename from base_url
-                filename_base = db.portal_url_to_filename(portal.base_url, portal.portal_name)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{filename_base}_tenders_{timestamp}.xlsx"
-                
-                # Create DataFrame
-                df = pd.DataFrame(tenders)
-                
-                # Column order
-                column_order = [
-                    "Department Name",
-                    "S.No",
-                    "e-Published Date",
-                    "Closing Date",
-                    "Opening Date",
-                    "Organisation Chain",
-                    "Title and Ref.No./Tender ID",
-                    "Tender ID (Extracted)",
-                    "Direct URL",
-                    "Status URL"
-                ]
-                df = df[column_order]
-                
-                # Export to Excel
-                filepath = export_dir / filename
-                df.to_excel(filepath, index=False, engine='openpyxl')
-                
-                exported_files.append(filename)
-                total_tenders += len(tenders)
-            
-            # Log export history
-            portal_names = [p.portal_name for p in self.portal_rows if p.portal_slug in self.export_selected_portals]
-            db.log_export_history(
-                export_type="selected_portals",
-                portals=portal_names,
-                total_tenders=total_tenders,
-                file_count=len(exported_files),
-                export_dir=export_dir.name,
-                settings={
-                    "live_only": self.export_live_only,
-                    "expired_days": self.export_expired_days,
-                }
-            )
-            
-            # Success message
-            message = f"✅ Exported {len(exported_files)} portal(s) with {total_tenders} tenders to {export_dir.name}"
-            self.show_toast_notification(message, "success")
-            
+            self.export_job_id = str(jobs.submit_job(kind, params))
         except Exception as ex:
-            error_msg = f"Export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
-        
-        finally:
-            self.exporting = False
-            self.show_export_dialog = False
-            yield
-
-    async def export_selected_portals_single_excel(self):
-        """Export selected portals into a single Excel workbook (one sheet per portal + combined sheet)."""
+            self.show_toast_notification(f"{meta['error_prefix']}: {type(ex).__name__}: {ex}", "error")
+            return
+        self._export_job_meta = meta
         self.exporting = True
-        yield
-
-        try:
-            import pandas as pd
+        self.export_progress = 0
+        self.export_progress_message = "Starting export..."
+
+    def _export_params(self, portal_rows: list[PortalRow], **extra: Any) -> dict[str, Any]:
+        return {
+            "jobs": [
+                {"portal_slug": p.portal_slug, "portal_name": p.portal_name, "base_url": p.base_url}
+                for p in portal_rows
+            ],
+            "expired_days": self.export_expired_days,
+            "live_only": self.export_live_only,
+            **extra,
+        }
 
-            if not self.export_selected_portals:
-                self.show_toast_notification("Please select at least one portal to export", "error")
-                self.exporting = False
-                yield
+    def poll_export_job(self, _value=None):
+        """Poll the background export job and log history when it completes."""
+        if not self.export_job_id:
+            return
+        job = jobs.get_job(int(self.export_job_id))
+        meta = self._export_job_meta
+        if job is not None:
+            self.export_progress = job["progress"]
+            self.export_progress_message = job["message"]
+            if job["status"] in jobs.ACTIVE_STATUSES:
                 return
 
-            # Create export directory
-            export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"portals_selected_tenders_{timestamp}.xlsx"
-            filepath = export_dir / filename
-
-            # Create ExcelWriter and write each portal to its own sheet
-            column_order = [
-                "Department Name",
-                "S.No",
-                "e-Published Date",
-                "Closing Date",
-                "Opening Date",
-                "Organisation Chain",
-                "Title and Ref.No./Tender ID",
-                "Tender ID (Extracted)",
-                "Direct URL",
-                "Status URL",
-            ]
-
-            with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
-                combined_rows = []
-
-                for portal_slug in self.export_selected_portals:
-                    portal = next((p for p in self.portal_rows if p.portal_slug == portal_slug), None)
-                    if not portal:
-                        continue
-
-                    tenders = db.export_portal_data(
-                        portal_slug=portal.portal_slug,
-                        portal_name=portal.portal_name,
-                        base_url=portal.base_url,
-                        expired_days=self.export_expired_days,
-                        live_only=self.export_live_only,
-                    )
-
-                    if not tenders:
-                        continue
-
-                    df = pd.DataFrame(tenders)
-                    # Ensure expected columns exist
-                    column_order = [
-                        "Department Name",
-                        "S.No",
-                        "e-Published Date",
-                        "Closing Date",
-                        "Opening Date",
-                        "Organisation Chain",
-                        "Title and Ref.No./Tender ID",
-                        "Tender ID (Extracted)",
-                        "Direct URL",
-                        "Status URL",
-                    ]
-                    # Reindex to keep columns present; missing columns will be filled with NaN
-                    df = df.reindex(columns=column_order)
-
-                    sheet_name = portal.portal_slug[:31] if portal.portal_slug else portal.portal_name[:31]
-                    # Avoid empty sheet name
-                    if not sheet_name:
-                        sheet_name = f"portal_{portal_slug}"
-
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    combined_rows.extend(tenders)
-
-                # Write combined sheet
-                if combined_rows:
-                    combined_df = pd.DataFrame(combined_rows)
-                    combined_df = combined_df.reindex(columns=column_order)
-                    combined_df.to_excel(writer, sheet_name="All_Portals", index=False)
-
-            # Log export history and record full path
-            portal_names = [p.portal_name for p in self.portal_rows if p.portal_slug in self.export_selected_portals]
-            full_path = str(filepath.resolve())
-            self.last_export_path = full_path
-            db.log_export_history(
-                export_type="selected_portals_single_file",
-                portals=portal_names,
-                total_tenders=len(combined_rows),
-                file_count=1,
-                export_dir=export_dir.name,
-                settings={
-                    "live_only": self.export_live_only,
-                    "expired_days": self.export_expired_days,
-                    "export_path": full_path,
-                }
-            )
-
-            message = f"✅ Exported {len(portal_names)} portal(s) into single file: {filename}"
-            self.show_toast_notification(message, "success")
-
+        try:
+            if job is None or job["status"] == "failed":
+                error = job["message"] if job else "job record missing"
+                self.show_toast_notification(f"{meta['error_prefix']}: {error}", "error")
+            elif job["status"] == "cancelled":
+                self.show_toast_notification("Export cancelled", "info")
+            else:
+                result = job["result"] or {}
+                if "results" in result:
+                    exported_files = [r["filename"] for r in result["results"] if r["filename"]]
+                    total_tenders = sum(r["row_count"] for r in result["results"])
+                    file_count = len(exported_files)
+                else:
+                    total_tenders = result.get("row_count", 0)
+                    file_count = 1
+                    self.last_export_path = meta["settings"]["export_path"]
+                db.log_export_history(
+                    export_type=meta["export_type"],
+                    portals=meta["portals"],
+                    total_tenders=total_tenders,
+                    file_count=file_count,
+                    export_dir=meta["export_dir"],
+                    settings=meta["settings"],
+                )
+                message = meta["message"].format(files=file_count, tenders=total_tenders)
+                self.show_toast_notification(message, "success")
         except Exception as ex:
-            error_msg = f"Export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
-
+            self.show_toast_notification(f"{meta['error_prefix']}: {type(ex).__name__}: {ex}", "error")
         finally:
+            self.export_job_id = ""
+            self._export_job_meta = {}
             self.exporting = False
-            self.show_export_dialog = False
-            yield
+            self.export_progress_message = ""
 
-    async def export_all_portals_single_excel(self):
-        """Export all visible portals into a single Excel workbook (one sheet per portal + combined sheet)."""
-        self.exporting = True
-        yield
-
-        try:
-            import pandas as pd
+    def cancel_export(self):
+        """Request cancellation of the running export job."""
+        if self.export_job_id:
+            jobs.cancel_job(int(self.export_job_id))
+            self.export_progress_message = "Cancelling..."
 
-            portals_to_export = self.portal_rows
-            if not portals_to_export:
-                self.show_toast_notification("No portals available for export", "error")
-                self.exporting = False
-                yield
-                return
-
-            # Create export directory
-            export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"portals_all_tenders_{timestamp}.xlsx"
-            filepath = export_dir / filename
-
-            column_order = [
-                "Department Name",
-                "S.No",
-                "e-Published Date",
-                "Closing Date",
-                "Opening Date",
-                "Organisation Chain",
-                "Title and Ref.No./Tender ID",
-                "Tender ID (Extracted)",
-                "Direct URL",
-                "Status URL",
-            ]
-
-            with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
-                combined_rows = []
-
-                for portal in portals_to_export:
-                    tenders = db.export_portal_data(
-                        portal_slug=portal.portal_slug,
-                        portal_name=portal.portal_name,
-                        base_url=portal.base_url,
-                        expired_days=self.export_expired_days,
-                        live_only=self.export_live_only,
-                    )
-
-                    if not tenders:
-                        continue
-
-                    df = pd.DataFrame(tenders)
-                    column_order = [
-                        "Department Name",
-                        "S.No",
-                        "e-Published Date",
-                        "Closing Date",
-                        "Opening Date",
-                        "Organisation Chain",
-                        "Title and Ref.No./Tender ID",
-                        "Tender ID (Extracted)",
-                        "Direct URL",
-                        "Status URL",
-                    ]
-                    df = df.reindex(columns=column_order)
-
-                    sheet_name = portal.portal_slug[:31] if portal.portal_slug else portal.portal_name[:31]
-                    if not sheet_name:
-                        sheet_name = f"portal_{portal.portal_slug}"
-
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    combined_rows.extend(tenders)
-
-                if combined_rows:
-                    combined_df = pd.DataFrame(combined_rows)
-                    combined_df = combined_df.reindex(columns=column_order)
-                    combined_df.to_excel(writer, sheet_name="All_Portals", index=False)
-
-            portal_names = [p.portal_name for p in portals_to_export]
-            full_path = str(filepath.resolve())
-            self.last_export_path = full_path
-            db.log_export_history(
-                export_type="all_portals_single_file",
-                portals=portal_names,
-                total_tenders=len(combined_rows),
-                file_count=1,
-                export_dir=export_dir.name,
-                settings={
+    def export_selected_portals_to_excel(self):
+        """Export selected portals to individual Excel files."""
+        if not self.export_selected_portals:
+            self.show_toast_notification("Please select at least one portal to export", "error")
+            return
+        
+        export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
+        selected_rows = [p for p in self.portal_rows if p.portal_slug in self.export_selected_portals]
+        
+        # Stream each selected portal into its own workbook in a background job
+        self._submit_export(
+            "export_portal_files",
+            self._export_params(selected_rows, export_dir=str(export_dir)),
+            {
+                "export_type": "selected_portals",
+                "portals": [p.portal_name for p in selected_rows],
+                "export_dir": export_dir.name,
+                "settings": {
+                    "live_only": self.export_live_only,
+                    "expired_days": self.export_expired_days,
+                },
+                "message": "✅ Exported {files} portal(s) with {tenders} tenders to " + export_dir.name,
+                "error_prefix": "Export failed",
+            },
+        )
+        self.show_export_dialog = False
+
+    def _submit_single_workbook_export(self, portal_rows: list[PortalRow], export_type: str, file_label: str, message: str):
+        export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"portals_{file_label}_tenders_{timestamp}.xlsx"
+        filepath = export_dir / filename
+        full_path = str(filepath.resolve())
+
+        self._submit_export(
+            "export_portal_workbook",
+            self._export_params(portal_rows, filepath=full_path),
+            {
+                "export_type": export_type,
+                "portals": [p.portal_name for p in portal_rows],
+                "export_dir": export_dir.name,
+                "settings": {
                     "live_only": self.export_live_only,
                     "expired_days": self.export_expired_days,
                     "export_path": full_path,
-                }
-            )
-
-            message = f"✅ Exported all portals into single file: {filename}"
-            self.show_toast_notification(message, "success")
+                },
+                "message": message.replace("{filename}", filename),
+                "error_prefix": "Export failed",
+            },
+        )
 
-        except Exception as ex:
-            error_msg = f"Export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
+    def export_selected_portals_single_excel(self):
+        """Export selected portals into a single Excel workbook (one sheet per portal + combined sheet)."""
+        if not self.export_selected_portals:
+            self.show_toast_notification("Please select at least one portal to export", "error")
+            return
+
+        selected_rows = [p for p in self.portal_rows if p.portal_slug in self.export_selected_portals]
+        self._submit_single_workbook_export(
+            selected_rows,
+            "selected_portals_single_file",
+            "selected",
+            f"✅ Exported {len(selected_rows)} portal(s) into single file: {{filename}}",
+        )
+        self.show_export_dialog = False
 
-        finally:
-            self.exporting = False
-            yield
+    def export_all_portals_single_excel(self):
+        """Export all visible portals into a single Excel workbook (one sheet per portal + combined sheet)."""
+        if not self.portal_rows:
+            self.show_toast_notification("No portals available for export", "error")
+            return
+
+        self._submit_single_workbook_export(
+            self.portal_rows,
+            "all_portals_single_file",
+            "all",
+            "✅ Exported all portals into single file: {filename}",
+        )
     
     def show_toast_notification(self, message: str, toast_type: str = "info"):
         """Show toast notification."""
@@ -1281,100 +1075,32 @@ class PortalManagementState(rx.State):
         self.category_filter = value
         self.load_portal_statistics()
     
-    async def export_category_portals(self, category: str):
+    def export_category_portals(self, category: str):
         """Export all portals in a category."""
-        self.exporting = True
-        yield
+        category_portals = [p for p in self.portal_rows if p.category == category]
+        if not category_portals:
+            self.show_toast_notification(f"No portals found in {category} category", "error")
+            return
         
-        try:
-            import pandas as pd
-            
-            # Get all portals in this category
-            category_portals = [p for p in self.portal_rows if p.category == category]
-            
-            if not category_portals:
-                self.show_toast_notification(f"No portals found in {category} category", "error")
-                self.exporting = False
-                yield
-                return
-            
-            # Create export directory
-            export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir.mkdir(parents=True, exist_ok=True)
-            
-            exported_files = []
-            total_tenders = 0
-            
-            # Export each portal in category
-            for portal in category_portals:
-                # Get tender data
-                tenders = db.export_portal_data(
-                    portal_slug=portal.portal_slug,
-                    portal_name=portal.portal_name,
-                    base_url=portal.base_url,
-                    expired_days=self.export_expired_days,
-                    live_only=self.export_live_only
-                )
-                
-                if not tenders:
-                    continue
-                
-                # Create filename from base_url
-                filename_base = db.portal_url_to_filename(portal.base_url, portal.portal_name)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{filename_base}_tenders_{timestamp}.xlsx"
-                
-                # Create DataFrame
-                df = pd.DataFrame(tenders)
-                
-                # Column order
-                column_order = [
-                    "Department Name",
-                    "S.No",
-                    "e-Published Date",
-                    "Closing Date",
-                    "Opening Date",
-                    "Organisation Chain",
-                    "Title and Ref.No./Tender ID",
-                    "Tender ID (Extracted)",
-                    "Direct URL",
-                    "Status URL"
-                ]
-                df = df[column_order]
-                
-                # Export to Excel
-                filepath = export_dir / filename
-                df.to_excel(filepath, index=False, engine='openpyxl')
-                
-                exported_files.append(filename)
-                total_tenders += len(tenders)
-            
-            # Log export history
-            portal_names = [p.portal_name for p in category_portals]
-            db.log_export_history(
-                export_type=f"category_{category.lower()}",
-                portals=portal_names,
-                total_tenders=total_tenders,
-                file_count=len(exported_files),
-                export_dir=export_dir.name,
-                settings={
+        export_dir = Path("Portal_Exports") / datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Stream each portal in the category into its own workbook
+        self._submit_export(
+            "export_portal_files",
+            self._export_params(category_portals, export_dir=str(export_dir)),
+            {
+                "export_type": f"category_{category.lower()}",
+                "portals": [p.portal_name for p in category_portals],
+                "export_dir": export_dir.name,
+                "settings": {
                     "live_only": self.export_live_only,
                     "expired_days": self.export_expired_days,
                     "category": category,
-                }
-            )
-            
-            # Success message
-            message = f"✅ Exported {category} category: {len(exported_files)} portal(s) with {total_tenders} tenders"
-            self.show_toast_notification(message, "success")
-            
-        except Exception as ex:
-            error_msg = f"Category export failed: {type(ex).__name__}: {ex}"
-            self.show_toast_notification(error_msg, "error")
-        
-        finally:
-            self.exporting = False
-            yield
+                },
+                "message": f"✅ Exported {category} category: {{files}} portal(s) with {{tenders}} tenders",
+                "error_prefix": "Category export failed",
+            },
+        )
     
     def load_export_history(self):
         """Load export history."""
@@ -1425,6 +1151,13 @@ class DataVisualizationState(rx.State):
     db_active_records: int = 0
     db_portal_count: int = 0
     
+    # Query profiler dev panel
+    profiler_enabled: bool = False
+    profiler_slow_ms: float = 0.0
+    profiler_log_path: str = ""
+    query_stats: list[QueryStatRow] = []
+    slow_queries: list[SlowQueryRow] = []
+    
     @rx.var
     def total_pages(self) -> int:
         """Calculate total pages."""
@@ -1538,6 +1271,39 @@ class DataVisualizationState(rx.State):
         """Go to last page."""
         self.page = self.total_pages
         self.load_data()
+    
+    def load_profiler(self):
+        """Refresh the query profiler dev panel."""
+        self.profiler_enabled = query_profiler.is_enabled()
+        self.profiler_slow_ms = query_profiler.SLOW_QUERY_MS
+        self.profiler_log_path = str(query_profiler.SLOW_LOG_PATH)
+        self.query_stats = [QueryStatRow(**row) for row in query_profiler.get_query_summary()]
+        try:
+            entries = query_profiler.read_slow_query_log(limit=50)
+        except Exception as ex:
+            print(f"Error reading slow query log: {ex}")
+            entries = []
+        self.slow_queries = [
+            SlowQueryRow(
+                ts=entry.get("ts", ""),
+                ms=entry.get("ms", 0.0),
+                rows=entry.get("rows", 0),
+                sql=entry.get("sql", ""),
+                plan=" | ".join(entry.get("plan", [])),
+                full_scan=bool(entry.get("full_scan")),
+            )
+            for entry in entries
+        ]
+    
+    def toggle_profiler(self, value: bool):
+        """Enable or disable query profiling for this dashboard process."""
+        query_profiler.set_enabled(value)
+        self.load_profiler()
+    
+    def clear_profiler(self):
+        """Forget in-memory query timings (the slow-query log is kept)."""
+        query_profiler.clear_recent()
+        self.load_profiler()
 
 
 class ColumnMapping(BaseModel):
@@ -1587,6 +1353,7 @@ class ExcelImportState(rx.State):
     import_completed: bool = False
     import_duration: str = ""
     error_messages: list[str] = []
+    import_job_id: str = ""  # Background job id while an import runs
     
     @rx.var
     def has_errors(self) -> bool:
@@ -1688,9 +1455,9 @@ class ExcelImportState(rx.State):
         yield
         
         try:
-            import pandas as pd
             from pathlib import Path
             import os
+            from . import importer
             
             if not files or len(files) == 0:
                 self.error_messages = ["No file uploaded"]
@@ -1714,13 +1481,10 @@ class ExcelImportState(rx.State):
             self.file_path = str(upload_path)
             self.file_size_text = self._format_file_size(len(file_content))
             
-            # Read Excel/CSV based on extension
-            if upload_filename.endswith('.csv'):
-                df = pd.read_csv(upload_path)
-            else:
-                df = pd.read_excel(upload_path)
+            # Sample rows for column matching; the full file is only streamed by the import job
+            df, total_rows = importer.preview_file(str(upload_path))
             
-            self.file_rows = len(df)
+            self.file_rows = total_rows
             self.file_columns = len(df.columns)
             self.excel_columns = list(df.columns)
             
@@ -1883,124 +1647,80 @@ class ExcelImportState(rx.State):
         self.auto_matched_columns = matched
         self.all_required_mapped = (matched == self.total_required_columns)
     
-    async def start_import(self):
-        """Start importing data to database."""
-        self.importing = True
+    def start_import(self):
+        """Start importing data to database in a background job."""
+        if self.import_job_id:
+            return
         self.import_progress = 0
         self.import_status = "Starting import..."
         self.import_processed = 0
         self.import_success = 0
         self.import_skipped = 0
         self.import_errors = 0
+        self.import_completed = False
         self.error_messages = []
-        yield
+        
+        # Create mapping dict: excel_column -> db_column
+        excel_to_db = {}
+        for mapping in self.column_mappings:
+            if mapping.is_mapped and mapping.excel_column:
+                excel_to_db[mapping.excel_column] = mapping.db_column
         
         try:
-            import pandas as pd
-            from datetime import datetime
-            import sys
-            import os
-            
-            # Add parent directory to path to import tender_store
-            workspace_root = Path(__file__).parent.parent.parent
-            sys.path.insert(0, str(workspace_root))
-            
-            from tender_store import TenderDataStore
-            
-            # Read the uploaded file
-            self.import_status = "Reading file..."
-            yield
-            
-            if self.file_path.endswith('.csv'):
-                df = pd.read_csv(self.file_path)
-            else:
-                df = pd.read_excel(self.file_path)
-            
-            # Create mapping dict: excel_column -> db_column
-            excel_to_db = {}
-            for mapping in self.column_mappings:
-                if mapping.is_mapped and mapping.excel_column:
-                    excel_to_db[mapping.excel_column] = mapping.db_column
-            
-            # Initialize database
-            db_path = workspace_root / "database" / "blackforest_tenders.sqlite3"
-            store = TenderDataStore(str(db_path))
-            
-            # Get or create run_id
-            run_id = store.start_run(
-                portal_name=self.portal_name or "imported",
-                base_url=self.base_url or "",
-            )
-            
-            # Convert DataFrame to tender list
-            tenders = []
-            start_time = datetime.now()
-            total_rows = len(df)
-            
-            for idx, row in df.iterrows():
-                row_num = int(idx) + 1  # type: ignore[arg-type]
-                self.import_processed = row_num
-                self.import_progress = int(row_num / total_rows * 90)  # Reserve 10% for DB write
-                self.import_status = f"Processing row {row_num}/{total_rows}..."
-                
-                if row_num % 10 == 0:  # Update UI every 10 rows
-                    yield
-                
-                try:
-                    tender = {"portal_name": self.portal_name or "imported"}
-                    
-                    # Map columns
-                    for excel_col, db_col in excel_to_db.items():
-                        value = row.get(excel_col, "")
-                        # Convert to string, handle NaN
-                        if pd.isna(value):
-                            value = ""
-                        else:
-                            value = str(value).strip()
-                        tender[db_col] = value
-                    
-                    # Validate required fields if enabled
-                    if self.validate_data:
-                        if not tender.get("tender_id_extracted"):
-                            self.import_errors += 1
-                            self.error_messages.append(f"Row {row_num}: Missing tender ID")
-                            continue
-                    
-                    tenders.append(tender)
-                    
-                except Exception as ex:
-                    self.import_errors += 1
-                    self.error_messages.append(f"Row {row_num}: {str(ex)}")
-            
-            # Import to database
-            self.import_status = "Importing to database..."
-            self.import_progress = 95
-            yield
-            
-            result = store.replace_run_tenders(run_id, tenders)
-            
-            self.import_success = int(result)
-            self.import_skipped = 0
-            
-            # Calculate duration
-            end_time = datetime.now()
-            duration = end_time - start_time
-            minutes = int(duration.total_seconds() // 60)
-            seconds = int(duration.total_seconds() % 60)
-            self.import_duration = f"{minutes} minute{'s' if minutes != 1 else ''} {seconds} second{'s' if seconds != 1 else ''}"
-            
-            self.import_progress = 100
-            self.import_status = f"Import completed! {self.import_success} tenders imported successfully."
-            self.import_completed = True
-            
+            self.import_job_id = str(jobs.submit_job("excel_import", {
+                "file_path": self.file_path,
+                "excel_to_db": excel_to_db,
+                "db_path": str(db.DB_PATH),
+                "portal_name": self.portal_name or "imported",
+                "base_url": self.base_url or "",
+                "validate_data": self.validate_data,
+                "skip_duplicates": self.skip_duplicates,
+                "total_rows": self.file_rows,
+            }))
+            self.importing = True
         except Exception as ex:
             self.error_messages.append(f"Import failed: {str(ex)}")
             self.import_status = f"Import failed: {str(ex)}"
-            import traceback
-            print(f"Import error: {traceback.format_exc()}")
-        finally:
+    
+    def poll_import_job(self, _value=None):
+        """Poll the background import job and apply its result when it ends."""
+        if not self.import_job_id:
+            return
+        job = jobs.get_job(int(self.import_job_id))
+        if job is None:
+            self.import_job_id = ""
             self.importing = False
-            yield
+            return
+        self.import_progress = job["progress"]
+        self.import_status = job["message"]
+        if job["status"] in jobs.ACTIVE_STATUSES:
+            return
+        
+        if job["status"] == "completed":
+            result = job["result"] or {}
+            self.import_processed = result.get("processed", 0)
+            self.import_success = result.get("success", 0)
+            self.import_skipped = result.get("skipped", 0)
+            self.import_errors = result.get("errors", 0)
+            self.error_messages = result.get("error_messages", [])
+            self.import_duration = result.get("duration", "")
+            self.import_status = f"Import completed! {self.import_success} tenders imported successfully."
+            self.import_completed = True
+        elif job["status"] == "cancelled":
+            self.import_status = "Import cancelled."
+        else:
+            self.error_messages.append(f"Import failed: {job['message']}")
+            self.import_status = f"Import failed: {job['message']}"
+            if job.get("error"):
+                print(f"Import error: {job['error']}")
+        self.import_job_id = ""
+        self.importing = False
+    
+    def cancel_import(self):
+        """Request cancellation of the running import job."""
+        if self.import_job_id:
+            jobs.cancel_job(int(self.import_job_id))
+            self.import_status = "Cancelling..."
     
     def clear_upload(self):
         """Clear upload and reset state."""
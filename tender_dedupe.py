@@ -0,0 +1,153 @@
+"""
+Set-based duplicate cleanup for the tenders table.
+
+Shared by the dashboard cleanup job (tender_dashboard_reflex/integrity.py),
+fix_database_duplicates.py and tools/cleanup_tender_records.py.
+
+Rows are grouped by the normalised (portal, tender ID) key used everywhere
+else (idx_tenders_portal_tender_norm) and ranked with
+
+    ROW_NUMBER() OVER (PARTITION BY portal_key, tender_key ORDER BY run_id DESC, id DESC)
+
+so the newest run's row is kept. The ranking is a plain read; deletes then
+run in small batches, each in its own short transaction, so a scrape
+writing to the same database only ever waits for one batch. Every batch
+re-checks that a newer row with the same key still exists, which keeps the
+cleanup safe if rows change between ranking and deleting.
+
+Placeholder IDs ('nan', '-', ...) are not treated as a key; they are
+removed by the invalid-record cleanup instead.
+
+Usage:
+    from tender_dedupe import remove_duplicates
+    deleted = remove_duplicates("data/blackforest_tenders.sqlite3", portal="Haryana")
+"""
+
+import json
+import sqlite3
+import time
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_BATCH_PAUSE_SECONDS = 0.05
+PLACEHOLDER_TENDER_IDS = "('nan', 'none', 'null', 'na', 'n/a', '-')"
+
+PORTAL_KEY = "LOWER(TRIM(COALESCE(portal_name, '')))"
+TENDER_KEY = "TRIM(COALESCE(tender_id_extracted, ''))"
+
+_DUPLICATE_RANK_SQL = f"""
+    SELECT id
+    FROM (
+        SELECT
+            id,
+            ROW_NUMBER() OVER (
+                PARTITION BY {PORTAL_KEY}, {TENDER_KEY}
+                ORDER BY run_id DESC, id DESC
+            ) AS key_rank
+        FROM tenders
+        WHERE {TENDER_KEY} <> ''
+          AND LOWER({TENDER_KEY}) NOT IN {PLACEHOLDER_TENDER_IDS}
+          {{portal_filter}}
+    )
+    WHERE key_rank > 1
+"""
+
+# Only delete a row while a newer row with the same key still exists
+_NEWER_DUPLICATE_EXISTS = """
+    EXISTS (
+        SELECT 1 FROM tenders k
+        WHERE LOWER(TRIM(COALESCE(k.portal_name, ''))) = LOWER(TRIM(COALESCE(tenders.portal_name, '')))
+          AND TRIM(COALESCE(k.tender_id_extracted, '')) = TRIM(COALESCE(tenders.tender_id_extracted, ''))
+          AND (k.run_id > tenders.run_id OR (k.run_id = tenders.run_id AND k.id > tenders.id))
+    )
+"""
+
+
+def portal_filter(portal):
+    """SQL fragment and params restricting to one portal (None or 'All Portals' = no filter)."""
+    if not portal or portal == "All Portals":
+        return "", []
+    return f"AND LOWER(TRIM(COALESCE(portal_name, ''))) = LOWER(TRIM(?))", [portal]
+
+
+def find_duplicate_ids(conn, portal=None):
+    """Ids of every non-newest row in a (portal, tender ID) group."""
+    where, params = portal_filter(portal)
+    return [row[0] for row in conn.execute(_DUPLICATE_RANK_SQL.format(portal_filter=where), params)]
+
+
+def count_duplicates(conn, portal=None):
+    """Number of rows remove_duplicates() would delete."""
+    where, params = portal_filter(portal)
+    sql = f"SELECT COUNT(*) FROM ({_DUPLICATE_RANK_SQL.format(portal_filter=where)})"
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def delete_ids_in_batches(
+    db_path,
+    ids,
+    guard_sql="",
+    batch_size=DEFAULT_BATCH_SIZE,
+    pause_seconds=DEFAULT_BATCH_PAUSE_SECONDS,
+    progress_callback=None,
+    label="records",
+):
+    """
+    Delete tenders rows by id, one short write transaction per batch.
+
+    Args:
+        guard_sql: extra condition every deleted row must still satisfy
+        progress_callback: progress_callback(done, total, message); may raise
+            to stop between batches (already committed batches stay deleted)
+
+    Returns:
+        number of rows deleted
+    """
+    ids = list(ids)
+    total = len(ids)
+    deleted = 0
+    if not total:
+        return 0
+
+    guard = f"AND {guard_sql}" if guard_sql else ""
+    sql = f"DELETE FROM tenders WHERE id IN (SELECT value FROM json_each(?)) {guard}"
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        conn.execute("PRAGMA busy_timeout = 30000")
+        for start in range(0, total, batch_size):
+            batch = ids[start:start + batch_size]
+            with conn:
+                deleted += conn.execute(sql, (json.dumps(batch),)).rowcount
+            done = min(start + batch_size, total)
+            if progress_callback:
+                progress_callback(done, total, f"Deleted {deleted:,} {label} ({done:,}/{total:,} checked)")
+            if pause_seconds and done < total:
+                # Give a concurrent writer (scraper) a chance to take the lock
+                time.sleep(pause_seconds)
+    finally:
+        conn.close()
+    return deleted
+
+
+def remove_duplicates(
+    db_path,
+    portal=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    pause_seconds=DEFAULT_BATCH_PAUSE_SECONDS,
+    progress_callback=None,
+):
+    """Delete all but the newest row of every duplicate group. Returns rows deleted."""
+    # The ranking is a plain read: under WAL it does not block the scraper
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        ids = find_duplicate_ids(conn, portal)
+    finally:
+        conn.close()
+    return delete_ids_in_batches(
+        db_path,
+        ids,
+        guard_sql=_NEWER_DUPLICATE_EXISTS,
+        batch_size=batch_size,
+        pause_seconds=pause_seconds,
+        progress_callback=progress_callback,
+        label="duplicates",
+    )
@@ -0,0 +1,159 @@
+"""
+Streaming reader for tender Excel/CSV files.
+
+Shared by the dashboard import (tender_dashboard_reflex/importer.py and the
+upload preview in state.py) and tools/import_recent_scrapes.py.
+
+Files are read in fixed-size DataFrame chunks so memory stays flat
+regardless of file size:
+    .csv          pandas.read_csv(chunksize=...)
+    .xlsx/.xlsm   openpyxl read-only worksheet rows
+    .xls          pandas.read_excel (legacy format, no streaming reader)
+
+Every cell is text (dtype=str); empty cells are NaN. Whole-number floats
+become "1" rather than "1.0", matching pd.read_excel(dtype=str).
+
+Usage:
+    from tender_file_reader import iter_table_chunks, read_table_sample
+    sample, total_rows = read_table_sample("export.xlsx", nrows=100)
+    for chunk in iter_table_chunks("export.xlsx", chunk_size=5000):
+        ...
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SAMPLE_ROWS = 100
+CSV_ENCODING = "utf-8-sig"
+
+
+def _is_csv(file_path):
+    return str(file_path).lower().endswith(".csv")
+
+
+def _is_legacy_xls(file_path):
+    return str(file_path).lower().endswith(".xls")
+
+
+def _cell_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def _header_names(values):
+    """Column names the way pandas builds them: 'Unnamed: n' for blanks, '.1' suffix for repeats."""
+    names = []
+    seen = {}
+    for idx, value in enumerate(values):
+        name = _cell_text(value)
+        if name is None or not name.strip():
+            name = f"Unnamed: {idx}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _iter_xlsx_chunks(file_path, chunk_size, max_rows=None):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(str(file_path), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+        width = len(columns)
+        batch = []
+        emitted = 0
+        for row in rows:
+            if not any(cell is not None and str(cell).strip() for cell in row):
+                continue  # pandas skips fully blank rows too
+            batch.append([_cell_text(cell) for cell in row[:width]] + [None] * (width - len(row)))
+            if max_rows is not None and emitted + len(batch) >= max_rows:
+                break
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns, dtype=str, index=range(emitted, emitted + len(batch)))
+                emitted += len(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, dtype=str, index=range(emitted, emitted + len(batch)))
+    finally:
+        workbook.close()
+
+
+def iter_table_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, max_rows=None):
+    """
+    Yield the file as DataFrame chunks of at most chunk_size rows.
+
+    Chunk indexes continue across chunks (0-based file row number, header
+    excluded), so error messages can point at the original row.
+    """
+    if _is_csv(file_path):
+        reader = pd.read_csv(file_path, dtype=str, encoding=CSV_ENCODING, chunksize=chunk_size, nrows=max_rows)
+        with reader:
+            yield from reader
+    elif _is_legacy_xls(file_path):
+        df = pd.read_excel(file_path, dtype=str, nrows=max_rows)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        yield from _iter_xlsx_chunks(file_path, chunk_size, max_rows)
+
+
+def count_rows(file_path):
+    """Number of data rows, counted by streaming (CSV) or from the sheet dimensions (xlsx)."""
+    if _is_csv(file_path):
+        reader = pd.read_csv(file_path, dtype=str, encoding=CSV_ENCODING, usecols=[0], chunksize=50_000)
+        with reader:
+            return sum(len(chunk) for chunk in reader)
+    if _is_legacy_xls(file_path):
+        return len(pd.read_excel(file_path, dtype=str, usecols=[0]))
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(str(file_path), read_only=True, data_only=True)
+    try:
+        max_row = workbook.active.max_row
+    finally:
+        workbook.close()
+    if max_row is None:
+        # No dimension record in the file: stream it
+        return sum(len(chunk) for chunk in _iter_xlsx_chunks(file_path, 50_000))
+    return max(0, max_row - 1)
+
+
+def read_table_sample(file_path, nrows=DEFAULT_SAMPLE_ROWS):
+    """First nrows rows (for previews and column matching) plus the file's total row count."""
+    chunks = list(iter_table_chunks(file_path, chunk_size=nrows, max_rows=nrows))
+    sample = pd.concat(chunks) if chunks else pd.DataFrame()
+    if not chunks and not _is_csv(file_path):
+        # Keep the header even for an empty sheet
+        sample = pd.DataFrame(columns=_read_xlsx_header(file_path))
+    return sample, count_rows(file_path)
+
+
+def _read_xlsx_header(file_path):
+    if _is_legacy_xls(file_path):
+        return list(pd.read_excel(file_path, dtype=str, nrows=0).columns)
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(str(file_path), read_only=True, data_only=True)
+    try:
+        header = next(workbook.active.iter_rows(values_only=True, max_row=1), None)
+    finally:
+        workbook.close()
+    return _header_names(header or [])
+
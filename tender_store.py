@@ -1,15 +1,113 @@
+import json
 import os
 import re
 import shutil
 import sqlite3
 from datetime import datetime, timedelta, timezone
 
-import pandas as pd
-
 
 # IST = UTC+5:30  (all portal closing times are in Indian Standard Time)
 _IST = timezone(timedelta(hours=5, minutes=30))
 
+# Closing date formats seen on the portals, tried in order
+CLOSING_DATE_FORMATS = (
+    "%d-%b-%Y %I:%M %p",   # 05-Mar-2026 09:00 AM
+    "%d/%b/%Y %I:%M %p",   # 05/Mar/2026 09:00 AM
+    "%d-%m-%Y %I:%M %p",   # 05-03-2026 09:00 AM
+    "%d-%b-%Y %H:%M",      # 05-Mar-2026 09:00
+    "%Y-%m-%d %H:%M:%S",   # ISO format
+)
+
+# Placeholder tender IDs counted as missing by the integrity counters
+_PLACEHOLDER_TENDER_IDS = "('nan', 'none', 'null', 'na', 'n/a', '-')"
+
+# Rows that can never be live regardless of closing date (cancelled, expired, ...)
+_NOT_ACTIVE_SQL = "lower(trim(coalesce(lifecycle_status, ''))) != 'active'"
+
+
+def _integrity_terms(row):
+    """SQL fragments describing one tenders row (`row` is NEW, OLD or a table alias)."""
+    portal_key = f"LOWER(TRIM(COALESCE({row}.portal_name, '')))"
+    tender_key = f"TRIM(COALESCE({row}.tender_id_extracted, ''))"
+    return {
+        "portal_key": portal_key,
+        "tender_key": tender_key,
+        "placeholder_id": f"(LOWER({tender_key}) IN {_PLACEHOLDER_TENDER_IDS})",
+        "missing_id": f"({tender_key} = '' OR LOWER({tender_key}) IN {_PLACEHOLDER_TENDER_IDS})",
+        "missing_date": f"({row}.closing_date IS NULL OR TRIM({row}.closing_date) = '')",
+        # Rows currently sharing this row's (portal, tender ID) key; served by idx_tenders_portal_tender_norm
+        "key_rows": (
+            "(SELECT COUNT(*) FROM tenders k"
+            f" WHERE LOWER(TRIM(COALESCE(k.portal_name, ''))) = {portal_key}"
+            f" AND TRIM(COALESCE(k.tender_id_extracted, '')) = {tender_key})"
+        ),
+    }
+
+
+def _integrity_counter_triggers():
+    new = _integrity_terms("NEW")
+    old = _integrity_terms("OLD")
+    now = "strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')"
+    key_changed = f"({old['portal_key']} <> {new['portal_key']} OR {old['tender_key']} <> {new['tender_key']})"
+
+    # Duplicate counters are adjusted in a separate UPDATE whose WHERE needs a
+    # single EXISTS probe, so unique rows never count their key group.
+    add_new = f"""
+        INSERT OR IGNORE INTO portal_integrity_counters (portal_key, portal_name) VALUES ({new['portal_key']}, NEW.portal_name);
+        UPDATE portal_integrity_counters SET
+            row_count = row_count + 1,
+            missing_ids = missing_ids + {new['missing_id']},
+            placeholder_ids = placeholder_ids + {new['placeholder_id']},
+            missing_dates = missing_dates + {new['missing_date']},
+            portal_name = COALESCE(portal_name, NEW.portal_name),
+            updated_at = {now}
+        WHERE portal_key = {new['portal_key']};
+        UPDATE portal_integrity_counters SET
+            duplicate_rows = duplicate_rows + 1,
+            duplicate_groups = duplicate_groups + ({new['key_rows']} = 2)
+        WHERE portal_key = {new['portal_key']}
+          AND {{changed}} AND {new['tender_key']} <> ''
+          AND EXISTS (SELECT 1 FROM tenders k
+                      WHERE LOWER(TRIM(COALESCE(k.portal_name, ''))) = {new['portal_key']}
+                        AND TRIM(COALESCE(k.tender_id_extracted, '')) = {new['tender_key']}
+                        AND k.id <> NEW.id);
+    """
+    remove_old = f"""
+        UPDATE portal_integrity_counters SET
+            row_count = row_count - 1,
+            missing_ids = missing_ids - {old['missing_id']},
+            placeholder_ids = placeholder_ids - {old['placeholder_id']},
+            missing_dates = missing_dates - {old['missing_date']},
+            updated_at = {now}
+        WHERE portal_key = {old['portal_key']};
+        UPDATE portal_integrity_counters SET
+            duplicate_rows = duplicate_rows - 1,
+            duplicate_groups = duplicate_groups - ({old['key_rows']} = 1)
+        WHERE portal_key = {old['portal_key']}
+          AND {{changed}} AND {old['tender_key']} <> ''
+          AND EXISTS (SELECT 1 FROM tenders k
+                      WHERE LOWER(TRIM(COALESCE(k.portal_name, ''))) = {old['portal_key']}
+                        AND TRIM(COALESCE(k.tender_id_extracted, '')) = {old['tender_key']});
+    """
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tenders_integrity_insert AFTER INSERT ON tenders
+        BEGIN
+            {add_new.format(changed=1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tenders_integrity_delete AFTER DELETE ON tenders
+        BEGIN
+            {remove_old.format(changed=1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tenders_integrity_update
+        AFTER UPDATE OF portal_name, tender_id_extracted, closing_date ON tenders
+        BEGIN
+            {remove_old.format(changed=key_changed)}
+            {add_new.format(changed=key_changed)}
+        END;
+    """
+
 
 class TenderDataStore:
     """SQLite-backed primary datastore for tender runs and extracted tenders."""
@@ -66,9 +164,20 @@ class TenderDataStore:
                     emd_amount TEXT,
                     emd_amount_numeric REAL,
                     tender_json TEXT,
+                    closing_at TEXT,
+                    is_live INTEGER NOT NULL DEFAULT 1,
                     FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE
                 );
 
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    content_hash TEXT PRIMARY KEY,
+                    file_path TEXT,
+                    portal_name TEXT,
+                    run_id INTEGER,
+                    row_count INTEGER DEFAULT 0,
+                    imported_at TEXT
+                );
+
                 CREATE INDEX IF NOT EXISTS idx_tenders_run_id ON tenders(run_id);
                 CREATE INDEX IF NOT EXISTS idx_tenders_tender_id ON tenders(tender_id_extracted);
                 CREATE INDEX IF NOT EXISTS idx_tenders_portal_tender_norm
@@ -110,6 +219,14 @@ class TenderDataStore:
             self._ensure_column(conn, "tenders", "serial_no", "TEXT")
             self._ensure_column(conn, "tenders", "direct_url", "TEXT")
             self._ensure_column(conn, "tenders", "status_url", "TEXT")
+            self._ensure_column(conn, "tenders", "closing_at", "TEXT")
+            self._ensure_column(conn, "tenders", "is_live", "INTEGER NOT NULL DEFAULT 1")
+            conn.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_tenders_live_closing ON tenders(is_live, closing_at);
+                CREATE INDEX IF NOT EXISTS idx_tenders_closing_at_pending ON tenders(id) WHERE closing_at IS NULL;
+                """
+            )
             conn.execute(
                 """
                 UPDATE tenders
@@ -117,6 +234,81 @@ class TenderDataStore:
                 WHERE trim(coalesce(lifecycle_status, '')) = ''
                 """
             )
+            # is_live was added with DEFAULT 1: cancelled/expired rows are never live
+            conn.execute(
+                f"""
+                UPDATE tenders
+                SET is_live = 0
+                WHERE is_live = 1
+                  AND {_NOT_ACTIVE_SQL}
+                """
+            )
+            self._ensure_integrity_counters(conn)
+            self._ensure_manifest_tables(conn)
+
+    def _ensure_manifest_tables(self, conn):
+        """Batch resume manifest (formerly batch_tender_manifest.json)."""
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS manifest_portals (
+                portal_name TEXT PRIMARY KEY,
+                last_run TEXT,
+                last_expected INTEGER,
+                last_extracted INTEGER,
+                known_ids INTEGER NOT NULL DEFAULT 0,
+                seeded_from TEXT,
+                seed_reason TEXT,
+                last_db_seed TEXT,
+                seeded_tender_rowid INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS manifest_tender_ids (
+                portal_name TEXT NOT NULL,
+                tender_id TEXT NOT NULL,
+                PRIMARY KEY (portal_name, tender_id)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS manifest_departments (
+                portal_name TEXT NOT NULL,
+                department TEXT NOT NULL,
+                PRIMARY KEY (portal_name, department)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS manifest_department_urls (
+                portal_name TEXT NOT NULL,
+                department_key TEXT NOT NULL,
+                name TEXT,
+                direct_url TEXT,
+                last_seen TEXT,
+                PRIMARY KEY (portal_name, department_key)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def _ensure_integrity_counters(self, conn):
+        """Per-portal integrity counters kept current by triggers on tenders."""
+        seeded = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'portal_integrity_counters'"
+        ).fetchone()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS portal_integrity_counters (
+                portal_key TEXT PRIMARY KEY,
+                portal_name TEXT,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                duplicate_groups INTEGER NOT NULL DEFAULT 0,
+                duplicate_rows INTEGER NOT NULL DEFAULT 0,
+                missing_ids INTEGER NOT NULL DEFAULT 0,
+                placeholder_ids INTEGER NOT NULL DEFAULT 0,
+                missing_dates INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT,
+                reconciled_at TEXT
+            );
+            """
+            + _integrity_counter_triggers()
+        )
+        if not seeded:
+            self._reconcile_integrity_counters(conn)
 
     def _ensure_column(self, conn, table_name, column_name, ddl):
         columns = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
@@ -226,19 +418,169 @@ class TenderDataStore:
         text = str(value or "").strip()
         if not text:
             return None
-        for fmt in (
-            "%d-%b-%Y %I:%M %p",   # 05-Mar-2026 09:00 AM
-            "%d/%b/%Y %I:%M %p",   # 05/Mar/2026 09:00 AM
-            "%d-%m-%Y %I:%M %p",   # 05-03-2026 09:00 AM
-            "%d-%b-%Y %H:%M",      # 05-Mar-2026 09:00
-            "%Y-%m-%d %H:%M:%S",   # ISO format
-        ):
+        for fmt in CLOSING_DATE_FORMATS:
             try:
                 return datetime.strptime(text, fmt).replace(tzinfo=_IST)
             except ValueError:
                 continue
         return None
 
+    @classmethod
+    def _closing_at_text(cls, value):
+        """Return the closing date as sortable IST text ('YYYY-MM-DD HH:MM:SS').
+
+        Unparseable or missing dates map to '' so they are recorded as
+        processed and never picked up again by the backfill.
+        """
+        parsed = cls._parse_closing_date_ist(value)
+        if parsed is None:
+            return ""
+        return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def _now_ist_text():
+        return datetime.now(tz=_IST).strftime("%Y-%m-%d %H:%M:%S")
+
+    def backfill_closing_at(self, batch_size=5000):
+        """Populate `closing_at` for rows written before the column existed.
+
+        Rows whose lifecycle_status is not 'active' are marked not live on the
+        way, since the sweep only clears rows by closing date.
+
+        Works through the partial index on pending rows in bounded batches so
+        the write lock is released between batches. Returns rows updated.
+        """
+        batch_size = max(100, int(batch_size or 5000))
+        updated = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, closing_date
+                    FROM tenders
+                    WHERE closing_at IS NULL
+                    LIMIT ?
+                    """,
+                    (batch_size,),
+                ).fetchall()
+                if not rows:
+                    return updated
+                conn.executemany(
+                    f"""
+                    UPDATE tenders
+                    SET
+                        closing_at = ?,
+                        is_live = CASE WHEN {_NOT_ACTIVE_SQL} THEN 0 ELSE is_live END
+                    WHERE id = ?
+                    """,
+                    [(self._closing_at_text(row["closing_date"]), row["id"]) for row in rows],
+                )
+            updated += len(rows)
+            if len(rows) < batch_size:
+                return updated
+
+    def expire_closed_tenders(self, now_ist=None):
+        """
+        Flip live tenders whose closing time has passed to expired.
+
+        Uses the (is_live, closing_at) index, so a sweep only touches rows that
+        actually changed state. Active rows also get lifecycle_status='expired'
+        so legacy readers of that column stay consistent; cancelled rows keep
+        their status. Returns the number of rows flipped.
+        """
+        cutoff = now_ist or self._now_ist_text()
+        with self._connect() as conn:
+            cur = conn.execute(
+                """
+                UPDATE tenders
+                SET
+                    is_live = 0,
+                    lifecycle_status = CASE
+                        WHEN lower(trim(coalesce(lifecycle_status, ''))) IN ('', 'active') THEN 'expired'
+                        ELSE lifecycle_status
+                    END
+                WHERE is_live = 1
+                  AND closing_at > ''
+                  AND closing_at <= ?
+                """,
+                (cutoff,),
+            )
+            return int(cur.rowcount or 0)
+
+    def _reconcile_integrity_counters(self, conn):
+        if not conn.in_transaction:
+            # Hold the write lock so no trigger update lands between recount and replace
+            conn.execute("BEGIN IMMEDIATE")
+        terms = _integrity_terms("t")
+        rows = conn.execute(
+            f"""
+            SELECT
+                portal_key,
+                MAX(portal_name) AS portal_name,
+                SUM(key_rows) AS row_count,
+                SUM(CASE WHEN tender_key <> '' AND key_rows > 1 THEN 1 ELSE 0 END) AS duplicate_groups,
+                SUM(CASE WHEN tender_key <> '' AND key_rows > 1 THEN key_rows - 1 ELSE 0 END) AS duplicate_rows,
+                SUM(missing_ids) AS missing_ids,
+                SUM(placeholder_ids) AS placeholder_ids,
+                SUM(missing_dates) AS missing_dates
+            FROM (
+                SELECT
+                    {terms['portal_key']} AS portal_key,
+                    {terms['tender_key']} AS tender_key,
+                    MAX(t.portal_name) AS portal_name,
+                    COUNT(*) AS key_rows,
+                    SUM({terms['missing_id']}) AS missing_ids,
+                    SUM({terms['placeholder_id']}) AS placeholder_ids,
+                    SUM({terms['missing_date']}) AS missing_dates
+                FROM tenders t
+                GROUP BY 1, 2
+            )
+            GROUP BY portal_key
+            """
+        ).fetchall()
+        fields = ("row_count", "duplicate_groups", "duplicate_rows", "missing_ids", "placeholder_ids", "missing_dates")
+        stored = {
+            row["portal_key"]: row
+            for row in conn.execute("SELECT * FROM portal_integrity_counters").fetchall()
+        }
+        drift = []
+        for row in rows:
+            previous = stored.pop(row["portal_key"], None)
+            for field in fields:
+                before = previous[field] if previous is not None else 0
+                if before != row[field]:
+                    drift.append({"portal_key": row["portal_key"], "field": field, "counter": before, "actual": row[field]})
+        for portal_key, previous in stored.items():
+            for field in fields:
+                if previous[field]:
+                    drift.append({"portal_key": portal_key, "field": field, "counter": previous[field], "actual": 0})
+
+        now = datetime.now().isoformat(timespec="seconds")
+        conn.execute("DELETE FROM portal_integrity_counters")
+        conn.executemany(
+            """
+            INSERT INTO portal_integrity_counters (
+                portal_key, portal_name, row_count, duplicate_groups, duplicate_rows,
+                missing_ids, placeholder_ids, missing_dates, updated_at, reconciled_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (row["portal_key"], row["portal_name"], *(row[field] for field in fields), now, now)
+                for row in rows
+            ],
+        )
+        return drift
+
+    def reconcile_integrity_counters(self):
+        """Recount portal_integrity_counters from tenders; returns the drift that was corrected."""
+        with self._connect() as conn:
+            return self._reconcile_integrity_counters(conn)
+
+    def get_integrity_counters(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM portal_integrity_counters ORDER BY row_count DESC").fetchall()
+        return [dict(row) for row in rows]
+
     def get_existing_tender_ids_for_portal(self, portal_name):
         """
         Return the set of tender IDs from this portal that are still live
@@ -281,6 +623,33 @@ class TenderDataStore:
                 live_ids.add(tid)
         return live_ids
 
+    def get_live_department_counts(self, portal_name):
+        """
+        Return { lower-cased department name -> live tender count } for a portal.
+
+        Used by the scrape scheduler to estimate each department's new-tender
+        yield (listed count minus live tenders already stored).
+        """
+        portal_key = str(portal_name or "").strip().lower()
+        if not portal_key:
+            return {}
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT LOWER(TRIM(COALESCE(department_name, ''))) AS department,
+                       COUNT(DISTINCT TRIM(tender_id_extracted))   AS live_count
+                FROM tenders
+                WHERE LOWER(TRIM(COALESCE(portal_name, ''))) = ?
+                  AND TRIM(COALESCE(tender_id_extracted, '')) != ''
+                  AND is_live = 1
+                GROUP BY 1
+                """,
+                (portal_key,),
+            ).fetchall()
+
+        return {row["department"]: int(row["live_count"] or 0) for row in rows if row["department"]}
+
     @staticmethod
     def _normalize_date_text(value):
         text = str(value or "").strip().upper()
@@ -402,37 +771,11 @@ class TenderDataStore:
 
             rows = []
             dedupe_keys = []
+            now_ist_text = self._now_ist_text()
             for key in ordered_keys:
-                item = deduped[key]
-                portal_name = _normalize_text(item.get("Portal"))
-                tender_id = _normalize_text(item.get("Tender ID (Extracted)"))
-                emd_raw = item.get("EMD Amount")
-                emd_numeric = item.get("EMD Amount (Numeric)")
-                try:
-                    emd_numeric = float(emd_numeric) if emd_numeric is not None else None
-                except Exception:
-                    emd_numeric = None
-                dedupe_keys.append((key[0], tender_id))
-
-                rows.append(
-                    (
-                        run_id,
-                        portal_name,
-                        _normalize_text(item.get("Department Name")),
-                        tender_id,
-                        _normalize_text(item.get("S.No")),
-                        _normalize_text(item.get("Published Date") or item.get("e-Published Date")),
-                        _normalize_text(item.get("Closing Date")),
-                        _normalize_text(item.get("Opening Date")),
-                        _normalize_text(item.get("Title and Ref.No./Tender ID")),
-                        _normalize_text(item.get("Organisation Chain")),
-                        _normalize_text(item.get("Direct URL")),
-                        _normalize_text(item.get("Status URL")),
-                        _normalize_text(emd_raw),
-                        emd_numeric,
-                        str(item)
-                    )
-                )
+                row = self.import_row_from_export(deduped[key], now_ist_text)
+                dedupe_keys.append((key[0], row[2]))
+                rows.append((run_id, *row))
 
             if dedupe_keys:
                 conn.execute("DROP TABLE IF EXISTS _incoming_keys")
@@ -470,14 +813,199 @@ class TenderDataStore:
                     run_id, portal_name, department_name, tender_id_extracted,
                     serial_no, published_date, closing_date, opening_date,
                     title_ref, organisation_chain, direct_url, status_url,
-                    emd_amount, emd_amount_numeric, tender_json
+                    emd_amount, emd_amount_numeric, tender_json,
+                    closing_at, is_live, lifecycle_status
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 rows
             )
             return len(rows)
 
+    @classmethod
+    def import_row_from_export(cls, item, now_ist_text=None):
+        """One scrape-export record (export column names) as a tuple in IMPORT_COLUMNS order."""
+        def _normalize_text(value):
+            if value is None:
+                return ""
+            return str(value).strip()
+
+        if now_ist_text is None:
+            now_ist_text = cls._now_ist_text()
+        emd_numeric = item.get("EMD Amount (Numeric)")
+        try:
+            emd_numeric = float(emd_numeric) if emd_numeric is not None else None
+        except Exception:
+            emd_numeric = None
+        closing_at = cls._closing_at_text(item.get("Closing Date"))
+        is_live = 0 if closing_at and closing_at <= now_ist_text else 1
+        return (
+            _normalize_text(item.get("Portal")),
+            _normalize_text(item.get("Department Name")),
+            _normalize_text(item.get("Tender ID (Extracted)")),
+            _normalize_text(item.get("S.No")),
+            _normalize_text(item.get("Published Date") or item.get("e-Published Date")),
+            _normalize_text(item.get("Closing Date")),
+            _normalize_text(item.get("Opening Date")),
+            _normalize_text(item.get("Title and Ref.No./Tender ID")),
+            _normalize_text(item.get("Organisation Chain")),
+            _normalize_text(item.get("Direct URL")),
+            _normalize_text(item.get("Status URL")),
+            _normalize_text(item.get("EMD Amount")),
+            emd_numeric,
+            str(item),
+            closing_at,
+            is_live,
+            "active" if is_live else "expired",
+        )
+
+    # Column order of the rows accepted by bulk_import_run_tenders()
+    IMPORT_COLUMNS = (
+        "portal_name", "department_name", "tender_id_extracted", "serial_no",
+        "published_date", "closing_date", "opening_date", "title_ref",
+        "organisation_chain", "direct_url", "status_url", "emd_amount",
+        "emd_amount_numeric", "tender_json", "closing_at", "is_live", "lifecycle_status",
+    )
+
+    def bulk_import_run_tenders(self, run_id, row_chunks, skip_existing=False):
+        """
+        Insert already-normalised rows into a run, chunk by chunk.
+
+        row_chunks yields lists of tuples in IMPORT_COLUMNS order, so callers
+        can stream a file without holding it in memory. Each chunk's keys go
+        into a temp table joined against idx_tenders_portal_tender_norm:
+        matching tenders are skipped when skip_existing is set, otherwise the
+        older rows are replaced (a repeat later in the same import replaces
+        the earlier row). Everything runs in one transaction, so an exception
+        raised while producing chunks (e.g. job cancellation) leaves the
+        database untouched.
+
+        Returns:
+            (inserted, skipped) where skipped counts existing matches and
+            repeats replaced within the import
+        """
+        with self._connect() as conn:
+            return self._import_run_rows(conn, run_id, row_chunks, skip_existing)
+
+    def _import_run_rows(self, conn, run_id, row_chunks, skip_existing):
+        portal_idx = self.IMPORT_COLUMNS.index("portal_name")
+        tender_idx = self.IMPORT_COLUMNS.index("tender_id_extracted")
+        placeholders = ", ".join("?" for _ in self.IMPORT_COLUMNS)
+        insert_sql = f"""
+            INSERT INTO tenders (run_id, {", ".join(self.IMPORT_COLUMNS)})
+            VALUES (?, {placeholders})
+        """
+        existing_join = """
+            FROM _import_keys k
+            JOIN tenders t
+              ON LOWER(TRIM(COALESCE(t.portal_name, ''))) = k.portal_key
+             AND TRIM(COALESCE(t.tender_id_extracted, '')) = k.tender_key
+        """
+
+        inserted = 0
+        skipped = 0
+        conn.execute("DROP TABLE IF EXISTS temp._import_keys")
+        # Key columns are untyped on purpose: a TEXT affinity would stop
+        # the join from probing the expression index
+        conn.execute(
+            """
+            CREATE TEMP TABLE _import_keys (
+                row_idx INTEGER PRIMARY KEY,
+                portal_key NOT NULL,
+                tender_key NOT NULL
+            )
+            """
+        )
+        for chunk in row_chunks:
+            chunk = list(chunk)
+            if not chunk:
+                continue
+            conn.execute("DELETE FROM temp._import_keys")
+            conn.executemany(
+                "INSERT INTO _import_keys (row_idx, portal_key, tender_key) VALUES (?, ?, ?)",
+                (
+                    (idx, str(row[portal_idx] or "").strip().lower(), str(row[tender_idx] or "").strip())
+                    for idx, row in enumerate(chunk)
+                ),
+            )
+            if skip_existing:
+                existing = {r[0] for r in conn.execute(f"SELECT DISTINCT k.row_idx {existing_join}")}
+                if existing:
+                    chunk = [row for idx, row in enumerate(chunk) if idx not in existing]
+                    skipped += len(existing)
+            else:
+                matches = conn.execute(f"SELECT t.id, t.run_id = ? {existing_join}", (run_id,)).fetchall()
+                if matches:
+                    conn.execute(
+                        "DELETE FROM tenders WHERE id IN (SELECT value FROM json_each(?))",
+                        (json.dumps([row_id for row_id, _ in matches]),),
+                    )
+                # Rows replaced from an earlier chunk of this import were never really new
+                replaced_in_run = sum(1 for _, in_run in matches if in_run)
+                inserted -= replaced_in_run
+                skipped += replaced_in_run
+            conn.executemany(insert_sql, [(run_id, *row) for row in chunk])
+            inserted += len(chunk)
+        conn.execute("DROP TABLE temp._import_keys")
+        return inserted, skipped
+
+    def get_imported_file_hashes(self):
+        """Content hashes of every export file already loaded by import_export_files()."""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT content_hash FROM imported_files")}
+
+    def import_export_files(self, files, base_url="", scope_mode="import_bulk", skip_existing=True):
+        """
+        Load several parsed export files in a single write transaction.
+
+        files is a list of dicts with file_path, file_type, content_hash,
+        portal_name and rows (tuples in IMPORT_COLUMNS order), oldest file
+        first. Each file with rows becomes one run, so run order follows file
+        age; every file, including ones with no rows left, is recorded in
+        imported_files so a re-run can skip it.
+
+        Returns:
+            list of (file_path, run_id, inserted, skipped), run_id None for
+            files that had no rows
+        """
+        started_at = datetime.now().isoformat(timespec="seconds")
+        results = []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for item in files:
+                run_id = None
+                inserted = skipped = 0
+                rows = item.get("rows") or []
+                if rows:
+                    run_id = conn.execute(
+                        """
+                        INSERT INTO runs (portal_name, base_url, scope_mode, started_at, status)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (item.get("portal_name") or "Unknown", base_url or "", scope_mode, started_at, "running"),
+                    ).lastrowid
+                    inserted, skipped = self._import_run_rows(conn, run_id, [rows], skip_existing)
+                    conn.execute(
+                        """
+                        UPDATE runs
+                        SET completed_at = ?, status = 'Imported', expected_total_tenders = ?,
+                            extracted_total_tenders = ?, skipped_existing_total = ?,
+                            output_file_path = ?, output_file_type = ?
+                        WHERE id = ?
+                        """,
+                        (started_at, len(rows), inserted, skipped, item.get("file_path"), item.get("file_type"), run_id),
+                    )
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO imported_files
+                        (content_hash, file_path, portal_name, run_id, row_count, imported_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (item["content_hash"], item.get("file_path"), item.get("portal_name"), run_id, inserted, started_at),
+                )
+                results.append((item.get("file_path"), run_id, inserted, skipped))
+        return results
+
     def export_run(self, run_id, output_dir, website_keyword, mark_partial=False):
         query = """
             SELECT
@@ -510,6 +1038,8 @@ class TenderDataStore:
             ORDER BY [Department Name] ASC, [Tender ID (Extracted)] ASC
         """
 
+        import pandas as pd
+
         with self._connect() as conn:
             df = pd.read_sql_query(query, conn, params=(run_id,))
 
@@ -608,6 +1138,298 @@ class TenderDataStore:
             "last_excel_export_path": str(last_excel[1]) if last_excel and len(last_excel) > 1 and last_excel[1] else None,
         }
 
+    def get_portal_schedule_stats(self):
+        """
+        Return { lower-cased portal name -> {last_completed_at, last_extracted} }
+        from each portal's latest completed run, for batch scheduling priority.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT LOWER(TRIM(COALESCE(portal_name, ''))) AS portal,
+                       completed_at,
+                       extracted_total_tenders
+                FROM runs
+                WHERE id IN (
+                    SELECT MAX(id)
+                    FROM runs
+                    WHERE completed_at IS NOT NULL
+                    GROUP BY LOWER(TRIM(COALESCE(portal_name, '')))
+                )
+                """
+            ).fetchall()
+
+        return {
+            row["portal"]: {
+                "last_completed_at": row["completed_at"],
+                "last_extracted": int(row["extracted_total_tenders"] or 0),
+            }
+            for row in rows
+            if row["portal"]
+        }
+
+    def get_manifest_portal(self, portal_name):
+        """Manifest row dict for a portal (known_ids is its ID count), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM manifest_portals WHERE portal_name = ?",
+                (str(portal_name or "").strip(),),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_manifest_portals(self):
+        """Return { portal name -> manifest row dict } for every portal in the manifest."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM manifest_portals ORDER BY portal_name").fetchall()
+        return {row["portal_name"]: dict(row) for row in rows}
+
+    def get_manifest_tender_ids(self, portal_name):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT tender_id FROM manifest_tender_ids WHERE portal_name = ?",
+                (str(portal_name or "").strip(),),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_manifest_only_tender_ids(self, portal_name, portal_keys):
+        """
+        Normalized manifest IDs of a portal with no row in the tenders table
+        under any of portal_keys (e.g. IDs migrated from the JSON manifest).
+        """
+        portal_name = str(portal_name or "").strip()
+        portal_keys = sorted({str(key or "").strip().lower() for key in portal_keys or () if str(key or "").strip()})
+        if not portal_name or not portal_keys:
+            return set()
+        placeholders = ",".join("?" * len(portal_keys))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT m.tender_id
+                FROM manifest_tender_ids m
+                WHERE m.portal_name = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM tenders t
+                      WHERE LOWER(TRIM(COALESCE(t.portal_name, ''))) IN ({placeholders})
+                        AND TRIM(COALESCE(t.tender_id_extracted, '')) = TRIM(m.tender_id)
+                  )
+                """,
+                (portal_name, *portal_keys),
+            ).fetchall()
+        return {normalized for normalized in (self._normalize_tender_id_text(row[0]) for row in rows) if normalized}
+
+    def get_manifest_departments(self, portal_name):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT department FROM manifest_departments WHERE portal_name = ?",
+                (str(portal_name or "").strip(),),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_direct_urls_for_tender_ids(self, tender_ids, portal_keys):
+        """
+        Return { normalized tender ID -> direct_url } for the given IDs, taken
+        from the newest stored row with a direct URL under any of portal_keys
+        (lower-cased portal names). IDs that are not stored are left out.
+        """
+        portal_keys = sorted({str(key or "").strip().lower() for key in portal_keys or () if str(key or "").strip()})
+        lookup = set()
+        for tender_id in tender_ids or ():
+            raw = str(tender_id or "").strip()
+            normalized = self._normalize_tender_id_text(raw)
+            if normalized:
+                lookup.update((raw, normalized))
+        if not portal_keys or not lookup:
+            return {}
+
+        portal_placeholders = ",".join("?" * len(portal_keys))
+        lookup = sorted(lookup)
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(lookup), 500):
+                chunk = lookup[start:start + 500]
+                rows = conn.execute(
+                    f"""
+                    SELECT TRIM(tender_id_extracted) AS tender_id, TRIM(direct_url) AS direct_url
+                    FROM tenders
+                    WHERE LOWER(TRIM(COALESCE(portal_name, ''))) IN ({portal_placeholders})
+                      AND TRIM(COALESCE(tender_id_extracted, '')) IN ({",".join("?" * len(chunk))})
+                      AND TRIM(COALESCE(direct_url, '')) != ''
+                    ORDER BY id
+                    """,
+                    (*portal_keys, *chunk),
+                ).fetchall()
+                for row in rows:
+                    # Ascending ids: the newest row of a tender wins
+                    found[self._normalize_tender_id_text(row["tender_id"])] = row["direct_url"]
+        return found
+
+    def get_manifest_department_urls(self, portal_name):
+        """Return { department key -> {name, direct_url, last_seen} } for a portal."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT department_key, name, direct_url, last_seen
+                FROM manifest_department_urls
+                WHERE portal_name = ?
+                """,
+                (str(portal_name or "").strip(),),
+            ).fetchall()
+        return {
+            row["department_key"]: {"name": row["name"], "direct_url": row["direct_url"], "last_seen": row["last_seen"]}
+            for row in rows
+        }
+
+    def record_manifest_portal(
+        self,
+        portal_name,
+        tender_ids=(),
+        departments=(),
+        department_urls=None,
+        last_run=None,
+        last_expected=None,
+        last_extracted=None,
+        seeded_from=None,
+        seed_reason=None,
+    ):
+        """
+        Merge one portal's run results into the manifest in a single transaction.
+
+        Only IDs and departments not already recorded are written, so the cost
+        follows the size of the change rather than the portal's history.
+        department_urls is { department key -> {name, direct_url} }. None
+        arguments keep the stored value. Returns the portal's known ID count.
+        """
+        portal_name = str(portal_name or "").strip()
+        if not portal_name:
+            return 0
+        now_text = datetime.now().isoformat(timespec="seconds")
+        id_rows = [(portal_name, tid) for tid in {str(item).strip() for item in tender_ids or ()} if tid]
+        dept_rows = [(portal_name, name) for name in {str(item).strip().lower() for item in departments or ()} if name]
+        url_rows = [
+            (portal_name, key, str(row.get("name") or ""), str(row.get("direct_url") or ""), row.get("last_seen") or now_text)
+            for key, row in (department_urls or {}).items()
+            if key and str(row.get("direct_url") or "").strip()
+        ]
+
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO manifest_portals (portal_name) VALUES (?)", (portal_name,))
+            added = 0
+            if id_rows:
+                added = conn.executemany(
+                    "INSERT OR IGNORE INTO manifest_tender_ids (portal_name, tender_id) VALUES (?, ?)",
+                    id_rows,
+                ).rowcount
+            if dept_rows:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO manifest_departments (portal_name, department) VALUES (?, ?)",
+                    dept_rows,
+                )
+            if url_rows:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO manifest_department_urls
+                        (portal_name, department_key, name, direct_url, last_seen)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    url_rows,
+                )
+            conn.execute(
+                """
+                UPDATE manifest_portals
+                SET known_ids = known_ids + ?,
+                    last_run = ?,
+                    last_expected = COALESCE(?, last_expected),
+                    last_extracted = COALESCE(?, last_extracted),
+                    seeded_from = COALESCE(?, seeded_from),
+                    seed_reason = COALESCE(?, seed_reason)
+                WHERE portal_name = ?
+                """,
+                (max(0, added), last_run or now_text, last_expected, last_extracted, seeded_from, seed_reason, portal_name),
+            )
+            row = conn.execute("SELECT known_ids FROM manifest_portals WHERE portal_name = ?", (portal_name,)).fetchone()
+        return int(row[0] or 0) if row else 0
+
+    def seed_manifest_from_tenders(self, portal_name, portal_keys):
+        """
+        Add tender IDs stored under any of portal_keys (lower-cased portal
+        names) to the manifest. Only tender rows inserted since the previous
+        seed are read. Returns the number of IDs added.
+        """
+        portal_name = str(portal_name or "").strip()
+        portal_keys = sorted({str(key or "").strip().lower() for key in portal_keys or () if str(key or "").strip()})
+        if not portal_name or not portal_keys:
+            return 0
+        placeholders = ",".join("?" * len(portal_keys))
+
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO manifest_portals (portal_name) VALUES (?)", (portal_name,))
+            seeded_rowid = conn.execute(
+                "SELECT seeded_tender_rowid FROM manifest_portals WHERE portal_name = ?",
+                (portal_name,),
+            ).fetchone()[0]
+            high_rowid = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tenders").fetchone()[0]
+            if high_rowid <= seeded_rowid:
+                return 0
+            added = conn.execute(
+                f"""
+                INSERT OR IGNORE INTO manifest_tender_ids (portal_name, tender_id)
+                SELECT ?, TRIM(tender_id_extracted)
+                FROM tenders
+                WHERE id > ? AND id <= ?
+                  AND TRIM(COALESCE(tender_id_extracted, '')) != ''
+                  AND LOWER(TRIM(COALESCE(portal_name, ''))) IN ({placeholders})
+                """,
+                (portal_name, seeded_rowid, high_rowid, *portal_keys),
+            ).rowcount
+            conn.execute(
+                """
+                UPDATE manifest_portals
+                SET known_ids = known_ids + ?,
+                    seeded_tender_rowid = ?,
+                    last_db_seed = CASE WHEN ? > 0 THEN ? ELSE last_db_seed END
+                WHERE portal_name = ?
+                """,
+                (max(0, added), high_rowid, added, datetime.now().isoformat(timespec="seconds"), portal_name),
+            )
+        return max(0, added)
+
+    def import_manifest_json(self, path):
+        """
+        One-time migration of a batch_tender_manifest.json file into the
+        manifest tables. The file is renamed to <path>.migrated afterwards.
+        Returns the number of portals imported.
+        """
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        portals = data.get("portals", {}) if isinstance(data, dict) else {}
+        imported = 0
+        for portal_name, portal_data in (portals if isinstance(portals, dict) else {}).items():
+            if not isinstance(portal_data, dict):
+                continue
+            url_map = portal_data.get("department_url_map")
+            self.record_manifest_portal(
+                portal_name,
+                tender_ids=portal_data.get("tender_ids") or (),
+                departments=portal_data.get("processed_departments") or (),
+                department_urls={
+                    key: row for key, row in url_map.items() if isinstance(row, dict)
+                } if isinstance(url_map, dict) else None,
+                last_run=portal_data.get("last_run"),
+                last_expected=portal_data.get("last_expected"),
+                last_extracted=portal_data.get("last_extracted"),
+                seeded_from=portal_data.get("seeded_from"),
+                seed_reason=portal_data.get("seed_reason"),
+            )
+            imported += 1
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError:
+            # Another process migrated it first; the import above is idempotent
+            pass
+        return imported
+
     def update_run_progress(self, run_id, expected_total=None, extracted_total=None, skipped_total=None):
         """Update run progress counters without finalizing the run."""
         with self._connect() as conn:
@@ -678,6 +1500,7 @@ class TenderDataStore:
                 UPDATE tenders
                 SET
                     lifecycle_status = 'cancelled',
+                    is_live = 0,
                     cancelled_detected_at = ?,
                     cancelled_source = ?
                 WHERE lower(trim(coalesce(portal_name, ''))) = ?
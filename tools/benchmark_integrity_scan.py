@@ -0,0 +1,205 @@
+"""Benchmark the single-pass integrity scan against the legacy per-check queries.
+
+Builds a synthetic tenders database (1M rows by default) with duplicates,
+placeholder IDs and missing closing dates, then times:
+
+  legacy  - the former compute_integrity_report: ten queries, including the
+            per-portal metrics query with four correlated subqueries
+  single  - integrity.scan_integrity (one streaming cursor)
+
+and checks that both produce the same headline and per-portal numbers.
+
+Usage:
+    python tools/benchmark_integrity_scan.py --rows 1000000
+    python tools/benchmark_integrity_scan.py --db data/blackforest_tenders.sqlite3 --skip-legacy
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "tender_dashboard_reflex"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from tender_store import TenderDataStore
+from tender_dashboard_reflex import integrity
+
+PORTALS = ["HP Tenders", "Haryana", "Chandigarh", "CPPP1 eProcure", "CPPP2 eTenders",
+           "Uttar Pradesh", "Punjab", "Rajasthan", "Kerala", "West Bengal"]
+PLACEHOLDERS = ["nan", "None", "NULL", "-", "n/a"]
+
+LEGACY_QUERIES = [
+    "SELECT COUNT(*) FROM tenders",
+    "SELECT COUNT(DISTINCT LOWER(TRIM(COALESCE(portal_name, '')))) FROM tenders WHERE portal_name IS NOT NULL",
+    """SELECT COUNT(*), COALESCE(SUM(c - 1), 0) FROM (
+           SELECT COUNT(*) AS c FROM tenders
+           WHERE TRIM(COALESCE(tender_id_extracted, '')) <> ''
+           GROUP BY LOWER(TRIM(COALESCE(portal_name, ''))), TRIM(COALESCE(tender_id_extracted, ''))
+           HAVING c > 1)""",
+    """SELECT portal_name, tender_id_extracted, COUNT(*) AS count FROM tenders
+       WHERE TRIM(COALESCE(tender_id_extracted, '')) <> ''
+       GROUP BY LOWER(TRIM(COALESCE(portal_name, ''))), TRIM(COALESCE(tender_id_extracted, ''))
+       HAVING COUNT(*) > 1 ORDER BY count DESC, portal_name ASC LIMIT 20""",
+    """SELECT COUNT(*) FROM tenders
+       WHERE tender_id_extracted IS NULL OR TRIM(tender_id_extracted) = ''
+          OR LOWER(TRIM(tender_id_extracted)) IN ('nan', 'none', 'null', 'na', 'n/a', '-')""",
+    """SELECT COUNT(*) FROM tenders
+       WHERE LOWER(TRIM(COALESCE(tender_id_extracted, ''))) IN ('nan', 'none', 'null', 'na', 'n/a', '-')""",
+    "SELECT COUNT(*) FROM tenders WHERE closing_date IS NULL OR TRIM(closing_date) = ''",
+    """SELECT portal_name, department_name, COUNT(*) AS missing_count FROM tenders
+       WHERE closing_date IS NULL OR TRIM(closing_date) = ''
+       GROUP BY portal_name, department_name ORDER BY missing_count DESC LIMIT 20""",
+]
+
+LEGACY_PORTAL_METRICS = """
+    SELECT
+        COALESCE(portal_name, 'Unknown') AS portal_name,
+        COUNT(*) AS total_tenders,
+        (SELECT COUNT(*) FROM (
+            SELECT COUNT(*) AS c FROM tenders t2
+            WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
+              AND TRIM(COALESCE(t2.tender_id_extracted, '')) <> ''
+            GROUP BY TRIM(COALESCE(t2.tender_id_extracted, ''))
+            HAVING c > 1
+        )) AS duplicate_groups,
+        (SELECT COALESCE(SUM(c - 1), 0) FROM (
+            SELECT COUNT(*) AS c FROM tenders t2
+            WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
+              AND TRIM(COALESCE(t2.tender_id_extracted, '')) <> ''
+            GROUP BY TRIM(COALESCE(t2.tender_id_extracted, ''))
+            HAVING c > 1
+        )) AS duplicate_rows,
+        (SELECT COUNT(*) FROM tenders t2
+         WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
+           AND (t2.tender_id_extracted IS NULL
+                OR TRIM(t2.tender_id_extracted) = ''
+                OR LOWER(TRIM(t2.tender_id_extracted)) IN ('nan', 'none', 'null', 'na', 'n/a', '-'))
+        ) AS missing_tender_ids,
+        (SELECT COUNT(*) FROM tenders t2
+         WHERE LOWER(TRIM(COALESCE(t2.portal_name, ''))) = LOWER(TRIM(COALESCE(t1.portal_name, '')))
+           AND (t2.closing_date IS NULL OR TRIM(t2.closing_date) = '')
+        ) AS missing_closing_dates
+    FROM tenders t1
+    WHERE portal_name IS NOT NULL
+    GROUP BY LOWER(TRIM(COALESCE(portal_name, '')))
+    ORDER BY total_tenders DESC
+"""
+
+
+def build_database(db_path: Path, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    store = TenderDataStore(str(db_path))
+    run_id = store.start_run(portal_name="benchmark", base_url="")
+
+    def generate():
+        for i in range(rows):
+            portal = rng.choice(PORTALS)
+            if rng.random() < 0.05:
+                portal = f"  {portal.lower()} "  # same portal, different spelling
+            roll = rng.random()
+            if roll < 0.02:
+                tender_id = rng.choice(PLACEHOLDERS)
+            elif roll < 0.03:
+                tender_id = None
+            elif roll < 0.10:
+                tender_id = f"2024_TND_{rng.randrange(max(1, i)):07d}"  # likely duplicate
+            else:
+                tender_id = f"2024_TND_{i:07d}"
+            closing = None if rng.random() < 0.04 else f"{rng.randint(1, 28):02d}-Jan-2025 03:00 PM"
+            yield (run_id, portal, tender_id, f"Department {rng.randrange(200)}", closing)
+
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executemany(
+            "INSERT INTO tenders (run_id, portal_name, tender_id_extracted, department_name, closing_date) "
+            "VALUES (?, ?, ?, ?, ?)",
+            generate(),
+        )
+    conn.close()
+
+
+def run_legacy(conn: sqlite3.Connection) -> dict:
+    results = [conn.execute(sql).fetchall() for sql in LEGACY_QUERIES]
+    portals = {
+        row[0].strip().lower(): (row[1], row[2], row[3], row[4], row[5])
+        for row in conn.execute(LEGACY_PORTAL_METRICS).fetchall()
+    }
+    return {
+        "total_tenders": results[0][0][0],
+        "duplicate_groups": results[2][0][0],
+        "duplicate_extra_rows": results[2][0][1],
+        "missing_tender_ids": results[4][0][0],
+        "missing_closing_dates": results[6][0][0],
+        "portals": portals,
+    }
+
+
+def run_single(conn: sqlite3.Connection) -> dict:
+    report = integrity.scan_integrity(conn)
+    report["portals"] = {
+        item["portal_name"].strip().lower(): (
+            item["total_tenders"], item["duplicate_groups"], item["duplicate_rows"],
+            item["missing_tender_ids"], item["missing_closing_dates"],
+        )
+        for item in report["portal_metrics"]
+    }
+    return report
+
+
+def timed(label: str, func, conn):
+    started = time.perf_counter()
+    result = func(conn)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<8} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass integrity scan")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="", help="Benchmark an existing database instead")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the single-pass scan")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.db:
+        db_path = Path(args.db)
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix="integrity_bench_")
+        db_path = Path(tmp_dir) / "bench.sqlite3"
+        started = time.perf_counter()
+        build_database(db_path, args.rows, args.seed)
+        print(f"Built {args.rows:,} rows in {time.perf_counter() - started:.1f}s -> {db_path}")
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        single, single_s = timed("single", run_single, conn)
+        print(f"         {single['total_tenders']:,} rows, {single['duplicate_groups']:,} duplicate groups, "
+              f"{single['missing_tender_ids']:,} missing IDs, {single['missing_closing_dates']:,} missing dates")
+        if not args.skip_legacy:
+            legacy, legacy_s = timed("legacy", run_legacy, conn)
+            print(f"speedup  {legacy_s / single_s:8.1f}x")
+            mismatched = [
+                key for key in ("total_tenders", "duplicate_groups", "duplicate_extra_rows",
+                                "missing_tender_ids", "missing_closing_dates", "portals")
+                if legacy[key] != single[key]
+            ]
+            print("results  " + ("match" if not mismatched else f"MISMATCH in {', '.join(mismatched)}"))
+    finally:
+        conn.close()
+        if tmp_dir:
+            for name in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
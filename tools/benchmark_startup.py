@@ -0,0 +1,148 @@
+"""Benchmark import time and CLI startup.
+
+Two measurements, each in fresh interpreters:
+
+  imports   - `python -X importtime -c "import <module>"` for the entry-point
+              modules; reports the module's cumulative import time and the
+              slowest top-level imports it pulled in
+  commands  - wall-clock time of `python cli_main.py <command>` for commands
+              that should not start a browser (help, urls, status)
+
+Results are medians over --repeat runs. --max-seconds makes the script exit
+non-zero when a command is slower, so it can guard against heavy imports
+creeping back into the startup path.
+
+Usage:
+    python tools/benchmark_startup.py
+    python tools/benchmark_startup.py --repeat 5 --max-seconds 1.0 --json startup.json
+    python tools/benchmark_startup.py --modules scraper.logic --top 25
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+DEFAULT_MODULES = ["config", "cli_parser", "cli_runner", "tender_store", "app_settings", "scraper.logic"]
+DEFAULT_COMMANDS = ["help", "urls", "status"]
+HEAVY_MODULES = ("pandas", "numpy", "selenium", "tkinter", "openpyxl", "playwright")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr_text):
+    """[(module, self us, cumulative us, depth)] from -X importtime output."""
+    entries = []
+    for line in stderr_text.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def profile_import(module, repeat):
+    """Median cumulative import time of module and its import tree from the last run."""
+    totals = []
+    entries = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(PROJECT_ROOT),
+            capture_output=True,
+            text=True,
+        )
+        entries = parse_importtime(result.stderr)
+        tops = [position for position, (name, _self, _cumulative, depth) in enumerate(entries) if depth == 0]
+        if result.returncode != 0 or not tops or entries[tops[-1]][0] != module:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        totals.append(entries[tops[-1]][2])
+        # Children are listed before their parent: keep the entries after the previous top-level import
+        start = tops[-2] + 1 if len(tops) > 1 else 0
+        entries = entries[start:tops[-1] + 1]
+    return statistics.median(totals), entries
+
+
+def time_command(command, repeat):
+    """Median wall-clock seconds of `cli_main.py <command>`."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "cli_main.py", *command.split()],
+            cwd=str(PROJECT_ROOT),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            raise RuntimeError(f"cli_main.py {command} exited with {result.returncode}:\n{result.stdout[-2000:]}")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--commands", nargs="*", default=DEFAULT_COMMANDS,
+                        help="cli_main.py commands to time (quote commands with arguments)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list per module")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if any command takes longer than this")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = parser.parse_args()
+    repeat = max(1, args.repeat)
+
+    report = {"python": sys.version.split()[0], "repeat": repeat, "imports": {}, "commands": {}}
+
+    print(f"Import time (median of {repeat}, cumulative ms)")
+    print("-" * 70)
+    for module in args.modules:
+        total_us, entries = profile_import(module, repeat)
+        loaded = {name.split(".")[0] for name, *_ in entries}
+        heavy = [name for name in HEAVY_MODULES if name in loaded]
+        children = sorted(
+            ((name, cumulative) for name, _self, cumulative, depth in entries if depth == 1),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:args.top]
+        report["imports"][module] = {
+            "cumulative_ms": round(total_us / 1000, 1),
+            "heavy_modules": heavy,
+            "slowest_imports": [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in children],
+        }
+        print(f"{module:<28} {total_us / 1000:>9.1f} ms   heavy: {', '.join(heavy) or '-'}")
+        for name, us in children:
+            print(f"    {name:<40} {us / 1000:>9.1f} ms")
+
+    failures = []
+    if args.commands:
+        print()
+        print(f"CLI startup (median of {repeat}, wall clock)")
+        print("-" * 70)
+    for command in args.commands:
+        seconds = time_command(command, repeat)
+        report["commands"][command] = round(seconds, 3)
+        flag = ""
+        if args.max_seconds is not None and seconds > args.max_seconds:
+            failures.append(command)
+            flag = f"  SLOWER THAN {args.max_seconds:.2f}s"
+        print(f"cli_main.py {command:<24} {seconds:>7.3f} s{flag}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nWrote {args.json_path}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Bulk import every historical scrape export under Tender_Downloads.
+
+Finds all *_tenders_*.xlsx / *_tenders_*.csv files and parses them in a
+process pool. It keeps only the newest copy of each (portal, tender ID)
+across files, then loads all files in one write transaction
+(TenderDataStore.import_export_files). Files are tracked by content hash in
+the imported_files table, so a re-run only parses new or changed files.
+
+Usage:
+    python tools/bulk_import_scrapes.py --workspace .
+    python tools/bulk_import_scrapes.py --workers 8 --replace-existing
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from import_recent_scrapes import load_store_rows, resolve_settings_paths
+from tender_store import TenderDataStore
+
+EXPORT_PATTERNS = ("*_tenders_*.xlsx", "*_tenders_*.csv")
+HASH_CHUNK_SIZE = 1024 * 1024
+# TenderDataStore.export_run stamps files as <keyword>_tenders_YYYYmmdd_HHMMSS
+_STAMP_RE = re.compile(r"_tenders_(\d{8}_\d{6})")
+
+
+def discover_export_files(source_dir: Path):
+    files = set()
+    for pattern in EXPORT_PATTERNS:
+        files.update(p for p in source_dir.rglob(pattern) if p.is_file())
+    return sorted(files)
+
+
+def file_content_hash(file_path: Path) -> str:
+    # Chunked read rather than hashlib.file_digest, which needs Python 3.11
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def export_timestamp(file_path: Path) -> str:
+    """Scrape time from the file name, falling back to the modification time."""
+    match = _STAMP_RE.search(file_path.stem)
+    if match:
+        return match.group(1)
+    return datetime.fromtimestamp(file_path.stat().st_mtime).strftime("%Y%m%d_%H%M%S")
+
+
+def parse_export_file(file_path: str):
+    """Worker: parse one export into store rows. Runs in a pool process."""
+    path = Path(file_path)
+    try:
+        records, portal_name = load_store_rows(path)
+    except Exception as exc:
+        return {"file_path": file_path, "error": str(exc)}
+    if records is None:
+        return {"file_path": file_path, "non_scrape": True, "rows": []}
+    now_ist_text = TenderDataStore._now_ist_text()
+    return {
+        "file_path": file_path,
+        "portal_name": portal_name,
+        "rows": [TenderDataStore.import_row_from_export(item, now_ist_text) for item in records],
+    }
+
+
+def dedupe_across_files(parsed):
+    """
+    Keep the newest row per (portal, tender ID) over all files.
+
+    parsed must be sorted oldest file first; a later file (or a later row in
+    the same file) replaces an earlier one. Returns the number of rows dropped.
+    """
+    portal_idx = TenderDataStore.IMPORT_COLUMNS.index("portal_name")
+    tender_idx = TenderDataStore.IMPORT_COLUMNS.index("tender_id_extracted")
+    newest = {}
+    total = 0
+    for file_idx, item in enumerate(parsed):
+        for row_idx, row in enumerate(item["rows"]):
+            newest[(row[portal_idx].lower(), row[tender_idx])] = (file_idx, row_idx)
+            total += 1
+    keep = {}
+    for file_idx, row_idx in newest.values():
+        keep.setdefault(file_idx, set()).add(row_idx)
+    for file_idx, item in enumerate(parsed):
+        kept = keep.get(file_idx, set())
+        item["rows"] = [row for row_idx, row in enumerate(item["rows"]) if row_idx in kept]
+    return total - len(newest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import all scrape exports under Tender_Downloads into SQLite")
+    parser.add_argument("--workspace", default=".", help="Workspace root path")
+    parser.add_argument("--source-dir", default="Tender_Downloads", help="Directory searched recursively for exports")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parser processes")
+    parser.add_argument(
+        "--replace-existing",
+        action="store_true",
+        help="Replace tenders already in the database (default: keep them and skip the imported copy)",
+    )
+    args = parser.parse_args()
+
+    workspace = Path(args.workspace).resolve()
+    source_dir = (workspace / args.source_dir).resolve()
+    db_path, backup_dir, retention_days = resolve_settings_paths(workspace)
+    if not source_dir.exists():
+        print(f"Source directory not found: {source_dir}")
+        return 1
+
+    store = TenderDataStore(db_path)
+    known_hashes = store.get_imported_file_hashes()
+
+    pending = []
+    unchanged = 0
+    for file_path in discover_export_files(source_dir):
+        content_hash = file_content_hash(file_path)
+        if content_hash in known_hashes:
+            unchanged += 1
+            continue
+        known_hashes.add(content_hash)  # identical copies in two folders are parsed once
+        pending.append((export_timestamp(file_path), str(file_path), content_hash))
+
+    if not pending:
+        print(f"No new export files ({unchanged} already imported).")
+        print(f"DB path: {db_path}")
+        return 0
+
+    pending.sort()
+    print(f"Parsing {len(pending)} new export file(s) with {max(1, args.workers)} worker(s)...")
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        parsed = list(pool.map(parse_export_file, [path for _, path, _ in pending], chunksize=4))
+
+    failed = 0
+    non_scrape = 0
+    for (_, file_path, content_hash), item in zip(pending, parsed):
+        item["content_hash"] = content_hash
+        item["file_type"] = Path(file_path).suffix.lower().lstrip(".")
+        if item.get("error"):
+            failed += 1
+            print(f"Skipped {Path(file_path).name}: {item['error']}")
+        elif item.get("non_scrape"):
+            non_scrape += 1
+    # Failed files are not recorded, so the next run retries them
+    parsed = [item for item in parsed if not item.get("error")]
+    superseded = dedupe_across_files(parsed)
+
+    backup_path = store.backup_if_due(backup_dir=backup_dir, retention_days=retention_days)
+    results = store.import_export_files(
+        parsed,
+        base_url="imported://bulk-scrape",
+        skip_existing=not args.replace_existing,
+    )
+
+    imported_rows = sum(inserted for _, _, inserted, _ in results)
+    skipped_rows = sum(skipped for _, _, _, skipped in results)
+    print("--- Bulk Import Summary ---")
+    print(f"New files parsed        : {len(pending)}")
+    print(f"Unchanged files skipped : {unchanged}")
+    print(f"Non-scrape files        : {non_scrape}")
+    print(f"Failed files            : {failed}")
+    print(f"Runs created            : {sum(1 for _, run_id, _, _ in results if run_id)}")
+    print(f"Rows imported           : {imported_rows}")
+    print(f"Superseded by newer file: {superseded}")
+    print(f"Already in database     : {skipped_rows}")
+    print(f"Main DB path            : {db_path}")
+    print(f"Backup file             : {backup_path if backup_path else 'not-created'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
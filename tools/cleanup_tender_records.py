@@ -2,20 +2,15 @@ import argparse
 import os
 import shutil
 import sqlite3
+import sys
 from datetime import datetime
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-def normalize_text(value):
-    if value is None:
-        return ""
-    return str(value).strip()
-
-
-def is_missing_tender_id(value):
-    tender_id = normalize_text(value)
-    if not tender_id:
-        return True
-    return tender_id.lower() in {"nan", "none", "null", "na", "n/a", "-"}
+from tender_dedupe import PLACEHOLDER_TENDER_IDS, TENDER_KEY, delete_ids_in_batches, remove_duplicates
 
 
 def backup_db(db_path, backup_dir):
@@ -36,45 +31,18 @@ def main():
     db_path = os.path.abspath(args.db)
     backup_path = backup_db(db_path, os.path.abspath(args.backup_dir))
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = sqlite3.connect(db_path, timeout=30)
     cur = conn.cursor()
 
-    rows = cur.execute(
-        """
-        SELECT id, run_id, portal_name, tender_id_extracted
-        FROM tenders
-        ORDER BY id ASC
-        """
-    ).fetchall()
-
-    total_before = len(rows)
-    missing_ids = []
-    keep_by_key = {}
-
-    for row in rows:
-        tender_id = normalize_text(row["tender_id_extracted"])
-        portal_name = normalize_text(row["portal_name"])
-
-        if is_missing_tender_id(tender_id):
-            missing_ids.append(int(row["id"]))
-            continue
-
-        key = (portal_name.lower(), tender_id)
-        existing = keep_by_key.get(key)
-        current_sort = (int(row["run_id"] or 0), int(row["id"]))
-        if existing is None or current_sort > existing[0]:
-            keep_by_key[key] = (current_sort, int(row["id"]))
-
-    keep_ids = {v[1] for v in keep_by_key.values()}
-    duplicate_ids = [int(r["id"]) for r in rows if int(r["id"]) not in keep_ids and int(r["id"]) not in set(missing_ids)]
-
-    delete_ids = missing_ids + duplicate_ids
-
-    if delete_ids:
-        cur.executemany("DELETE FROM tenders WHERE id = ?", [(x,) for x in delete_ids])
-
-    conn.commit()
+    total_before = cur.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
+    missing_ids = [
+        row[0]
+        for row in cur.execute(
+            f"SELECT id FROM tenders WHERE {TENDER_KEY} = '' OR LOWER({TENDER_KEY}) IN {PLACEHOLDER_TENDER_IDS}"
+        )
+    ]
+    removed_missing = delete_ids_in_batches(db_path, missing_ids, label="missing tender IDs")
+    removed_duplicates = remove_duplicates(db_path)
 
     total_after = cur.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
     remaining_dup_groups = cur.execute(
@@ -99,8 +67,8 @@ def main():
     print(f"DB: {db_path}")
     print(f"Backup: {backup_path}")
     print(f"Rows before: {total_before}")
-    print(f"Removed missing tender IDs: {len(missing_ids)}")
-    print(f"Removed older duplicates: {len(duplicate_ids)}")
+    print(f"Removed missing tender IDs: {removed_missing}")
+    print(f"Removed older duplicates: {removed_duplicates}")
     print(f"Rows after: {total_after}")
     print(f"Remaining duplicate groups: {remaining_dup_groups}")
 
@@ -13,6 +13,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from app_settings import DEFAULT_SETTINGS_STRUCTURE
+from tender_file_reader import iter_table_chunks
 from tender_store import TenderDataStore
 
 
@@ -115,15 +116,28 @@ def to_store_rows(df: pd.DataFrame, portal_name: str):
     return rows
 
 
-def load_table(file_path: Path) -> pd.DataFrame:
+def iter_table(file_path: Path):
+    """Normalised DataFrame chunks of an export, streamed by tender_file_reader."""
     suffix = file_path.suffix.lower()
-    if suffix == ".xlsx":
-        df = pd.read_excel(file_path)
-    elif suffix == ".csv":
-        df = pd.read_csv(file_path, encoding="utf-8-sig")
-    else:
+    if suffix not in {".xlsx", ".csv"}:
         raise ValueError(f"Unsupported file type: {file_path}")
-    return normalize_columns(df)
+    for chunk in iter_table_chunks(file_path):
+        yield normalize_columns(chunk.fillna(""))
+
+
+def load_store_rows(file_path: Path):
+    """Store rows and portal name for a scrape export; rows is None for any other table."""
+    rows = []
+    portal_name = None
+    for chunk in iter_table(file_path):
+        if portal_name is None:
+            if chunk.empty:
+                return [], None
+            if not is_scrape_export(chunk):
+                return None, None
+            portal_name = infer_portal_name(file_path, chunk)
+        rows.extend(to_store_rows(chunk, portal_name))
+    return rows, portal_name
 
 
 def collect_source_files(source_dir: Path, cutoff_ts: float, max_files: int):
@@ -196,14 +210,10 @@ def main():
                 skipped_existing += 1
                 continue
 
-            df = load_table(file_path)
-            if df.empty:
-                continue
-            if not is_scrape_export(df):
+            rows, portal_name = load_store_rows(file_path)
+            if rows is None:
                 skipped_non_scrape += 1
                 continue
-            portal_name = infer_portal_name(file_path, df)
-            rows = to_store_rows(df, portal_name)
             if not rows:
                 continue
             run_id = store.start_run(portal_name=portal_name, base_url="imported://recent-scrape", scope_mode="import_recent")
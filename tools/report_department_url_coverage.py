@@ -2,26 +2,24 @@ import argparse
 import csv
 import json
 import os
+import sys
 from datetime import datetime
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-def _normalize_portal_data(value):
-    return value if isinstance(value, dict) else {}
+from tender_store import TenderDataStore
 
 
-def _compute_stats(portal_data):
-    known_departments = {
-        str(name).strip().lower()
-        for name in portal_data.get("processed_departments", [])
-        if str(name).strip()
-    }
-    dept_url_map = portal_data.get("department_url_map", {})
-    if not isinstance(dept_url_map, dict):
-        dept_url_map = {}
+def _compute_stats(store, portal_name):
+    known_departments = store.get_manifest_departments(portal_name)
+    dept_url_map = store.get_manifest_department_urls(portal_name)
 
     mapped = 0
     for row in dept_url_map.values():
-        if isinstance(row, dict) and str(row.get("direct_url", "") or "").strip():
+        if str(row.get("direct_url", "") or "").strip():
             mapped += 1
 
     known = len(known_departments)
@@ -29,21 +27,17 @@ def _compute_stats(portal_data):
     return mapped, known, coverage
 
 
-def generate_report(manifest_path, output_dir):
-    with open(manifest_path, "r", encoding="utf-8") as handle:
-        manifest = json.load(handle)
-
-    portals = manifest.get("portals", {})
-    if not isinstance(portals, dict):
-        portals = {}
+def generate_report(db_path, output_dir):
+    store = TenderDataStore(db_path)
+    portals = store.get_manifest_portals()
 
     rows = []
     mapped_total = 0
     known_total = 0
 
     for portal_name in sorted(portals.keys()):
-        portal_data = _normalize_portal_data(portals.get(portal_name, {}))
-        mapped, known, coverage = _compute_stats(portal_data)
+        portal_data = portals[portal_name]
+        mapped, known, coverage = _compute_stats(store, portal_name)
         row = {
             "portal": portal_name,
             "mapped_departments": mapped,
@@ -64,7 +58,7 @@ def generate_report(manifest_path, output_dir):
 
     payload = {
         "generated_at": datetime.now().isoformat(timespec="seconds"),
-        "manifest_path": os.path.abspath(manifest_path),
+        "db_path": os.path.abspath(db_path),
         "portal_count": len(rows),
         "mapped_departments_total": mapped_total,
         "known_departments_total": known_total,
@@ -98,9 +92,9 @@ def generate_report(manifest_path, output_dir):
 def main():
     parser = argparse.ArgumentParser(description="Generate department direct-URL coverage report from batch manifest.")
     parser.add_argument(
-        "--manifest",
-        default="batch_tender_manifest.json",
-        help="Path to batch manifest JSON file (default: batch_tender_manifest.json)",
+        "--db",
+        default=os.path.join("data", "blackforest_tenders.sqlite3"),
+        help="Tender database holding the batch manifest (default: data/blackforest_tenders.sqlite3)",
     )
     parser.add_argument(
         "--out-dir",
@@ -109,11 +103,11 @@ def main():
     )
     args = parser.parse_args()
 
-    manifest_path = os.path.abspath(args.manifest)
-    if not os.path.exists(manifest_path):
-        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+    db_path = os.path.abspath(args.db)
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
 
-    result = generate_report(manifest_path, os.path.abspath(args.out_dir))
+    result = generate_report(db_path, os.path.abspath(args.out_dir))
 
     print(
         "Department URL coverage report created: "
@@ -24,19 +24,117 @@ Usage in GUI:
         self.root.after(100, self.process_ui_queue)
 """
 
-import queue
+import itertools
 import time
+from array import array
+from collections import deque
 from threading import Lock
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 
-# Global message queue (thread-safe)
-_message_queue = queue.Queue()
-
-# Worker health tracking
+# ============================================================================
+# Bounded, coalescing message buffer
+# ============================================================================
+#
+# Log, completion and error messages go into a bounded ring buffer. Progress
+# is coalesced: only the latest send_progress per worker is kept, since the
+# UI only ever shows the current value. When the ring is full the overflow
+# policy decides what is lost:
+#   "drop_oldest"  evict the oldest log line for every new one
+#   "sample"       keep only every Nth new log line while full
+# Completion and error messages are never dropped. Dropped/coalesced counts
+# are reported by get_stats() so the UI can say how much it skipped.
+
+DEFAULT_MAX_QUEUE_SIZE = 5000
+DEFAULT_OVERFLOW_POLICY = "drop_oldest"
+DEFAULT_SAMPLE_EVERY = 10
+OVERFLOW_POLICIES = ("drop_oldest", "sample")
+
+_max_queue_size = DEFAULT_MAX_QUEUE_SIZE
+_overflow_policy = DEFAULT_OVERFLOW_POLICY
+_sample_every = DEFAULT_SAMPLE_EVERY
+
+_buffer_lock = Lock()
+_log_buffer: deque = deque()
+_control_messages: deque = deque()  # complete/error, unbounded (one or two per worker)
+_latest_progress: Dict[str, Dict] = {}
+_sequence = itertools.count()
+_overflow_seen = 0
+_dropped_counts = {"log": 0, "progress": 0}
+
+# Optional replacement consumer (see set_event_sink)
+_event_sink = None
+
+# Worker health tracking. Status changes take _health_lock; heartbeats are
+# written lock-free into a per-worker slot of a timestamp array.
 _worker_health: Dict[str, Dict] = {}
 _health_lock = Lock()
+_worker_slots: Dict[str, int] = {}
+_heartbeat_times = array("d")
+_current_tasks: List[str] = []
+
+
+def configure_queue(max_size: Optional[int] = None, policy: Optional[str] = None, sample_every: Optional[int] = None):
+    """
+    Change the buffer bound and overflow policy (call before workers start).
+
+    Args:
+        max_size: Maximum buffered log messages
+        policy: "drop_oldest" or "sample"
+        sample_every: With "sample", keep 1 of every N log lines while full
+    """
+    global _max_queue_size, _overflow_policy, _sample_every
+    if policy is not None and policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"Unknown overflow policy: {policy}")
+    with _buffer_lock:
+        if max_size is not None:
+            _max_queue_size = max(1, int(max_size))
+        if policy is not None:
+            _overflow_policy = policy
+        if sample_every is not None:
+            _sample_every = max(1, int(sample_every))
+        while len(_log_buffer) > _max_queue_size:
+            _log_buffer.popleft()
+            _dropped_counts["log"] += 1
+
+
+def set_event_sink(sink):
+    """
+    Send every message to sink(msg) instead of buffering it.
+
+    Used inside worker processes, where nothing drains this queue: the
+    scraper's send_* calls are forwarded to the parent over
+    worker_event_bus instead. Pass None to restore buffering.
+    """
+    global _event_sink
+    _event_sink = sink
+
+
+def _enqueue_log(msg: Dict):
+    global _overflow_seen
+    if _event_sink is not None:
+        _event_sink(msg)
+        return
+    with _buffer_lock:
+        if len(_log_buffer) >= _max_queue_size:
+            _overflow_seen += 1
+            if _overflow_policy == "sample" and _overflow_seen % _sample_every:
+                _dropped_counts["log"] += 1
+                return
+            _log_buffer.popleft()
+            _dropped_counts["log"] += 1
+        else:
+            _overflow_seen = 0
+        _log_buffer.append(msg)
+
+
+def _enqueue_control(msg: Dict):
+    if _event_sink is not None:
+        _event_sink(msg)
+        return
+    with _buffer_lock:
+        _control_messages.append(msg)
 
 
 def send_log(worker_id: str, message: str, level: str = "INFO"):
@@ -48,8 +146,9 @@ def send_log(worker_id: str, message: str, level: str = "INFO"):
         message: Log message text
         level: Log level ("INFO", "WARNING", "ERROR")
     """
-    _message_queue.put({
+    _enqueue_log({
         'type': 'log',
+        'seq': next(_sequence),
         'worker_id': worker_id,
         'message': message,
         'level': level,
@@ -63,6 +162,9 @@ def send_log(worker_id: str, message: str, level: str = "INFO"):
 def send_progress(worker_id: str, current: int, total: int, status: str = "", extra_data: dict = None):
     """
     Send progress update from worker to UI (non-blocking).
+
+    Replaces any progress update from the same worker the UI has not
+    picked up yet.
     
     Args:
         worker_id: Worker identifier
@@ -73,6 +175,7 @@ def send_progress(worker_id: str, current: int, total: int, status: str = "", ex
     """
     msg = {
         'type': 'progress',
+        'seq': next(_sequence),
         'worker_id': worker_id,
         'current': current,
         'total': total,
@@ -85,7 +188,22 @@ def send_progress(worker_id: str, current: int, total: int, status: str = "", ex
     if extra_data:
         msg['extra_data'] = extra_data
     
-    _message_queue.put(msg)
+    if _event_sink is not None:
+        _event_sink(msg)
+        _update_heartbeat(worker_id, status or f"Progress: {current}/{total}")
+        return
+
+    with _buffer_lock:
+        previous = _latest_progress.get(worker_id)
+        if previous is not None:
+            _dropped_counts["progress"] += 1
+            # Per-update counters must survive coalescing
+            skipped = (previous.get('extra_data') or {}).get('skipped_duplicates', 0)
+            if skipped:
+                merged = dict(msg.get('extra_data') or {})
+                merged['skipped_duplicates'] = merged.get('skipped_duplicates', 0) + skipped
+                msg['extra_data'] = merged
+        _latest_progress[worker_id] = msg
     
     # Update worker heartbeat
     _update_heartbeat(worker_id, status or f"Progress: {current}/{total}")
@@ -100,8 +218,9 @@ def send_complete(worker_id: str, data: Optional[Dict] = None, success: bool = T
         data: Optional result data
         success: Whether worker completed successfully
     """
-    _message_queue.put({
+    _enqueue_control({
         'type': 'complete',
+        'seq': next(_sequence),
         'worker_id': worker_id,
         'data': data or {},
         'success': success,
@@ -124,8 +243,9 @@ def send_error(worker_id: str, error: str, exception: Optional[Exception] = None
         error: Error message
         exception: Optional exception object
     """
-    _message_queue.put({
+    _enqueue_control({
         'type': 'error',
+        'seq': next(_sequence),
         'worker_id': worker_id,
         'error': error,
         'exception': str(exception) if exception else None,
@@ -139,73 +259,125 @@ def send_error(worker_id: str, error: str, exception: Optional[Exception] = None
             _worker_health[worker_id]['error'] = error
 
 
+def _batch_logs(messages: List[Dict]) -> List[Dict]:
+    """Merge consecutive log lines from the same worker and level into one message."""
+    batched: List[Dict] = []
+    for msg in messages:
+        last = batched[-1] if batched else None
+        if (
+            msg['type'] == 'log'
+            and last is not None
+            and last['type'] == 'log'
+            and last['worker_id'] == msg['worker_id']
+            and last['level'] == msg['level']
+        ):
+            last['lines'].append(msg['message'])
+            last['message'] = "\n".join(last['lines'])
+            last['count'] += 1
+            last['timestamp'] = msg['timestamp']
+            continue
+        if msg['type'] == 'log':
+            msg = dict(msg, lines=[msg['message']], count=1)
+        batched.append(msg)
+    return batched
+
+
 def get_pending_messages(max_messages: int = 100) -> List[Dict]:
     """
     Get all pending messages from queue (call from UI thread).
+
+    Returns up to max_messages buffered log/complete/error messages plus the
+    latest progress update of each worker, all in send order (so a worker's
+    last progress never lands after its complete/error). Consecutive log
+    lines of one worker are batched into a single message (message text
+    joined by newlines, plus 'lines' and 'count').
     
     Args:
-        max_messages: Maximum number of messages to retrieve in one call
+        max_messages: Maximum number of buffered messages to retrieve in one call
     
     Returns:
         List of message dictionaries
     """
-    messages = []
-    
-    try:
-        # Get up to max_messages without blocking
-        for _ in range(max_messages):
-            try:
-                msg = _message_queue.get_nowait()
-                messages.append(msg)
-            except queue.Empty:
-                break  # No more messages
-    
-    except Exception as e:
-        # Should never happen, but log it just in case
-        print(f"Error getting messages from queue: {e}")
-    
-    return messages
+    with _buffer_lock:
+        control = list(_control_messages)
+        _control_messages.clear()
+        log_count = min(len(_log_buffer), max(0, max_messages - len(control)))
+        logs = [_log_buffer.popleft() for _ in range(log_count)]
+        progress = list(_latest_progress.values())
+        _latest_progress.clear()
+
+    ordered = sorted(logs + control + progress, key=lambda msg: msg['seq'])
+    return _batch_logs(ordered)
 
 
 def clear_queue():
     """Clear all pending messages (useful for reset)"""
-    try:
-        while True:
-            _message_queue.get_nowait()
-    except queue.Empty:
-        pass
+    with _buffer_lock:
+        _log_buffer.clear()
+        _control_messages.clear()
+        _latest_progress.clear()
 
 
 def get_queue_size() -> int:
     """Get number of pending messages in queue"""
-    return _message_queue.qsize()
+    return len(_log_buffer) + len(_control_messages) + len(_latest_progress)
+
+
+def get_dropped_counts() -> Dict[str, int]:
+    """Messages dropped since start: 'log' lost to overflow, 'progress' coalesced away."""
+    with _buffer_lock:
+        return dict(_dropped_counts)
 
 
 # ============================================================================
 # Worker Health Monitoring
 # ============================================================================
 
+def _worker_slot(worker_id: str) -> int:
+    slot = _worker_slots.get(worker_id)
+    if slot is None:
+        with _health_lock:
+            slot = _worker_slots.get(worker_id)
+            if slot is None:
+                slot = len(_heartbeat_times)
+                _heartbeat_times.append(0.0)
+                _current_tasks.append("")
+                _worker_slots[worker_id] = slot
+    return slot
+
+
 def _update_heartbeat(worker_id: str, current_task: str):
-    """Update worker heartbeat (internal)"""
-    with _health_lock:
-        if worker_id not in _worker_health:
-            _worker_health[worker_id] = {
-                'status': 'running',
-                'started_at': time.time()
-            }
-        
-        _worker_health[worker_id]['last_heartbeat'] = time.time()
-        _worker_health[worker_id]['current_task'] = current_task
+    """Update worker heartbeat (internal, lock-free once the worker is known)"""
+    slot = _worker_slot(worker_id)
+    _heartbeat_times[slot] = time.time()
+    _current_tasks[slot] = current_task
+
+    health = _worker_health.get(worker_id)
+    if health is None or health.get('status') == 'starting':
+        with _health_lock:
+            health = _worker_health.setdefault(worker_id, {'started_at': time.time()})
+            if health.get('status') in (None, 'starting'):
+                health['status'] = 'running'
+
+
+def _health_snapshot(worker_id: str, health: Dict) -> Dict:
+    snapshot = dict(health)
+    slot = _worker_slots.get(worker_id)
+    if slot is not None and _heartbeat_times[slot]:
+        snapshot['last_heartbeat'] = _heartbeat_times[slot]
+        snapshot['current_task'] = _current_tasks[slot]
+    return snapshot
 
 
 def register_worker(worker_id: str):
     """Register a new worker (call at worker start)"""
+    slot = _worker_slot(worker_id)
+    _heartbeat_times[slot] = time.time()
+    _current_tasks[slot] = 'Initializing'
     with _health_lock:
         _worker_health[worker_id] = {
             'status': 'starting',
             'started_at': time.time(),
-            'last_heartbeat': time.time(),
-            'current_task': 'Initializing',
             'success': None,
             'error': None
         }
@@ -221,13 +393,14 @@ def unregister_worker(worker_id: str):
 def get_worker_health(worker_id: str) -> Optional[Dict]:
     """Get health status for a specific worker"""
     with _health_lock:
-        return _worker_health.get(worker_id, None)
+        health = _worker_health.get(worker_id, None)
+        return _health_snapshot(worker_id, health) if health is not None else None
 
 
 def get_all_workers_health() -> Dict[str, Dict]:
     """Get health status for all workers"""
     with _health_lock:
-        return dict(_worker_health)  # Return copy
+        return {worker_id: _health_snapshot(worker_id, health) for worker_id, health in _worker_health.items()}
 
 
 def check_stuck_workers(timeout_seconds: int = 300) -> List[str]:
@@ -246,7 +419,9 @@ def check_stuck_workers(timeout_seconds: int = 300) -> List[str]:
     with _health_lock:
         for worker_id, health in _worker_health.items():
             if health['status'] == 'running':
-                time_since_heartbeat = current_time - health.get('last_heartbeat', 0)
+                slot = _worker_slots.get(worker_id)
+                last_heartbeat = _heartbeat_times[slot] if slot is not None else 0
+                time_since_heartbeat = current_time - last_heartbeat
                 
                 if time_since_heartbeat > timeout_seconds:
                     stuck_workers.append(worker_id)
@@ -259,6 +434,9 @@ def reset_all_workers():
     """Reset all worker health data (useful for new scrape)"""
     with _health_lock:
         _worker_health.clear()
+        for slot in range(len(_heartbeat_times)):
+            _heartbeat_times[slot] = 0.0
+            _current_tasks[slot] = ""
     
     clear_queue()
 
@@ -275,8 +453,13 @@ def get_stats() -> Dict:
         completed_workers = sum(1 for w in _worker_health.values() if w['status'] == 'completed')
         error_workers = sum(1 for w in _worker_health.values() if w['status'] == 'error')
     
+    dropped = get_dropped_counts()
     return {
         'queue_size': get_queue_size(),
+        'max_queue_size': _max_queue_size,
+        'overflow_policy': _overflow_policy,
+        'dropped_log_messages': dropped['log'],
+        'coalesced_progress_updates': dropped['progress'],
         'total_workers': len(_worker_health),
         'active_workers': active_workers,
         'stuck_workers': stuck_workers,
@@ -291,7 +474,9 @@ def print_diagnostics():
     print(f"\n{'='*60}")
     print(f"UI MESSAGE QUEUE DIAGNOSTICS")
     print(f"{'='*60}")
-    print(f"Queue size: {stats['queue_size']} messages")
+    print(f"Queue size: {stats['queue_size']} messages (max {stats['max_queue_size']}, {stats['overflow_policy']})")
+    print(f"Dropped log messages: {stats['dropped_log_messages']}")
+    print(f"Coalesced progress updates: {stats['coalesced_progress_updates']}")
     print(f"Total workers: {stats['total_workers']}")
     print(f"  Active: {stats['active_workers']}")
     print(f"  Stuck: {stats['stuck_workers']}")
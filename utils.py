@@ -53,6 +53,21 @@ def get_website_keyword_from_url(url):
         return "unknown_site"
 
 
+
+def portal_name_candidates(portal_name, portal_config):
+    """Lower-cased names a portal's tenders may be stored under (name, keyword, host keyword)."""
+    base_url = str(portal_config.get('BaseURL') or '').strip()
+    keyword = str(portal_config.get('Keyword') or '').strip()
+    keyword_from_url = str(get_website_keyword_from_url(base_url) or '').strip() if base_url else ''
+    candidates_raw = {
+        str(portal_name or '').strip(),
+        keyword,
+        keyword_from_url,
+        keyword.replace('.', '_').replace('-', '_'),
+        keyword_from_url.replace('.', '_').replace('-', '_'),
+    }
+    return sorted({item.lower() for item in candidates_raw if item})
+
 def generate_tender_urls(original_url, base_url):
     """
     Generates Direct URL and Status URL from the original tender detail link found on list pages.
@@ -0,0 +1,267 @@
+"""
+Cross-process event bus for scraping worker processes.
+
+Replaces the per-message pickled dicts that workers used to push through a
+multiprocessing.Queue. There are two channels:
+
+    counters   one row of float64 progress counters per worker in a shared
+               memory array (multiprocessing.Array). Progress updates just
+               overwrite the row; the parent reads the latest values when it
+               polls, so per-row progress costs no IPC at all.
+    pipe       one one-way Pipe per worker carrying struct-packed records:
+               batches of log lines (flushed every FLUSH_INTERVAL_SECONDS or
+               MAX_LOG_BATCH lines) and the occasional status/completion
+               record with text fields (compact JSON, no pickling).
+
+Record layout (little endian):
+    header   B event type, B worker slot, H item count
+    log      per line: B level index, I byte length, UTF-8 text
+    status   I byte length, UTF-8 JSON object
+
+Worker side:
+    publisher = EventPublisher(conn, counters, worker_id)
+    publisher.reset_progress()  # new portal: clear the previous portal's numbers
+    publisher.log("Starting portal")
+    publisher.progress(dept_current=3, dept_total=40, tenders_found=120)
+    publisher.status(portal_name="HP", department_name="PWD")
+    publisher.close()
+
+Parent side:
+    reader = EventBusReader(parent_conns, counters)
+    while reader.active:
+        for event in reader.poll(timeout=0.25):
+            ...  # dicts shaped like the old queue messages
+
+The reader yields the same dict shapes ScrapingWorkerManager used before
+("log", "worker_status", "portal_complete"), so consumers need no changes.
+"""
+
+import json
+import struct
+import threading
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional
+
+EVENT_LOG_BATCH = 1
+EVENT_STATUS = 2
+EVENT_PORTAL_COMPLETE = 3
+EVENT_WORKER_DONE = 4
+
+LEVELS = ("INFO", "WARNING", "ERROR", "DEBUG")
+FLUSH_INTERVAL_SECONDS = 0.25
+MAX_LOG_BATCH = 200
+
+# "seq" is bumped after every update so the reader can tell a row changed
+COUNTER_FIELDS = (
+    "seq",
+    "dept_current",
+    "dept_total",
+    "expected_departments",
+    "tenders_found",
+    "expected_tenders",
+    "pending_depts",
+    "skipped_existing",
+    "progress_percent",
+    "tender_percent",
+)
+_FIELD_INDEX = {name: idx for idx, name in enumerate(COUNTER_FIELDS)}
+# Stored as doubles like the rest of the row, but reported unrounded
+_FLOAT_FIELDS = frozenset({"progress_percent", "tender_percent"})
+
+_HEADER = struct.Struct("<BBH")
+_LINE = struct.Struct("<BI")
+_BLOB = struct.Struct("<I")
+
+
+class WorkerCounters:
+    """Shared-memory progress counters, one row per worker slot."""
+
+    def __init__(self, array, worker_count: int):
+        self.array = array
+        self.worker_count = worker_count
+
+    @classmethod
+    def create(cls, mp_context, worker_count: int) -> "WorkerCounters":
+        # lock=False: each row has a single writer; the reader tolerates a torn row for one poll.
+        # Doubles so the percent fields keep their fractions (counts stay exact up to 2**53).
+        array = mp_context.Array("d", max(1, worker_count) * len(COUNTER_FIELDS), lock=False)
+        return cls(array, worker_count)
+
+    def update(self, worker_id: int, **values):
+        base = worker_id * len(COUNTER_FIELDS)
+        for name, value in values.items():
+            idx = _FIELD_INDEX.get(name)
+            if idx:
+                self.array[base + idx] = float(value or 0)
+        self.array[base] += 1
+
+    def reset(self, worker_id: int):
+        """Zero a worker's row (keeping seq moving) before it starts another portal."""
+        base = worker_id * len(COUNTER_FIELDS)
+        for idx in range(1, len(COUNTER_FIELDS)):
+            self.array[base + idx] = 0.0
+        self.array[base] += 1
+
+    def snapshot(self, worker_id: int) -> Dict[str, float]:
+        base = worker_id * len(COUNTER_FIELDS)
+        row = self.array[base:base + len(COUNTER_FIELDS)]
+        return {
+            name: value if name in _FLOAT_FIELDS else int(value)
+            for name, value in zip(COUNTER_FIELDS, row)
+        }
+
+
+def _pack_json(event_type: int, worker_id: int, payload: Dict) -> bytes:
+    blob = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    return _HEADER.pack(event_type, worker_id, 0) + _BLOB.pack(len(blob)) + blob
+
+
+class EventPublisher:
+    """Worker-side writer. Thread-safe: department threads share one publisher."""
+
+    def __init__(self, conn, counters: WorkerCounters, worker_id: int,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS, max_batch: int = MAX_LOG_BATCH):
+        self.conn = conn
+        self.counters = counters
+        self.worker_id = worker_id
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name=f"EventBusFlush-{worker_id}", daemon=True)
+        self._flusher.start()
+
+    def log(self, message: str, level: str = "INFO"):
+        data = str(message).encode("utf-8", errors="replace")
+        level_idx = LEVELS.index(level) if level in LEVELS else 0
+        with self._lock:
+            self._pending.append(_LINE.pack(level_idx, len(data)) + data)
+            if len(self._pending) >= self.max_batch:
+                self._flush_locked()
+
+    def progress(self, **counters):
+        self.counters.update(self.worker_id, **counters)
+
+    def reset_progress(self):
+        self.counters.reset(self.worker_id)
+
+    def status(self, **fields):
+        """Text fields of a worker_status update (numbers go through progress())."""
+        self._send(_pack_json(EVENT_STATUS, self.worker_id, fields))
+
+    def portal_complete(self, **fields):
+        self._send(_pack_json(EVENT_PORTAL_COMPLETE, self.worker_id, fields))
+
+    def ui_message(self, msg: Dict):
+        """ui_message_queue sink: forward the scraper's in-process queue calls."""
+        msg_type = msg.get("type")
+        label = msg.get("worker_id", "")
+        if msg_type == "log":
+            # The same text also goes through log_callback, hence DEBUG
+            self.log(f"[{label}] {msg.get('message', '')}", "DEBUG")
+        elif msg_type == "error":
+            self.log(f"[{label}] ✗ ERROR: {msg.get('error', '')}", "ERROR")
+        elif msg_type == "complete":
+            self.log(f"[{label}] ✓ Completed {msg.get('data', {}).get('departments', 0)} departments")
+        # progress: progress_callback already writes the same numbers to the counters
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and tell the reader this worker is done."""
+        self._closed.set()
+        self._send(_HEADER.pack(EVENT_WORKER_DONE, self.worker_id, 0))
+
+    def _send(self, record: bytes):
+        with self._lock:
+            self._flush_locked()
+            self.conn.send_bytes(record)
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        lines = self._pending
+        self._pending = []
+        for start in range(0, len(lines), 0xFFFF):
+            batch = lines[start:start + 0xFFFF]
+            self.conn.send_bytes(_HEADER.pack(EVENT_LOG_BATCH, self.worker_id, len(batch)) + b"".join(batch))
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                return  # pipe closed
+
+
+def decode_record(record: bytes) -> List[Dict]:
+    """Turn one pipe record back into queue-style event dicts."""
+    event_type, worker_id, count = _HEADER.unpack_from(record, 0)
+    offset = _HEADER.size
+    if event_type == EVENT_LOG_BATCH:
+        events = []
+        for _ in range(count):
+            level_idx, length = _LINE.unpack_from(record, offset)
+            offset += _LINE.size
+            message = record[offset:offset + length].decode("utf-8", errors="replace")
+            offset += length
+            events.append({"type": "log", "worker_id": worker_id, "level": LEVELS[level_idx], "message": message})
+        return events
+    if event_type in (EVENT_STATUS, EVENT_PORTAL_COMPLETE):
+        (length,) = _BLOB.unpack_from(record, offset)
+        offset += _BLOB.size
+        payload = json.loads(record[offset:offset + length].decode("utf-8"))
+        payload["type"] = "worker_status" if event_type == EVENT_STATUS else "portal_complete"
+        payload["worker_id"] = worker_id
+        return [payload]
+    if event_type == EVENT_WORKER_DONE:
+        return [{"type": "worker_done", "worker_id": worker_id}]
+    return []
+
+
+class EventBusReader:
+    """Parent-side reader over every worker pipe plus the shared counters."""
+
+    def __init__(self, connections: List, counters: WorkerCounters):
+        self._open = {conn: idx for idx, conn in enumerate(connections)}
+        self.counters = counters
+        self._seen_seq = [0] * counters.worker_count
+
+    @property
+    def active(self) -> int:
+        return len(self._open)
+
+    def poll(self, timeout: Optional[float] = FLUSH_INTERVAL_SECONDS) -> List[Dict]:
+        """Events received within timeout, then one counters update per changed worker."""
+        events: List[Dict] = []
+        if self._open:
+            for conn in wait(list(self._open), timeout):
+                done = False
+                try:
+                    while not done:
+                        decoded = decode_record(conn.recv_bytes())
+                        events.extend(decoded)
+                        done = any(event["type"] == "worker_done" for event in decoded)
+                        if not conn.poll():
+                            break
+                except (EOFError, OSError):
+                    # Worker died without close(): treat as done
+                    events.append({"type": "worker_done", "worker_id": self._open[conn]})
+                    done = True
+                if done:
+                    self._open.pop(conn, None)
+                    conn.close()
+        return events + self.counter_updates()
+
+    def counter_updates(self) -> List[Dict]:
+        updates = []
+        for worker_id in range(self.counters.worker_count):
+            values = self.counters.snapshot(worker_id)
+            if values["seq"] != self._seen_seq[worker_id]:
+                self._seen_seq[worker_id] = values.pop("seq")
+                updates.append({"type": "worker_status", "worker_id": worker_id, **values})
+        return updates
+